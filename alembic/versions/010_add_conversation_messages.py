@@ -0,0 +1,127 @@
+"""add_conversation_messages
+
+Move conversation messages out of the conversations.messages JSONB array
+into one row per message, keyed by (conversation_id, seq).
+
+Appending used to rewrite the whole array (`messages || $2`) and every read
+decoded all of it. Rows make appends O(1) and let readers fetch the tail or
+a keyset page through the primary key. conversations keeps running
+message_count (next seq) and user_turns counters, updated with each append.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-03-20
+"""
+
+from alembic import op
+
+revision: str = "010"
+down_revision: str | None = "009"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE conversation_messages (
+            conversation_id UUID NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+            seq BIGINT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL DEFAULT '',
+            metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (conversation_id, seq)
+        );
+    """)
+
+    op.execute("""
+        ALTER TABLE conversations
+        ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0,
+        ADD COLUMN user_turns INTEGER NOT NULL DEFAULT 0;
+    """)
+
+    # Backfill: one row per array element, seq = 1-based array position
+    op.execute("""
+        INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, created_at)
+        SELECT c.id,
+               e.i,
+               COALESCE(e.m->>'role', 'user'),
+               COALESCE(e.m->>'content', ''),
+               COALESCE(e.m->'metadata', '{}'::jsonb),
+               COALESCE((e.m->>'timestamp')::timestamptz, c.updated_at, now())
+        FROM conversations c,
+             jsonb_array_elements(c.messages) WITH ORDINALITY AS e(m, i)
+        WHERE jsonb_typeof(c.messages) = 'array'
+          AND jsonb_typeof(e.m) = 'object';
+    """)
+
+    op.execute("""
+        UPDATE conversations c
+        SET message_count = s.message_count,
+            user_turns = s.user_turns
+        FROM (
+            SELECT conversation_id,
+                   max(seq) AS message_count,
+                   count(*) FILTER (WHERE role = 'user') AS user_turns
+            FROM conversation_messages
+            GROUP BY conversation_id
+        ) s
+        WHERE s.conversation_id = c.id;
+    """)
+
+    op.execute("ALTER TABLE conversations DROP COLUMN messages;")
+
+    # Messages belong to users via conversation -> aide
+    op.execute("""
+        ALTER TABLE conversation_messages ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE conversation_messages FORCE ROW LEVEL SECURITY;
+    """)
+
+    op.execute("""
+        CREATE POLICY conversation_messages_all_own ON conversation_messages
+        FOR ALL
+        USING (
+            get_app_user_id() IS NULL OR
+            conversation_id IN (
+                SELECT c.id FROM conversations c
+                JOIN aides a ON a.id = c.aide_id
+                WHERE a.user_id = get_app_user_id()
+            )
+        );
+    """)
+
+    op.execute("GRANT SELECT, INSERT, DELETE ON conversation_messages TO aide_app;")
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE conversations ADD COLUMN messages JSONB DEFAULT '[]'::jsonb;
+    """)
+
+    op.execute("""
+        UPDATE conversations c
+        SET messages = s.messages
+        FROM (
+            SELECT conversation_id,
+                   jsonb_agg(
+                       jsonb_build_object(
+                           'role', role,
+                           'content', content,
+                           'timestamp', created_at,
+                           'metadata', metadata
+                       )
+                       ORDER BY seq
+                   ) AS messages
+            FROM conversation_messages
+            GROUP BY conversation_id
+        ) s
+        WHERE s.conversation_id = c.id;
+    """)
+
+    op.execute("DROP TABLE IF EXISTS conversation_messages CASCADE;")
+
+    op.execute("""
+        ALTER TABLE conversations
+        DROP COLUMN IF EXISTS user_turns,
+        DROP COLUMN IF EXISTS message_count;
+    """)
@@ -0,0 +1,82 @@
+"""add_aide_entities
+
+Optional per-entity storage for aide state (AIDE_STATE_STORAGE=entities).
+
+An aide stored this way keeps a header in aides.state (meta, styles,
+relationships, _sequence; `entities` is empty) and one aide_entities row per
+entity. A turn then rewrites only the entities it changed instead of the
+whole state document. aides.state_storage records which layout each aide is
+in, so both can coexist and an aide switches layout on its next write.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-03-24
+"""
+
+from alembic import op
+
+revision: str = "011"
+down_revision: str | None = "010"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE aides
+        ADD COLUMN state_storage TEXT NOT NULL DEFAULT 'document'
+        CHECK (state_storage IN ('document', 'entities'));
+    """)
+
+    # props is split out so the entity's bulky part sits in its own column;
+    # attrs holds every other key (display, _children, _removed, _*_seq, ...)
+    op.execute("""
+        CREATE TABLE aide_entities (
+            aide_id UUID NOT NULL REFERENCES aides(id) ON DELETE CASCADE,
+            entity_id TEXT NOT NULL,
+            parent TEXT,
+            seq BIGINT NOT NULL DEFAULT 0,
+            props JSONB,
+            attrs JSONB NOT NULL DEFAULT '{}'::jsonb,
+            PRIMARY KEY (aide_id, entity_id)
+        );
+    """)
+
+    op.execute("""
+        CREATE INDEX idx_aide_entities_parent ON aide_entities(aide_id, parent);
+    """)
+
+    op.execute("""
+        ALTER TABLE aide_entities ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE aide_entities FORCE ROW LEVEL SECURITY;
+    """)
+
+    op.execute("""
+        CREATE POLICY aide_entities_all_own ON aide_entities
+        FOR ALL
+        USING (
+            get_app_user_id() IS NULL OR
+            aide_id IN (SELECT id FROM aides WHERE user_id = get_app_user_id())
+        );
+    """)
+
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON aide_entities TO aide_app;")
+
+
+def downgrade() -> None:
+    # Fold entity rows back into the state document before dropping them
+    op.execute("""
+        UPDATE aides a
+        SET state = jsonb_set(a.state, '{entities}', COALESCE((
+                SELECT jsonb_object_agg(
+                    e.entity_id,
+                    CASE WHEN e.props IS NULL THEN e.attrs ELSE e.attrs || jsonb_build_object('props', e.props) END
+                )
+                FROM aide_entities e
+                WHERE e.aide_id = a.id
+            ), '{}'::jsonb))
+        WHERE a.state_storage = 'entities';
+    """)
+
+    op.execute("DROP TABLE IF EXISTS aide_entities CASCADE;")
+    op.execute("ALTER TABLE aides DROP COLUMN IF EXISTS state_storage;")
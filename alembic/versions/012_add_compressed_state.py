@@ -0,0 +1,63 @@
+"""add_compressed_state
+
+Optional zstd-compressed storage for large aide states
+(AIDE_STATE_COMPRESS_MIN_BYTES).
+
+An aide stored this way (state_storage 'compressed') keeps a header in
+aides.state (the state with `entities` empty) and the whole state, zstd
+over canonical JSON, in aides.state_blob. aides.state_format records the
+blob's format version (see backend/utils/state_codec.py).
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-03-27
+"""
+
+from alembic import op
+
+revision: str = "012"
+down_revision: str | None = "011"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE aides
+        ADD COLUMN state_blob BYTEA,
+        ADD COLUMN state_format SMALLINT,
+        DROP CONSTRAINT aides_state_storage_check;
+    """)
+
+    op.execute("""
+        ALTER TABLE aides
+        ADD CONSTRAINT aides_state_storage_check
+            CHECK (state_storage IN ('document', 'entities', 'compressed')),
+        ADD CONSTRAINT aides_state_blob_check
+            CHECK ((state_storage = 'compressed') = (state_blob IS NOT NULL AND state_format IS NOT NULL));
+    """)
+
+
+def downgrade() -> None:
+    # Postgres can't inflate the blobs; convert them back in Python first
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM aides WHERE state_storage = 'compressed') THEN
+                RAISE EXCEPTION 'compressed aide states remain; run scripts/convert_aide_states.py --decompress';
+            END IF;
+        END $$;
+    """)
+
+    op.execute("""
+        ALTER TABLE aides
+        DROP CONSTRAINT aides_state_blob_check,
+        DROP CONSTRAINT aides_state_storage_check,
+        DROP COLUMN state_format,
+        DROP COLUMN state_blob;
+    """)
+
+    op.execute("""
+        ALTER TABLE aides
+        ADD CONSTRAINT aides_state_storage_check CHECK (state_storage IN ('document', 'entities'));
+    """)
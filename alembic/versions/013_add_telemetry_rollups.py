@@ -0,0 +1,127 @@
+"""add_telemetry_rollups
+
+Rollup tables and materialized counts for the stats endpoints, so admin
+requests stop scanning raw telemetry, users and aides.
+
+- telemetry_aide_daily: per aide, UTC day and model tier ('' for events
+  without one): counts, sums and TTFC/TTC percentiles.
+- telemetry_tier_daily: the same per UTC day and model tier, across aides.
+- telemetry_rollup_state: how far the rollups job has rolled up (by ts).
+- admin_counts / user_aide_counts: materialized users-by-tier,
+  aides-by-status and per-user aide counts, refreshed through
+  refresh_admin_counts() (SECURITY DEFINER, since only the owner may
+  refresh a materialized view).
+
+The scheduler's rollups job (backend/main.py) maintains all of
+these through backend/repos/rollup_repo.py.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-03-30
+"""
+
+from alembic import op
+
+revision: str = "013"
+down_revision: str | None = "012"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE telemetry_aide_daily (
+            aide_id UUID NOT NULL,
+            day DATE NOT NULL,
+            tier TEXT NOT NULL,
+            llm_calls INT NOT NULL DEFAULT 0,
+            direct_edits INT NOT NULL DEFAULT 0,
+            escalations INT NOT NULL DEFAULT 0,
+            ttfc_count INT NOT NULL DEFAULT 0,
+            ttfc_sum BIGINT NOT NULL DEFAULT 0,
+            ttfc_p50 DOUBLE PRECISION,
+            ttfc_p95 DOUBLE PRECISION,
+            ttc_p50 DOUBLE PRECISION,
+            ttc_p95 DOUBLE PRECISION,
+            cost_usd NUMERIC(14,6),
+            lines_emitted BIGINT NOT NULL DEFAULT 0,
+            lines_accepted BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (aide_id, day, tier)
+        );
+    """)
+
+    op.execute("""
+        CREATE TABLE telemetry_tier_daily (
+            day DATE NOT NULL,
+            tier TEXT NOT NULL,
+            aides INT NOT NULL DEFAULT 0,
+            llm_calls INT NOT NULL DEFAULT 0,
+            direct_edits INT NOT NULL DEFAULT 0,
+            escalations INT NOT NULL DEFAULT 0,
+            input_tokens BIGINT NOT NULL DEFAULT 0,
+            output_tokens BIGINT NOT NULL DEFAULT 0,
+            ttfc_p50 DOUBLE PRECISION,
+            ttfc_p95 DOUBLE PRECISION,
+            ttc_p50 DOUBLE PRECISION,
+            ttc_p95 DOUBLE PRECISION,
+            cost_usd NUMERIC(14,6),
+            PRIMARY KEY (day, tier)
+        );
+    """)
+
+    op.execute("""
+        CREATE TABLE telemetry_rollup_state (
+            id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+            rolled_up_to TIMESTAMPTZ NOT NULL
+        );
+        INSERT INTO telemetry_rollup_state (rolled_up_to) VALUES ('-infinity');
+    """)
+
+    # Finding the rows written since the last run; BRIN suits an append-only ts
+    op.execute("CREATE INDEX idx_telemetry_ts_brin ON telemetry USING brin (ts);")
+
+    # Telemetry is system-level — no RLS, like the telemetry table itself
+    op.execute("GRANT SELECT, INSERT, UPDATE ON telemetry_aide_daily, telemetry_tier_daily TO aide_app;")
+    op.execute("GRANT SELECT, UPDATE ON telemetry_rollup_state TO aide_app;")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW admin_counts AS
+            SELECT 'users_by_tier' AS kind, tier AS key, count(*) AS count FROM users GROUP BY tier
+            UNION ALL
+            SELECT 'aides_by_status', status, count(*) FROM aides GROUP BY status;
+        CREATE UNIQUE INDEX idx_admin_counts ON admin_counts(kind, key);
+    """)
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW user_aide_counts AS
+            SELECT user_id, count(*) AS aide_count FROM aides WHERE status != 'archived' GROUP BY user_id;
+        CREATE UNIQUE INDEX idx_user_aide_counts ON user_aide_counts(user_id);
+    """)
+
+    # list_all pages users newest first
+    op.execute("CREATE INDEX idx_users_created ON users(created_at DESC);")
+
+    op.execute("GRANT SELECT ON admin_counts, user_aide_counts TO aide_app;")
+
+    op.execute("""
+        CREATE FUNCTION refresh_admin_counts() RETURNS void
+        LANGUAGE plpgsql SECURITY DEFINER SET search_path = public AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW CONCURRENTLY admin_counts;
+            REFRESH MATERIALIZED VIEW CONCURRENTLY user_aide_counts;
+        END;
+        $$;
+        REVOKE ALL ON FUNCTION refresh_admin_counts() FROM PUBLIC;
+        GRANT EXECUTE ON FUNCTION refresh_admin_counts() TO aide_app;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS refresh_admin_counts();")
+    op.execute("DROP INDEX IF EXISTS idx_users_created;")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_aide_counts;")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS admin_counts;")
+    op.execute("DROP INDEX IF EXISTS idx_telemetry_ts_brin;")
+    op.execute("DROP TABLE IF EXISTS telemetry_rollup_state;")
+    op.execute("DROP TABLE IF EXISTS telemetry_tier_daily;")
+    op.execute("DROP TABLE IF EXISTS telemetry_aide_daily;")
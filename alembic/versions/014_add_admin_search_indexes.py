@@ -0,0 +1,49 @@
+"""add_admin_search_indexes
+
+Indexes for the admin listings and breakglass search.
+
+- idx_users_email_trgm: pg_trgm GIN index on lower(email), so
+  AideRepo.search_by_user_email's LIKE '%...%' is an index scan instead of
+  a sequential scan of users (for patterns of three or more characters).
+- idx_users_created / idx_admin_audit_log_created now cover
+  (created_at DESC, id DESC), the keyset order UserRepo.list_all and
+  AdminAuditRepo.list_audit_logs page by. created_at becomes NOT NULL on
+  both tables, since keyset comparisons skip NULL rows.
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-04-02
+"""
+
+from alembic import op
+
+revision: str = "014"
+down_revision: str | None = "013"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute("CREATE INDEX idx_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops);")
+
+    op.execute("ALTER TABLE users ALTER COLUMN created_at SET NOT NULL;")
+    op.execute("DROP INDEX IF EXISTS idx_users_created;")
+    op.execute("CREATE INDEX idx_users_created ON users(created_at DESC, id DESC);")
+
+    op.execute("ALTER TABLE admin_audit_log ALTER COLUMN created_at SET NOT NULL;")
+    op.execute("DROP INDEX IF EXISTS idx_admin_audit_log_created;")
+    op.execute("CREATE INDEX idx_admin_audit_log_created ON admin_audit_log(created_at DESC, id DESC);")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_admin_audit_log_created;")
+    op.execute("CREATE INDEX idx_admin_audit_log_created ON admin_audit_log(created_at);")
+    op.execute("ALTER TABLE admin_audit_log ALTER COLUMN created_at DROP NOT NULL;")
+
+    op.execute("DROP INDEX IF EXISTS idx_users_created;")
+    op.execute("CREATE INDEX idx_users_created ON users(created_at DESC);")
+    op.execute("ALTER TABLE users ALTER COLUMN created_at DROP NOT NULL;")
+
+    # pg_trgm stays installed; other objects may have come to depend on it
+    op.execute("DROP INDEX IF EXISTS idx_users_email_trgm;")
@@ -0,0 +1,31 @@
+"""add_aide_state_version
+
+Optimistic concurrency for AideRepo.update_state.
+
+- aides.version: bumped by every state write. Callers that read an aide
+  can pass the version back (expected_version) so the write only applies
+  if nobody wrote in between.
+
+Unchanged states are recognised by their kernel _sequence, so no hash
+column is needed.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-04-05
+"""
+
+from alembic import op
+
+revision: str = "015"
+down_revision: str | None = "014"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    # Constant default: no table rewrite
+    op.execute("ALTER TABLE aides ADD COLUMN version BIGINT NOT NULL DEFAULT 0;")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE aides DROP COLUMN IF EXISTS version;")
@@ -15,6 +15,21 @@ class Settings:
     # Database
     DATABASE_URL: str = os.environ.get("DATABASE_URL", "")
 
+    # Optional streaming replica for read-only repo methods (db.read_conn / db.user_read_conn);
+    # reads fall back to the primary while its measured lag exceeds REPLICA_MAX_LAG_MS
+    DATABASE_READ_URL: str = os.environ.get("DATABASE_READ_URL", "")
+    REPLICA_MAX_LAG_MS: int = int(os.environ.get("REPLICA_MAX_LAG_MS", "1000"))
+
+    # Connection pool bounds (db.init_pool). With DB_POOL_ADAPTIVE_MAX_SIZE above DB_POOL_MAX_SIZE,
+    # primary checkouts may grow to it while p95 acquire wait exceeds DB_POOL_WAIT_TARGET_MS
+    DB_POOL_MIN_SIZE: int = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE: int = int(os.environ.get("DB_POOL_MAX_SIZE", "20"))
+    DB_POOL_ADAPTIVE_MAX_SIZE: int = int(os.environ.get("DB_POOL_ADAPTIVE_MAX_SIZE", "0"))
+    DB_POOL_WAIT_TARGET_MS: float = float(os.environ.get("DB_POOL_WAIT_TARGET_MS", "10"))
+
+    # Statements slower than this are logged with the calling repo method; 0 disables
+    DB_SLOW_QUERY_MS: int = int(os.environ.get("DB_SLOW_QUERY_MS", "500"))
+
     # R2 / S3 Storage
     R2_ENDPOINT: str = os.environ.get("R2_ENDPOINT", "")
     R2_ACCESS_KEY: str = os.environ.get("R2_ACCESS_KEY", "")
@@ -80,6 +95,49 @@ class Settings:
     API_RATE_LIMIT_PER_MINUTE: int = 100  # per user
     WEBSOCKET_MAX_CONNECTIONS: int = 5  # per user
 
+    # Longest a turn waits for another replica's turn on the same aide before giving up
+    ADVISORY_LOCK_TIMEOUT_S: float = float(os.environ.get("ADVISORY_LOCK_TIMEOUT_S", "90"))
+
+    # Direct edits are persisted write-behind: coalesced per aide and flushed once per window
+    DIRECT_EDIT_FLUSH_MS: int = int(os.environ.get("DIRECT_EDIT_FLUSH_MS", "500"))
+
+    # In-process cache of decoded aide snapshots (repos/snapshot_cache.py); 0 disables it
+    SNAPSHOT_CACHE_MB: int = int(os.environ.get("SNAPSHOT_CACHE_MB", "64"))
+
+    # Telemetry rows are queued in process (services/telemetry_sink.py) and COPYed in batches of
+    # TELEMETRY_BATCH_ROWS at least every TELEMETRY_FLUSH_MS; past TELEMETRY_QUEUE_MAX new rows are dropped
+    TELEMETRY_BATCH_ROWS: int = int(os.environ.get("TELEMETRY_BATCH_ROWS", "500"))
+    TELEMETRY_FLUSH_MS: int = int(os.environ.get("TELEMETRY_FLUSH_MS", "1000"))
+    TELEMETRY_QUEUE_MAX: int = int(os.environ.get("TELEMETRY_QUEUE_MAX", "10000"))
+
+    # Seconds between runs of the stats rollups job (main.roll_up_stats, services/scheduler.py)
+    TELEMETRY_ROLLUP_S: int = int(os.environ.get("TELEMETRY_ROLLUP_S", "60"))
+
+    # Rows deleted per transaction by the batched cleanup jobs (services/scheduler.py)
+    CLEANUP_BATCH_SIZE: int = int(os.environ.get("CLEANUP_BATCH_SIZE", "1000"))
+
+    # Shadow users with no aides are deleted this many days after creation
+    SHADOW_USER_MAX_AGE_DAYS: int = int(os.environ.get("SHADOW_USER_MAX_AGE_DAYS", "30"))
+
+    # How update_state stores aide state: "document" (one JSONB value) or "entities" (one row per entity)
+    AIDE_STATE_STORAGE: str = os.environ.get("AIDE_STATE_STORAGE", "document")
+
+    # Document-layout states whose JSON reaches this many bytes are stored zstd-compressed
+    # (utils/state_codec.py; needs zstandard); 0 disables. A scheduler job converts existing rows.
+    AIDE_STATE_COMPRESS_MIN_BYTES: int = int(os.environ.get("AIDE_STATE_COMPRESS_MIN_BYTES", "0"))
+
+    # Per-connection WebSocket send queue (services/outbound.py): past these limits pending deltas
+    # are dropped for a resync; a client whose single send stalls this long is disconnected
+    WS_SEND_QUEUE_FRAMES: int = int(os.environ.get("WS_SEND_QUEUE_FRAMES", "1000"))
+    WS_SEND_QUEUE_BYTES: int = int(os.environ.get("WS_SEND_QUEUE_BYTES", str(4 * 1024 * 1024)))
+    WS_SEND_TIMEOUT_S: float = float(os.environ.get("WS_SEND_TIMEOUT_S", "30"))
+
+    # Long-lived Node workers rendering published pages (services/render_pool.py): how many,
+    # how long one render may take before its worker is restarted, and how often idle ones are pinged
+    RENDER_WORKERS: int = int(os.environ.get("RENDER_WORKERS", "2"))
+    RENDER_TIMEOUT_S: float = float(os.environ.get("RENDER_TIMEOUT_S", "5"))
+    RENDER_HEALTH_S: int = int(os.environ.get("RENDER_HEALTH_S", "30"))
+
     # AI Providers (for managed API routing)
     ANTHROPIC_API_KEY: str = os.environ.get("ANTHROPIC_API_KEY", "")
     OPENAI_API_KEY: str = os.environ.get("OPENAI_API_KEY", "")
@@ -89,6 +147,10 @@ class Settings:
     L2_MODEL: str = os.environ.get("L2_MODEL", "claude-sonnet-4-20250514")
     L3_MODEL: str = os.environ.get("L3_MODEL", "claude-sonnet-4-20250514")
 
+    # LLM output wire format per tier: "tools" (tool_use blocks) or "jsonl" (compact JSONL in text)
+    L3_OUTPUT_MODE: str = os.environ.get("L3_OUTPUT_MODE", "tools")
+    L4_OUTPUT_MODE: str = os.environ.get("L4_OUTPUT_MODE", "tools")
+
     # Shadow models (run after production calls, results recorded but not applied)
     # Shadow uses lower-tier models to measure if cheaper models would suffice
     L2_SHADOW_MODEL: str = os.environ.get("L2_SHADOW_MODEL", "claude-3-5-haiku-20241022")
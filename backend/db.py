@@ -3,73 +3,504 @@ Database connection pool and RLS-scoped connection managers.
 
 All database access goes through user_conn() or system_conn().
 Never use pool.acquire() directly outside this module.
+
+A route that makes several repo calls for one user can wrap them in
+unit_of_work(): every user_conn() for that user inside it (in the same
+task) reuses one connection and one transaction instead of acquiring,
+BEGINning and setting the RLS context again for each call.
+
+Read-only repo methods that tolerate slight staleness use read_conn() or
+user_read_conn(). With DATABASE_READ_URL set these go to a read replica,
+with the same RLS context, unless the replica is lagging or the user
+committed on the primary too recently to be sure the replica has it.
+
+Every checkout is instrumented: acquire-wait and hold-time histograms,
+in-use and waiting counts per pool, a statement latency histogram, and a
+warning naming the calling repo method for statements slower than
+DB_SLOW_QUERY_MS (see pool_stats()). With DB_POOL_ADAPTIVE_MAX_SIZE set,
+checkouts from the primary are capped by a limit that starts at
+DB_POOL_MAX_SIZE and grows toward DB_POOL_ADAPTIVE_MAX_SIZE while p95
+acquire wait exceeds DB_POOL_WAIT_TARGET_MS, shrinking back when the pool
+is idle.
 """
 
 from __future__ import annotations
 
-import json
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+import sys
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+from typing import Any
 from uuid import UUID
 
 import asyncpg
 
 from backend import config
+from backend.utils import jsonx
+
+logger = logging.getLogger(__name__)
 
 pool: asyncpg.Pool | None = None
+read_pool: asyncpg.Pool | None = None
+
+# Replica lag in ms as last measured; None until measured or while the replica is unreachable
+_replica_lag_ms: float | None = None
+_lag_task: asyncio.Task | None = None
+_LAG_CHECK_S = 1.0
+
+# Zero when the replica has replayed all it has received (idle primary), else age of the last replayed commit
+_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) * 1000, 0)
+    END
+"""
+
+# user_id -> time.monotonic() of that user's last commit on the primary (read-your-writes)
+_recent_writes: dict[str, float] = {}
+_MAX_TRACKED_WRITERS = 10_000
+_read_counts = {"replica": 0, "primary": 0}
+
+# Recent samples each histogram keeps for percentiles
+_WINDOW = 1024
+# Seconds between adaptive pool limit adjustments
+_ADAPT_S = 5.0
+_adapt_task: asyncio.Task | None = None
 
 
 async def init_pool() -> None:
     """
-    Initialize the connection pool.
+    Initialize the connection pool, and the read replica pool if DATABASE_READ_URL is set.
     Called once at application startup.
     """
-    global pool
+    global pool, read_pool, _lag_task, _gate, _adapt_task
+    settings = config.settings
+    adaptive = settings.DB_POOL_ADAPTIVE_MAX_SIZE > settings.DB_POOL_MAX_SIZE
     pool = await asyncpg.create_pool(
-        dsn=config.settings.DATABASE_URL,
-        min_size=2,
-        max_size=20,
+        dsn=settings.DATABASE_URL,
+        min_size=settings.DB_POOL_MIN_SIZE,
+        max_size=settings.DB_POOL_ADAPTIVE_MAX_SIZE if adaptive else settings.DB_POOL_MAX_SIZE,
         command_timeout=60,
         init=_init_connection,
     )
+    if adaptive:
+        _gate = _Gate(settings.DB_POOL_MAX_SIZE, settings.DB_POOL_MAX_SIZE, settings.DB_POOL_ADAPTIVE_MAX_SIZE)
+        _adapt_task = asyncio.create_task(_adapt_pool_limit())
+    if settings.DATABASE_READ_URL:
+        read_pool = await asyncpg.create_pool(
+            dsn=settings.DATABASE_READ_URL,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            command_timeout=60,
+            init=_init_connection,
+        )
+        _lag_task = asyncio.create_task(_watch_replica_lag())
 
 
 async def close_pool() -> None:
     """
-    Close the connection pool.
+    Close the connection pools.
     Called at application shutdown.
     """
-    global pool
+    global pool, read_pool, _lag_task, _replica_lag_ms, _gate, _adapt_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _adapt_task is not None:
+        _adapt_task.cancel()
+        _adapt_task = None
+    _gate = None
+    _replica_lag_ms = None
+    if read_pool is not None:
+        await read_pool.close()
+        read_pool = None
     if pool is not None:
         await pool.close()
         pool = None
 
 
+async def _watch_replica_lag() -> None:
+    """Measure replica lag every _LAG_CHECK_S; reads avoid the replica while it is unknown or too high."""
+    global _replica_lag_ms
+    while True:
+        try:
+            async with read_pool.acquire() as conn:
+                _replica_lag_ms = float(await conn.fetchval(_LAG_QUERY))
+        except Exception as e:
+            if _replica_lag_ms is not None:
+                logger.warning("db: read replica unreachable, reading from the primary: %s", e)
+            _replica_lag_ms = None
+        await asyncio.sleep(_LAG_CHECK_S)
+
+
+def _note_write(user_id: str) -> None:
+    if len(_recent_writes) >= _MAX_TRACKED_WRITERS:
+        cutoff = time.monotonic() - _read_your_writes_s()
+        for stale in [key for key, at in _recent_writes.items() if at < cutoff]:
+            del _recent_writes[stale]
+    _recent_writes[user_id] = time.monotonic()
+
+
+def _read_your_writes_s() -> float:
+    # A replica measured at most REPLICA_MAX_LAG_MS behind, no more than _LAG_CHECK_S ago,
+    # has replayed every commit older than this
+    return config.settings.REPLICA_MAX_LAG_MS / 1000 + _LAG_CHECK_S
+
+
+def _read_target(user_id: str) -> asyncpg.Pool | None:
+    """The replica if it is current enough for this caller, else the primary."""
+    lag = _replica_lag_ms
+    use_replica = (
+        read_pool is not None
+        and lag is not None
+        and lag <= config.settings.REPLICA_MAX_LAG_MS
+        and not (user_id and time.monotonic() - _recent_writes.get(user_id, float("-inf")) < _read_your_writes_s())
+    )
+    _read_counts["replica" if use_replica else "primary"] += 1
+    return read_pool if use_replica else pool
+
+
+def read_stats() -> dict:
+    """Replica routing counters for this process."""
+    return {
+        "replica_configured": read_pool is not None,
+        "replica_lag_ms": _replica_lag_ms,
+        "reads_replica": _read_counts["replica"],
+        "reads_primary": _read_counts["primary"],
+        "tracked_writers": len(_recent_writes),
+    }
+
+
+def _percentile(ordered: list[float], pct: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(int(pct / 100 * len(ordered)), len(ordered) - 1)], 2)
+
+
+class _Histogram:
+    """Latency histogram in ms: cumulative bucket counts plus a window of recent samples for percentiles."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.recent: deque[float] = deque(maxlen=_WINDOW)
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.recent.append(ms)
+
+    def since(self, count: int) -> list[float]:
+        """Samples observed after the histogram had `count` (as many as the window still holds)."""
+        new = min(self.count - count, len(self.recent))
+        return list(self.recent)[len(self.recent) - new :] if new > 0 else []
+
+    def stats(self) -> dict[str, Any]:
+        ordered = sorted(self.recent)
+        buckets, total = {}, 0
+        for bound, count in zip(self.BOUNDS_MS, self.counts, strict=False):
+            total += count
+            buckets[f"le_{bound}"] = total
+        buckets["inf"] = self.count
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 1),
+            "p50_ms": _percentile(ordered, 50),
+            "p95_ms": _percentile(ordered, 95),
+            "p99_ms": _percentile(ordered, 99),
+            "buckets": buckets,
+        }
+
+
+class _PoolStats:
+    """Checkout counters for one pool."""
+
+    def __init__(self) -> None:
+        self.wait = _Histogram()
+        self.hold = _Histogram()
+        self.waiting = 0
+        self.in_use = 0
+        # Highest in_use since the adaptive limit last looked
+        self.peak_in_use = 0
+
+
+class _Gate:
+    """Caps concurrent checkouts at a limit that can be moved within [low, high] while in use."""
+
+    def __init__(self, limit: int, low: int, high: int) -> None:
+        self.limit, self.low, self.high = limit, low, high
+        self.active = 0
+        self.resizes = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    async def enter(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot, then cancelled before taking it: hand it on
+                self.leave()
+            else:
+                with suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def leave(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = max(self.low, min(self.high, limit))
+        self.resizes += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+_pool_stats = {"primary": _PoolStats(), "replica": _PoolStats()}
+_statements = _Histogram()
+_slow_statements = 0
+# Adaptive cap on primary checkouts; None unless DB_POOL_ADAPTIVE_MAX_SIZE is set
+_gate: _Gate | None = None
+
+# The repo method (or other caller) that opened the current transaction, for slow-query logs
+_caller: ContextVar[str | None] = ContextVar("db_caller", default=None)
+
+
+_CONTEXTLIB_FILE = asynccontextmanager.__code__.co_filename
+
+
+def _calling_function() -> str:
+    """module.qualname of the nearest frame outside this module and contextlib."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in (__file__, _CONTEXTLIB_FILE):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+
+def _log_query(record: Any) -> None:
+    """asyncpg query logger: statement latency, and a warning for slow statements."""
+    global _slow_statements
+    elapsed_ms = record.elapsed * 1000
+    _statements.observe(elapsed_ms)
+    threshold = config.settings.DB_SLOW_QUERY_MS
+    if threshold and elapsed_ms >= threshold:
+        _slow_statements += 1
+        logger.warning(
+            "db: slow statement (%.0f ms) in %s: %s",
+            elapsed_ms,
+            _caller.get() or "unknown",
+            " ".join(record.query.split())[:300],
+        )
+
+
+def _adapt_step(gate: _Gate, stats: _PoolStats, wait_count: int) -> int:
+    """
+    Move the checkout limit for the waits observed since `wait_count`.
+
+    Grows by a quarter while p95 acquire wait is over DB_POOL_WAIT_TARGET_MS;
+    shrinks by an eighth when waits are well under target and the peak in-use
+    count since the last step left that much headroom. Idle connections above
+    the limit are closed by asyncpg once inactive for 5 minutes.
+
+    Returns:
+        The wait count to pass to the next step
+    """
+    target = config.settings.DB_POOL_WAIT_TARGET_MS
+    waits = sorted(stats.wait.since(wait_count))
+    p95 = _percentile(waits, 95) or 0.0
+    grow, shrink = max(1, gate.limit // 4), max(1, gate.limit // 8)
+    if p95 > target and gate.limit < gate.high:
+        gate.resize(gate.limit + grow)
+        logger.info("db: pool limit raised to %d (p95 acquire wait %.1f ms)", gate.limit, p95)
+    elif p95 <= target / 2 and stats.peak_in_use <= gate.limit - 2 * shrink and gate.limit > gate.low:
+        gate.resize(gate.limit - shrink)
+        logger.info("db: pool limit lowered to %d", gate.limit)
+    stats.peak_in_use = stats.in_use
+    return stats.wait.count
+
+
+async def _adapt_pool_limit() -> None:
+    stats, wait_count = _pool_stats["primary"], 0
+    while True:
+        await asyncio.sleep(_ADAPT_S)
+        if _gate is not None:
+            wait_count = _adapt_step(_gate, stats, wait_count)
+
+
+def pool_stats() -> dict[str, Any]:
+    """Checkout and statement counters for this process (GET /api/admin/metrics)."""
+    pools: dict[str, Any] = {}
+    for name, target in (("primary", pool), ("replica", read_pool)):
+        if target is None:
+            continue
+        stats = _pool_stats[name]
+        pools[name] = {
+            "size": target.get_size(),
+            "idle": target.get_idle_size(),
+            "max_size": target.get_max_size(),
+            "limit": _gate.limit if name == "primary" and _gate is not None else target.get_max_size(),
+            "in_use": stats.in_use,
+            "waiting": stats.waiting,
+            "acquire_wait": stats.wait.stats(),
+            "hold": stats.hold.stats(),
+        }
+    return {
+        "pools": pools,
+        "adaptive_resizes": _gate.resizes if _gate is not None else 0,
+        "statements": _statements.stats(),
+        "slow_statements": _slow_statements,
+        "slow_statement_ms": config.settings.DB_SLOW_QUERY_MS,
+    }
+
+
+@asynccontextmanager
+async def _acquire(target: asyncpg.Pool):
+    """Check a connection out of target, recording wait and hold times (and obeying the adaptive limit)."""
+    stats = _pool_stats["replica" if target is read_pool else "primary"]
+    gate = _gate if target is pool else None
+    started = time.perf_counter()
+    stats.waiting += 1
+    waiting = True
+    try:
+        if gate is not None:
+            await gate.enter()
+        try:
+            async with target.acquire() as conn:
+                acquired = time.perf_counter()
+                stats.waiting -= 1
+                waiting = False
+                stats.wait.observe((acquired - started) * 1000)
+                stats.in_use += 1
+                stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+                try:
+                    yield conn
+                finally:
+                    stats.in_use -= 1
+                    stats.hold.observe((time.perf_counter() - acquired) * 1000)
+        finally:
+            if gate is not None:
+                gate.leave()
+    finally:
+        if waiting:
+            stats.waiting -= 1
+
+
 async def _init_connection(conn: asyncpg.Connection) -> None:
     """
     Initialize each new connection.
-    Sets up type codecs for UUID and JSON handling.
+    Sets up type codecs for UUID and JSON handling, and the statement logger.
     """
+    conn.add_query_logger(_log_query)
     await conn.set_type_codec(
         "uuid",
         encoder=str,
         decoder=lambda x: UUID(x),
         schema="pg_catalog",
     )
-    # JSONB codec - decode to Python dict/list
+    # JSON codecs in binary format: values go over the wire as the encoder's bytes, with no
+    # str round trip. jsonb's binary form is a version byte (1) followed by the JSON text.
     await conn.set_type_codec(
         "jsonb",
-        encoder=json.dumps,
-        decoder=json.loads,
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
         schema="pg_catalog",
+        format="binary",
     )
     await conn.set_type_codec(
         "json",
-        encoder=json.dumps,
-        decoder=json.loads,
+        encoder=jsonx.dumpb,
+        decoder=jsonx.loads,
         schema="pg_catalog",
+        format="binary",
     )
 
 
+def _encode_jsonb(value: Any) -> bytes:
+    return b"\x01" + jsonx.dumpb(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return jsonx.loads(memoryview(data)[1:])
+
+
+class _UnitOfWork:
+    """A connection and open transaction pinned for one user's repo calls in one task."""
+
+    def __init__(self, user_id: str, conn: asyncpg.Connection) -> None:
+        self.user_id = user_id
+        self.conn = conn
+        # Tasks spawned inside the scope inherit the context var; only the owner may reuse conn
+        self.owner = asyncio.current_task()
+        self.after_commit: list[Callable[[], None]] = []
+
+
+_unit: ContextVar[_UnitOfWork | None] = ContextVar("db_unit_of_work", default=None)
+
+
+def _active_unit(user_id: str | None = None) -> _UnitOfWork | None:
+    unit = _unit.get()
+    if unit is None or unit.owner is not asyncio.current_task():
+        return None
+    if user_id is not None and unit.user_id != user_id:
+        return None
+    return unit
+
+
+@asynccontextmanager
+async def _transaction(user_id: str, target: asyncpg.Pool | None = None, read_only: bool = False):
+    """
+    Acquire a connection and open a transaction with app.user_id set ('' for system).
+
+    BEGIN and set_config go out as one simple-protocol query, so the RLS context
+    costs no round trip of its own. user_id is a formatted UUID (or empty), never
+    caller text, so inlining it is safe. `target` defaults to the primary pool.
+    """
+    if pool is None:
+        raise RuntimeError("Database pool not initialized. Call init_pool() first.")
+
+    begin = "BEGIN READ ONLY" if read_only else "BEGIN"
+    caller = _caller.set(_calling_function())
+    try:
+        async with _acquire(target or pool) as conn:
+            await conn.execute(f"{begin}; SELECT set_config('app.user_id', '{user_id}', true)")
+            try:
+                yield conn
+            except BaseException:
+                # Best effort; if it fails the pool's reset rolls back before reuse
+                if not conn.is_closed():
+                    with suppress(Exception):
+                        await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+    finally:
+        _caller.reset(caller)
+    if user_id and not read_only and read_pool is not None:
+        _note_write(user_id)
+
+
 @asynccontextmanager
 async def user_conn(user_id: str | UUID):
     """
@@ -78,6 +509,9 @@ async def user_conn(user_id: str | UUID):
     Every query through this connection can only see/modify rows
     belonging to this user. Enforced by Postgres RLS policies.
 
+    Inside unit_of_work() for the same user, yields the unit's connection;
+    the unit commits or rolls back, not this block.
+
     Usage:
         async with user_conn(user_id) as conn:
             row = await conn.fetchrow("SELECT * FROM aides WHERE id = $1", aide_id)
@@ -88,17 +522,107 @@ async def user_conn(user_id: str | UUID):
     Yields:
         asyncpg.Connection with RLS context set
     """
-    if pool is None:
-        raise RuntimeError("Database pool not initialized. Call init_pool() first.")
+    key = str(UUID(str(user_id)))
+    unit = _active_unit(key)
+    if unit is not None:
+        yield unit.conn
+        return
+    async with _transaction(key) as conn:
+        yield conn
 
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-            # Set RLS context. All policies reference current_setting('app.user_id')
-            await conn.execute(
-                "SELECT set_config('app.user_id', $1, true)",
-                str(user_id),
-            )
-            yield conn
+
+@asynccontextmanager
+async def user_read_conn(user_id: str | UUID):
+    """
+    Like user_conn(), for read-only queries that may be served by the read replica.
+
+    RLS applies the same way on the replica. Goes to the primary when no
+    replica is configured, its lag is unknown or above REPLICA_MAX_LAG_MS, or
+    this user committed on the primary (from this process) too recently for
+    the replica to be sure to have it. Inside unit_of_work() for the same
+    user, yields the unit's connection.
+
+    Args:
+        user_id: UUID of the user to scope the connection to
+
+    Yields:
+        asyncpg.Connection in a read-only transaction with RLS context set
+    """
+    key = str(UUID(str(user_id)))
+    unit = _active_unit(key)
+    if unit is not None:
+        yield unit.conn
+        return
+    async with _transaction(key, _read_target(key), read_only=True) as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def read_conn():
+    """
+    Like system_conn(), for read-only queries that may be served by the read replica.
+
+    For public and admin reads that tolerate up to REPLICA_MAX_LAG_MS of staleness.
+
+    Yields:
+        asyncpg.Connection in a read-only transaction without RLS scoping
+    """
+    async with _transaction("", _read_target(""), read_only=True) as conn:
+        yield conn
+
+
+@asynccontextmanager
+async def unit_of_work(user_id: str | UUID):
+    """
+    Share one connection and transaction among the user_conn() calls in this block.
+
+    Scope it to one request or one step of a turn, never across slow work
+    such as an LLM call: the pooled connection stays checked out until the
+    block exits. Nested units for the same user join the outer one. A failed
+    statement aborts the whole unit, and system_conn() calls and tasks
+    started inside the block still get their own connections.
+
+    Usage:
+        async with unit_of_work(user.id):
+            aide = await aide_repo.get(user.id, aide_id)
+            conversation = await conversation_repo.get_for_aide(user.id, aide_id)
+
+    Args:
+        user_id: UUID of the user whose calls share the connection
+    """
+    key = str(UUID(str(user_id)))
+    if _active_unit(key) is not None:
+        yield
+        return
+    async with _transaction(key) as conn:
+        unit = _UnitOfWork(key, conn)
+        token = _unit.set(unit)
+        try:
+            yield
+        finally:
+            _unit.reset(token)
+    for callback in unit.after_commit:
+        callback()
+
+
+def on_commit(conn: asyncpg.Connection, callback: Callable[[], None]) -> None:
+    """
+    Run callback once conn's work is committed.
+
+    Repo calls return after their own transaction has committed, except on a
+    unit_of_work() connection, which commits when the unit ends; callbacks
+    for it are held until then and dropped if the unit rolls back. Use for
+    side effects that must only see committed data (e.g. the snapshot cache).
+
+    Args:
+        conn: Connection the write or read went through
+        callback: Called with no arguments
+    """
+    unit = _active_unit()
+    if unit is not None and unit.conn is conn:
+        unit.after_commit.append(callback)
+    else:
+        callback()
 
 
 @asynccontextmanager
@@ -122,13 +646,179 @@ async def system_conn():
     Yields:
         asyncpg.Connection without RLS scoping
     """
-    if pool is None:
-        raise RuntimeError("Database pool not initialized. Call init_pool() first.")
+    # Explicitly reset RLS context to empty string.
+    # RLS policies use CASE WHEN NULLIF(current_setting('app.user_id', true), '') IS NULL
+    # to bypass for system operations. Using LOCAL (true) ensures it's cleaned up.
+    async with _transaction("") as conn:
+        yield conn
+
+
+class AdvisoryLockTimeout(Exception):
+    """Another session held the advisory lock for longer than the caller was willing to wait."""
+
+
+class AdvisoryLockLost(Exception):
+    """The lock connection dropped while the lock was held, so Postgres released it."""
+
+
+# Session-level advisory locks live on one dedicated connection outside the pool, so a
+# lock held across a long LLM turn never pins a pooled connection. _lock_mutex serializes
+# the (non-blocking) lock queries on it; asyncpg allows one operation at a time.
+_lock_conn: asyncpg.Connection | None = None
+_lock_mutex = asyncio.Lock()
+
+# Locks taken with hold_advisory_lock(), by key, with the connection that holds them
+_held_locks: dict[str, asyncpg.Connection] = {}
+
+# Backoff between pg_try_advisory_lock attempts while another session holds the lock
+_LOCK_RETRY_MIN_S = 0.05
+_LOCK_RETRY_MAX_S = 1.0
 
-    async with pool.acquire() as conn:
-        async with conn.transaction():
-            # Explicitly reset RLS context to empty string.
-            # RLS policies use CASE WHEN NULLIF(current_setting('app.user_id', true), '') IS NULL
-            # to bypass for system operations. Using LOCAL (true) ensures it's cleaned up.
-            await conn.execute("SELECT set_config('app.user_id', '', true)")
-            yield conn
+
+async def _lock_query(query: str, key: str) -> bool:
+    global _lock_conn
+    async with _lock_mutex:
+        if _lock_conn is None or _lock_conn.is_closed():
+            _lock_conn = await asyncpg.connect(dsn=config.settings.DATABASE_URL, command_timeout=10)
+        return await _lock_conn.fetchval(query, key)
+
+
+class AdvisoryLease:
+    """A lock taken with advisory_lock(), valid while the connection that took it is alive."""
+
+    def __init__(self, key: str, conn: asyncpg.Connection | None) -> None:
+        self.key = key
+        self._conn = conn
+
+    @property
+    def held(self) -> bool:
+        """False once the lock connection has dropped (or been replaced), releasing the lock."""
+        return self._conn is not None and self._conn is _lock_conn and not self._conn.is_closed()
+
+    def check(self) -> None:
+        """
+        Raise if the lock has been released underneath the holder.
+
+        Call before work that must not run unserialized, such as persisting.
+
+        Raises:
+            AdvisoryLockLost: The lock connection dropped since the lock was taken
+        """
+        if not self.held:
+            raise AdvisoryLockLost(self.key)
+
+
+@asynccontextmanager
+async def advisory_lock(key: str, timeout: float | None = None):
+    """
+    Hold a Postgres advisory lock for the duration of the block.
+
+    Used to serialize work on one resource (e.g. an aide's turns) across
+    replicas. Locks are taken with pg_try_advisory_lock on a dedicated
+    connection, retrying with backoff, so waiting for or holding a lock
+    never ties up a pooled connection. Locks are reentrant within this
+    process (they share the connection); callers serialize in-process work
+    themselves.
+
+    Every lock in the process lives on that one connection, so if it drops
+    they are all released at once. The yielded lease reports this: check()
+    it before persisting, and leaving the block after the lock was lost
+    raises AdvisoryLockLost rather than finishing silently.
+
+    Usage:
+        async with advisory_lock(f"aide:{aide_id}") as lease:
+            ...
+            lease.check()
+            await save(...)
+
+    Args:
+        key: Lock name, hashed to a bigint with hashtextextended()
+        timeout: Seconds to wait for the lock (default ADVISORY_LOCK_TIMEOUT_S)
+
+    Yields:
+        AdvisoryLease for the lock
+
+    Raises:
+        AdvisoryLockTimeout: The lock was still held elsewhere after `timeout`
+        AdvisoryLockLost: The lock connection dropped while the block ran
+    """
+    deadline = time.monotonic() + (timeout if timeout is not None else config.settings.ADVISORY_LOCK_TIMEOUT_S)
+    delay = _LOCK_RETRY_MIN_S
+    while not await _lock_query("SELECT pg_try_advisory_lock(hashtextextended($1, 0))", key):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise AdvisoryLockTimeout(key)
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, _LOCK_RETRY_MAX_S)
+    lease = AdvisoryLease(key, _lock_conn)
+    try:
+        yield lease
+    except BaseException:
+        # If the lock connection dropped meanwhile, Postgres already released the lock
+        if lease.held:
+            await _lock_query("SELECT pg_advisory_unlock(hashtextextended($1, 0))", key)
+        raise
+    lease.check()
+    await _lock_query("SELECT pg_advisory_unlock(hashtextextended($1, 0))", key)
+
+
+async def hold_advisory_lock(key: str) -> bool:
+    """
+    Take a session-level advisory lock without waiting, and keep it.
+
+    Unlike advisory_lock(), the lock outlives the call: it is held until
+    release_advisory_lock(), or until the lock connection drops and Postgres
+    releases it. Calling again while it is held returns True without a
+    query, so a leader can cheaply re-check its lease before each piece of
+    work (services/scheduler.py).
+
+    Args:
+        key: Lock name, hashed to a bigint with hashtextextended()
+
+    Returns:
+        True if this process holds the lock
+    """
+    held_on = _held_locks.get(key)
+    if held_on is not None and held_on is _lock_conn and not held_on.is_closed():
+        return True
+    _held_locks.pop(key, None)
+    if not await _lock_query("SELECT pg_try_advisory_lock(hashtextextended($1, 0))", key):
+        return False
+    _held_locks[key] = _lock_conn
+    return True
+
+
+async def release_advisory_lock(key: str) -> None:
+    """Release a lock taken with hold_advisory_lock(); a no-op if it is not held."""
+    held_on = _held_locks.pop(key, None)
+    if held_on is not None and held_on is _lock_conn and not held_on.is_closed():
+        await _lock_query("SELECT pg_advisory_unlock(hashtextextended($1, 0))", key)
+
+
+async def close_lock_connection() -> None:
+    """Close the advisory lock connection (releasing any locks still held). Called at shutdown."""
+    global _lock_conn
+    async with _lock_mutex:
+        if _lock_conn is not None:
+            await _lock_conn.close()
+            _lock_conn = None
+        _held_locks.clear()
+
+
+async def listen(channel: str, callback) -> asyncpg.Connection:
+    """
+    Open a dedicated connection that LISTENs on channel.
+
+    The connection is separate from the pool because it is held for the
+    life of the process. Close it with `await conn.close()`.
+
+    Args:
+        channel: Channel name
+        callback: Called as callback(connection, pid, channel, payload)
+
+    Returns:
+        The listening connection
+    """
+    conn = await asyncpg.connect(dsn=config.settings.DATABASE_URL)
+    await conn.add_listener(channel, callback)
+    return conn
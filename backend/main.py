@@ -6,7 +6,6 @@ Entry point for the API server.
 
 from __future__ import annotations
 
-import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -15,8 +14,13 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend import db
+from backend.config import settings
 from backend.middleware.rate_limit import rate_limiter
+from backend.repos import rollup_repo
+from backend.repos.aide_repo import AideRepo
 from backend.repos.magic_link_repo import MagicLinkRepo
+from backend.repos.snapshot_cache import snapshot_cache
+from backend.repos.user_repo import UserRepo
 from backend.routes import admin as admin_routes
 from backend.routes import aides as aide_routes
 from backend.routes import api_tokens, auth_routes, cli_auth
@@ -26,32 +30,62 @@ from backend.routes import pages as pages_routes
 from backend.routes import publish as publish_routes
 from backend.routes import telemetry as telemetry_routes
 from backend.routes import ws as ws_routes
+from backend.services.aide_sessions import sessions as aide_sessions
+from backend.services.render_pool import render_pool
+from backend.services.scheduler import scheduler
+from backend.services.telemetry_sink import telemetry_sink
+from backend.utils import state_codec
 
+# Periodic maintenance, run by the scheduler (services/scheduler.py)
+magic_link_repo = MagicLinkRepo()
+aide_repo = AideRepo()
+user_repo = UserRepo()
 
-# Background task for cleanup
-async def cleanup_task():
-    """
-    Background task to clean up expired magic links and old rate limit entries.
 
-    Runs every 60 seconds.
-    """
-    magic_link_repo = MagicLinkRepo()
+async def cleanup_magic_links() -> int:
+    """Delete expired/used magic links older than 1 hour."""
+    return await magic_link_repo.cleanup_expired(older_than_hours=1, batch_size=settings.CLEANUP_BATCH_SIZE)
+
+
+async def cleanup_shadow_users() -> int:
+    """Delete shadow users that never created an aide."""
+    return await user_repo.cleanup_old_shadow_users(
+        max_age_days=settings.SHADOW_USER_MAX_AGE_DAYS, batch_size=settings.CLEANUP_BATCH_SIZE
+    )
+
+
+async def cleanup_rate_limits() -> None:
+    """Drop this process's old rate limit entries."""
+    rate_limiter.cleanup_old_entries(max_age_hours=2)
+
 
-    while True:
-        try:
-            # Clean up expired/used magic links older than 1 hour
-            deleted_count = await magic_link_repo.cleanup_expired(older_than_hours=1)
-            if deleted_count > 0:
-                print(f"Cleaned up {deleted_count} expired magic links")
+async def compress_aide_states() -> int:
+    """Convert a batch of aides not written since AIDE_STATE_COMPRESS_MIN_BYTES was set."""
+    return await aide_repo.compress_states(settings.AIDE_STATE_COMPRESS_MIN_BYTES)
 
-            # Clean up old rate limit entries
-            rate_limiter.cleanup_old_entries(max_age_hours=2)
 
-        except Exception as e:
-            print(f"Error in cleanup task: {e}")
+async def roll_up_stats() -> int | None:
+    """Roll up new telemetry into the stats rollups, then refresh the materialized admin counts."""
+    rows = await rollup_repo.roll_up_telemetry()
+    if rows is None:
+        # Another process holds the rollup lock (a second leader, briefly) and refreshes the counts
+        return None
+    await rollup_repo.refresh_admin_counts()
+    return rows
 
-        # Wait 60 seconds before next cleanup
-        await asyncio.sleep(60)
+
+def register_jobs() -> None:
+    """Register the maintenance jobs with the scheduler."""
+    scheduler.register("magic_links", cleanup_magic_links, interval_s=60)
+    scheduler.register("shadow_users", cleanup_shadow_users, interval_s=3600)
+    scheduler.register("rate_limits", cleanup_rate_limits, interval_s=60, leader_only=False)
+    scheduler.register("rollups", roll_up_stats, interval_s=settings.TELEMETRY_ROLLUP_S)
+    scheduler.register("render_workers", render_pool.check, interval_s=settings.RENDER_HEALTH_S, leader_only=False)
+    if settings.AIDE_STATE_COMPRESS_MIN_BYTES > 0 and state_codec.available():
+        scheduler.register("compress_states", compress_aide_states, interval_s=60)
+
+
+register_jobs()
 
 
 @asynccontextmanager
@@ -61,26 +95,41 @@ async def lifespan(app: FastAPI):
 
     Handles startup and shutdown logic:
     - Initialize database pool
-    - Start background cleanup task
+    - Start the background maintenance job scheduler
+    - Listen for other replicas' aide saves (aide_sessions)
+    - Listen for aide writes that invalidate the snapshot cache
+    - Start the batched telemetry writer, and drain it on shutdown
+    - Start the Node render workers used by publish
     - Close database pool on shutdown
     """
     # Startup
     await db.init_pool()
     print("Database pool initialized")
 
-    # Start background cleanup task
-    cleanup_task_handle = asyncio.create_task(cleanup_task())
-    print("Background cleanup task started")
+    if settings.AIDE_STATE_COMPRESS_MIN_BYTES > 0 and not state_codec.available():
+        print("AIDE_STATE_COMPRESS_MIN_BYTES is set but zstandard is not installed; states stay uncompressed")
+
+    # Start background maintenance jobs
+    await scheduler.start()
+    print("Background job scheduler started")
+
+    await aide_sessions.start()
+    await snapshot_cache.start()
+    await telemetry_sink.start()
+    await render_pool.start()
 
     yield
 
     # Shutdown
-    cleanup_task_handle.cancel()
-    try:
-        await cleanup_task_handle
-    except asyncio.CancelledError:
-        print("Background cleanup task stopped")
-
+    await scheduler.stop()
+    print("Background job scheduler stopped")
+
+    await render_pool.stop()
+    await aide_sessions.stop()
+    # After sessions, whose final flushes queue direct-edit telemetry
+    await telemetry_sink.stop()
+    await snapshot_cache.stop()
+    await db.close_lock_connection()
     await db.close_pool()
     print("Database pool closed")
 
@@ -7,6 +7,7 @@ All data shapes defined here. No imports from db, repos, or routes.
 from backend.models.aide import (
     Aide,
     AideResponse,
+    AideSummary,
     CreateAideRequest,
     UpdateAideRequest,
 )
@@ -37,6 +38,7 @@ __all__ = [
     "LogoutResponse",
     # Aide models
     "Aide",
+    "AideSummary",
     "CreateAideRequest",
     "UpdateAideRequest",
     "AideResponse",
@@ -65,6 +65,7 @@ class AdminUserListResponse(BaseModel):
 
     users: list[AdminUserListItem]
     total: int
+    next_cursor: str | None = None
 
 
 class SystemStatsResponse(BaseModel):
@@ -37,12 +37,14 @@ class SaveStateRequest(BaseModel):
     meta: dict[str, Any] = Field(default_factory=dict)
     message: str | None = None  # Original user message for conversation history
     response: str | None = None  # AI response text for conversation history
+    version: int | None = None  # Aide version the state was based on; 409 if it has moved on
 
 
 class SaveStateResponse(BaseModel):
     """What the save state endpoint returns."""
 
     preview_url: str
+    version: int | None = None  # Aide version after the save, for the next save's `version`
 
 
 class SaveConversationRequest(BaseModel):
@@ -80,6 +82,20 @@ class Aide(BaseModel):
     state: dict[str, Any] = Field(default_factory=dict)
     event_log: list[dict[str, Any]] = Field(default_factory=list)
     r2_prefix: str | None = None
+    version: int = 0  # Bumped by every state write (AideRepo.update_state expected_version)
+    created_at: datetime
+    updated_at: datetime
+
+
+class AideSummary(BaseModel):
+    """An aide's row without state and event_log, for listings and metadata-only writes."""
+
+    id: UUID
+    user_id: UUID
+    title: str = "Untitled"
+    slug: str | None = None
+    status: Literal["draft", "published", "archived"] = "draft"
+    r2_prefix: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -113,7 +129,7 @@ class AideResponse(BaseModel):
     snapshot: dict[str, Any] | None = None  # Included when include_snapshot=true (CLI usage)
 
     @classmethod
-    def from_model(cls, aide: Aide) -> AideResponse:
+    def from_model(cls, aide: Aide | AideSummary) -> AideResponse:
         """Convert internal Aide model to public API response."""
         return cls(
             id=aide.id,
@@ -142,3 +158,4 @@ class HydrateResponse(BaseModel):
     blueprint: dict[str, str]
     messages: list[dict[str, Any]]
     snapshot_hash: str
+    version: int = 0  # Pass back as SaveStateRequest.version
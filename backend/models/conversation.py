@@ -19,16 +19,38 @@ class Message(BaseModel):
 
 
 class Conversation(BaseModel):
-    """Core conversation model. Represents a row in the conversations table."""
+    """
+    Core conversation model. Represents a row in the conversations table.
+
+    Messages live in conversation_messages; only ConversationRepo.get()
+    fills `messages`. Use the repo's page and window reads for the rest.
+    """
 
     id: UUID
     aide_id: UUID
     channel: Literal["web", "signal"] = "web"
     messages: list[Message] = Field(default_factory=list)
+    message_count: int = 0
+    user_turns: int = 0
     created_at: datetime
     updated_at: datetime
 
 
+class MessagePage(BaseModel):
+    """One keyset page of a conversation's messages, oldest first."""
+
+    messages: list[Message] = Field(default_factory=list)
+    before: int | None = None  # pass back to fetch the previous page; None at the start
+
+
+class ConversationWindow(BaseModel):
+    """The last few messages of an aide's latest conversation, as raw dicts."""
+
+    id: UUID
+    messages: list[dict[str, Any]] = Field(default_factory=list)  # oldest first
+    user_turns: int = 0  # user messages in the whole conversation
+
+
 class ConversationResponse(BaseModel):
     """What the API returns for conversations."""
 
@@ -46,7 +68,7 @@ class ConversationResponse(BaseModel):
             id=conversation.id,
             aide_id=conversation.aide_id,
             channel=conversation.channel,
-            message_count=len(conversation.messages),
+            message_count=conversation.message_count,
             created_at=conversation.created_at,
             updated_at=conversation.updated_at,
         )
@@ -63,3 +85,4 @@ class ConversationHistoryResponse(BaseModel):
     """Conversation history for loading in the editor."""
 
     messages: list[MessageResponse]
+    before: int | None = None  # cursor for the previous page
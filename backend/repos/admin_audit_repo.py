@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
 import asyncpg
@@ -74,22 +75,28 @@ class AdminAuditRepo:
         self,
         limit: int = 100,
         offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
     ) -> list[AdminAuditLogResponse]:
         """
-        List admin audit logs.
+        List admin audit logs, newest first by (created_at, id).
+
+        Pass `after` (the last entry of the previous page, see
+        backend/utils/cursor.py) to seek straight to the next page.
 
         Caller must verify admin authorization before calling this method.
 
         Args:
             limit: Maximum number of logs to return
             offset: Number of logs to skip
+            after: (created_at, id) of the entry to continue after
 
         Returns:
             List of AdminAuditLogResponse entries with enriched data
         """
+        keyset, args = ("WHERE (aal.created_at, aal.id) < ($3, $4)", after) if after else ("", ())
         async with system_conn() as conn:
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT
                     aal.id,
                     aal.admin_user_id,
@@ -106,11 +113,13 @@ class AdminAuditRepo:
                 JOIN users admin_user ON aal.admin_user_id = admin_user.id
                 LEFT JOIN users target_user ON aal.target_user_id = target_user.id
                 LEFT JOIN aides aide ON aal.target_aide_id = aide.id
-                ORDER BY aal.created_at DESC
+                {keyset}
+                ORDER BY aal.created_at DESC, aal.id DESC
                 LIMIT $1 OFFSET $2
                 """,
                 limit,
                 offset,
+                *args,
             )
             return [
                 AdminAuditLogResponse(
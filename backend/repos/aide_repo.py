@@ -7,26 +7,210 @@ from uuid import UUID, uuid4
 
 import asyncpg
 
-from backend.db import system_conn, user_conn
-from backend.models.aide import Aide, CreateAideRequest, UpdateAideRequest
+from backend.config import settings
+from backend.db import on_commit, read_conn, system_conn, user_conn, user_read_conn
+from backend.models.aide import Aide, AideSummary, CreateAideRequest, UpdateAideRequest
+from backend.repos.snapshot_cache import NOTIFY_CHANNEL, notify_payload, snapshot_cache
+from backend.utils import state_codec
+
+# Metadata columns for AideSummary, for queries over `aides a`
+_SUMMARY_COLUMNS = "a.id, a.user_id, a.title, a.slug, a.status, a.r2_prefix, a.created_at, a.updated_at"
+
+# Aide columns other than state
+_COLUMNS = f"{_SUMMARY_COLUMNS}, a.event_log, a.version"
+
+# Full state in the document and per-entity layouts. Aides stored per entity
+# (state_storage 'entities') keep a header in aides.state and their entities in
+# aide_entities. Compressed aides (state_storage 'compressed') keep a header in
+# aides.state and the whole state in state_blob, which _row_to_aide decodes.
+_STATE = """
+    CASE WHEN a.state_storage = 'entities' THEN jsonb_set(a.state, '{entities}', COALESCE((
+        SELECT jsonb_object_agg(
+            e.entity_id,
+            CASE WHEN e.props IS NULL THEN e.attrs ELSE e.attrs || jsonb_build_object('props', e.props) END
+        )
+        FROM aide_entities e
+        WHERE e.aide_id = a.id
+    ), '{}'::jsonb)) ELSE a.state END AS state
+"""
+
+# Stored size of state (header plus entity rows or compressed blob) and event_log, for sizing cache entries
+_STORED_BYTES = """
+    pg_column_size(a.state) + pg_column_size(a.event_log) + COALESCE(pg_column_size(a.state_blob), 0)
+    + CASE WHEN a.state_storage = 'entities' THEN COALESCE((
+        SELECT sum(pg_column_size(e.attrs) + COALESCE(pg_column_size(e.props), 0))
+        FROM aide_entities e
+        WHERE e.aide_id = a.id
+    ), 0) ELSE 0 END AS stored_bytes
+"""
+
+_AIDE = f"{_COLUMNS}, {_STATE}, a.state_blob, a.state_format"
+_AIDE_SIZED = f"{_AIDE}, {_STORED_BYTES}"
+
+# Upserts a {entity_id: entity} object as aide_entities rows
+_UPSERT_ENTITIES = """
+    INSERT INTO aide_entities (aide_id, entity_id, parent, seq, props, attrs)
+    SELECT $1,
+           e.key,
+           e.value->>'parent',
+           GREATEST(
+               COALESCE((e.value->>'_created_seq')::bigint, 0),
+               COALESCE((e.value->>'_updated_seq')::bigint, 0),
+               COALESCE((e.value->>'_removed_seq')::bigint, 0)
+           ),
+           e.value->'props',
+           e.value - 'props'
+    FROM jsonb_each($2::jsonb) AS e
+    ON CONFLICT (aide_id, entity_id) DO UPDATE
+    SET parent = EXCLUDED.parent, seq = EXCLUDED.seq, props = EXCLUDED.props, attrs = EXCLUDED.attrs
+"""
+
+
+def _entity_seq(entity: dict) -> int:
+    """Latest kernel sequence that touched an entity (0 if it carries none)."""
+    return max(entity.get("_created_seq") or 0, entity.get("_updated_seq") or 0, entity.get("_removed_seq") or 0)
+
+
+def _changed_entities(entities: dict, since: int) -> dict:
+    """
+    Entities to rewrite when the kernel has moved the state on from sequence `since`.
+
+    The kernel stamps every entity it creates, updates, moves, reorders or
+    removes. Creating or moving an entity also edits its new parent's
+    _children without stamping the parent, so parents of changed entities
+    are included as well.
+    """
+    changed = {}
+    for entity_id, entity in entities.items():
+        if _entity_seq(entity) > since:
+            changed[entity_id] = entity
+            parent = entity.get("parent")
+            if parent in entities:
+                changed[parent] = entities[parent]
+    return changed
+
+
+async def _write_entities(conn: asyncpg.Connection, aide_id: UUID, state: dict, replace: bool = False) -> bool:
+    """
+    Write a state's entities as aide_entities rows, touching only what changed.
+
+    Locks the aide row and compares with the stored `_sequence`. A state that
+    follows on from the stored one rewrites only the entities changed since;
+    anything else (first write in this layout, a state built outside the
+    kernel, or `replace`) replaces all rows.
+
+    Returns:
+        False if the aide is not visible to this connection
+    """
+    stored = await conn.fetchrow(
+        """
+        SELECT state_storage, COALESCE((state->>'_sequence')::bigint, 0) AS seq
+        FROM aides WHERE id = $1
+        FOR UPDATE
+        """,
+        aide_id,
+    )
+    if stored is None:
+        return False
+    entities = state.get("entities") or {}
+    sequence = state.get("_sequence", 0)
+    if not replace and stored["state_storage"] == "entities" and sequence > 0 and sequence >= stored["seq"]:
+        rows = _changed_entities(entities, stored["seq"])
+    else:
+        await conn.execute("DELETE FROM aide_entities WHERE aide_id = $1", aide_id)
+        rows = entities
+    if rows:
+        await conn.execute(_UPSERT_ENTITIES, aide_id, rows)
+    return True
 
 
 def _row_to_aide(row: asyncpg.Record) -> Aide:
-    """Convert a database row to an Aide model."""
+    """Convert a database row to an Aide model, inflating a compressed state."""
+    blob = row.get("state_blob")
     return Aide(
         id=row["id"],
         user_id=row["user_id"],
         title=row["title"],
         slug=row["slug"],
         status=row["status"],
-        state=row["state"],
+        state=row["state"] if blob is None else state_codec.decode(blob, row["state_format"]),
         event_log=row["event_log"],
         r2_prefix=row["r2_prefix"],
+        version=row["version"],
         created_at=row["created_at"],
         updated_at=row["updated_at"],
     )
 
 
+def _row_to_summary(row: asyncpg.Record) -> AideSummary:
+    """Convert a database row to an AideSummary model."""
+    return AideSummary(
+        id=row["id"],
+        user_id=row["user_id"],
+        title=row["title"],
+        slug=row["slug"],
+        status=row["status"],
+        r2_prefix=row["r2_prefix"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+async def _announce(
+    conn: asyncpg.Connection, aide_id: UUID, updated_at: datetime | None, seq: int | None = None
+) -> None:
+    """Queue the aide_cache NOTIFY for a write; Postgres delivers it when the transaction commits."""
+    await conn.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, notify_payload(aide_id, updated_at, seq))
+
+
+async def _written(conn: asyncpg.Connection, row: asyncpg.Record | None) -> Aide | None:
+    """Convert the returned row of a write and announce its new version."""
+    if row is None:
+        return None
+    aide = _row_to_aide(row)
+    seq = aide.state.get("_sequence", 0) if isinstance(aide.state, dict) else 0
+    await _announce(conn, aide.id, aide.updated_at, seq)
+    return aide
+
+
+async def _summary_written(conn: asyncpg.Connection, row: asyncpg.Record | None) -> AideSummary | None:
+    """Convert the returned row of a metadata-only write and announce its new version (state unchanged)."""
+    if row is None:
+        return None
+    summary = _row_to_summary(row)
+    await _announce(conn, summary.id, summary.updated_at)
+    return summary
+
+
+def _evicted(conn: asyncpg.Connection, summary: AideSummary | None) -> AideSummary | None:
+    """Drop cached copies older than a metadata-only write once it commits, and pass it through."""
+    if summary is not None:
+        on_commit(conn, lambda: snapshot_cache.invalidate(summary.id, summary.updated_at))
+    return summary
+
+
+def _cached(conn: asyncpg.Connection, aide: Aide | None, row: asyncpg.Record | None) -> Aide | None:
+    """
+    Put an aide in the snapshot cache once conn's transaction commits, and pass it through.
+
+    `row` must select `stored_bytes`: the stored size of state and event_log,
+    which Postgres already knows, so sizing the entry costs no re-encoding.
+    """
+    if aide is not None and row is not None:
+        on_commit(conn, lambda: snapshot_cache.put(aide, size=row["stored_bytes"]))
+    return aide
+
+
+class StateConflict(Exception):
+    """An update_state() whose expected_version is no longer the aide's version."""
+
+    def __init__(self, aide_id: UUID, expected: int, current: int | None):
+        self.aide_id = aide_id
+        self.expected = expected
+        self.current = current
+        super().__init__(f"Aide {aide_id} is at version {current}, not {expected}")
+
+
 class AideRepo:
     """All aide-related database operations."""
 
@@ -46,10 +230,10 @@ class AideRepo:
 
         async with user_conn(user_id) as conn:
             row = await conn.fetchrow(
-                """
-                INSERT INTO aides (id, user_id, title, r2_prefix, created_at, updated_at)
+                f"""
+                INSERT INTO aides AS a (id, user_id, title, r2_prefix, created_at, updated_at)
                 VALUES ($1, $2, $3, $4, $5, $5)
-                RETURNING *
+                RETURNING {_AIDE_SIZED}
                 """,
                 aide_id,
                 user_id,
@@ -57,41 +241,69 @@ class AideRepo:
                 f"aides/{aide_id}",
                 now,
             )
-            return _row_to_aide(row)
+            aide = _row_to_aide(row)
+        return _cached(conn, aide, row)
 
-    async def get(self, user_id: UUID, aide_id: UUID) -> Aide | None:
+    async def get(self, user_id: UUID, aide_id: UUID, min_sequence: int = 0) -> Aide | None:
         """
         Get an aide by ID. RLS ensures only the owner can access.
 
+        Served from the snapshot cache when a current copy is held. Treat
+        the returned state and event log as read-only.
+
         Args:
             user_id: User UUID
             aide_id: Aide UUID
+            min_sequence: Skip cached copies whose state._sequence is below
+                this (a caller that knows the store has moved on)
 
         Returns:
             Aide if found and owned by user, None otherwise
         """
+        cached = snapshot_cache.get(aide_id, user_id, min_sequence)
+        if cached is not None:
+            return cached
         async with user_conn(user_id) as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM aides WHERE id = $1",
-                aide_id,
+            row = await conn.fetchrow(f"SELECT {_AIDE_SIZED} FROM aides a WHERE a.id = $1", aide_id)
+        return _cached(conn, _row_to_aide(row), row) if row else None
+
+    async def list_for_user(self, user_id: UUID) -> list[AideSummary]:
+        """
+        List all non-archived aides for a user, without their state.
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            List of AideSummary objects ordered by updated_at DESC
+        """
+        async with user_read_conn(user_id) as conn:
+            rows = await conn.fetch(
+                f"SELECT {_SUMMARY_COLUMNS} FROM aides a WHERE a.status != 'archived' ORDER BY a.updated_at DESC"
             )
-            return _row_to_aide(row) if row else None
+            return [_row_to_summary(row) for row in rows]
 
-    async def list_for_user(self, user_id: UUID) -> list[Aide]:
+    async def get_summary(self, user_id: UUID, aide_id: UUID) -> AideSummary | None:
         """
-        List all non-archived aides for a user.
+        Get an aide's metadata without loading its state. RLS ensures only the owner can access.
+
+        For ownership checks and responses that don't need the state.
 
         Args:
             user_id: User UUID
+            aide_id: Aide UUID
 
         Returns:
-            List of Aide objects ordered by updated_at DESC
+            AideSummary if found and owned by user, None otherwise
         """
+        cached = snapshot_cache.get(aide_id, user_id)
+        if cached is not None:
+            return AideSummary(**cached.model_dump(include=set(AideSummary.model_fields)))
         async with user_conn(user_id) as conn:
-            rows = await conn.fetch("SELECT * FROM aides WHERE status != 'archived' ORDER BY updated_at DESC")
-            return [_row_to_aide(row) for row in rows]
+            row = await conn.fetchrow(f"SELECT {_SUMMARY_COLUMNS} FROM aides a WHERE a.id = $1", aide_id)
+            return _row_to_summary(row) if row else None
 
-    async def update(self, user_id: UUID, aide_id: UUID, req: UpdateAideRequest) -> Aide | None:
+    async def update(self, user_id: UUID, aide_id: UUID, req: UpdateAideRequest) -> AideSummary | None:
         """
         Update an aide. RLS ensures only the owner can update.
 
@@ -101,7 +313,7 @@ class AideRepo:
             req: UpdateAideRequest with fields to update
 
         Returns:
-            Updated Aide if found and owned by user, None otherwise
+            Updated AideSummary if found and owned by user, None otherwise
         """
         async with user_conn(user_id) as conn:
             # Build SET clause from non-None fields only
@@ -112,7 +324,7 @@ class AideRepo:
                 updates["slug"] = req.slug
 
             if not updates:
-                return await self.get(user_id, aide_id)
+                return await self.get_summary(user_id, aide_id)
 
             set_clause = ", ".join(f"{k} = ${i + 2}" for i, k in enumerate(updates))
             values = list(updates.values())
@@ -120,15 +332,16 @@ class AideRepo:
             # S608/B608: False positive - set_clause only contains validated column names
             row = await conn.fetchrow(
                 f"""
-                UPDATE aides
-                SET {set_clause}, updated_at = now()
-                WHERE id = $1
-                RETURNING *
+                UPDATE aides a
+                SET {set_clause}, updated_at = GREATEST(now(), updated_at + interval '1 microsecond')
+                WHERE a.id = $1
+                RETURNING {_SUMMARY_COLUMNS}
                 """,  # nosec B608
                 aide_id,
                 *values,
             )
-            return _row_to_aide(row) if row else None
+            summary = await _summary_written(conn, row)
+        return _evicted(conn, summary)
 
     async def delete(self, user_id: UUID, aide_id: UUID) -> bool:
         """
@@ -146,9 +359,14 @@ class AideRepo:
                 "DELETE FROM aides WHERE id = $1",
                 aide_id,
             )
-            return result == "DELETE 1"
+            deleted = result == "DELETE 1"
+            if deleted:
+                await _announce(conn, aide_id, None)
+        if deleted:
+            on_commit(conn, lambda: snapshot_cache.invalidate(aide_id))
+        return deleted
 
-    async def archive(self, user_id: UUID, aide_id: UUID) -> Aide | None:
+    async def archive(self, user_id: UUID, aide_id: UUID) -> AideSummary | None:
         """
         Archive an aide (soft delete).
 
@@ -157,21 +375,22 @@ class AideRepo:
             aide_id: Aide UUID
 
         Returns:
-            Updated Aide if found and owned by user, None otherwise
+            Updated AideSummary if found and owned by user, None otherwise
         """
         async with user_conn(user_id) as conn:
             row = await conn.fetchrow(
-                """
-                UPDATE aides
-                SET status = 'archived', updated_at = now()
-                WHERE id = $1
-                RETURNING *
+                f"""
+                UPDATE aides a
+                SET status = 'archived', updated_at = GREATEST(now(), updated_at + interval '1 microsecond')
+                WHERE a.id = $1
+                RETURNING {_SUMMARY_COLUMNS}
                 """,
                 aide_id,
             )
-            return _row_to_aide(row) if row else None
+            summary = await _summary_written(conn, row)
+        return _evicted(conn, summary)
 
-    async def publish(self, user_id: UUID, aide_id: UUID, slug: str) -> Aide | None:
+    async def publish(self, user_id: UUID, aide_id: UUID, slug: str) -> AideSummary | None:
         """
         Publish an aide with a slug.
 
@@ -181,22 +400,24 @@ class AideRepo:
             slug: URL slug for published page
 
         Returns:
-            Updated Aide if found and owned by user, None otherwise
+            Updated AideSummary if found and owned by user, None otherwise
         """
         async with user_conn(user_id) as conn:
             row = await conn.fetchrow(
-                """
-                UPDATE aides
-                SET status = 'published', slug = $2, updated_at = now()
-                WHERE id = $1
-                RETURNING *
+                f"""
+                UPDATE aides a
+                SET status = 'published', slug = $2,
+                    updated_at = GREATEST(now(), updated_at + interval '1 microsecond')
+                WHERE a.id = $1
+                RETURNING {_SUMMARY_COLUMNS}
                 """,
                 aide_id,
                 slug,
             )
-            return _row_to_aide(row) if row else None
+            summary = await _summary_written(conn, row)
+        return _evicted(conn, summary)
 
-    async def unpublish(self, user_id: UUID, aide_id: UUID) -> Aide | None:
+    async def unpublish(self, user_id: UUID, aide_id: UUID) -> AideSummary | None:
         """
         Unpublish an aide (set back to draft, clear slug).
 
@@ -205,19 +426,20 @@ class AideRepo:
             aide_id: Aide UUID
 
         Returns:
-            Updated Aide if found and owned by user, None otherwise
+            Updated AideSummary if found and owned by user, None otherwise
         """
         async with user_conn(user_id) as conn:
             row = await conn.fetchrow(
-                """
-                UPDATE aides
-                SET status = 'draft', slug = NULL, updated_at = now()
-                WHERE id = $1
-                RETURNING *
+                f"""
+                UPDATE aides a
+                SET status = 'draft', slug = NULL, updated_at = GREATEST(now(), updated_at + interval '1 microsecond')
+                WHERE a.id = $1
+                RETURNING {_SUMMARY_COLUMNS}
                 """,
                 aide_id,
             )
-            return _row_to_aide(row) if row else None
+            summary = await _summary_written(conn, row)
+        return _evicted(conn, summary)
 
     async def get_by_slug(self, slug: str) -> Aide | None:
         """
@@ -229,9 +451,9 @@ class AideRepo:
         Returns:
             Aide if found and published, None otherwise
         """
-        async with system_conn() as conn:
+        async with read_conn() as conn:
             row = await conn.fetchrow(
-                "SELECT * FROM aides WHERE slug = $1 AND status = 'published'",
+                f"SELECT {_AIDE} FROM aides a WHERE a.slug = $1 AND a.status = 'published'",
                 slug,
             )
             return _row_to_aide(row) if row else None
@@ -249,12 +471,25 @@ class AideRepo:
             Aide if found, None otherwise
         """
         async with system_conn() as conn:
-            row = await conn.fetchrow(
-                "SELECT * FROM aides WHERE id = $1",
-                aide_id,
-            )
+            row = await conn.fetchrow(f"SELECT {_AIDE} FROM aides a WHERE a.id = $1", aide_id)
             return _row_to_aide(row) if row else None
 
+    async def get_summary_by_id_system(self, aide_id: UUID) -> AideSummary | None:
+        """
+        Get an aide's metadata by ID using system connection (bypasses RLS).
+
+        For admin lookups that don't need the state. Caller must verify admin authorization.
+
+        Args:
+            aide_id: Aide UUID
+
+        Returns:
+            AideSummary if found, None otherwise
+        """
+        async with system_conn() as conn:
+            row = await conn.fetchrow(f"SELECT {_SUMMARY_COLUMNS} FROM aides a WHERE a.id = $1", aide_id)
+            return _row_to_summary(row) if row else None
+
     async def count_for_user(self, user_id: UUID) -> int:
         """
         Count non-archived aides for a user.
@@ -265,7 +500,7 @@ class AideRepo:
         Returns:
             Count of non-archived aides
         """
-        async with user_conn(user_id) as conn:
+        async with user_read_conn(user_id) as conn:
             count = await conn.fetchval("SELECT count(*) FROM aides WHERE status != 'archived'")
             return count or 0
 
@@ -276,47 +511,196 @@ class AideRepo:
         state: dict,
         event_log: list,
         title: str | None = None,
+        expected_version: int | None = None,
+        replace: bool = False,
     ) -> Aide | None:
         """
         Update aide state and event log (for kernel operations).
 
+        With AIDE_STATE_STORAGE=entities the state is stored one row per
+        entity and a turn writes only the entities it changed (see
+        _write_entities); otherwise the whole document is written, zstd-
+        compressed into state_blob once it reaches AIDE_STATE_COMPRESS_MIN_BYTES.
+        Either way the aide moves to the configured layout.
+
+        A write of the state, event log and title already stored is skipped:
+        nothing is written, announced or re-cached, and the aide's version
+        stays put. Every other write bumps the version. The state is matched
+        by its kernel `_sequence`, which every accepted mutation advances, so
+        no snapshot is serialized or hashed. States at sequence 0, and
+        `replace` writes, are always written.
+
         Args:
             user_id: User UUID
             aide_id: Aide UUID
             state: New state snapshot
             event_log: Updated event log
             title: Optional new title (from meta.update primitive)
+            expected_version: Only write if the aide is still at this version
+            replace: State built outside the kernel (POST /api/aides/{id}/state)
+                rather than from the stored one: written whole, never skipped
 
         Returns:
             Updated Aide if found and owned by user, None otherwise
+
+        Raises:
+            StateConflict: If expected_version is given and the aide has moved on
         """
+        per_entity = settings.AIDE_STATE_STORAGE == "entities"
         async with user_conn(user_id) as conn:
-            if title:
-                row = await conn.fetchrow(
+            # Unlocked check: a no-op save takes no row lock and writes nothing
+            current = await conn.fetchrow(
+                f"""
+                SELECT {_COLUMNS}, a.state_storage,
+                       NOT $6::boolean AND $2::bigint > 0 AND COALESCE((a.state->>'_sequence')::bigint, 0) = $2
+                       AND a.event_log = $3 AND ($4::text IS NULL OR a.title = $4)
+                       AND a.state_storage = ANY($5) AS unchanged
+                FROM aides a WHERE a.id = $1
+                """,
+                aide_id,
+                state.get("_sequence", 0),
+                event_log,
+                title or None,
+                ["entities"] if per_entity else ["document", "compressed"],
+                replace,
+            )
+            if current is None:
+                return None
+            if expected_version is not None and current["version"] != expected_version:
+                raise StateConflict(aide_id, expected_version, current["version"])
+            if current["unchanged"]:
+                return _row_to_aide(dict(current, state=state))
+
+            blob = None if per_entity else state_codec.encode_if_large(state, settings.AIDE_STATE_COMPRESS_MIN_BYTES)
+            if per_entity:
+                if not await _write_entities(conn, aide_id, state, replace=replace):
+                    return None
+                storage, stored_state = "entities", state_codec.header(state)
+            else:
+                if current["state_storage"] == "entities":
+                    # Leaving the per-entity layout. Rows are only read in that layout and
+                    # _write_entities replaces them all when switching back, so this is cleanup.
+                    await conn.execute("DELETE FROM aide_entities WHERE aide_id = $1", aide_id)
+                storage, stored_state = (
+                    ("document", state) if blob is None else ("compressed", state_codec.header(state))
+                )
+            row = await conn.fetchrow(
+                f"""
+                UPDATE aides a
+                SET state = $2, event_log = $3, title = COALESCE($4, title), state_storage = $5,
+                    state_blob = $6, state_format = $7, version = version + 1,
+                    updated_at = GREATEST(now(), updated_at + interval '1 microsecond')
+                WHERE a.id = $1 AND ($8::bigint IS NULL OR a.version = $8)
+                RETURNING {_COLUMNS}, a.state, {_STORED_BYTES}
+                """,
+                aide_id,
+                stored_state,
+                event_log,
+                title or None,
+                storage,
+                blob,
+                None if blob is None else state_codec.STATE_FORMAT,
+                expected_version,
+            )
+            if row is None and expected_version is not None:
+                # Written since the check; raising rolls back the entity rows too
+                raise StateConflict(aide_id, expected_version, None)
+            aide = await _written(conn, row)
+            if aide is not None and storage == "entities":
+                # The stored header plus the entities just written; no need to read them back
+                aide.state = {**aide.state, "entities": state.get("entities") or {}}
+            elif aide is not None and storage == "compressed":
+                aide.state = state
+        return _cached(conn, aide, row)
+
+    async def compress_states(self, min_bytes: int, limit: int = 50) -> int:
+        """
+        Convert document-layout aides stored at min_bytes or more to the compressed layout.
+
+        Background conversion for aides that have not been written since
+        AIDE_STATE_COMPRESS_MIN_BYTES was set. Rows are locked with SKIP
+        LOCKED, so a concurrent update_state is never blocked for long, and
+        updated_at is left alone: the decoded state is unchanged.
+
+        Args:
+            min_bytes: Stored (TOAST-compressed) size of aides.state to convert at
+            limit: Most aides converted per call
+
+        Returns:
+            Number of aides converted
+        """
+        async with system_conn() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, state FROM aides
+                WHERE state_storage = 'document' AND pg_column_size(state) >= $1
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+                """,
+                min_bytes,
+                limit,
+            )
+            for row in rows:
+                await conn.execute(
                     """
-                    UPDATE aides
-                    SET state = $2, event_log = $3, title = $4, updated_at = now()
+                    UPDATE aides SET state = $2, state_blob = $3, state_format = $4, state_storage = 'compressed'
                     WHERE id = $1
-                    RETURNING *
                     """,
-                    aide_id,
-                    state,
-                    event_log,
-                    title,
+                    row["id"],
+                    state_codec.header(row["state"]),
+                    state_codec.encode(row["state"]),
+                    state_codec.STATE_FORMAT,
                 )
-            else:
-                row = await conn.fetchrow(
+            return len(rows)
+
+    async def decompress_states(self, limit: int = 50) -> int:
+        """
+        Convert compressed aides back to the document layout (before downgrading migration 012).
+
+        Args:
+            limit: Most aides converted per call
+
+        Returns:
+            Number of aides converted
+        """
+        async with system_conn() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, state_blob, state_format FROM aides
+                WHERE state_storage = 'compressed'
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+                """,
+                limit,
+            )
+            for row in rows:
+                await conn.execute(
                     """
-                    UPDATE aides
-                    SET state = $2, event_log = $3, updated_at = now()
+                    UPDATE aides SET state = $2, state_blob = NULL, state_format = NULL, state_storage = 'document'
                     WHERE id = $1
-                    RETURNING *
                     """,
-                    aide_id,
-                    state,
-                    event_log,
+                    row["id"],
+                    state_codec.decode(row["state_blob"], row["state_format"]),
                 )
-            return _row_to_aide(row) if row else None
+            return len(rows)
+
+    async def get_sequence(self, user_id: UUID, aide_id: UUID) -> int | None:
+        """
+        Get the kernel sequence number of the stored snapshot, without loading it.
+
+        Args:
+            user_id: User UUID
+            aide_id: Aide UUID
+
+        Returns:
+            state._sequence (0 for empty state) if found and owned by user, None otherwise
+        """
+        async with user_conn(user_id) as conn:
+            row = await conn.fetchrow(
+                "SELECT COALESCE((state->>'_sequence')::bigint, 0) AS seq FROM aides WHERE id = $1",
+                aide_id,
+            )
+            return row["seq"] if row else None
 
     async def count_all(self) -> int:
         """
@@ -327,7 +711,7 @@ class AideRepo:
         Returns:
             Total number of aides
         """
-        async with system_conn() as conn:
+        async with read_conn() as conn:
             count = await conn.fetchval("SELECT COUNT(*) FROM aides")
             return count or 0
 
@@ -335,19 +719,26 @@ class AideRepo:
         """
         Count aides grouped by status. For admin stats.
 
+        Read from the admin_counts materialized view, which the rollups job
+        refreshes; it trails the aides table by up to one interval.
+
         Caller must verify admin authorization before calling.
 
         Returns:
             Dict mapping status to count
         """
-        async with system_conn() as conn:
-            rows = await conn.fetch("SELECT status, COUNT(*) as count FROM aides GROUP BY status")
-            return {row["status"]: row["count"] for row in rows}
+        async with read_conn() as conn:
+            rows = await conn.fetch("SELECT key, count FROM admin_counts WHERE kind = 'aides_by_status'")
+            return {row["key"]: row["count"] for row in rows}
 
     async def search_by_user_email(self, email: str, limit: int = 50) -> list[dict]:
         """
         Search aides by owner email. For admin breakglass search.
 
+        The match runs on the idx_users_email_trgm trigram index, so it
+        stays an index scan however many users there are (for queries of
+        three or more characters; shorter ones fall back to a scan).
+
         Caller must verify admin authorization before calling.
 
         Args:
@@ -357,7 +748,7 @@ class AideRepo:
         Returns:
             List of aide dicts with owner info
         """
-        async with system_conn() as conn:
+        async with read_conn() as conn:
             rows = await conn.fetch(
                 """
                 SELECT
@@ -370,11 +761,11 @@ class AideRepo:
                     u.email as owner_email
                 FROM aides a
                 JOIN users u ON a.user_id = u.id
-                WHERE LOWER(u.email) LIKE LOWER($1)
+                WHERE lower(u.email) LIKE $1
                 ORDER BY a.updated_at DESC
                 LIMIT $2
                 """,
-                f"%{email}%",
+                f"%{email.lower()}%",
                 limit,
             )
             return [
@@ -405,7 +796,7 @@ class AideRepo:
         Returns:
             List of aide dicts with owner info
         """
-        async with system_conn() as conn:
+        async with read_conn() as conn:
             rows = await conn.fetch(
                 """
                 SELECT
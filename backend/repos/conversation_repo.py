@@ -2,28 +2,32 @@
 
 from __future__ import annotations
 
-import json
 from uuid import UUID, uuid4
 
 import asyncpg
 
-from backend.db import user_conn
-from backend.models.conversation import Conversation, Message
+from backend.db import user_conn, user_read_conn
+from backend.models.conversation import Conversation, ConversationWindow, Message, MessagePage
+from backend.utils import jsonx
 
 
-def _row_to_conversation(row: asyncpg.Record) -> Conversation:
-    """Convert a database row to a Conversation model."""
-    messages_raw = row["messages"]
-    # JSONB comes back as a Python list from asyncpg
-    if isinstance(messages_raw, str):
-        messages_raw = json.loads(messages_raw)
-    messages = [Message(**m) for m in messages_raw]
+def _row_to_message(row: asyncpg.Record) -> Message:
+    """Convert a conversation_messages row to a Message model."""
+    metadata = row["metadata"]
+    if isinstance(metadata, str):
+        metadata = jsonx.loads(metadata)
+    return Message(role=row["role"], content=row["content"], timestamp=row["created_at"], metadata=metadata or {})
 
+
+def _row_to_conversation(row: asyncpg.Record, messages: list[Message] | None = None) -> Conversation:
+    """Convert a database row (and optionally its message rows) to a Conversation model."""
     return Conversation(
         id=row["id"],
         aide_id=row["aide_id"],
         channel=row["channel"],
-        messages=messages,
+        messages=messages or [],
+        message_count=row["message_count"],
+        user_turns=row["user_turns"],
         created_at=row["created_at"],
         updated_at=row["updated_at"],
     )
@@ -34,7 +38,7 @@ class ConversationRepo:
 
     async def get_for_aide(self, user_id: UUID, aide_id: UUID) -> Conversation | None:
         """
-        Get the most recent conversation for an aide.
+        Get the most recent conversation for an aide, without its messages.
 
         Args:
             user_id: User UUID
@@ -55,9 +59,93 @@ class ConversationRepo:
             )
             return _row_to_conversation(row) if row else None
 
+    async def get_recent(self, user_id: UUID, aide_id: UUID, limit: int) -> ConversationWindow | None:
+        """
+        Get the last `limit` messages of the most recent conversation for an aide.
+
+        Reads the tail through the (conversation_id, seq) key, so the cost
+        stays the same however long the conversation grows.
+
+        Args:
+            user_id: User UUID
+            aide_id: Aide UUID
+            limit: Number of trailing messages to return
+
+        Returns:
+            ConversationWindow if a conversation exists, None otherwise
+        """
+        async with user_conn(user_id) as conn:
+            conversation = await conn.fetchrow(
+                """
+                SELECT id, user_turns FROM conversations
+                WHERE aide_id = $1
+                ORDER BY updated_at DESC
+                LIMIT 1
+                """,
+                aide_id,
+            )
+            if conversation is None:
+                return None
+            rows = await conn.fetch(
+                """
+                SELECT role, content FROM conversation_messages
+                WHERE conversation_id = $1
+                ORDER BY seq DESC
+                LIMIT $2
+                """,
+                conversation["id"],
+                limit,
+            )
+            return ConversationWindow(
+                id=conversation["id"],
+                messages=[{"role": r["role"], "content": r["content"]} for r in reversed(rows)],
+                user_turns=conversation["user_turns"],
+            )
+
+    async def get_page(
+        self,
+        user_id: UUID,
+        conversation_id: UUID,
+        limit: int,
+        before: int | None = None,
+    ) -> MessagePage:
+        """
+        Get one keyset page of messages, newest page first.
+
+        Without `before` this is the conversation's tail. Pass the returned
+        page's `before` to walk back towards the start.
+
+        Args:
+            user_id: User UUID
+            conversation_id: Conversation UUID
+            limit: Maximum messages in the page
+            before: Return only messages with seq below this cursor
+
+        Returns:
+            MessagePage with messages oldest first
+        """
+        async with user_conn(user_id) as conn:
+            rows = await conn.fetch(
+                """
+                SELECT seq, role, content, metadata, created_at FROM conversation_messages
+                WHERE conversation_id = $1 AND ($2::bigint IS NULL OR seq < $2)
+                ORDER BY seq DESC
+                LIMIT $3
+                """,
+                conversation_id,
+                before,
+                limit,
+            )
+        rows = list(reversed(rows))
+        more = len(rows) == limit and rows[0]["seq"] > 1
+        return MessagePage(
+            messages=[_row_to_message(r) for r in rows],
+            before=rows[0]["seq"] if more else None,
+        )
+
     async def get(self, user_id: UUID, conversation_id: UUID) -> Conversation | None:
         """
-        Get a conversation by ID. RLS ensures only owner can access.
+        Get a conversation by ID with all of its messages. RLS ensures only owner can access.
 
         Args:
             user_id: User UUID
@@ -71,7 +159,17 @@ class ConversationRepo:
                 "SELECT * FROM conversations WHERE id = $1",
                 conversation_id,
             )
-            return _row_to_conversation(row) if row else None
+            if row is None:
+                return None
+            messages = await conn.fetch(
+                """
+                SELECT role, content, metadata, created_at FROM conversation_messages
+                WHERE conversation_id = $1
+                ORDER BY seq
+                """,
+                conversation_id,
+            )
+            return _row_to_conversation(row, [_row_to_message(m) for m in messages])
 
     async def create(self, user_id: UUID, aide_id: UUID, channel: str = "web") -> Conversation:
         """
@@ -109,22 +207,50 @@ class ConversationRepo:
             conversation_id: Conversation UUID
             message: Message to append
         """
+        await self.append_messages(user_id, conversation_id, [message])
+
+    async def append_messages(self, user_id: UUID, conversation_id: UUID, messages: list[Message]) -> None:
+        """
+        Append several messages to a conversation in one statement.
+
+        Bumping the conversation's counters allocates the new seqs and locks
+        the row, so concurrent appends queue up instead of colliding. If RLS
+        hides the conversation nothing is updated and nothing is inserted.
+
+        Args:
+            user_id: User UUID
+            conversation_id: Conversation UUID
+            messages: Messages to append, in order
+        """
+        if not messages:
+            return
+        user_turns = sum(1 for m in messages if m.role == "user")
         async with user_conn(user_id) as conn:
             await conn.execute(
                 """
-                UPDATE conversations
-                SET messages = messages || $2::jsonb,
-                    updated_at = now()
-                WHERE id = $1
+                WITH c AS (
+                    UPDATE conversations
+                    SET message_count = message_count + $3,
+                        user_turns = user_turns + $4,
+                        updated_at = now()
+                    WHERE id = $1
+                    RETURNING message_count - $3 AS base
+                )
+                INSERT INTO conversation_messages (conversation_id, seq, role, content, metadata, created_at)
+                SELECT $1, c.base + e.i, e.m->>'role', e.m->>'content',
+                       COALESCE(e.m->'metadata', '{}'::jsonb), (e.m->>'timestamp')::timestamptz
+                FROM c, jsonb_array_elements($2::jsonb) WITH ORDINALITY AS e(m, i)
                 """,
                 conversation_id,
                 # Pass list directly - JSONB codec handles serialization
-                [message.model_dump(mode="json")],
+                [m.model_dump(mode="json") for m in messages],
+                len(messages),
+                user_turns,
             )
 
     async def list_for_aide(self, user_id: UUID, aide_id: UUID) -> list[Conversation]:
         """
-        List all conversations for an aide.
+        List all conversations for an aide, without their messages.
 
         Args:
             user_id: User UUID
@@ -133,7 +259,7 @@ class ConversationRepo:
         Returns:
             List of Conversation objects ordered by updated_at DESC
         """
-        async with user_conn(user_id) as conn:
+        async with user_read_conn(user_id) as conn:
             rows = await conn.fetch(
                 """
                 SELECT * FROM conversations
@@ -146,7 +272,7 @@ class ConversationRepo:
 
     async def delete(self, user_id: UUID, conversation_id: UUID) -> bool:
         """
-        Delete a conversation. RLS ensures only owner can delete.
+        Delete a conversation and its messages. RLS ensures only owner can delete.
 
         Args:
             user_id: User UUID
@@ -171,11 +297,18 @@ class ConversationRepo:
             conversation_id: Conversation UUID
         """
         async with user_conn(user_id) as conn:
-            await conn.execute(
+            # Lock the counters first so a concurrent append can't slip a row in between
+            cleared = await conn.fetchval(
                 """
                 UPDATE conversations
-                SET messages = '[]'::jsonb, updated_at = now()
+                SET message_count = 0, user_turns = 0, updated_at = now()
                 WHERE id = $1
+                RETURNING id
                 """,
                 conversation_id,
             )
+            if cleared is not None:
+                await conn.execute(
+                    "DELETE FROM conversation_messages WHERE conversation_id = $1",
+                    conversation_id,
+                )
@@ -130,24 +130,40 @@ class MagicLinkRepo:
         # For now, IP-based rate limiting will be handled in-memory via middleware
         return 0
 
-    async def cleanup_expired(self, older_than_hours: int = 1) -> int:
+    async def cleanup_expired(self, older_than_hours: int = 1, batch_size: int = 1000) -> int:
         """
         Delete expired and used magic links older than specified hours.
 
+        Deletes in batches of batch_size rows, each in its own transaction,
+        so a large backlog never holds locks for long. Rows another session
+        has locked are skipped until the next call.
+
         Args:
             older_than_hours: Delete tokens older than this many hours (default 1)
+            batch_size: Rows deleted per transaction
 
         Returns:
             Number of records deleted
         """
-        async with system_conn() as conn:
-            result = await conn.execute(
-                """
-                DELETE FROM magic_links
-                WHERE created_at < now() - interval '1 hour' * $1
-                AND (used = true OR expires_at < now())
-                """,
-                older_than_hours,
-            )
+        total = 0
+        while True:
+            async with system_conn() as conn:
+                result = await conn.execute(
+                    """
+                    DELETE FROM magic_links
+                    WHERE ctid = ANY(ARRAY(
+                        SELECT ctid FROM magic_links
+                        WHERE created_at < now() - interval '1 hour' * $1
+                        AND (used = true OR expires_at < now())
+                        LIMIT $2
+                        FOR UPDATE SKIP LOCKED
+                    ))
+                    """,
+                    older_than_hours,
+                    batch_size,
+                )
             # Result format is "DELETE N" where N is the count
-            return int(result.split()[-1]) if result else 0
+            deleted = int(result.split()[-1]) if result else 0
+            total += deleted
+            if deleted < batch_size:
+                return total
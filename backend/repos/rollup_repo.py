@@ -0,0 +1,149 @@
+"""
+Repository for telemetry rollups and the materialized admin counts.
+
+The stats endpoints read these instead of scanning raw telemetry, users
+and aides on every request. The scheduler's leader-only rollups job
+(main.roll_up_stats) keeps them current; they trail the raw tables by up to
+one TELEMETRY_ROLLUP_S interval.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+
+from backend.db import read_conn, system_conn
+
+# Telemetry rows written since the last run. ts is the row's transaction start, so a
+# row can commit after a roll-up that already covered its ts; each run re-reads five
+# minutes back. The groups it touches are recomputed whole, so re-reading is harmless.
+_SINCE = "(SELECT rolled_up_to - interval '5 minutes' FROM telemetry_rollup_state)"
+
+# One roll-up at a time. The scheduler already runs it on the leader only; this
+# covers the brief overlap when two replicas both think they lead
+_ROLLUP_LOCK = "SELECT pg_try_advisory_xact_lock(hashtextextended('telemetry:rollup', 0))"
+
+# Recompute every (aide, UTC day, tier) group that received new telemetry
+_ROLL_UP_AIDES = f"""
+    WITH touched AS (
+        SELECT DISTINCT aide_id, (ts AT TIME ZONE 'UTC')::date AS day
+        FROM telemetry
+        WHERE ts >= {_SINCE}
+    )
+    INSERT INTO telemetry_aide_daily (
+        aide_id, day, tier, llm_calls, direct_edits, escalations, ttfc_count, ttfc_sum,
+        ttfc_p50, ttfc_p95, ttc_p50, ttc_p95, cost_usd, lines_emitted, lines_accepted
+    )
+    SELECT t.aide_id,
+           d.day,
+           COALESCE(t.tier, ''),
+           count(*) FILTER (WHERE t.event_type = 'llm_call'),
+           count(*) FILTER (WHERE t.event_type = 'direct_edit'),
+           count(*) FILTER (WHERE t.escalated),
+           count(t.ttfc_ms),
+           COALESCE(sum(t.ttfc_ms), 0),
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY t.ttfc_ms),
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY t.ttfc_ms),
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY t.ttc_ms),
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY t.ttc_ms),
+           sum(t.cost_usd),
+           COALESCE(sum(t.lines_emitted), 0),
+           COALESCE(sum(t.lines_accepted), 0)
+    FROM touched d
+    JOIN telemetry t
+      ON t.aide_id = d.aide_id
+     AND t.ts >= d.day::timestamp AT TIME ZONE 'UTC'
+     AND t.ts < (d.day + 1)::timestamp AT TIME ZONE 'UTC'
+    GROUP BY t.aide_id, d.day, COALESCE(t.tier, '')
+    ON CONFLICT (aide_id, day, tier) DO UPDATE
+    SET llm_calls = EXCLUDED.llm_calls, direct_edits = EXCLUDED.direct_edits, escalations = EXCLUDED.escalations,
+        ttfc_count = EXCLUDED.ttfc_count, ttfc_sum = EXCLUDED.ttfc_sum,
+        ttfc_p50 = EXCLUDED.ttfc_p50, ttfc_p95 = EXCLUDED.ttfc_p95,
+        ttc_p50 = EXCLUDED.ttc_p50, ttc_p95 = EXCLUDED.ttc_p95,
+        cost_usd = EXCLUDED.cost_usd, lines_emitted = EXCLUDED.lines_emitted, lines_accepted = EXCLUDED.lines_accepted
+"""
+
+# Recompute every (UTC day, tier) group for days that received new telemetry
+_ROLL_UP_TIERS = f"""
+    WITH touched AS (
+        SELECT DISTINCT (ts AT TIME ZONE 'UTC')::date AS day
+        FROM telemetry
+        WHERE ts >= {_SINCE}
+    )
+    INSERT INTO telemetry_tier_daily (
+        day, tier, aides, llm_calls, direct_edits, escalations, input_tokens, output_tokens,
+        ttfc_p50, ttfc_p95, ttc_p50, ttc_p95, cost_usd
+    )
+    SELECT d.day,
+           COALESCE(t.tier, ''),
+           count(DISTINCT t.aide_id),
+           count(*) FILTER (WHERE t.event_type = 'llm_call'),
+           count(*) FILTER (WHERE t.event_type = 'direct_edit'),
+           count(*) FILTER (WHERE t.escalated),
+           COALESCE(sum(t.input_tokens), 0),
+           COALESCE(sum(t.output_tokens), 0),
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY t.ttfc_ms),
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY t.ttfc_ms),
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY t.ttc_ms),
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY t.ttc_ms),
+           sum(t.cost_usd)
+    FROM touched d
+    JOIN telemetry t
+      ON t.ts >= d.day::timestamp AT TIME ZONE 'UTC'
+     AND t.ts < (d.day + 1)::timestamp AT TIME ZONE 'UTC'
+    GROUP BY d.day, COALESCE(t.tier, '')
+    ON CONFLICT (day, tier) DO UPDATE
+    SET aides = EXCLUDED.aides, llm_calls = EXCLUDED.llm_calls, direct_edits = EXCLUDED.direct_edits,
+        escalations = EXCLUDED.escalations, input_tokens = EXCLUDED.input_tokens,
+        output_tokens = EXCLUDED.output_tokens,
+        ttfc_p50 = EXCLUDED.ttfc_p50, ttfc_p95 = EXCLUDED.ttfc_p95,
+        ttc_p50 = EXCLUDED.ttc_p50, ttc_p95 = EXCLUDED.ttc_p95,
+        cost_usd = EXCLUDED.cost_usd
+"""
+
+
+async def roll_up_telemetry() -> int | None:
+    """
+    Recompute the daily rollups for telemetry written since the last run.
+
+    Returns:
+        Number of per-aide rollup rows written, or None if another process
+        is rolling up right now
+    """
+    async with system_conn() as conn:
+        if not await conn.fetchval(_ROLLUP_LOCK):
+            return None
+        result = await conn.execute(_ROLL_UP_AIDES)
+        await conn.execute(_ROLL_UP_TIERS)
+        await conn.execute("UPDATE telemetry_rollup_state SET rolled_up_to = now()")
+    # "INSERT 0 N"
+    return int(result.split()[-1])
+
+
+async def refresh_admin_counts() -> None:
+    """Refresh the materialized users-by-tier, aides-by-status and per-user aide counts."""
+    async with system_conn() as conn:
+        await conn.execute("SELECT refresh_admin_counts()")
+
+
+async def get_tier_daily(since: date) -> list[dict]:
+    """
+    Daily telemetry per model tier, across all aides. For admin dashboards.
+
+    Args:
+        since: First UTC day to include
+
+    Returns:
+        One dict per (day, tier), oldest first; tier is '' for events without one
+    """
+    async with read_conn() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT day, tier, aides, llm_calls, direct_edits, escalations, input_tokens, output_tokens,
+                   ttfc_p50, ttfc_p95, ttc_p50, ttc_p95, cost_usd
+            FROM telemetry_tier_daily
+            WHERE day >= $1
+            ORDER BY day, tier
+            """,
+            since,
+        )
+        return [dict(row) for row in rows]
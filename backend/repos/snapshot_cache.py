@@ -0,0 +1,298 @@
+"""
+Process-local cache of decoded aides, shared by the WebSocket and REST paths.
+
+`AideRepo.get` used to read and JSON-decode the whole `aides.state` row on
+every call. Hot aides are now served from an LRU of `Aide` objects, bounded
+by the stored size of their state and event log (SNAPSHOT_CACHE_MB), which
+AideRepo selects alongside the row.
+
+Versions are `updated_at`, which AideRepo bumps monotonically on every
+write. Writes through AideRepo put the returned row in the cache and NOTIFY
+`aide_cache` from inside the write transaction, so every replica (this one
+included) hears about each committed version in commit order and drops
+older copies. A read that raced a write cannot re-insert the stale row:
+puts older than the newest version seen for the aide are ignored.
+
+The same notifications drive cross-replica session refresh: the payload
+carries the stored `_sequence`, and `subscribe()` passes each committed
+write on (services/aide_sessions.py re-hydrates sockets from it). One
+LISTEN connection per process serves both.
+
+The cache only serves reads while its LISTEN connection is up; without it
+there is no way to hear about other replicas' writes, so every read goes
+to the database as before. A lost connection is re-established with
+backoff, after which subscribers are told to catch up on what they missed.
+Cached `Aide` objects are shared: callers get a shallow copy and must
+treat `state` and `event_log` as read-only (the kernel already never
+mutates its input snapshot).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+
+from backend import db
+from backend.config import settings
+from backend.models.aide import Aide
+from backend.utils import jsonx
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "aide_cache"
+
+# Newest version seen per aide, kept for this many aides beyond the cached ones
+MAX_VERSIONS = 10_000
+
+# Version recorded for a deleted aide; no later read can be cached
+_DELETED = datetime.max.replace(tzinfo=UTC)
+
+# Backoff between attempts to re-LISTEN after the listener connection drops
+_RELISTEN_MIN_S = 1.0
+_RELISTEN_MAX_S = 30.0
+
+# Called with (aide_id, stored _sequence, or None for a delete or metadata-only write) for every committed write
+ChangeCallback = Callable[[UUID, int | None], None]
+
+
+def _size(aide: Aide) -> int:
+    """Encoded size of an aide's state and event log, for puts that don't know the stored size."""
+    return len(jsonx.dumpb(aide.state)) + len(jsonx.dumpb(aide.event_log))
+
+
+def notify_payload(aide_id: UUID, updated_at: datetime | None, seq: int | None = None) -> str:
+    """NOTIFY payload announcing a committed version and its state._sequence (None if the state was not written)."""
+    return jsonx.dumps(
+        {"aide_id": str(aide_id), "updated_at": updated_at.isoformat() if updated_at else None, "seq": seq}
+    )
+
+
+class SnapshotCache:
+    """Size-bounded LRU of decoded aides, kept coherent across replicas via NOTIFY."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Args:
+            max_bytes: Budget for cached state and event logs; 0 disables the cache
+        """
+        self.max_bytes = max_bytes
+        self.enabled = False
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[UUID, tuple[Aide, int]] = OrderedDict()
+        # Newest committed version heard of per aide, so stale in-flight reads are not cached
+        self._versions: OrderedDict[UUID, datetime] = OrderedDict()
+        self._listener: asyncpg.Connection | None = None
+        self._reconnect: asyncio.Task | None = None
+        self._subscribers: list[tuple[ChangeCallback, Callable[[], None] | None]] = []
+
+    def subscribe(self, on_change: ChangeCallback, on_reconnect: Callable[[], None] | None = None) -> None:
+        """
+        Hear about every committed aide write, from any replica (this one included).
+
+        Args:
+            on_change: Called with the aide id and stored _sequence (None for a delete
+                or a write that left the state alone)
+            on_reconnect: Called after a lost listener is re-established;
+                writes in between were missed
+        """
+        self._subscribers.append((on_change, on_reconnect))
+
+    def unsubscribe(self, on_change: ChangeCallback) -> None:
+        """Stop calling a subscriber."""
+        self._subscribers = [s for s in self._subscribers if s[0] != on_change]
+
+    @property
+    def listening(self) -> bool:
+        """True while the LISTEN connection is up."""
+        return self._listener is not None
+
+    def get(self, aide_id: UUID, user_id: UUID, min_sequence: int = 0) -> Aide | None:
+        """
+        Return a cached copy of the aide, or None on a miss.
+
+        Args:
+            aide_id: Aide UUID
+            user_id: Requesting user; other users' aides are never served
+            min_sequence: Treat entries whose state._sequence is below this as misses
+
+        Returns:
+            Shallow copy of the cached Aide, or None
+        """
+        if not self.enabled:
+            return None
+        entry = self._entries.get(aide_id)
+        if entry is None or entry[0].user_id != user_id or self._sequence(entry[0]) < min_sequence:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(aide_id)
+        self.hits += 1
+        return entry[0].model_copy()
+
+    def put(self, aide: Aide, size: int | None = None) -> None:
+        """
+        Cache an aide read from or written to the database, unless a newer version is known.
+
+        Args:
+            aide: Committed aide
+            size: Stored size of its state and event log; computed by
+                re-encoding them when not given
+        """
+        if not self.enabled or self.max_bytes <= 0:
+            return
+        known = self._versions.get(aide.id)
+        if known is not None and aide.updated_at < known:
+            return
+        if size is None:
+            size = _size(aide)
+        self._discard(aide.id)
+        self._seen(aide.id, aide.updated_at)
+        if size > self.max_bytes:
+            return
+        self._entries[aide.id] = (aide, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def invalidate(self, aide_id: UUID, updated_at: datetime | None = None) -> None:
+        """
+        Drop cached copies older than a committed version.
+
+        Args:
+            aide_id: Aide UUID
+            updated_at: Version that was committed; None means the aide was deleted
+        """
+        version = updated_at or _DELETED
+        entry = self._entries.get(aide_id)
+        if entry is not None and entry[0].updated_at < version:
+            self._discard(aide_id)
+            self.invalidations += 1
+        self._seen(aide_id, version)
+
+    def clear(self) -> None:
+        """Drop every entry and known version."""
+        self._entries.clear()
+        self._versions.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Counters for the admin metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    async def start(self) -> None:
+        """
+        Listen for committed writes and start serving reads (if SNAPSHOT_CACHE_MB > 0).
+
+        Listens even with the cache off, for subscribers. Best-effort: logs
+        and stays disabled.
+        """
+        try:
+            await self._listen()
+        except Exception as e:
+            logger.warning(
+                "snapshot_cache: LISTEN %s failed, cache and cross-replica refresh disabled: %s", NOTIFY_CHANNEL, e
+            )
+
+    async def stop(self) -> None:
+        """Stop serving reads and close the listener connection."""
+        self.enabled = False
+        self.clear()
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            await listener.close()
+
+    async def _listen(self) -> None:
+        self._listener = await db.listen(NOTIFY_CHANNEL, self._on_notify)
+        self._listener.add_termination_listener(self._on_terminate)
+        self.enabled = self.max_bytes > 0
+
+    async def _relisten(self) -> None:
+        """Re-LISTEN with backoff, then tell subscribers to catch up on the writes they missed."""
+        delay = _RELISTEN_MIN_S
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                break
+            except Exception as e:
+                logger.warning("snapshot_cache: re-LISTEN failed, retrying in %.0fs: %s", delay, e)
+                delay = min(delay * 2, _RELISTEN_MAX_S)
+        self._reconnect = None
+        logger.info("snapshot_cache: listener reconnected")
+        for _, on_reconnect in list(self._subscribers):
+            if on_reconnect is not None:
+                on_reconnect()
+
+    @staticmethod
+    def _sequence(aide: Aide) -> int:
+        return aide.state.get("_sequence", 0) if isinstance(aide.state, dict) else 0
+
+    def _discard(self, aide_id: UUID) -> None:
+        entry = self._entries.pop(aide_id, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _seen(self, aide_id: UUID, version: datetime) -> None:
+        known = self._versions.get(aide_id)
+        if known is None or version > known:
+            self._versions[aide_id] = version
+        self._versions.move_to_end(aide_id)
+        while len(self._versions) > MAX_VERSIONS + len(self._entries):
+            self._versions.popitem(last=False)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = jsonx.loads(payload)
+            aide_id = UUID(message["aide_id"])
+            updated_at = datetime.fromisoformat(message["updated_at"]) if message.get("updated_at") else None
+            seq = int(message["seq"]) if message.get("seq") is not None else None
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning("snapshot_cache: malformed notify payload: %r", payload[:200])
+            return
+        self.invalidate(aide_id, updated_at)
+        for on_change, _ in list(self._subscribers):
+            try:
+                on_change(aide_id, seq)
+            except Exception:
+                logger.exception("snapshot_cache: subscriber failed aide_id=%s", aide_id)
+
+    def _on_terminate(self, connection: Any) -> None:
+        # stop() clears _listener before closing, so only an unexpected loss gets here with it set
+        if connection is not self._listener:
+            return
+        # Without the listener other replicas' writes go unheard; stop serving possibly stale copies
+        logger.warning("snapshot_cache: listener connection lost, cache disabled until it reconnects")
+        self.enabled = False
+        self.clear()
+        self._listener = None
+        self._reconnect = asyncio.create_task(self._relisten())
+
+
+# Singleton instance
+snapshot_cache = SnapshotCache(settings.SNAPSHOT_CACHE_MB * 1024 * 1024)
@@ -2,111 +2,240 @@
 
 from __future__ import annotations
 
-import json
+from datetime import datetime
 from uuid import UUID
 
-from backend.db import system_conn, user_conn
+from backend.db import read_conn, system_conn, user_read_conn
 from backend.models.telemetry import TelemetryEvent, TokenUsage, TurnTelemetry
+from backend.utils import jsonx
 
 
-async def record_event(event: TelemetryEvent) -> int:
-    """Insert a telemetry event row. Returns the new row id."""
+def _event_args(event: TelemetryEvent) -> tuple:
+    return (
+        event.aide_id,
+        event.user_id,
+        event.event_type,
+        event.tier,
+        event.model,
+        event.prompt_ver,
+        event.ttfc_ms,
+        event.ttc_ms,
+        event.input_tokens,
+        event.output_tokens,
+        event.cache_read_tokens,
+        event.cache_write_tokens,
+        event.lines_emitted,
+        event.lines_accepted,
+        event.lines_rejected,
+        event.escalated,
+        event.escalation_reason,
+        event.cost_usd,
+        event.edit_latency_ms,
+        event.message_id,
+        event.error,
+    )
+
+
+# Batched writes (services/telemetry_sink.py) COPY into staging tables, then INSERT ... SELECT.
+# asyncpg's binary COPY cannot use the text codecs db._init_connection registers for uuid and
+# jsonb, so ids and JSON are staged as text and cast on the way into the real tables.
+_EVENT_COLUMNS = (
+    "ts",
+    "aide_id",
+    "user_id",
+    "event_type",
+    "tier",
+    "model",
+    "prompt_ver",
+    "ttfc_ms",
+    "ttc_ms",
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+    "lines_emitted",
+    "lines_accepted",
+    "lines_rejected",
+    "escalated",
+    "escalation_reason",
+    "cost_usd",
+    "edit_latency_ms",
+    "message_id",
+    "error",
+)
+
+_STAGE_EVENTS = """
+    CREATE TEMP TABLE telemetry_stage (
+        ts TIMESTAMPTZ, aide_id TEXT, user_id TEXT, event_type TEXT,
+        tier TEXT, model TEXT, prompt_ver TEXT, ttfc_ms INT, ttc_ms INT,
+        input_tokens INT, output_tokens INT, cache_read_tokens INT, cache_write_tokens INT,
+        lines_emitted INT, lines_accepted INT, lines_rejected INT,
+        escalated BOOLEAN, escalation_reason TEXT, cost_usd NUMERIC(10,6),
+        edit_latency_ms INT, message_id TEXT, error TEXT
+    ) ON COMMIT DROP
+"""
+
+_INSERT_STAGED_EVENTS = f"""
+    INSERT INTO telemetry ({", ".join(_EVENT_COLUMNS)})
+    SELECT ts, aide_id::uuid, user_id::uuid, event_type,
+           tier, model, prompt_ver, ttfc_ms, ttc_ms,
+           input_tokens, output_tokens, cache_read_tokens, cache_write_tokens,
+           lines_emitted, lines_accepted, lines_rejected,
+           escalated, escalation_reason, cost_usd,
+           edit_latency_ms, message_id::uuid, error
+    FROM telemetry_stage
+"""
+
+_TURN_COLUMNS = (
+    "created_at",
+    "aide_id",
+    "user_id",
+    "turn_num",
+    "tier",
+    "model",
+    "message",
+    "tool_calls",
+    "text_blocks",
+    "system_prompt",
+    "usage",
+    "ttfc_ms",
+    "ttc_ms",
+    "validation",
+)
+
+_STAGE_TURNS = """
+    CREATE TEMP TABLE aide_turn_telemetry_stage (
+        created_at TIMESTAMPTZ, aide_id TEXT, user_id TEXT, turn_num INT,
+        tier TEXT, model TEXT, message TEXT,
+        tool_calls TEXT, text_blocks TEXT, system_prompt TEXT, usage TEXT,
+        ttfc_ms INT, ttc_ms INT, validation TEXT
+    ) ON COMMIT DROP
+"""
+
+# to_jsonb(text) stores the JSON documents as JSON-string values, which is what
+# get_turns_for_aide decodes. Turns whose aide has been deleted, or that were already
+# recorded, are skipped instead of failing the batch. users.turn_count is not touched here:
+# the trial quota is counted synchronously by TurnRecorder.finish, never through this queue.
+_INSERT_STAGED_TURNS = f"""
+    WITH stored AS (
+        INSERT INTO aide_turn_telemetry ({", ".join(_TURN_COLUMNS)})
+        SELECT s.created_at, s.aide_id::uuid, s.user_id::uuid, s.turn_num,
+               s.tier, s.model, s.message,
+               to_jsonb(s.tool_calls), to_jsonb(s.text_blocks), s.system_prompt, to_jsonb(s.usage),
+               s.ttfc_ms, s.ttc_ms, to_jsonb(s.validation)
+        FROM aide_turn_telemetry_stage s
+        WHERE EXISTS (SELECT 1 FROM aides a WHERE a.id = s.aide_id::uuid)
+        ON CONFLICT (aide_id, turn_num) DO NOTHING
+        RETURNING 1
+    )
+    SELECT count(*) FROM stored
+"""
+
+
+def _staged_event(ts: datetime, event: TelemetryEvent) -> tuple:
+    args = _event_args(event)
+    return (
+        ts,
+        str(event.aide_id),
+        str(event.user_id) if event.user_id else None,
+        *args[2:19],
+        str(event.message_id) if event.message_id else None,
+        event.error,
+    )
+
+
+def _staged_turn(ts: datetime, user_id: UUID, aide_id: UUID, turn: TurnTelemetry) -> tuple:
+    return (
+        ts,
+        str(aide_id),
+        str(user_id),
+        turn.turn,
+        turn.tier,
+        turn.model,
+        turn.message,
+        jsonx.dumps(turn.tool_calls),
+        jsonx.dumps(turn.text_blocks),
+        turn.system_prompt,
+        jsonx.dumps(turn.usage.model_dump()),
+        turn.ttfc_ms,
+        turn.ttc_ms,
+        jsonx.dumps(turn.validation) if turn.validation else None,
+    )
+
+
+async def copy_batch(
+    events: list[tuple[datetime, TelemetryEvent]],
+    turns: list[tuple[datetime, UUID, UUID, TurnTelemetry]],
+) -> int:
+    """
+    Bulk-insert queued telemetry with COPY, in one transaction on one connection.
+
+    Args:
+        events: (recorded at, event) pairs for the telemetry table
+        turns: (recorded at, user_id, aide_id, turn) for aide_turn_telemetry
+
+    Returns:
+        Number of turns stored (duplicates and turns of deleted aides are skipped)
+    """
+    if not events and not turns:
+        return 0
+    stored = 0
     async with system_conn() as conn:
-        row = await conn.fetchrow(
-            """
-            INSERT INTO telemetry (
-                aide_id, user_id, event_type,
-                tier, model, prompt_ver,
-                ttfc_ms, ttc_ms,
-                input_tokens, output_tokens,
-                cache_read_tokens, cache_write_tokens,
-                lines_emitted, lines_accepted, lines_rejected,
-                escalated, escalation_reason,
-                cost_usd, edit_latency_ms,
-                message_id, error
-            ) VALUES (
-                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10,
-                $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21
-            ) RETURNING id
-            """,
-            event.aide_id,
-            event.user_id,
-            event.event_type,
-            event.tier,
-            event.model,
-            event.prompt_ver,
-            event.ttfc_ms,
-            event.ttc_ms,
-            event.input_tokens,
-            event.output_tokens,
-            event.cache_read_tokens,
-            event.cache_write_tokens,
-            event.lines_emitted,
-            event.lines_accepted,
-            event.lines_rejected,
-            event.escalated,
-            event.escalation_reason,
-            event.cost_usd,
-            event.edit_latency_ms,
-            event.message_id,
-            event.error,
-        )
-        return row["id"]
+        if events:
+            await conn.execute(_STAGE_EVENTS)
+            await conn.copy_records_to_table(
+                "telemetry_stage",
+                records=[_staged_event(ts, event) for ts, event in events],
+                columns=_EVENT_COLUMNS,
+            )
+            await conn.execute(_INSERT_STAGED_EVENTS)
+        if turns:
+            await conn.execute(_STAGE_TURNS)
+            await conn.copy_records_to_table(
+                "aide_turn_telemetry_stage",
+                records=[_staged_turn(*queued) for queued in turns],
+                columns=_TURN_COLUMNS,
+            )
+            stored = await conn.fetchval(_INSERT_STAGED_TURNS)
+    return stored
 
 
 async def get_aide_stats(aide_id: UUID) -> dict:
-    """Return aggregate telemetry stats for a single aide."""
-    async with system_conn() as conn:
+    """
+    Return aggregate telemetry stats for a single aide, from the daily rollups.
+
+    Trails raw telemetry by up to one rollup interval (the rollups job in main.py).
+    `daily` lists each UTC day and tier with its TTFC/TTC percentiles, oldest first.
+    """
+    async with read_conn() as conn:
         row = await conn.fetchrow(
             """
             SELECT
-                COUNT(*) FILTER (WHERE event_type = 'llm_call')    AS llm_calls,
-                COUNT(*) FILTER (WHERE event_type = 'direct_edit') AS direct_edits,
-                COUNT(*) FILTER (WHERE escalated = true)           AS escalations,
-                AVG(ttfc_ms) FILTER (WHERE tier = 'L2')            AS avg_l2_ttfc,
-                AVG(ttfc_ms) FILTER (WHERE tier = 'L3')            AS avg_l3_ttfc,
-                SUM(cost_usd)                                       AS total_cost,
+                COALESCE(SUM(llm_calls), 0)                              AS llm_calls,
+                COALESCE(SUM(direct_edits), 0)                           AS direct_edits,
+                COALESCE(SUM(escalations), 0)                            AS escalations,
+                SUM(ttfc_sum) FILTER (WHERE tier = 'L2')::float
+                    / NULLIF(SUM(ttfc_count) FILTER (WHERE tier = 'L2'), 0) AS avg_l2_ttfc,
+                SUM(ttfc_sum) FILTER (WHERE tier = 'L3')::float
+                    / NULLIF(SUM(ttfc_count) FILTER (WHERE tier = 'L3'), 0) AS avg_l3_ttfc,
+                SUM(cost_usd)                                            AS total_cost,
                 SUM(lines_accepted)::float
-                    / NULLIF(SUM(lines_emitted), 0)                AS accept_rate
-            FROM telemetry
+                    / NULLIF(SUM(lines_emitted), 0)                      AS accept_rate
+            FROM telemetry_aide_daily
             WHERE aide_id = $1
             """,
             aide_id,
         )
-        return dict(row)
-
-
-async def insert_turn(
-    user_id: UUID,
-    aide_id: UUID,
-    turn: TurnTelemetry,
-) -> UUID:
-    """Insert a turn telemetry record. Returns row ID."""
-    async with user_conn(user_id) as conn:
-        row = await conn.fetchrow(
+        daily = await conn.fetch(
             """
-            INSERT INTO aide_turn_telemetry (
-                aide_id, user_id, turn_num, tier, model, message,
-                tool_calls, text_blocks, system_prompt, usage,
-                ttfc_ms, ttc_ms, validation
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
-            RETURNING id
+            SELECT day, tier, llm_calls, direct_edits, ttfc_p50, ttfc_p95, ttc_p50, ttc_p95
+            FROM telemetry_aide_daily
+            WHERE aide_id = $1
+            ORDER BY day, tier
             """,
             aide_id,
-            user_id,
-            turn.turn,
-            turn.tier,
-            turn.model,
-            turn.message,
-            json.dumps(turn.tool_calls),
-            json.dumps(turn.text_blocks),
-            turn.system_prompt,
-            json.dumps(turn.usage.model_dump()),
-            turn.ttfc_ms,
-            turn.ttc_ms,
-            json.dumps(turn.validation) if turn.validation else None,
         )
-        return row["id"]
+        return {**dict(row), "daily": [dict(r) for r in daily]}
 
 
 async def get_turns_for_aide(
@@ -114,7 +243,7 @@ async def get_turns_for_aide(
     aide_id: UUID,
 ) -> list[TurnTelemetry]:
     """Get all turns for an aide, ordered by turn number."""
-    async with user_conn(user_id) as conn:
+    async with user_read_conn(user_id) as conn:
         rows = await conn.fetch(
             """
             SELECT turn_num, tier, model, message, tool_calls, text_blocks,
@@ -131,13 +260,13 @@ async def get_turns_for_aide(
                 tier=r["tier"],
                 model=r["model"],
                 message=r["message"],
-                tool_calls=json.loads(r["tool_calls"]),
-                text_blocks=json.loads(r["text_blocks"]),
+                tool_calls=jsonx.loads(r["tool_calls"]),
+                text_blocks=jsonx.loads(r["text_blocks"]),
                 system_prompt=r["system_prompt"],
-                usage=TokenUsage(**json.loads(r["usage"])),
+                usage=TokenUsage(**jsonx.loads(r["usage"])),
                 ttfc_ms=r["ttfc_ms"],
                 ttc_ms=r["ttc_ms"],
-                validation=json.loads(r["validation"]) if r["validation"] else None,
+                validation=jsonx.loads(r["validation"]) if r["validation"] else None,
             )
             for r in rows
         ]
@@ -149,7 +278,7 @@ async def get_turns_for_aide_system(aide_id: UUID) -> list[TurnTelemetry]:
 
     For admin breakglass access only. Caller must verify admin authorization.
     """
-    async with system_conn() as conn:
+    async with read_conn() as conn:
         rows = await conn.fetch(
             """
             SELECT turn_num, tier, model, message, tool_calls, text_blocks,
@@ -166,13 +295,13 @@ async def get_turns_for_aide_system(aide_id: UUID) -> list[TurnTelemetry]:
                 tier=r["tier"],
                 model=r["model"],
                 message=r["message"],
-                tool_calls=json.loads(r["tool_calls"]),
-                text_blocks=json.loads(r["text_blocks"]),
+                tool_calls=jsonx.loads(r["tool_calls"]),
+                text_blocks=jsonx.loads(r["text_blocks"]),
                 system_prompt=r["system_prompt"],
-                usage=TokenUsage(**json.loads(r["usage"])),
+                usage=TokenUsage(**jsonx.loads(r["usage"])),
                 ttfc_ms=r["ttfc_ms"],
                 ttc_ms=r["ttc_ms"],
-                validation=json.loads(r["validation"]) if r["validation"] else None,
+                validation=jsonx.loads(r["validation"]) if r["validation"] else None,
             )
             for r in rows
         ]
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from uuid import UUID
 
 import asyncpg
 
-from backend.db import system_conn, user_conn
+from backend.db import read_conn, system_conn, user_conn
 from backend.models.user import User
 
 # Shadow user turn limit
@@ -187,22 +188,35 @@ class UserRepo:
         self,
         limit: int = 100,
         offset: int = 0,
+        after: tuple[datetime, UUID] | None = None,
     ) -> tuple[list[dict], int]:
         """
         List all users with aide counts. For admin use only.
 
+        Aide counts and the total come from the user_aide_counts and
+        admin_counts materialized views, so they trail by up to one rollup
+        interval; the users themselves are read live.
+
+        Users are ordered newest first by (created_at, id). Pass `after`
+        (the last user of the previous page, see backend/utils/cursor.py) to
+        seek straight to the next page; OFFSET has to walk every skipped row.
+
         Caller must verify admin authorization before calling.
 
         Args:
             limit: Maximum number of users to return
             offset: Number of users to skip
+            after: (created_at, id) of the user to continue after
 
         Returns:
             Tuple of (list of user dicts with aide_count, total count)
         """
-        async with system_conn() as conn:
+        # A separate statement per shape: an OR'd "$3 IS NULL" would leave the
+        # generic plan unable to use the (created_at, id) index for the seek
+        keyset, args = ("WHERE (u.created_at, u.id) < ($3, $4)", after) if after else ("", ())
+        async with read_conn() as conn:
             rows = await conn.fetch(
-                """
+                f"""
                 SELECT
                     u.id,
                     u.email,
@@ -212,18 +226,19 @@ class UserRepo:
                     u.is_shadow,
                     u.turn_count,
                     u.created_at,
-                    COUNT(a.id) as aide_count
+                    COALESCE(c.aide_count, 0) AS aide_count
                 FROM users u
-                LEFT JOIN aides a ON u.id = a.user_id AND a.status != 'archived'
-                GROUP BY u.id
-                ORDER BY u.created_at DESC
+                LEFT JOIN user_aide_counts c ON c.user_id = u.id
+                {keyset}
+                ORDER BY u.created_at DESC, u.id DESC
                 LIMIT $1 OFFSET $2
                 """,
                 limit,
                 offset,
+                *args,
             )
 
-            total = await conn.fetchval("SELECT COUNT(*) FROM users")
+            total = await conn.fetchval("SELECT sum(count)::bigint FROM admin_counts WHERE kind = 'users_by_tier'")
 
             users = [
                 {
@@ -246,14 +261,17 @@ class UserRepo:
         """
         Count users grouped by tier. For admin stats.
 
+        Read from the admin_counts materialized view, which the rollups job
+        refreshes; it trails the users table by up to one interval.
+
         Caller must verify admin authorization before calling.
 
         Returns:
             Dict mapping tier name to count
         """
-        async with system_conn() as conn:
-            rows = await conn.fetch("SELECT tier, COUNT(*) as count FROM users GROUP BY tier")
-            return {row["tier"]: row["count"] for row in rows}
+        async with read_conn() as conn:
+            rows = await conn.fetch("SELECT key, count FROM admin_counts WHERE kind = 'users_by_tier'")
+            return {row["key"]: row["count"] for row in rows}
 
     async def get_or_create_shadow_user(self, fingerprint_id: str) -> dict:
         """
@@ -358,27 +376,42 @@ class UserRepo:
             )
             return result == "UPDATE 1"
 
-    async def cleanup_old_shadow_users(self, max_age_days: int = 30) -> int:
+    async def cleanup_old_shadow_users(self, max_age_days: int = 30, batch_size: int = 1000) -> int:
         """
         Delete shadow users with no activity older than max_age_days.
 
+        Deletes in batches of batch_size rows, each in its own transaction;
+        rows another session has locked are skipped until the next call.
+
         Args:
             max_age_days: Maximum age in days before cleanup
+            batch_size: Users deleted per transaction
 
         Returns:
             Number of shadow users deleted
         """
-        async with system_conn() as conn:
-            result = await conn.execute(
-                """
-                DELETE FROM users
-                WHERE is_shadow = true
-                AND created_at < now() - interval '1 day' * $1
-                AND NOT EXISTS (
-                    SELECT 1 FROM aides WHERE user_id = users.id
+        total = 0
+        while True:
+            async with system_conn() as conn:
+                result = await conn.execute(
+                    """
+                    DELETE FROM users
+                    WHERE ctid = ANY(ARRAY(
+                        SELECT ctid FROM users
+                        WHERE is_shadow = true
+                        AND created_at < now() - interval '1 day' * $1
+                        AND NOT EXISTS (
+                            SELECT 1 FROM aides WHERE user_id = users.id
+                        )
+                        LIMIT $2
+                        FOR UPDATE SKIP LOCKED
+                    ))
+                    """,
+                    max_age_days,
+                    batch_size,
                 )
-                """,
-                max_age_days,
-            )
             # Returns "DELETE N"
-            return int(result.split()[1]) if result.startswith("DELETE") else 0
+            deleted = int(result.split()[1]) if result.startswith("DELETE") else 0
+            total += deleted
+            if deleted < batch_size:
+                return total
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
+from backend import db
 from backend.auth import get_current_admin
 from backend.models.admin_audit import (
     AdminAuditLogResponse,
@@ -20,10 +22,17 @@ from backend.models.admin_audit import (
 from backend.models.aide import Aide
 from backend.models.telemetry import AideTelemetry
 from backend.models.user import User
+from backend.repos import rollup_repo
 from backend.repos.admin_audit_repo import AdminAuditRepo
 from backend.repos.aide_repo import AideRepo
+from backend.repos.snapshot_cache import snapshot_cache
 from backend.repos.user_repo import UserRepo
+from backend.services import outbound
+from backend.services.render_pool import render_pool
+from backend.services.scheduler import scheduler
 from backend.services.telemetry import get_aide_telemetry_system
+from backend.services.telemetry_sink import telemetry_sink
+from backend.utils import cursor as cursor_codec
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 admin_audit_repo = AdminAuditRepo()
@@ -31,6 +40,16 @@ aide_repo = AideRepo()
 user_repo = UserRepo()
 
 
+def _decode_cursor(cursor: str | None) -> tuple[datetime, UUID] | None:
+    """Parse a listing cursor query parameter, rejecting malformed ones with a 400."""
+    if cursor is None:
+        return None
+    try:
+        return cursor_codec.decode(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
 @router.post("/breakglass/aide/{aide_id}")
 async def breakglass_view_aide(
     aide_id: UUID,
@@ -117,7 +136,7 @@ async def breakglass_view_aide_telemetry(
         raise HTTPException(status_code=404, detail="Aide not found")
 
     # Get aide for audit log (need user_id)
-    aide = await aide_repo.get_by_id_system(aide_id)
+    aide = await aide_repo.get_summary_by_id_system(aide_id)
 
     # Log the breakglass access
     client_ip = request.client.host if request.client else None
@@ -135,33 +154,43 @@ async def breakglass_view_aide_telemetry(
 
 @router.get("/audit-logs")
 async def list_audit_logs(
+    response: Response,
     admin: Annotated[User, Depends(get_current_admin)],
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[AdminAuditLogResponse]:
     """
     List admin audit logs.
 
-    Requires admin privileges.
+    Requires admin privileges. When a full page is returned, the
+    X-Next-Cursor header carries the cursor for the next one; pass it back
+    as `cursor` instead of a growing `offset`.
 
     Args:
+        response: Outgoing response (for the X-Next-Cursor header)
         admin: Current admin user (from dependency)
         limit: Maximum number of logs to return (default 100, max 1000)
         offset: Number of logs to skip (default 0)
+        cursor: X-Next-Cursor of the previous page
 
     Returns:
         List of AdminAuditLogResponse entries
 
     Raises:
-        HTTPException: If limit exceeds maximum
+        HTTPException: If limit exceeds maximum or the cursor is invalid
     """
     if limit > 1000:
         raise HTTPException(status_code=400, detail="Maximum limit is 1000")
 
-    return await admin_audit_repo.list_audit_logs(
+    logs = await admin_audit_repo.list_audit_logs(
         limit=limit,
         offset=offset,
+        after=_decode_cursor(cursor),
     )
+    if logs and len(logs) == limit:
+        response.headers["X-Next-Cursor"] = cursor_codec.encode(logs[-1].created_at, logs[-1].id)
+    return logs
 
 
 @router.get("/audit-logs/count")
@@ -188,31 +217,39 @@ async def list_users(
     admin: Annotated[User, Depends(get_current_admin)],
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> AdminUserListResponse:
     """
     List all users in the system.
 
-    Requires admin privileges.
+    Requires admin privileges. When a full page is returned, next_cursor
+    is set; pass it back as `cursor` instead of a growing `offset`.
 
     Args:
         admin: Current admin user (from dependency)
         limit: Maximum number of users to return (default 100, max 1000)
         offset: Number of users to skip (default 0)
+        cursor: next_cursor of the previous page
 
     Returns:
-        AdminUserListResponse with users and total count
+        AdminUserListResponse with users, total count and next_cursor
 
     Raises:
-        HTTPException: If limit exceeds maximum
+        HTTPException: If limit exceeds maximum or the cursor is invalid
     """
     if limit > 1000:
         raise HTTPException(status_code=400, detail="Maximum limit is 1000")
 
-    users, total = await user_repo.list_all(limit=limit, offset=offset)
+    users, total = await user_repo.list_all(limit=limit, offset=offset, after=_decode_cursor(cursor))
+
+    next_cursor = None
+    if users and len(users) == limit:
+        next_cursor = cursor_codec.encode(users[-1]["created_at"], users[-1]["id"])
 
     return AdminUserListResponse(
         users=[AdminUserListItem(**u) for u in users],
         total=total,
+        next_cursor=next_cursor,
     )
 
 
@@ -248,6 +285,150 @@ async def get_system_stats(
     )
 
 
+@router.get("/cache")
+async def get_cache_stats(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get this process's snapshot cache counters (hit rate, size, evictions).
+
+    Requires admin privileges. Each replica reports its own cache.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of snapshot cache stats
+    """
+    return snapshot_cache.stats()
+
+
+@router.get("/ws")
+async def get_ws_stats(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get this process's WebSocket send-queue counters (depth, coalesced, resyncs, slow closes).
+
+    Requires admin privileges. Each replica reports its own connections.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of outbound queue stats
+    """
+    return outbound.stats()
+
+
+@router.get("/telemetry-sink")
+async def get_telemetry_sink_stats(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get this process's telemetry queue counters (depth, rows written, dropped, failed).
+
+    Requires admin privileges. Each replica reports its own queue.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of telemetry sink stats
+    """
+    return telemetry_sink.stats()
+
+
+@router.get("/jobs")
+async def get_job_stats(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get this process's maintenance job counters (leadership, runs, rows, last run).
+
+    Requires admin privileges. Leader-only jobs run on one replica; on the
+    others they show up as `skipped`.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of scheduler stats
+    """
+    return scheduler.stats()
+
+
+@router.get("/render")
+async def get_render_stats(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get this process's render worker counters (workers, queue, wait and render times, restarts).
+
+    Requires admin privileges.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of render pool stats
+    """
+    return render_pool.stats()
+
+
+@router.get("/metrics")
+async def get_metrics(
+    admin: Annotated[User, Depends(get_current_admin)],
+) -> dict:
+    """
+    Get all of this process's runtime counters in one document.
+
+    Requires admin privileges. Combines the database pools (checkout waits,
+    hold times, statement latency, replica routing) with the counters of
+    /cache, /ws, /telemetry-sink, /jobs and /render, for dashboards and
+    scripts/ws_loadtest.py --metrics-url. Each replica reports its own.
+
+    Args:
+        admin: Current admin user (from dependency)
+
+    Returns:
+        Dict of stats by subsystem
+    """
+    return {
+        "db": {**db.pool_stats(), "reads": db.read_stats()},
+        "snapshot_cache": snapshot_cache.stats(),
+        "ws": outbound.stats(),
+        "telemetry_sink": telemetry_sink.stats(),
+        "jobs": scheduler.stats(),
+        "render": render_pool.stats(),
+    }
+
+
+@router.get("/telemetry/daily")
+async def get_telemetry_daily(
+    admin: Annotated[User, Depends(get_current_admin)],
+    days: int = 30,
+) -> list[dict]:
+    """
+    Get daily telemetry per model tier (calls, tokens, cost, TTFC/TTC p50 and p95).
+
+    Requires admin privileges. Served from the telemetry_tier_daily rollup.
+
+    Args:
+        admin: Current admin user (from dependency)
+        days: UTC days to include, counting today (default 30, max 366)
+
+    Returns:
+        One dict per day and tier, oldest first
+
+    Raises:
+        HTTPException: If days is out of range
+    """
+    if not 1 <= days <= 366:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 366")
+    return await rollup_repo.get_tier_daily(datetime.now(UTC).date() - timedelta(days=days - 1))
+
+
 @router.post("/search/aides")
 async def search_aides(
     req: AideSearchRequest,
@@ -278,7 +459,7 @@ async def search_aides(
     results = []
 
     if req.aide_id:
-        aide = await aide_repo.get_by_id_system(req.aide_id)
+        aide = await aide_repo.get_summary_by_id_system(req.aide_id)
         if aide:
             owner = await user_repo.get_by_id_system(aide.user_id)
             results.append(
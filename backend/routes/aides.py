@@ -7,6 +7,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from backend.auth import get_current_user
+from backend.db import AdvisoryLockLost, AdvisoryLockTimeout, unit_of_work
 from backend.models.aide import (
     AideResponse,
     CreateAideRequest,
@@ -18,14 +19,23 @@ from backend.models.aide import (
 )
 from backend.models.conversation import ConversationHistoryResponse, MessageResponse
 from backend.models.user import User
-from backend.repos.aide_repo import AideRepo
+from backend.repos.aide_repo import AideRepo, StateConflict
 from backend.repos.conversation_repo import ConversationRepo
+from backend.services.aide_sessions import sessions, stored_snapshot_loader
 from backend.utils.snapshot_hash import hash_snapshot
 
 router = APIRouter(prefix="/api/aides", tags=["aides"])
 aide_repo = AideRepo()
 conversation_repo = ConversationRepo()
 
+# Messages per /history page (and sent with /hydrate); older ones are paged in with `before`
+HISTORY_PAGE_SIZE = 100
+HISTORY_PAGE_MAX = 500
+
+# State saves take the aide's turn like a WebSocket turn (services/aide_sessions.py)
+_BUSY = "This aide is busy with another edit. Please try again."
+_UNAVAILABLE = "This aide can't be edited right now. Please try again."
+
 
 @router.get("", status_code=200)
 async def list_aides(user: User = Depends(get_current_user)) -> list[AideResponse]:
@@ -56,7 +66,11 @@ async def get_aide(
     If include_snapshot=true, the response will include the full snapshot.
     This is used by the CLI for text rendering.
     """
-    aide = await aide_repo.get(user.id, aide_id)
+    # State is only loaded when the caller asks for it
+    if include_snapshot:
+        aide = await aide_repo.get(user.id, aide_id)
+    else:
+        aide = await aide_repo.get_summary(user.id, aide_id)
     if not aide:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
 
@@ -83,24 +97,28 @@ async def hydrate_aide(
     - blueprint: identity, voice, prompt metadata
     - messages: conversation history
     - snapshot_hash: checksum for reconciliation
+    - version: pass back with the next state save
 
     No replay is needed - the snapshot is the current state, persisted
     after each turn by the server.
     """
-    # Verify user owns this aide
-    aide = await aide_repo.get(user.id, aide_id)
-    if not aide:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
-
-    # Get conversation history
-    conversation = await conversation_repo.get_for_aide(user.id, aide_id)
-    messages = []
-    if conversation:
-        messages = [
-            {"role": m.role, "content": m.content, "timestamp": m.timestamp.isoformat()}
-            for m in conversation.messages
-            if m.role in ("user", "assistant")
-        ]
+    # One connection and transaction for the aide and conversation reads
+    async with unit_of_work(user.id):
+        # Verify user owns this aide
+        aide = await aide_repo.get(user.id, aide_id)
+        if not aide:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
+
+        # Get the latest page of conversation history
+        conversation = await conversation_repo.get_for_aide(user.id, aide_id)
+        messages = []
+        if conversation:
+            page = await conversation_repo.get_page(user.id, conversation.id, HISTORY_PAGE_SIZE)
+            messages = [
+                {"role": m.role, "content": m.content, "timestamp": m.timestamp.isoformat()}
+                for m in page.messages
+                if m.role in ("user", "assistant")
+            ]
 
     # Build blueprint from aide metadata
     blueprint = {
@@ -124,6 +142,7 @@ async def hydrate_aide(
         blueprint=blueprint,
         messages=messages,
         snapshot_hash=snapshot_hash_value,
+        version=aide.version,
     )
 
 
@@ -185,26 +204,43 @@ async def get_aide_state(
 async def get_aide_history(
     aide_id: UUID,
     user: User = Depends(get_current_user),
+    limit: int = HISTORY_PAGE_SIZE,
+    before: int | None = None,
 ) -> ConversationHistoryResponse:
-    """Get conversation history for an aide."""
-    # Verify user owns this aide
-    aide = await aide_repo.get(user.id, aide_id)
-    if not aide:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
+    """
+    Get conversation history for an aide, one page at a time.
 
-    # Get conversation for this aide
-    conversation = await conversation_repo.get_for_aide(user.id, aide_id)
-    if not conversation:
-        return ConversationHistoryResponse(messages=[])
+    Args:
+        aide_id: Aide UUID
+        user: Current user (from dependency)
+        limit: Maximum messages to return (default 100, max 500)
+        before: Cursor from a previous response; omit for the latest page
+
+    Returns:
+        ConversationHistoryResponse with messages oldest first and the cursor for the page before
+    """
+    if limit < 1 or limit > HISTORY_PAGE_MAX:
+        raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {HISTORY_PAGE_MAX}")
+
+    async with unit_of_work(user.id):
+        # Verify user owns this aide
+        aide = await aide_repo.get_summary(user.id, aide_id)
+        if not aide:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
+
+        # Get conversation for this aide
+        conversation = await conversation_repo.get_for_aide(user.id, aide_id)
+        if not conversation:
+            return ConversationHistoryResponse(messages=[])
+
+        page = await conversation_repo.get_page(user.id, conversation.id, limit, before=before)
 
     # Convert messages to response format (exclude system messages and metadata)
     messages = [
-        MessageResponse(role=m.role, content=m.content)
-        for m in conversation.messages
-        if m.role in ("user", "assistant")
+        MessageResponse(role=m.role, content=m.content) for m in page.messages if m.role in ("user", "assistant")
     ]
 
-    return ConversationHistoryResponse(messages=messages)
+    return ConversationHistoryResponse(messages=messages, before=page.before)
 
 
 @router.post("/{aide_id}/state", status_code=200)
@@ -217,56 +253,82 @@ async def save_aide_state(
     Save streamed state to database.
 
     This endpoint persists the state that was streamed via WebSocket.
-    No LLM call - just saves what the frontend already has.
+    No LLM call - just saves what the frontend already has. With
+    `version`, the save is refused (409) if the aide has been written since
+    the client read it.
+
+    The save runs as a turn on the aide's shared session, so it waits for
+    (or, past ADVISORY_LOCK_TIMEOUT_S, is refused with 409 by) any turn in
+    progress, and connected WebSockets are re-hydrated with the saved state.
     """
     # Verify user owns this aide
-    aide = await aide_repo.get(user.id, aide_id)
+    aide = await aide_repo.get_summary(user.id, aide_id)
     if not aide:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
 
-    # Build v2 snapshot from frontend state
-    snapshot = {
-        "entities": req.entities,
-        "meta": req.meta,
-        "relationships": [],
-        "styles": {"global": {}, "entities": {}},
-        "_sequence": 0,
-    }
-
-    # Update aide state in database
-    title = req.meta.get("title") or aide.title
-    await aide_repo.update_state(user.id, aide_id, snapshot, event_log=[], title=title)
-
-    # Save conversation history if provided
-    if req.message or req.response:
-        from datetime import UTC, datetime
-
-        from backend.models.conversation import Message
-
-        # Get or create conversation for this aide
-        conversation = await conversation_repo.get_for_aide(user.id, aide_id)
-        if not conversation:
-            conversation = await conversation_repo.create(user.id, aide_id, channel="web")
-
-        now = datetime.now(UTC)
-
-        # Append user message
-        if req.message:
-            await conversation_repo.append_message(
-                user.id,
-                conversation.id,
-                Message(role="user", content=req.message, timestamp=now),
-            )
-
-        # Append assistant response
-        if req.response:
-            await conversation_repo.append_message(
-                user.id,
-                conversation.id,
-                Message(role="assistant", content=req.response, timestamp=now),
-            )
-
-    return SaveStateResponse(preview_url=f"/api/aides/{aide_id}/preview")
+    # Serialized with WebSocket turns on this aide, here and on other replicas
+    try:
+        async with sessions.turn(user.id, str(aide_id), stored_snapshot_loader(user.id, aide_id)) as session:
+            # Build v2 snapshot from frontend state. Its sequence goes past the session's, so
+            # connected sockets are re-hydrated and other replicas reload on the NOTIFY.
+            snapshot = {
+                "entities": req.entities,
+                "meta": req.meta,
+                "relationships": [],
+                "styles": {"global": {}, "entities": {}},
+                "_sequence": session.sequence + 1,
+            }
+            title = req.meta.get("title") or aide.title
+
+            # State and conversation commit together
+            session.check_lock()
+            async with unit_of_work(user.id):
+                try:
+                    saved = await aide_repo.update_state(
+                        user.id,
+                        aide_id,
+                        snapshot,
+                        event_log=[],
+                        title=title,
+                        expected_version=req.version,
+                        replace=True,
+                    )
+                except StateConflict:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Aide was changed elsewhere. Reload and try again.",
+                    ) from None
+
+                # Save conversation history if provided
+                if req.message or req.response:
+                    from datetime import UTC, datetime
+
+                    from backend.models.conversation import Message
+
+                    # Get or create conversation for this aide
+                    conversation = await conversation_repo.get_for_aide(user.id, aide_id)
+                    if not conversation:
+                        conversation = await conversation_repo.create(user.id, aide_id, channel="web")
+
+                    now = datetime.now(UTC)
+
+                    # Append user message and assistant response together
+                    messages = [
+                        Message(role=role, content=text, timestamp=now)
+                        for role, text in (("user", req.message), ("assistant", req.response))
+                        if text
+                    ]
+                    await conversation_repo.append_messages(user.id, conversation.id, messages)
+                    if session.history is not None:
+                        session.history.invalidate()
+
+            await session.publish(snapshot, replaced=True)
+    except AdvisoryLockTimeout:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=_BUSY) from None
+    except AdvisoryLockLost:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=_UNAVAILABLE) from None
+
+    return SaveStateResponse(preview_url=f"/api/aides/{aide_id}/preview", version=saved.version if saved else None)
 
 
 @router.post("/{aide_id}/conversation", status_code=200)
@@ -285,35 +347,28 @@ async def save_conversation(
 
     from backend.models.conversation import Message
 
-    # Verify user owns this aide
-    aide = await aide_repo.get(user.id, aide_id)
-    if not aide:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
+    async with unit_of_work(user.id):
+        # Verify user owns this aide
+        aide = await aide_repo.get_summary(user.id, aide_id)
+        if not aide:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
+
+        if not req.message and not req.response:
+            return {"status": "ok"}
 
-    if not req.message and not req.response:
-        return {"status": "ok"}
-
-    # Get or create conversation for this aide
-    conversation = await conversation_repo.get_for_aide(user.id, aide_id)
-    if not conversation:
-        conversation = await conversation_repo.create(user.id, aide_id, channel="web")
-
-    now = datetime.now(UTC)
-
-    # Append user message
-    if req.message:
-        await conversation_repo.append_message(
-            user.id,
-            conversation.id,
-            Message(role="user", content=req.message, timestamp=now),
-        )
-
-    # Append assistant response
-    if req.response:
-        await conversation_repo.append_message(
-            user.id,
-            conversation.id,
-            Message(role="assistant", content=req.response, timestamp=now),
-        )
+        # Get or create conversation for this aide
+        conversation = await conversation_repo.get_for_aide(user.id, aide_id)
+        if not conversation:
+            conversation = await conversation_repo.create(user.id, aide_id, channel="web")
+
+        now = datetime.now(UTC)
+
+        # Append user message and assistant response together
+        messages = [
+            Message(role=role, content=text, timestamp=now)
+            for role, text in (("user", req.message), ("assistant", req.response))
+            if text
+        ]
+        await conversation_repo.append_messages(user.id, conversation.id, messages)
 
     return {"status": "ok"}
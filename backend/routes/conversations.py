@@ -8,17 +8,22 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from backend.auth import get_current_user
 from backend.config import settings
+from backend.db import AdvisoryLockLost, AdvisoryLockTimeout
 from backend.models.aide import CreateAideRequest, SendMessageRequest, SendMessageResponse
 from backend.models.user import User
 from backend.repos.aide_repo import AideRepo
 from backend.repos.user_repo import UserRepo
+from backend.services.aide_sessions import sessions, stored_snapshot_loader
 from backend.services.streaming_orchestrator import StreamingOrchestrator
-from engine.kernel import empty_snapshot
 
 router = APIRouter(prefix="/api", tags=["conversations"])
 aide_repo = AideRepo()
 user_repo = UserRepo()
 
+# Sent when the aide's turn can't be taken (see services/aide_sessions.py)
+_BUSY = "This aide is busy with another edit. Please try again."
+_UNAVAILABLE = "This aide can't be edited right now. Please try again."
+
 
 @router.post("/message", status_code=200)
 async def send_message(
@@ -30,6 +35,10 @@ async def send_message(
 
     If aide_id is omitted, a new aide is created from the first message.
     Returns the assistant response, rendered page URL, and updated state.
+
+    The turn runs on the aide's shared session, serialized with WebSocket
+    turns; connected sockets are re-hydrated with its result. 409 if another
+    replica keeps the aide busy past ADVISORY_LOCK_TIMEOUT_S.
     """
     # Check shadow user turn limit
     if user.is_shadow:
@@ -53,14 +62,12 @@ async def send_message(
         aide = await aide_repo.create(user.id, create_req)
         aide_id = aide.id
 
-    # Load existing aide
-    aide = await aide_repo.get(user.id, UUID(aide_id) if isinstance(aide_id, str) else aide_id)
+    # Verify user owns this aide
+    aide_uuid = UUID(aide_id) if isinstance(aide_id, str) else aide_id
+    aide = await aide_repo.get_summary(user.id, aide_uuid)
     if not aide:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
 
-    # Get snapshot (or empty if none)
-    snapshot = aide.state if aide.state and isinstance(aide.state, dict) else empty_snapshot()
-
     # Check for API key
     if not settings.ANTHROPIC_API_KEY:
         raise HTTPException(
@@ -68,40 +75,52 @@ async def send_message(
             detail="Anthropic API key not configured.",
         )
 
-    # Create streaming orchestrator
-    orchestrator = StreamingOrchestrator(
-        aide_id=str(aide_id),
-        snapshot=snapshot,
-        conversation=[],  # TODO: Load conversation history if needed
-        api_key=settings.ANTHROPIC_API_KEY,
-    )
+    # One turn at a time per aide, with its WebSocket turns, here and on other replicas
+    try:
+        async with sessions.turn(user.id, str(aide_uuid), stored_snapshot_loader(user.id, aide_uuid)) as session:
+            snapshot = session.snapshot
+
+            # Create streaming orchestrator
+            orchestrator = StreamingOrchestrator(
+                aide_id=str(aide_id),
+                snapshot=snapshot,
+                conversation=[],  # TODO: Load conversation history if needed
+                api_key=settings.ANTHROPIC_API_KEY,
+            )
 
-    # Process message and collect results
-    voice_texts: list[str] = []
-    final_snapshot = snapshot
+            # Process message and collect results
+            voice_texts: list[str] = []
+            final_snapshot = snapshot
 
-    async for result in orchestrator.process_message(req.message):
-        result_type = result.get("type")
+            async for result in orchestrator.process_message(req.message):
+                result_type = result.get("type")
 
-        if result_type == "voice":
-            text = result.get("text", "")
-            if text.strip():
-                voice_texts.append(text)
+                if result_type == "voice":
+                    text = result.get("text", "")
+                    if text.strip():
+                        voice_texts.append(text)
 
-        elif result_type == "event":
-            final_snapshot = result.get("snapshot", final_snapshot)
+                elif result_type == "event":
+                    final_snapshot = result.get("snapshot", final_snapshot)
 
-        elif result_type == "stream.end":
-            # Stream complete
-            pass
+                elif result_type == "stream.end":
+                    # Stream complete
+                    pass
+
+            # Save updated state, unless the turn applied no events, and show it to connected sockets
+            if final_snapshot.get("_sequence", 0) != snapshot.get("_sequence", 0):
+                title = final_snapshot.get("meta", {}).get("title")
+                session.check_lock()
+                await aide_repo.update_state(user.id, aide.id, final_snapshot, event_log=[], title=title)
+                await session.publish(final_snapshot)
+    except AdvisoryLockTimeout:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=_BUSY) from None
+    except AdvisoryLockLost:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=_UNAVAILABLE) from None
 
     # Combine voice texts into response
     response_text = " ".join(voice_texts) if voice_texts else "Done."
 
-    # Save updated state
-    title = final_snapshot.get("meta", {}).get("title")
-    await aide_repo.update_state(user.id, aide.id, final_snapshot, event_log=[], title=title)
-
     return SendMessageResponse(
         response_text=response_text,
         page_url=f"/api/aides/{aide_id}/preview",
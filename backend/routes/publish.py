@@ -37,7 +37,7 @@ async def publish_aide(
     # Render current state to HTML using display.js
     title = aide.state.get("meta", {}).get("title") or aide.title
     try:
-        html_content = render_html(aide.state, title=title)
+        html_content = await render_html(aide.state, title=title)
     except RuntimeError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
 
@@ -63,7 +63,7 @@ async def unpublish_aide(
 
     Does not delete the R2 object (page remains cached at CDN until TTL).
     """
-    aide = await aide_repo.get(user.id, aide_id)
+    aide = await aide_repo.get_summary(user.id, aide_id)
     if not aide:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Aide not found.")
 
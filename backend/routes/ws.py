@@ -12,7 +12,7 @@ import logging
 import re
 import time
 import uuid
-from datetime import UTC, datetime
+from contextlib import AsyncExitStack
 from typing import Any
 from uuid import UUID
 
@@ -20,13 +20,15 @@ import jwt
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from backend.config import settings
-from backend.models.conversation import Message
+from backend.db import AdvisoryLockLost, AdvisoryLockTimeout
 from backend.models.telemetry import TelemetryEvent
-from backend.repos import telemetry_repo
 from backend.repos.aide_repo import AideRepo
-from backend.repos.conversation_repo import ConversationRepo
 from backend.repos.user_repo import UserRepo
+from backend.services import hydration
+from backend.services.aide_sessions import AideSession, sessions
+from backend.services.outbound import OutboundQueue
 from backend.services.streaming_orchestrator import StreamingOrchestrator
+from backend.utils import jsonx
 from engine.kernel import apply, empty_snapshot
 
 logger = logging.getLogger(__name__)
@@ -35,7 +37,6 @@ logger = logging.getLogger(__name__)
 _UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 
 aide_repo = AideRepo()
-conversation_repo = ConversationRepo()
 user_repo = UserRepo()
 
 
@@ -61,17 +62,19 @@ def _get_user_id_from_websocket(websocket: WebSocket) -> UUID | None:
     return None
 
 
-async def _load_snapshot(user_id: UUID | None, aide_id: str) -> dict[str, Any]:
+async def _load_snapshot(user_id: UUID | None, aide_id: str, min_sequence: int = 0) -> dict[str, Any]:
     """
     Load snapshot from database for the given aide.
 
-    Returns empty_snapshot() if aide not found or user not authenticated.
+    `min_sequence` bypasses cached copies older than a sequence the caller
+    knows is stored. Returns empty_snapshot() if aide not found or user
+    not authenticated.
     """
     if not user_id or not _UUID_RE.match(aide_id):
         return empty_snapshot()
 
     try:
-        aide = await aide_repo.get(user_id, UUID(aide_id))
+        aide = await aide_repo.get(user_id, UUID(aide_id), min_sequence=min_sequence)
         if aide and aide.state:
             state = aide.state
             if isinstance(state, dict) and "entities" in state:
@@ -99,84 +102,29 @@ async def _save_snapshot(user_id: UUID | None, aide_id: str, snapshot: dict[str,
         logger.warning("ws: failed to save snapshot for aide_id=%s: %s", aide_id, e)
 
 
-async def _load_conversation(user_id: UUID | None, aide_id: str) -> tuple[list[dict[str, str]], UUID | None, int]:
+async def _load_conversation(session: AideSession) -> tuple[list[dict[str, str]], int]:
     """
-    Load conversation history for the given aide.
+    Recent conversation history for the aide's next turn.
+
+    Loaded from the database on the session's first turn, then kept in
+    memory (see services/conversation_history.py).
 
     Returns:
-        Tuple of (conversation_messages, conversation_id, turn_num)
+        Tuple of (conversation_messages, turn_num)
         - conversation_messages: List of {"role": "...", "content": "..."} dicts
-        - conversation_id: UUID of the conversation if exists, None otherwise
         - turn_num: Current turn number (based on user messages count + 1)
     """
-    if not user_id or not _UUID_RE.match(aide_id):
-        return [], None, 1
+    history = session.history
+    if history is None:
+        return [], 1
 
     try:
-        aide_uuid = UUID(aide_id)
-        conversation = await conversation_repo.get_for_aide(user_id, aide_uuid)
-        if conversation:
-            # Convert Message objects to dict format for orchestrator
-            messages = [{"role": m.role, "content": m.content} for m in conversation.messages]
-            # Turn number is count of user messages + 1
-            turn_num = sum(1 for m in conversation.messages if m.role == "user") + 1
-            logger.info(
-                "ws: loaded %d messages for aide_id=%s, turn_num=%d",
-                len(messages),
-                aide_id,
-                turn_num,
-            )
-            return messages, conversation.id, turn_num
+        await history.load()
+        return list(history.messages), history.turn_num
     except Exception as e:
-        logger.warning("ws: failed to load conversation for aide_id=%s: %s", aide_id, e)
-
-    return [], None, 1
+        logger.warning("ws: failed to load conversation for aide_id=%s: %s", session.aide_id, e)
 
-
-async def _save_conversation_messages(
-    user_id: UUID | None,
-    aide_id: str,
-    conversation_id: UUID | None,
-    user_message: str,
-    assistant_response: str,
-) -> None:
-    """
-    Save user message and assistant response to conversation.
-
-    Creates a new conversation if one doesn't exist.
-    """
-    if not user_id or not _UUID_RE.match(aide_id):
-        return
-
-    try:
-        aide_uuid = UUID(aide_id)
-        now = datetime.now(UTC)
-
-        # Get or create conversation
-        if not conversation_id:
-            conversation = await conversation_repo.create(user_id, aide_uuid, channel="web")
-            conversation_id = conversation.id
-            logger.info("ws: created conversation for aide_id=%s", aide_id)
-
-        # Append user message
-        if user_message:
-            await conversation_repo.append_message(
-                user_id,
-                conversation_id,
-                Message(role="user", content=user_message, timestamp=now),
-            )
-
-        # Append assistant response
-        if assistant_response:
-            await conversation_repo.append_message(
-                user_id,
-                conversation_id,
-                Message(role="assistant", content=assistant_response, timestamp=now),
-            )
-
-        logger.info("ws: saved conversation messages for aide_id=%s", aide_id)
-    except Exception as e:
-        logger.warning("ws: failed to save conversation for aide_id=%s: %s", aide_id, e)
+    return [], 1
 
 
 router = APIRouter(tags=["websocket"])
@@ -190,22 +138,36 @@ _META_TYPES = {"meta.update"}
 # Types that carry voice text to display in the chat
 _VOICE_TYPES = {"voice"}
 
+# Sent when another replica keeps the aide busy past ADVISORY_LOCK_TIMEOUT_S
+_BUSY = "This aide is busy with another edit. Please try again."
+_UNAVAILABLE = "This aide can't be edited right now. Please try again."
+
+
+def _make_delta(event_type: str, entity_id: str | None, snapshot: dict, seq: int | None = None) -> dict[str, Any]:
+    """
+    Build an EntityDelta payload for the given event.
 
-def _make_delta(event_type: str, entity_id: str | None, snapshot: dict) -> dict[str, Any]:
-    """Build an EntityDelta payload for the given event."""
+    seq lets a reconnecting client resume from the last delta it applied, so
+    it must be the sequence right after this event (default: the snapshot's).
+    The entity data may be newer than that when `snapshot` is the end of a
+    burst; resuming from an earlier seq only resends it.
+    """
+    if seq is None:
+        seq = snapshot.get("_sequence", 0)
     if event_type == "entity.remove":
-        return {"type": "entity.remove", "id": entity_id, "data": None}
+        return {"type": "entity.remove", "id": entity_id, "data": None, "seq": seq}
 
     if entity_id and entity_id in snapshot.get("entities", {}):
         entity_data = snapshot["entities"][entity_id]
-        return {"type": event_type, "id": entity_id, "data": entity_data}
+        return {"type": event_type, "id": entity_id, "data": entity_data, "seq": seq}
 
     # Fallback: send the event type with no data (client will ignore gracefully)
-    return {"type": event_type, "id": entity_id, "data": None}
+    return {"type": event_type, "id": entity_id, "data": None, "seq": seq}
 
 
 async def _handle_direct_edit(
-    websocket: WebSocket,
+    outbox: OutboundQueue,
+    session: AideSession,
     user_id: UUID | None,
     aide_id: str,
     snapshot: dict[str, Any],
@@ -216,9 +178,12 @@ async def _handle_direct_edit(
 
     Protocol:
       Client sends: {"type": "direct_edit", "entity_id": "...", "field": "...", "value": "..."}
-      Server applies entity.update through reducer and broadcasts delta.
+      Server applies entity.update through reducer and broadcasts delta to
+      every socket on the aide. Errors go to the requesting socket only.
 
-    Returns the (possibly updated) snapshot.
+    Must be called inside session.turn(write_behind=True); the snapshot is
+    saved by the session's write-behind flush. Returns the (possibly updated)
+    snapshot.
     """
     start_ms = time.monotonic()
 
@@ -228,15 +193,13 @@ async def _handle_direct_edit(
 
     if not entity_id or not field:
         logger.warning("ws: direct_edit missing entity_id or field")
-        await websocket.send_text(
-            json.dumps({"type": "direct_edit.error", "error": "entity_id and field are required"})
-        )
+        await outbox.send_control({"type": "direct_edit.error", "error": "entity_id and field are required"})
         return snapshot
 
     # Validate entity exists in current snapshot
     if entity_id not in snapshot.get("entities", {}):
         logger.warning("ws: direct_edit entity_id not found: %s", entity_id)
-        await websocket.send_text(json.dumps({"type": "direct_edit.error", "error": f"Entity '{entity_id}' not found"}))
+        await outbox.send_control({"type": "direct_edit.error", "error": f"Entity '{entity_id}' not found"})
         return snapshot
 
     # Build entity.update event (v2 format: short keys; uses "ref" not "id")
@@ -251,17 +214,15 @@ async def _handle_direct_edit(
             field,
             result.reason,
         )
-        await websocket.send_text(
-            json.dumps({"type": "direct_edit.error", "error": result.reason or "Reducer rejected edit"})
-        )
+        await outbox.send_control({"type": "direct_edit.error", "error": result.reason or "Reducer rejected edit"})
         return snapshot
 
     snapshot = result.snapshot
     latency_ms = int((time.monotonic() - start_ms) * 1000)
 
-    # Broadcast the delta back to the client
+    # Broadcast the delta to every client on this aide
     delta = _make_delta("entity.update", entity_id, snapshot)
-    await websocket.send_text(json.dumps(delta))
+    await session.broadcast(delta)
 
     logger.info(
         "ws: direct_edit applied aide_id=%s entity_id=%s field=%s latency=%dms",
@@ -271,21 +232,12 @@ async def _handle_direct_edit(
         latency_ms,
     )
 
-    # Persist the updated snapshot
-    await _save_snapshot(user_id, aide_id, snapshot)
-
-    # Record telemetry (best-effort — don't fail the edit if telemetry fails)
-    try:
-        # aide_id may be 'new' for unauthenticated Phase 1 sessions; skip telemetry
-        if _UUID_RE.match(aide_id):
-            event_record = TelemetryEvent(
-                aide_id=UUID(aide_id),
-                event_type="direct_edit",
-                edit_latency_ms=latency_ms,
-            )
-            await telemetry_repo.record_event(event_record)
-    except Exception:
-        logger.debug("ws: telemetry record failed (non-fatal)", exc_info=True)
+    # Persist write-behind: a burst of edits becomes one save and one telemetry insert.
+    # aide_id may be 'new' for unauthenticated Phase 1 sessions; skip telemetry
+    event_record = None
+    if _UUID_RE.match(aide_id):
+        event_record = TelemetryEvent(aide_id=UUID(aide_id), event_type="direct_edit", edit_latency_ms=latency_ms)
+    session.write_behind(lambda latest: _save_snapshot(user_id, aide_id, latest), event_record)
 
     return snapshot
 
@@ -301,35 +253,52 @@ async def aide_websocket(websocket: WebSocket, aide_id: str) -> None:
                         {"type": "set_profile", "profile": "realistic_l3"}
       Server → Client:  EntityDelta | VoiceDelta | StreamStatus
 
+    Connect with ?hydrate=1 to receive the initial snapshot as bulk
+    `snapshot` frames (gzip binary when large) instead of one entity.create
+    per entity; add &since=<seq> on reconnect to receive only what changed
+    after the last `seq` seen. See services/hydration.py.
+
     Loads existing snapshot from database on connection.
     Persists updated snapshot after each stream.end.
+
+    Sockets on the same aide share one AideSession: turns and direct edits
+    are serialized and entity deltas reach every connected tab.
+
+    Everything sent to the client goes through the connection's bounded
+    OutboundQueue. A client that falls too far behind has its pending
+    deltas replaced by a fresh hydration, or is disconnected (1013).
     """
     await websocket.accept()
     logger.info("WebSocket accepted: aide_id=%s", aide_id)
+    outbox = OutboundQueue(websocket)
 
     # Get user_id from session cookie for DB access
     user_id = _get_user_id_from_websocket(websocket)
+    hydration_version = hydration.parse_version(websocket.query_params.get("hydrate"))
+    # Resuming needs the bulk protocol: legacy clients replace their store on every hydration
+    since = hydration.parse_since(websocket.query_params.get("since")) if hydration_version else None
 
-    # Load existing snapshot from database (or start empty for new aides)
-    snapshot: dict[str, Any] = await _load_snapshot(user_id, aide_id)
-
-    # Send existing entities to client on connection (hydrate client state)
-    entities = snapshot.get("entities", {})
-    if entities:
-        # Send snapshot.start to signal hydration beginning
-        await websocket.send_text(json.dumps({"type": "snapshot.start"}))
-        # Send each entity as entity.create, sorted by _created_seq
-        sorted_entities = sorted(entities.items(), key=lambda x: x[1].get("_created_seq", 0))
-        for entity_id, entity_data in sorted_entities:
-            delta = {"type": "entity.create", "id": entity_id, "data": entity_data}
-            await websocket.send_text(json.dumps(delta))
-        # Send meta if present
-        meta = snapshot.get("meta", {})
-        if meta:
-            await websocket.send_text(json.dumps({"type": "meta.update", "data": meta}))
-        # Send snapshot.end to signal hydration complete
-        await websocket.send_text(json.dumps({"type": "snapshot.end"}))
-        logger.info("ws: hydrated %d entities for aide_id=%s", len(entities), aide_id)
+    # Join the aide's shared session; the first socket loads the snapshot, every socket is hydrated
+    session = await sessions.join(
+        outbox,
+        aide_id,
+        loader=lambda min_sequence=0: _load_snapshot(user_id, aide_id, min_sequence),
+        user_id=user_id,
+        shared=bool(user_id and _UUID_RE.match(aide_id)),
+        hydration=hydration_version,
+        since=since,
+    )
+
+    def resync(delivered_seq: int | None) -> tuple[list[str | bytes], int]:
+        """Hydration frames replacing the deltas dropped from this socket's overflowing queue."""
+        if session.loaded:
+            current, resume = session.snapshot, delivered_seq
+        else:
+            current, resume = {"_sequence": since, "entities": {}}, since
+        return hydration.encode_hydration(current, hydration_version, since=resume), current.get("_sequence", 0)
+
+    outbox.resync = resync
+    outbox.start()
 
     interrupt_requested = False
     current_message_id: str | None = None
@@ -338,7 +307,7 @@ async def aide_websocket(websocket: WebSocket, aide_id: str) -> None:
         while True:
             raw = await websocket.receive_text()
             try:
-                msg = json.loads(raw)
+                msg = jsonx.loads(raw)
             except json.JSONDecodeError:
                 logger.warning("ws: malformed message from client: %r", raw[:200])
                 continue
@@ -349,15 +318,29 @@ async def aide_websocket(websocket: WebSocket, aide_id: str) -> None:
             if msg_type == "interrupt":
                 interrupt_requested = True
                 if current_message_id:
-                    await websocket.send_text(
-                        json.dumps({"type": "stream.interrupted", "message_id": current_message_id})
-                    )
+                    await outbox.send_control({"type": "stream.interrupted", "message_id": current_message_id})
                     logger.info("ws: interrupt requested for message_id=%s", current_message_id)
                 continue
 
             # ── direct_edit ──────────────────────────────────────────
             if msg_type == "direct_edit":
-                snapshot = await _handle_direct_edit(websocket, user_id, aide_id, snapshot, msg)
+                try:
+                    async with AsyncExitStack() as turn:
+                        try:
+                            await turn.enter_async_context(session.turn(write_behind=True))
+                        except AdvisoryLockTimeout:
+                            await outbox.send_control({"type": "direct_edit.error", "error": _BUSY})
+                            continue
+                        except Exception as e:
+                            logger.error("ws: direct_edit could not lock aide_id=%s: %s", aide_id, e)
+                            await outbox.send_control({"type": "direct_edit.error", "error": _UNAVAILABLE})
+                            continue
+                        session.snapshot = await _handle_direct_edit(
+                            outbox, session, user_id, aide_id, session.snapshot, msg
+                        )
+                except AdvisoryLockLost:
+                    logger.warning("ws: direct_edit lost the aide lock aide_id=%s", aide_id)
+                    await outbox.send_control({"type": "direct_edit.error", "error": _UNAVAILABLE})
                 continue
 
             if msg_type != "message":
@@ -372,128 +355,167 @@ async def aide_websocket(websocket: WebSocket, aide_id: str) -> None:
             if user_id:
                 usage = await user_repo.get_shadow_turn_count(user_id)
                 if usage and usage["limit_reached"]:
-                    await websocket.send_text(
-                        json.dumps(
-                            {
-                                "type": "stream.error",
-                                "error": "TURN_LIMIT_REACHED",
-                                "message": "Trial limit reached. Sign up to continue.",
-                                "turn_count": usage["turn_count"],
-                                "turn_limit": usage["turn_limit"],
-                            }
-                        )
+                    await outbox.send_control(
+                        {
+                            "type": "stream.error",
+                            "error": "TURN_LIMIT_REACHED",
+                            "message": "Trial limit reached. Sign up to continue.",
+                            "turn_count": usage["turn_count"],
+                            "turn_limit": usage["turn_limit"],
+                        }
                     )
-                    await websocket.send_text(json.dumps({"type": "stream.end", "message_id": message_id}))
+                    await outbox.send_control({"type": "stream.end", "message_id": message_id})
                     continue
 
-            # --- stream.start ---
-            await websocket.send_text(json.dumps({"type": "stream.start", "message_id": message_id}))
+            # One turn at a time per aide, across all of its sockets
+            try:
+                async with AsyncExitStack() as turn:
+                    try:
+                        await turn.enter_async_context(session.turn())
+                    except AdvisoryLockTimeout:
+                        await outbox.send_control({"type": "stream.error", "error": _BUSY})
+                        await outbox.send_control({"type": "stream.end", "message_id": message_id})
+                        continue
+                    except Exception as e:
+                        logger.error("ws: turn could not lock aide_id=%s: %s", aide_id, e)
+                        await outbox.send_control({"type": "stream.error", "error": _UNAVAILABLE})
+                        await outbox.send_control({"type": "stream.end", "message_id": message_id})
+                        continue
 
-            ttfc: float | None = None
-            start_time = time.monotonic()
+                    # Sequence before this turn; a turn that applies no events (a pure question) isn't saved
+                    turn_start_seq = session.sequence
 
-            # Load conversation history
-            conversation_history, conversation_id, turn_num = await _load_conversation(user_id, aide_id)
+                    # --- stream.start ---
+                    await outbox.send_control({"type": "stream.start", "message_id": message_id})
 
-            # Collect voice text during streaming for conversation history
-            voice_texts: list[str] = []
+                    ttfc: float | None = None
+                    start_time = time.monotonic()
 
-            # Check for API key - required for LLM streaming
-            if not settings.ANTHROPIC_API_KEY:
-                await websocket.send_text(json.dumps({"type": "stream.error", "error": "API key not configured"}))
-                await websocket.send_text(json.dumps({"type": "stream.end", "message_id": message_id}))
-                continue
+                    # Load conversation history
+                    conversation_history, turn_num = await _load_conversation(session)
 
-            try:
-                orchestrator = StreamingOrchestrator(
-                    aide_id=aide_id,
-                    snapshot=snapshot,
-                    conversation=conversation_history,
-                    api_key=settings.ANTHROPIC_API_KEY,
-                    user_id=user_id,
-                    turn_num=turn_num,
-                )
-
-                async for result in orchestrator.process_message(content):
-                    # Check for interrupt request
-                    if interrupt_requested:
-                        logger.info("ws: stream interrupted message_id=%s", message_id)
-                        break
-
-                    result_type = result.get("type")
-
-                    # Classification metadata
-                    if result_type == "meta.classification":
-                        logger.info(
-                            "ws: tier=%s model=%s reason=%s",
-                            result.get("tier"),
-                            result.get("model"),
-                            result.get("reason"),
-                        )
-                        continue
+                    # Collect voice text during streaming for conversation history
+                    voice_texts: list[str] = []
 
-                    # Voice events
-                    if result_type == "voice":
-                        voice_text = result.get("text", "")
-                        voice_texts.append(voice_text)
-                        await websocket.send_text(json.dumps({"type": "voice", "text": voice_text}))
+                    # Check for API key - required for LLM streaming
+                    if not settings.ANTHROPIC_API_KEY:
+                        await outbox.send_control({"type": "stream.error", "error": "API key not configured"})
+                        await outbox.send_control({"type": "stream.end", "message_id": message_id})
                         continue
 
-                    # Event processed
-                    if result_type == "event":
-                        event = result.get("event", {})
-                        snapshot = result.get("snapshot", snapshot)
-                        event_type = event.get("t", "")
-
-                        if ttfc is None:
-                            ttfc = (time.monotonic() - start_time) * 1000
-
-                        if event_type in _ENTITY_TYPES:
-                            entity_id = event.get("id") or event.get("ref")
-                            delta = _make_delta(event_type, entity_id, snapshot)
-                            await websocket.send_text(json.dumps(delta))
-                        elif event_type in _META_TYPES:
-                            # Send meta update to client
-                            meta = snapshot.get("meta", {})
-                            await websocket.send_text(json.dumps({"type": "meta.update", "data": meta}))
-                        continue
+                    try:
+                        orchestrator = StreamingOrchestrator(
+                            aide_id=aide_id,
+                            snapshot=session.snapshot,
+                            conversation=conversation_history,
+                            api_key=settings.ANTHROPIC_API_KEY,
+                            user_id=user_id,
+                            turn_num=turn_num,
+                        )
 
-                    # Rejection
-                    if result_type == "rejection":
-                        logger.debug("ws: event rejected reason=%s", result.get("reason"))
+                        async for result in orchestrator.process_message(content):
+                            # Check for interrupt request
+                            if interrupt_requested:
+                                logger.info("ws: stream interrupted message_id=%s", message_id)
+                                break
+
+                            result_type = result.get("type")
+
+                            # Classification metadata
+                            if result_type == "meta.classification":
+                                logger.info(
+                                    "ws: tier=%s model=%s reason=%s",
+                                    result.get("tier"),
+                                    result.get("model"),
+                                    result.get("reason"),
+                                )
+                                continue
+
+                            # Voice events
+                            if result_type == "voice":
+                                voice_text = result.get("text", "")
+                                voice_texts.append(voice_text)
+                                await outbox.send_control({"type": "voice", "text": voice_text})
+                                continue
+
+                            # Event processed
+                            if result_type == "event":
+                                event = result.get("event", {})
+                                session.snapshot = result.get("snapshot", session.snapshot)
+                                event_type = event.get("t", "")
+
+                                if ttfc is None:
+                                    ttfc = (time.monotonic() - start_time) * 1000
+
+                                # Sequence right after this event, not the end of the burst
+                                seq = result.get("seq", session.snapshot.get("_sequence", 0))
+
+                                if event_type in _ENTITY_TYPES:
+                                    entity_id = event.get("id") or event.get("ref")
+                                    delta = _make_delta(event_type, entity_id, session.snapshot, seq=seq)
+                                    await session.broadcast(delta)
+                                elif event_type in _META_TYPES:
+                                    # Send meta update to every client on this aide
+                                    meta = session.snapshot.get("meta", {})
+                                    await session.broadcast({"type": "meta.update", "data": meta, "seq": seq})
+                                continue
+
+                            # Rejection
+                            if result_type == "rejection":
+                                logger.debug("ws: event rejected reason=%s", result.get("reason"))
+                                continue
+
+                    except Exception as e:
+                        # Log the error and send error message to client
+                        logger.error("ws: LLM streaming failed: %s", e)
+                        try:
+                            error_msg = "Anthropic API is temporarily unavailable. Please try again."
+                            await outbox.send_control({"type": "stream.error", "error": error_msg})
+                        except RuntimeError:
+                            pass
                         continue
 
-            except Exception as e:
-                # Log the error and send error message to client
-                logger.error("ws: LLM streaming failed: %s", e)
-                try:
-                    error_msg = "Anthropic API is temporarily unavailable. Please try again."
-                    await websocket.send_text(json.dumps({"type": "stream.error", "error": error_msg}))
-                except RuntimeError:
-                    pass
-                continue
-
-            ttc = (time.monotonic() - start_time) * 1000
-            logger.info(
-                "ws: turn complete aide_id=%s message_id=%s ttfc=%.0fms ttc=%.0fms interrupted=%s",
-                aide_id,
-                message_id,
-                ttfc or 0,
-                ttc,
-                interrupt_requested,
-            )
-
-            # --- stream.end ---
-            if not interrupt_requested:
-                # Persist snapshot to database and R2
-                await _save_snapshot(user_id, aide_id, snapshot)
-
-                # Save conversation history (user message + assistant response)
-                assistant_response = " ".join(voice_texts) if voice_texts else ""
-                await _save_conversation_messages(user_id, aide_id, conversation_id, content, assistant_response)
+                    ttc = (time.monotonic() - start_time) * 1000
+                    logger.info(
+                        "ws: turn complete aide_id=%s message_id=%s ttfc=%.0fms ttc=%.0fms interrupted=%s",
+                        aide_id,
+                        message_id,
+                        ttfc or 0,
+                        ttc,
+                        interrupt_requested,
+                    )
 
-                await websocket.send_text(json.dumps({"type": "stream.end", "message_id": message_id}))
-            current_message_id = None
+                    # --- stream.end ---
+                    if not interrupt_requested:
+                        # Persist snapshot to database and R2
+                        if session.sequence != turn_start_seq:
+                            # Never persist outside the cross-replica lock
+                            session.check_lock()
+                            await _save_snapshot(user_id, aide_id, session.snapshot)
+
+                        # Save conversation history (user message + assistant response)
+                        assistant_response = " ".join(voice_texts) if voice_texts else ""
+                        # Stored in the background; turn() waits for it before releasing the aide
+                        if session.history is not None:
+                            session.history.append(content, assistant_response)
+
+                        await outbox.send_control({"type": "stream.end", "message_id": message_id})
+                    current_message_id = None
+            except AdvisoryLockLost:
+                # The lock connection dropped mid-turn; the turn's changes were not saved
+                logger.warning("ws: turn lost the aide lock aide_id=%s message_id=%s", aide_id, message_id)
+                await outbox.send_control({"type": "stream.error", "error": _UNAVAILABLE})
+                await outbox.send_control({"type": "stream.end", "message_id": message_id})
+                current_message_id = None
 
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected: aide_id=%s", aide_id)
+    finally:
+        try:
+            await outbox.close()
+            # Don't leave this socket's edits waiting on a timer
+            await session.flush()
+        except Exception as e:
+            logger.error("ws: final flush failed aide_id=%s: %s", aide_id, e)
+        finally:
+            sessions.leave(session, outbox)
@@ -0,0 +1,543 @@
+"""
+Per-aide sessions shared by every WebSocket on the same aide.
+
+Each /ws/aide/{aide_id} connection used to load its own snapshot, so two
+tabs on one aide overwrote each other's saves wholesale. Connections for the
+same (user, aide) now join one AideSession, which:
+
+- holds the single authoritative in-memory snapshot,
+- serializes LLM turns and direct edits through `AideSession.turn()`,
+- fans entity deltas out to every connected socket, through each
+  connection's bounded OutboundQueue so a slow client never stalls a turn,
+- keeps the recent conversation history in memory for persisted aides
+  (services/conversation_history.py).
+
+Across replicas, `turn()` also holds a Postgres advisory lock on the aide and
+reloads the snapshot first if the stored `_sequence` has moved past ours. A
+turn that cannot take the lock does not run, and one whose lock was lost
+(the lock connection dropped) fails instead of saving.
+Every save NOTIFYs `aide_cache` from AideRepo with the stored `_sequence`;
+the registry hears it through the snapshot cache's listener
+(repos/snapshot_cache.py) and re-hydrates local sockets whose session is
+behind.
+
+A reconnecting client that sends the last sequence it saw is resumed
+rather than re-hydrated. If nothing is loaded yet and the stored
+`_sequence` still matches, the session defers loading the snapshot until
+the first turn (or a change from another replica), so a reconnect storm
+after a deploy costs one scalar query per aide instead of a full state read.
+
+Direct edits are persisted write-behind: `write_behind()` marks the
+snapshot dirty and one flush saves it (and queues the edits' telemetry
+for telemetry_sink) DIRECT_EDIT_FLUSH_MS after the first edit. Until then the
+session keeps the cross-replica advisory lock, so no other replica can
+load the stale stored state. Pending edits are flushed before any LLM
+turn starts, when a socket disconnects and on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any
+from uuid import UUID
+
+from backend import db
+from backend.config import settings
+from backend.models.telemetry import TelemetryEvent
+from backend.repos.aide_repo import AideRepo
+from backend.repos.snapshot_cache import snapshot_cache
+from backend.services.conversation_history import ConversationHistory
+from backend.services.hydration import encode_hydration, send_encoded
+from backend.services.outbound import OutboundQueue, supersede_key
+from backend.services.telemetry_sink import telemetry_sink
+from backend.utils import jsonx
+from engine.kernel import empty_snapshot
+
+logger = logging.getLogger(__name__)
+
+aide_repo = AideRepo()
+
+SnapshotLoader = Callable[[int], Awaitable[dict[str, Any]]]
+SnapshotSaver = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+def stored_snapshot_loader(user_id: UUID, aide_id: UUID) -> SnapshotLoader:
+    """Loader for AideSessionRegistry.turn(): the aide's stored state, or empty_snapshot() if it has none."""
+
+    async def load(min_sequence: int = 0) -> dict[str, Any]:
+        aide = await aide_repo.get(user_id, aide_id, min_sequence=min_sequence)
+        state = aide.state if aide else None
+        return state if isinstance(state, dict) and "entities" in state else empty_snapshot()
+
+    return load
+
+
+class AideSession:
+    """Shared state for every socket connected to one aide in this process."""
+
+    def __init__(
+        self,
+        aide_id: str,
+        loader: SnapshotLoader,
+        user_id: UUID | None = None,
+        coordinated: bool = False,
+    ) -> None:
+        """
+        Args:
+            aide_id: Aide identifier from the WebSocket path
+            loader: Loads the stored snapshot (empty_snapshot() if none), given
+                the lowest _sequence a cached copy may have
+            user_id: Owner the session loads and saves as
+            coordinated: Persisted aide — take the advisory lock and NOTIFY other replicas
+        """
+        self.aide_id = aide_id
+        self.user_id = user_id
+        self.coordinated = coordinated
+        self.snapshot: dict[str, Any] = empty_snapshot()
+        # Each connection's outbound queue (services/outbound.py); sends never block on a slow client
+        self.sockets: set[OutboundQueue] = set()
+        # Hydration protocol version each socket asked for (see services/hydration.py)
+        self.hydration: dict[OutboundQueue, int] = {}
+        # Recent messages for LLM turns; None for unshared sessions, which keep no history
+        self.history: ConversationHistory | None = (
+            ConversationHistory(user_id, UUID(aide_id)) if coordinated and user_id is not None else None
+        )
+        self._loader = loader
+        self._loaded = False
+        # Sequence the connected clients hold while loading is deferred (see defer_load)
+        self._resume_seq: int | None = None
+        self._lock = asyncio.Lock()
+        # Write-behind state for direct edits (see write_behind)
+        self._pending_save: SnapshotSaver | None = None
+        self._pending_events: list[TelemetryEvent] = []
+        self._flush_task: asyncio.Task | None = None
+        self._held_lock: AsyncExitStack | None = None
+        # Cross-replica lock while a turn or pending edits hold it
+        self._lease: db.AdvisoryLease | None = None
+        # Connections between join() and attach(); keeps the registry from dropping the session
+        self._joining = 0
+
+    @property
+    def busy(self) -> bool:
+        """True while a turn or direct edit holds the session."""
+        return self._lock.locked()
+
+    @property
+    def dirty(self) -> bool:
+        """True while a write-behind save is pending."""
+        return self._pending_save is not None
+
+    @property
+    def loaded(self) -> bool:
+        """False while loading is deferred for resumed clients; `snapshot` is then empty."""
+        return self._loaded
+
+    @property
+    def sequence(self) -> int:
+        """Sequence of the state the session's clients hold."""
+        if not self._loaded and self._resume_seq is not None:
+            return self._resume_seq
+        return self.snapshot.get("_sequence", 0)
+
+    async def ensure_loaded(self) -> None:
+        """Load the stored snapshot once; concurrent joiners wait for the first load."""
+        # Already loaded: don't queue behind a running turn just to find that out
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self._load()
+
+    async def defer_load(self, since: int) -> bool:
+        """
+        Skip loading for a client resuming at `since` if the store is still there.
+
+        Returns:
+            True if the client is up to date and the snapshot stays unloaded
+            until it is needed; False if the caller should ensure_loaded()
+        """
+        if self._loaded or not self.coordinated or self.user_id is None:
+            return False
+        if self._resume_seq is not None:
+            return self._resume_seq == since
+        try:
+            stored = await aide_repo.get_sequence(self.user_id, UUID(self.aide_id))
+        except Exception as e:
+            logger.warning("aide_sessions: sequence check failed aide_id=%s: %s", self.aide_id, e)
+            return False
+        # Another joiner or a turn may have loaded while we waited
+        if stored != since or self._loaded or self._resume_seq not in (None, since):
+            return False
+        self._resume_seq = since
+        return True
+
+    async def attach(self, websocket: OutboundQueue, hydration: int = 0, since: int | None = None) -> int:
+        """
+        Queue the socket's initial hydration, then start sending it deltas.
+
+        Both happen without yielding to the event loop (OutboundQueue sends
+        only enqueue), so the socket sees exactly the deltas that come
+        after the state it was hydrated with, even mid-turn.
+
+        Args:
+            websocket: Outbound queue of the accepted WebSocket
+            hydration: Hydration protocol version the socket speaks
+            since: Last sequence a reconnecting client saw
+
+        Returns:
+            Number of hydration frames queued
+        """
+        if self._loaded:
+            snapshot = self.snapshot
+        else:
+            # Resumed without loading: the store is still at the client's sequence
+            snapshot = {"_sequence": since, "entities": {}}
+        frames: list[str | bytes] = []
+        if snapshot.get("entities") or since is not None:
+            frames = encode_hydration(snapshot, hydration, since=since)
+            await send_encoded(websocket, frames)
+        self.sockets.add(websocket)
+        self.hydration[websocket] = hydration
+        return len(frames)
+
+    async def catch_up(self) -> None:
+        """Reload if the store moved past us while this replica could not hear NOTIFYs."""
+        if not self.coordinated:
+            return
+        async with self._lock:
+            try:
+                await self._reload_if_behind()
+            except Exception as e:
+                logger.warning("aide_sessions: catch-up failed aide_id=%s: %s", self.aide_id, e)
+
+    async def broadcast(self, payload: dict[str, Any]) -> None:
+        """Queue a frame for every connected socket, dropping sockets that have gone away or fallen behind."""
+        text = jsonx.dumps(payload)
+        key, seq = supersede_key(payload), payload.get("seq")
+        for websocket in list(self.sockets):
+            try:
+                await websocket.send_text(text, key=key, seq=seq)
+            except Exception:
+                # Disconnected mid-send; its handler calls leave() on its way out
+                logger.debug("aide_sessions: dropping dead socket aide_id=%s", self.aide_id, exc_info=True)
+                self.sockets.discard(websocket)
+
+    @asynccontextmanager
+    async def turn(self, write_behind: bool = False) -> AsyncIterator[None]:
+        """
+        Serialize a turn or direct edit on this aide.
+
+        Callers read and replace `self.snapshot` inside the block and
+        persist it through AideRepo, calling check_lock() first. For
+        coordinated sessions the turn never runs without the advisory lock:
+        failing to take it raises, and losing it (the lock connection
+        dropped) raises db.AdvisoryLockLost from check_lock() or on exit.
+
+        Args:
+            write_behind: Direct edit that persists via write_behind(). Other
+                turns first flush pending edits so they are durable before
+                anything the turn saves.
+
+        Raises:
+            db.AdvisoryLockTimeout: Another replica kept the aide busy for
+                longer than ADVISORY_LOCK_TIMEOUT_S
+            db.AdvisoryLockLost: The lock was released while the turn ran
+        """
+        async with self._lock:
+            if not self._loaded:
+                await self._load()
+            if not write_behind:
+                await self._flush_pending()
+            try:
+                async with AsyncExitStack() as stack:
+                    # While edits are pending we already hold the advisory lock
+                    if self.coordinated and self._held_lock is None:
+                        self._lease = await stack.enter_async_context(db.advisory_lock(f"aide:{self.aide_id}"))
+                        await self._reload_if_behind()
+                    try:
+                        yield
+                    finally:
+                        # The next turn, here or on another replica, must see this turn's messages
+                        if self.history is not None:
+                            await self.history.flush()
+                    if self._pending_save is not None and self._held_lock is None:
+                        # Keep other replicas out until the pending edits are stored
+                        self._held_lock = stack.pop_all()
+            finally:
+                if self._held_lock is None:
+                    self._lease = None
+
+    def check_lock(self) -> None:
+        """
+        Confirm the cross-replica lock is still held; call before persisting inside turn().
+
+        Raises:
+            db.AdvisoryLockLost: The lock connection dropped since the turn took the lock
+        """
+        if self._lease is not None:
+            self._lease.check()
+
+    def write_behind(self, save: SnapshotSaver, event: TelemetryEvent | None = None) -> None:
+        """
+        Persist `self.snapshot` shortly instead of now. Call inside turn(write_behind=True).
+
+        Edits arriving before the flush are coalesced into one save of the
+        latest snapshot; their telemetry is queued with telemetry_sink at the flush.
+
+        Args:
+            save: Saves a snapshot to the store; the latest one is used
+            event: Telemetry row to record with the flush
+        """
+        self._pending_save = save
+        if event is not None:
+            self._pending_events.append(event)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(settings.DIRECT_EDIT_FLUSH_MS / 1000))
+
+    async def flush(self) -> None:
+        """Persist pending write-behind edits now (disconnect, shutdown)."""
+        if self.dirty:
+            async with self._lock:
+                await self._flush_pending()
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        async with self._lock:
+            try:
+                await self._flush_pending()
+            except Exception as e:
+                logger.error("aide_sessions: write-behind flush failed aide_id=%s: %s", self.aide_id, e)
+
+    async def _flush_pending(self) -> None:
+        """Save the snapshot, release the held advisory lock and queue telemetry. Hold self._lock."""
+        save, events = self._pending_save, self._pending_events
+        self._pending_save, self._pending_events = None, []
+        task, self._flush_task = self._flush_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        try:
+            if save is not None:
+                self.check_lock()
+                await save(self.snapshot)
+        finally:
+            held, self._held_lock = self._held_lock, None
+            self._lease = None
+            if held is not None:
+                await held.aclose()
+        telemetry_sink.add_events(events)
+
+    async def refresh(self, seq: int) -> None:
+        """Re-hydrate from the database after another replica saved up to `seq`."""
+        async with self._lock:
+            if seq > self.sequence:
+                await self._load(min_sequence=seq)
+
+    async def _reload_if_behind(self) -> None:
+        if self.user_id is None:
+            return
+        stored = await aide_repo.get_sequence(self.user_id, UUID(self.aide_id))
+        # Only move forward: an interrupted, unsaved turn may leave us ahead of the store
+        if stored is not None and stored > self.sequence:
+            await self._load(min_sequence=stored)
+
+    async def _load(self, min_sequence: int = 0) -> None:
+        """(Re)load the stored snapshot and catch already-hydrated sockets up to it."""
+        previous = self.snapshot.get("_sequence", 0) if self._loaded else self._resume_seq
+        # Deferred clients already hold _resume_seq, so no cached copy older than that will do
+        self.snapshot = await self._loader(max(min_sequence, previous or 0))
+        self._loaded = True
+        self._resume_seq = None
+        if previous is None or self.snapshot.get("_sequence", 0) == previous:
+            return
+        if self.history is not None:
+            # Whoever changed the aide may also have added to its conversation
+            self.history.invalidate()
+        logger.info("aide_sessions: reloaded aide_id=%s seq=%s", self.aide_id, self.snapshot.get("_sequence"))
+        await self._rehydrate(previous)
+
+    async def publish(self, snapshot: dict[str, Any], replaced: bool = False) -> None:
+        """
+        Adopt a snapshot a socketless turn just saved, and catch connected sockets up to it.
+
+        Call inside turn(), after the save (see AideSessionRegistry.turn).
+
+        Args:
+            snapshot: The saved snapshot
+            replaced: Built outside the kernel, so its entities carry no
+                sequence stamps; sockets get a full hydration, not a delta
+        """
+        previous = self.sequence
+        self.snapshot = snapshot
+        if snapshot.get("_sequence", 0) != previous:
+            await self._rehydrate(None if replaced else previous)
+
+    async def _rehydrate(self, previous: int | None) -> None:
+        """Send every socket the state changed since `previous` (everything if None)."""
+        encoded: dict[int, list[str | bytes]] = {}
+        for websocket in list(self.sockets):
+            version = self.hydration.get(websocket, 0)
+            if version not in encoded:
+                encoded[version] = encode_hydration(self.snapshot, version, since=previous)
+            try:
+                await send_encoded(websocket, encoded[version])
+            except Exception:
+                logger.debug("aide_sessions: dropping dead socket aide_id=%s", self.aide_id, exc_info=True)
+                self.sockets.discard(websocket)
+
+
+class AideSessionRegistry:
+    """Process-wide map of live sessions, refreshed from committed writes on any replica."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[tuple[UUID, str], AideSession] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def join(
+        self,
+        websocket: OutboundQueue,
+        aide_id: str,
+        loader: SnapshotLoader,
+        user_id: UUID | None = None,
+        shared: bool = False,
+        hydration: int = 0,
+        since: int | None = None,
+    ) -> AideSession:
+        """
+        Attach a socket to the aide's session, loading it if needed, and queue its hydration.
+
+        Args:
+            websocket: Outbound queue of the accepted WebSocket
+            aide_id: Aide identifier from the path
+            loader: Loads the stored snapshot for a new session
+            user_id: Authenticated user
+            shared: Persisted aide owned by user_id. Unshared sessions are
+                private to the socket (unauthenticated or placeholder aides).
+            hydration: Hydration protocol version the socket speaks, used
+                when a reload re-hydrates it
+            since: Last sequence a reconnecting client saw; lets a shared
+                session skip loading while the store is still at it
+
+        Returns:
+            The session, with its snapshot loaded unless defer_load() applied.
+            The socket receives deltas only from here on, after its hydration.
+        """
+        if shared and user_id is not None:
+            key = (user_id, aide_id)
+            session = self._sessions.get(key)
+            if session is None:
+                session = AideSession(aide_id, loader, user_id=user_id, coordinated=True)
+                self._sessions[key] = session
+        else:
+            session = AideSession(aide_id, loader, user_id=user_id)
+        session._joining += 1
+        try:
+            if since is None or not await session.defer_load(since):
+                await session.ensure_loaded()
+            frames = await session.attach(websocket, hydration, since)
+        finally:
+            session._joining -= 1
+            self._release(session)
+        if frames:
+            logger.info(
+                "aide_sessions: hydrated aide_id=%s v%d since=%s seq=%s frames=%d",
+                aide_id,
+                hydration,
+                since,
+                session.sequence,
+                frames,
+            )
+        return session
+
+    def leave(self, session: AideSession, websocket: OutboundQueue) -> None:
+        """Detach a socket; the session is dropped with its last socket."""
+        session.sockets.discard(websocket)
+        session.hydration.pop(websocket, None)
+        self._release(session)
+
+    def _release(self, session: AideSession) -> None:
+        if session.sockets or session._joining or session.user_id is None:
+            return
+        key = (session.user_id, session.aide_id)
+        if self._sessions.get(key) is session:
+            del self._sessions[key]
+
+    def get(self, user_id: UUID, aide_id: str) -> AideSession | None:
+        """Return the live shared session for (user, aide), if any."""
+        return self._sessions.get((user_id, aide_id))
+
+    @asynccontextmanager
+    async def turn(self, user_id: UUID, aide_id: str, loader: SnapshotLoader) -> AsyncIterator[AideSession]:
+        """
+        Run a turn on a persisted aide without a socket (REST callers).
+
+        Joins the aide's shared session, creating one for the duration if no
+        socket has it open, and holds AideSession.turn(): the turn is
+        serialized with WebSocket turns here and, through the advisory lock,
+        on other replicas. Inside the block, read `session.snapshot`, call
+        `session.check_lock()` before saving and `session.publish()` after,
+        so connected sockets see the result.
+
+        Usage:
+            async with sessions.turn(user.id, str(aide_id), loader) as session:
+                ...
+
+        Args:
+            user_id: Owner of the aide
+            aide_id: Aide UUID as a string
+            loader: Loads the stored snapshot if the session is new
+
+        Raises:
+            db.AdvisoryLockTimeout: Another replica kept the aide busy
+            db.AdvisoryLockLost: The lock was released while the turn ran
+        """
+        key = (user_id, aide_id)
+        session = self._sessions.get(key)
+        if session is None:
+            session = AideSession(aide_id, loader, user_id=user_id, coordinated=True)
+            self._sessions[key] = session
+        session._joining += 1
+        try:
+            async with session.turn():
+                yield session
+        finally:
+            session._joining -= 1
+            self._release(session)
+
+    async def start(self) -> None:
+        """Refresh sessions when any replica saves their aide (see snapshot_cache.subscribe)."""
+        snapshot_cache.subscribe(self._on_change, self._on_reconnect)
+
+    async def stop(self) -> None:
+        """Flush pending write-behind edits and stop listening for saves."""
+        snapshot_cache.unsubscribe(self._on_change)
+        for session in list(self._sessions.values()):
+            try:
+                await session.flush()
+            except Exception as e:
+                logger.warning("aide_sessions: flush on shutdown failed aide_id=%s: %s", session.aide_id, e)
+
+    def _on_change(self, aide_id: UUID, seq: int | None) -> None:
+        # Deletes and metadata-only writes (title, status) leave no state to catch up on
+        if seq is None:
+            return
+        for session in list(self._sessions.values()):
+            if session.aide_id == str(aide_id) and seq > session.sequence:
+                self._spawn(session.refresh(seq))
+
+    def _on_reconnect(self) -> None:
+        # Saves made while the listener was down went unheard
+        logger.info("aide_sessions: catching up %d sessions after listener reconnect", len(self._sessions))
+        for session in list(self._sessions.values()):
+            self._spawn(session.catch_up())
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# Singleton instance
+sessions = AideSessionRegistry()
@@ -34,6 +34,20 @@ def get_tier_models() -> dict[str, str]:
     }
 
 
+OutputMode = Literal["tools", "jsonl"]
+
+
+@lru_cache
+def get_tier_output_modes() -> dict[str, OutputMode]:
+    """Get output wire format per tier - unknown values fall back to tool_use."""
+    from backend.config import settings
+
+    modes: dict[str, OutputMode] = {}
+    for tier, mode in (("L3", settings.L3_OUTPUT_MODE), ("L4", settings.L4_OUTPUT_MODE)):
+        modes[tier] = "jsonl" if mode.strip().lower() == "jsonl" else "tools"
+    return modes
+
+
 # Cache TTLs (seconds)
 TIER_CACHE_TTL = {
     "L3": 3600,  # 1 hour
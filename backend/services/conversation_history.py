@@ -0,0 +1,126 @@
+"""
+Recent conversation history for one aide, shared by its WebSocket session.
+
+Every message turn used to call `ConversationRepo.get_for_aide`, decode the
+whole conversation into `Message` models and convert them back to dicts,
+although `build_messages` only sends the last MAX_HISTORY_MESSAGES. Now each
+AideSession keeps a ConversationHistory that:
+
+- loads the last MAX_HISTORY_MESSAGES once (`ConversationRepo.get_recent`,
+  sliced in Postgres) plus the user-turn count,
+- appends each completed turn in memory, trimming to the window,
+- persists appends in the background, in order, in one UPDATE per turn.
+
+`AideSession.turn()` flushes pending appends before it releases the aide,
+so the next turn (on any replica) sees them. When another replica changes
+the aide, the session invalidates the history and the next turn reloads it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from backend.models.conversation import Message
+from backend.repos.conversation_repo import ConversationRepo
+from backend.services.prompt_builder import MAX_HISTORY_MESSAGES
+
+logger = logging.getLogger(__name__)
+
+conversation_repo = ConversationRepo()
+
+
+class ConversationHistory:
+    """Windowed, write-behind view of an aide's latest conversation."""
+
+    def __init__(self, user_id: UUID, aide_id: UUID, window: int = MAX_HISTORY_MESSAGES) -> None:
+        """
+        Args:
+            user_id: Owner the history is read and written as
+            aide_id: Aide whose latest conversation this is
+            window: Trailing messages to keep
+        """
+        self.user_id = user_id
+        self.aide_id = aide_id
+        self.window = window
+        self.conversation_id: UUID | None = None
+        self.messages: list[dict[str, Any]] = []
+        self.user_turns = 0
+        self._loaded = False
+        self._persist: asyncio.Task | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """True once the window has been read from the database."""
+        return self._loaded
+
+    @property
+    def turn_num(self) -> int:
+        """Number of the next turn (user messages so far + 1)."""
+        return self.user_turns + 1
+
+    async def load(self) -> None:
+        """Read the window once; later calls are no-ops until invalidate()."""
+        if self._loaded:
+            return
+        # Our own appends must land before we read them back
+        await self.flush()
+        recent = await conversation_repo.get_recent(self.user_id, self.aide_id, self.window)
+        if recent is not None:
+            self.conversation_id = recent.id
+            self.messages = [{"role": m.get("role"), "content": m.get("content", "")} for m in recent.messages]
+            self.user_turns = recent.user_turns
+        self._loaded = True
+        logger.info(
+            "conversation_history: loaded %d messages for aide_id=%s, turn_num=%d",
+            len(self.messages),
+            self.aide_id,
+            self.turn_num,
+        )
+
+    def invalidate(self) -> None:
+        """Forget the window; another replica may have appended to the conversation."""
+        self._loaded = False
+        self.messages = []
+
+    def append(self, user_message: str, assistant_response: str) -> None:
+        """
+        Record a completed turn in memory and persist it in the background.
+
+        Args:
+            user_message: What the user sent (skipped if empty)
+            assistant_response: Voice text of the reply (skipped if empty)
+        """
+        now = datetime.now(UTC)
+        new = [
+            Message(role=role, content=text, timestamp=now)
+            for role, text in (("user", user_message), ("assistant", assistant_response))
+            if text
+        ]
+        if not new:
+            return
+        self.messages.extend({"role": m.role, "content": m.content} for m in new)
+        del self.messages[: -self.window]
+        self.user_turns += sum(1 for m in new if m.role == "user")
+        self._persist = asyncio.create_task(self._write(new, self._persist))
+
+    async def flush(self) -> None:
+        """Wait for pending appends to be stored."""
+        if self._persist is not None:
+            await asyncio.shield(self._persist)
+
+    async def _write(self, messages: list[Message], previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            # Keep appends in turn order
+            await asyncio.wait([previous])
+        try:
+            if self.conversation_id is None:
+                conversation = await conversation_repo.create(self.user_id, self.aide_id, channel="web")
+                self.conversation_id = conversation.id
+                logger.info("conversation_history: created conversation for aide_id=%s", self.aide_id)
+            await conversation_repo.append_messages(self.user_id, self.conversation_id, messages)
+        except Exception as e:
+            logger.warning("conversation_history: failed to save messages for aide_id=%s: %s", self.aide_id, e)
@@ -2,14 +2,17 @@
 Escalation detection for L3 → L4 routing.
 
 Detects when L3 (Sonnet) produces output that signals it needs L4 (Opus):
-1. Voice text contains escalation phrases
-2. L3 created structural containers (page/section/table/grid) — that's L4's job
+1. An explicit escalate line in JSONL wire mode (result["escalation_reason"])
+2. Voice text contains escalation phrases
+3. L3 created structural containers (page/section/table/grid) — that's L4's job
 """
 
 from __future__ import annotations
 
 from typing import Any
 
+from backend.services.tool_utils import tool_use_to_reducer_events
+
 # Phrases in L3 voice output that signal escalation need
 ESCALATION_PHRASES = [
     "needs a new section",
@@ -32,19 +35,34 @@ def needs_escalation(result: dict[str, Any]) -> bool:
     Returns:
         True if escalation to L4 is needed
     """
-    # Signal 1: Voice text contains escalation phrases
+    # Signal 1: JSONL escalate line (None when the model sent none)
+    if result.get("escalation_reason") is not None:
+        return True
+
+    # Signal 2: Voice text contains escalation phrases
     text_blocks = result.get("text_blocks", [])
     all_voice = " ".join(b["text"] if isinstance(b, dict) else b for b in text_blocks).lower()
     if any(phrase in all_voice for phrase in ESCALATION_PHRASES):
         return True
 
-    # Signal 2: L3 created structural containers
+    # Signal 3: L3 created structural containers
     tool_calls = result.get("tool_calls", [])
     for tc in tool_calls:
-        if tc.get("name") != "mutate_entity":
+        if tc.get("name") == "jsonl":
+            # JSONL wire mode: input is the kernel event itself
+            event = tc.get("input", {})
+            if event.get("t") == "entity.create" and event.get("display") in STRUCTURAL_DISPLAYS:
+                return True
+            continue
+        if tc.get("name") not in ("mutate_entity", "mutate_entities"):
             continue
         inp = tc.get("input", {})
-        if inp.get("action") == "create" and inp.get("display") in STRUCTURAL_DISPLAYS:
-            return True
+        if inp.get("action") != "create":
+            continue
+        # Expand as the orchestrator does, so object and columnar rows may override the shared display
+        for event in tool_use_to_reducer_events(tc["name"], inp):
+            display = event.get("display")
+            if isinstance(display, str) and display in STRUCTURAL_DISPLAYS:
+                return True
 
     return False
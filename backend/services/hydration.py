@@ -0,0 +1,176 @@
+"""
+Snapshot hydration frames for /ws/aide/{aide_id}.
+
+Two wire formats, chosen per socket by the `hydrate` query parameter:
+
+- Version 0 (legacy, default): snapshot.start, one entity.create per
+  entity, meta.update, snapshot.end. The client buffers the deltas and
+  replays them into its store one at a time.
+- Version 1 (`?hydrate=1`): the snapshot as one `snapshot` frame, split
+  into parts of CHUNK_ENTITIES entities for very large aides:
+
+      {"type": "snapshot", "v": 1, "seq": 42, "part": 0, "parts": 1,
+       "entities": [[id, data], ...], "meta": {...}}
+
+  Entities are ordered by _created_seq; meta rides on the last part.
+  Parts larger than COMPRESS_MIN_BYTES are sent as gzip-compressed
+  binary frames, smaller ones as text. The client builds its store in a
+  single pass once the last part arrives.
+
+Version 1 clients that reconnect pass the last `seq` they saw
+(`?hydrate=1&since=42`). If the gap is small, the frames carry
+`"base": 42` and only the entities created, updated or removed after it
+(plus their parents, whose `_children` may have changed; the kernel marks
+the parent a child was moved away from as updated); the client
+merges them into its store instead of replacing it. A client ahead of
+the server, or a gap touching more than RESUME_MAX_FRACTION of the
+entities, gets full hydration.
+"""
+
+from __future__ import annotations
+
+import gzip
+from typing import TYPE_CHECKING, Any
+
+from backend.utils import jsonx
+
+if TYPE_CHECKING:
+    from backend.services.outbound import OutboundQueue
+
+HYDRATION_VERSION = 1
+
+# Entities per snapshot part; keeps any single frame (and the client's parse) bounded
+CHUNK_ENTITIES = 2000
+
+# Parts at least this large are gzipped; below it the binary round trip isn't worth it
+COMPRESS_MIN_BYTES = 16 * 1024
+
+# Past this share of changed entities a resume falls back to full hydration
+RESUME_MAX_FRACTION = 0.5
+
+
+def parse_version(value: str | None) -> int:
+    """Map the client's `hydrate` query parameter to a supported version (0 = legacy)."""
+    try:
+        version = int(value or 0)
+    except ValueError:
+        return 0
+    return version if 0 <= version <= HYDRATION_VERSION else 0
+
+
+def parse_since(value: str | None) -> int | None:
+    """Parse the client's `since` query parameter; None means no resume."""
+    try:
+        since = int(value) if value else None
+    except ValueError:
+        return None
+    return since if since is not None and since >= 0 else None
+
+
+def _entity_seq(entity: dict[str, Any]) -> int:
+    """Latest sequence at which the kernel touched an entity."""
+    return max(entity.get("_updated_seq", 0), entity.get("_created_seq", 0), entity.get("_removed_seq", 0))
+
+
+def _ordered_entities(snapshot: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    entities = snapshot.get("entities", {})
+    return sorted(entities.items(), key=lambda x: x[1].get("_created_seq", 0))
+
+
+def legacy_frames(snapshot: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build the snapshot.start … snapshot.end frames that rebuild a client's entity store."""
+    frames: list[dict[str, Any]] = [{"type": "snapshot.start"}]
+    for entity_id, entity_data in _ordered_entities(snapshot):
+        frames.append({"type": "entity.create", "id": entity_id, "data": entity_data})
+    meta = snapshot.get("meta", {})
+    if meta:
+        frames.append({"type": "meta.update", "data": meta})
+    frames.append({"type": "snapshot.end"})
+    return frames
+
+
+def _chunked_frames(
+    entities: list[list[Any]],
+    seq: int,
+    meta: dict[str, Any] | None,
+    chunk_entities: int,
+    base: int | None = None,
+) -> list[dict[str, Any]]:
+    chunks = [entities[i : i + chunk_entities] for i in range(0, len(entities), chunk_entities)] or [[]]
+    frames: list[dict[str, Any]] = []
+    for i, chunk in enumerate(chunks):
+        frame: dict[str, Any] = {"type": "snapshot", "v": HYDRATION_VERSION, "seq": seq}
+        if base is not None:
+            frame["base"] = base
+        frame.update(part=i, parts=len(chunks), entities=chunk)
+        frames.append(frame)
+    if meta is not None:
+        frames[-1]["meta"] = meta
+    return frames
+
+
+def snapshot_frames(snapshot: dict[str, Any], chunk_entities: int = CHUNK_ENTITIES) -> list[dict[str, Any]]:
+    """Build the version 1 `snapshot` frame(s) for a snapshot."""
+    entities = [[entity_id, data] for entity_id, data in _ordered_entities(snapshot)]
+    return _chunked_frames(entities, snapshot.get("_sequence", 0), snapshot.get("meta", {}), chunk_entities)
+
+
+def delta_frames(
+    snapshot: dict[str, Any],
+    since: int,
+    chunk_entities: int = CHUNK_ENTITIES,
+) -> list[dict[str, Any]] | None:
+    """
+    Build version 1 frames that bring a client at sequence `since` up to date.
+
+    Args:
+        snapshot: Current snapshot. Meta is included when the snapshot has it.
+        since: Last sequence the client saw
+        chunk_entities: Entities per part
+
+    Returns:
+        Frames with `"base": since`, or None when the client needs full hydration
+    """
+    seq = snapshot.get("_sequence", 0)
+    if since <= 0 or since > seq:
+        return None
+
+    all_entities = snapshot.get("entities", {})
+    changed = {entity_id for entity_id, data in all_entities.items() if _entity_seq(data) > since}
+    # A new or moved child changes its new parent's _children without bumping it
+    changed |= {
+        parent
+        for entity_id in list(changed)
+        if (parent := all_entities[entity_id].get("parent")) and parent != "root" and parent in all_entities
+    }
+    if len(changed) > len(all_entities) * RESUME_MAX_FRACTION:
+        return None
+
+    entities = [[entity_id, data] for entity_id, data in _ordered_entities(snapshot) if entity_id in changed]
+    return _chunked_frames(entities, seq, snapshot.get("meta"), chunk_entities, base=since)
+
+
+def encode_frame(frame: dict[str, Any]) -> str | bytes:
+    """Serialize a frame: text, or gzip-compressed bytes once it reaches COMPRESS_MIN_BYTES."""
+    data = jsonx.dumpb(frame)
+    if len(data) < COMPRESS_MIN_BYTES:
+        return data.decode()
+    # mtime=0 keeps the output deterministic for identical snapshots
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def encode_hydration(snapshot: dict[str, Any], version: int, since: int | None = None) -> list[str | bytes]:
+    """Encoded frames that hydrate a client speaking `version`, resuming from `since` when possible."""
+    if version >= 1:
+        frames = delta_frames(snapshot, since) if since is not None else None
+        return [encode_frame(frame) for frame in frames or snapshot_frames(snapshot)]
+    return [jsonx.dumps(frame) for frame in legacy_frames(snapshot)]
+
+
+async def send_encoded(websocket: OutboundQueue, frames: list[str | bytes]) -> None:
+    """Queue pre-encoded frames on a connection, as binary messages where compressed."""
+    for frame in frames:
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
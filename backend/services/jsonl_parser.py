@@ -2,7 +2,9 @@
 JSONL stream parser for LLM output.
 
 Buffers streaming text until newlines, expands field abbreviations,
-and skips malformed lines with a warning.
+and skips malformed or non-object lines with a warning. With ``expand=False`` lines are
+returned in the compact kernel format (``t``/``p``) so the orchestrator can
+apply them directly in JSONL wire mode.
 """
 
 from __future__ import annotations
@@ -32,10 +34,26 @@ class JSONLParser:
 
     Accumulates partial chunks in a buffer, emits complete parsed lines
     as they become available. Skips malformed JSON with a warning log.
+
+    The pending (unterminated) line is kept as a list of chunks and only
+    joined once a newline arrives, so every byte is scanned and copied a
+    bounded number of times: feeding N bytes costs O(N) regardless of how
+    the stream is split into chunks or lines.
     """
 
-    def __init__(self) -> None:
-        self.buffer = ""
+    def __init__(self, expand: bool = True) -> None:
+        """
+        Args:
+            expand: Expand abbreviated keys (t → type, p → payload). Pass False
+                to keep the compact keys the kernel consumes.
+        """
+        self._pending: list[str] = []
+        self.expand = expand
+
+    @property
+    def buffer(self) -> str:
+        """Text received since the last newline (the incomplete line)."""
+        return "".join(self._pending)
 
     def feed(self, chunk: str) -> list[dict]:
         """
@@ -45,20 +63,25 @@ class JSONLParser:
             chunk: Raw text from the LLM stream
 
         Returns:
-            List of expanded event dicts for each complete JSONL line
+            List of event dicts for each complete JSONL line
         """
-        self.buffer += chunk
+        if "\n" not in chunk:
+            if chunk:
+                self._pending.append(chunk)
+            return []
+
+        # Join the pending pieces once, split all complete lines in one C-level pass
+        if self._pending:
+            self._pending.append(chunk)
+            chunk = "".join(self._pending)
+            self._pending.clear()
+        *complete, rest = chunk.split("\n")
+        if rest:
+            self._pending.append(rest)
+
         lines = []
-        while "\n" in self.buffer:
-            line, self.buffer = self.buffer.split("\n", 1)
-            stripped = line.strip()
-            if not stripped:
-                continue
-            try:
-                parsed = json.loads(stripped)
-                lines.append(self.expand_abbreviations(parsed))
-            except json.JSONDecodeError:
-                logger.warning("JSONLParser: skipping malformed line: %r", stripped[:200])
+        for line in complete:
+            self._parse_into(line, lines)
         return lines
 
     def flush(self) -> list[dict]:
@@ -68,18 +91,46 @@ class JSONLParser:
         Call this after the stream ends to handle files with no trailing newline.
 
         Returns:
-            List of expanded event dicts (0 or 1 items)
+            List of event dicts (0 or 1 items)
+        """
+        lines: list[dict] = []
+        self._parse_into(self.buffer, lines, what="final chunk")
+        self._pending.clear()
+        return lines
+
+    def partial(self) -> dict | None:
         """
-        stripped = self.buffer.strip()
-        self.buffer = ""
+        Best-effort parse of the incomplete line, without consuming it.
+
+        Open strings, objects and arrays are closed; a trailing key or value
+        that cannot be completed is dropped. Useful for showing e.g. voice
+        text before its line finishes. Costs O(len(pending line)) per call.
+
+        Returns:
+            Event dict for the partial line, or None if nothing parseable yet
+        """
+        text = self.buffer.strip()
+        if not text.startswith("{"):
+            return None
+        parsed = _parse_partial_object(text)
+        return self._convert(parsed) if parsed is not None else None
+
+    def _parse_into(self, line: str, out: list[dict], what: str = "line") -> None:
+        stripped = line.strip()
         if not stripped:
-            return []
+            return
         try:
             parsed = json.loads(stripped)
-            return [self.expand_abbreviations(parsed)]
         except json.JSONDecodeError:
-            logger.warning("JSONLParser: skipping malformed final chunk: %r", stripped[:200])
-            return []
+            parsed = None
+        # Valid JSON that isn't an object ([..], "text", 5) is no event either
+        if not isinstance(parsed, dict):
+            logger.warning("JSONLParser: skipping malformed %s: %r", what, stripped[:200])
+            return
+        out.append(self._convert(parsed))
+
+    def _convert(self, parsed: dict) -> dict:
+        return self.expand_abbreviations(parsed) if self.expand else parsed
 
     @staticmethod
     def expand_abbreviations(event: dict) -> dict:
@@ -107,3 +158,49 @@ class JSONLParser:
             expanded["payload"] = expanded.pop("props")
 
         return expanded
+
+
+def _parse_partial_object(text: str) -> dict | None:
+    """
+    Close a truncated JSON object and parse it.
+
+    Tries the whole text with open strings/containers closed first, then
+    falls back to cutting at each earlier top-level-or-nested comma (newest
+    first) so a half-written key or value is dropped rather than failing.
+    """
+    closers: list[str] = []
+    in_string = False
+    escaped = False
+    cuts: list[tuple[int, str]] = []  # (comma position, closers needed at that point)
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == "{":
+            closers.append("}")
+        elif ch == "[":
+            closers.append("]")
+        elif ch in "}]":
+            if closers:
+                closers.pop()
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(closers))))
+
+    head = text[:-1] if escaped else text
+    candidates = [head + ('"' if in_string else "") + "".join(reversed(closers))]
+    candidates.extend(text[:pos] + tail for pos, tail in reversed(cuts))
+    for candidate in candidates:
+        try:
+            parsed = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return None
@@ -0,0 +1,288 @@
+"""
+Bounded per-connection send queues for /ws/aide/{aide_id}.
+
+Handlers and AideSession broadcasts used to await `websocket.send_text`
+inline, so one slow client stalled the turn that was streaming to it (and,
+with shared sessions, every other tab on the aide). Each connection now
+gets an OutboundQueue: sends enqueue and return immediately, and a writer
+task drains the queue onto the socket.
+
+Frames come in two kinds:
+
+- State frames (`send_text` / `send_bytes`): entity and meta deltas and
+  hydration frames. They can always be rebuilt from the session snapshot,
+  so the queue may coalesce or drop them. A delta for an entity supersedes
+  a pending delta for the same entity (deltas carry the entity's full
+  data), and a meta.update supersedes a pending meta.update.
+- Control frames (`send_control`): stream.*, voice and errors. Never
+  coalesced or dropped.
+
+When the queue outgrows WS_SEND_QUEUE_FRAMES or WS_SEND_QUEUE_BYTES, every
+pending state frame is dropped and replaced by one resync marker. When the
+writer reaches it, it asks the connection for fresh hydration frames since
+the last sequence it delivered (see services/hydration.py). If control
+frames alone overflow, or a single send takes longer than
+WS_SEND_TIMEOUT_S, the connection is closed. Memory per connection stays
+bounded however slowly the client reads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from backend.config import settings
+from backend.utils import jsonx
+
+logger = logging.getLogger(__name__)
+
+# Close code for a client that cannot keep up ("try again later")
+CLOSE_SLOW_CONSUMER = 1013
+
+# Builds hydration frames for a client last sent `seq` (None: unknown) → (frames, sequence they bring it to)
+ResyncBuilder = Callable[[int | None], tuple[list[str | bytes], int]]
+
+# Counters across all connections in this process, reported by stats()
+_totals = {"coalesced": 0, "resyncs": 0, "closed_slow": 0}
+_live: set[OutboundQueue] = set()
+
+
+def supersede_key(payload: dict[str, Any]) -> Hashable | None:
+    """Key under which a newer state frame replaces a pending one, or None if it never does."""
+    frame_type = payload.get("type")
+    if frame_type in ("entity.update", "entity.remove"):
+        return ("entity", payload.get("id"))
+    if frame_type == "meta.update":
+        return ("meta",)
+    return None
+
+
+class _Slot:
+    """One queued frame. `frame` is None once a newer frame superseded it."""
+
+    __slots__ = ("frame", "size", "key", "seq", "kind")
+
+    def __init__(
+        self,
+        frame: str | bytes | None,
+        size: int,
+        key: Hashable | None = None,
+        seq: int | None = None,
+        kind: str = "state",
+    ) -> None:
+        self.frame = frame
+        self.size = size
+        self.key = key
+        self.seq = seq
+        # "state", "control", or "resync" (marker for rebuilt hydration frames)
+        self.kind = kind
+
+
+class OutboundQueue:
+    """Bounded, coalescing send queue for one WebSocket, drained by a writer task."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        resync: ResyncBuilder | None = None,
+        max_frames: int | None = None,
+        max_bytes: int | None = None,
+        send_timeout: float | None = None,
+    ) -> None:
+        """
+        Args:
+            websocket: Accepted WebSocket to write to
+            resync: Rebuilds state after pending state frames were dropped;
+                without it an overflow closes the connection
+            max_frames: Pending frame limit (default WS_SEND_QUEUE_FRAMES)
+            max_bytes: Pending size limit (default WS_SEND_QUEUE_BYTES)
+            send_timeout: Seconds one send may take (default WS_SEND_TIMEOUT_S)
+        """
+        self.websocket = websocket
+        self.resync = resync
+        self.max_frames = max_frames or settings.WS_SEND_QUEUE_FRAMES
+        self.max_bytes = max_bytes or settings.WS_SEND_QUEUE_BYTES
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_S
+        # Highest sequence of a state frame handed to the socket
+        self.delivered_seq: int | None = None
+        self.closed = False
+        self.depth = 0
+        self.bytes = 0
+        self.peak_depth = 0
+        self._queue: deque[_Slot] = deque()
+        self._keyed: dict[Hashable, _Slot] = {}
+        self._ready = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+        self._hangup: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the writer task."""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+            _live.add(self)
+
+    async def close(self) -> None:
+        """Stop the writer and drop anything still pending."""
+        self._shut()
+        writer, self._writer = self._writer, None
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+            try:
+                await writer
+            except asyncio.CancelledError:
+                pass
+        if self._hangup is not None:
+            await self._hangup
+
+    async def send_text(self, text: str, key: Hashable | None = None, seq: int | None = None) -> None:
+        """
+        Queue a state frame.
+
+        Args:
+            text: Encoded frame
+            key: supersede_key() of the payload; replaces a pending frame with the same key
+            seq: Snapshot sequence the frame brings the client to
+        """
+        self._put(_Slot(text, len(text), key=key, seq=seq))
+
+    async def send_bytes(self, data: bytes) -> None:
+        """Queue a binary state frame (compressed hydration part)."""
+        self._put(_Slot(data, len(data)))
+
+    async def send_control(self, payload: dict[str, Any]) -> None:
+        """Queue a control frame (stream.*, voice, errors); never coalesced or dropped."""
+        text = jsonx.dumps(payload)
+        self._put(_Slot(text, len(text), kind="control"))
+
+    def stats(self) -> dict[str, Any]:
+        """Current depth, size and high-water mark of this queue."""
+        return {"depth": self.depth, "bytes": self.bytes, "peak_depth": self.peak_depth}
+
+    def _put(self, slot: _Slot) -> None:
+        if self.closed:
+            raise WebSocketDisconnect(CLOSE_SLOW_CONSUMER)
+        if slot.key is not None:
+            pending = self._keyed.get(slot.key)
+            if pending is not None:
+                self._discard(pending)
+                _totals["coalesced"] += 1
+            self._keyed[slot.key] = slot
+        self._queue.append(slot)
+        self.depth += 1
+        self.bytes += slot.size
+        self.peak_depth = max(self.peak_depth, self.depth)
+        if self.depth > self.max_frames or self.bytes > self.max_bytes:
+            self._overflow()
+            if self.closed:
+                raise WebSocketDisconnect(CLOSE_SLOW_CONSUMER)
+        elif len(self._queue) > 2 * self.max_frames:
+            # Superseded slots stay queued until drained; compact so a blocked writer can't pile them up
+            self._queue = deque(slot for slot in self._queue if slot.frame is not None)
+        self._ready.set()
+
+    def _discard(self, slot: _Slot) -> None:
+        if slot.frame is not None:
+            slot.frame = None
+            self.depth -= 1
+            self.bytes -= slot.size
+
+    def _overflow(self) -> None:
+        """Drop pending state frames for one resync marker; close if control frames alone overflow."""
+        kept = deque(slot for slot in self._queue if slot.kind == "control" and slot.frame is not None)
+        if self.resync is None or len(kept) >= self.max_frames or sum(s.size for s in kept) > self.max_bytes:
+            logger.warning("outbound: closing slow consumer depth=%d bytes=%d", self.depth, self.bytes)
+            _totals["closed_slow"] += 1
+            self._shut()
+            # The writer may be stuck in a send to this client; stop it and hang up from outside
+            self._hangup = asyncio.create_task(self._hang_up())
+            return
+        kept.append(_Slot(b"", 0, kind="resync"))
+        self._queue = kept
+        self._keyed.clear()
+        self.depth = len(kept)
+        self.bytes = sum(s.size for s in kept)
+        _totals["resyncs"] += 1
+        logger.info("outbound: queue overflow, resyncing from seq=%s", self.delivered_seq)
+
+    def _shut(self) -> None:
+        self.closed = True
+        self._queue.clear()
+        self._keyed.clear()
+        self.depth = self.bytes = 0
+        self._ready.set()
+        _live.discard(self)
+
+    async def _run(self) -> None:
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._queue and not self.closed:
+                    slot = self._queue.popleft()
+                    if slot.frame is None:
+                        continue
+                    self.depth -= 1
+                    self.bytes -= slot.size
+                    if slot.key is not None and self._keyed.get(slot.key) is slot:
+                        del self._keyed[slot.key]
+                    if slot.kind == "resync":
+                        await self._send_resync()
+                        continue
+                    await self._send(slot.frame)
+                    if slot.seq is not None:
+                        self.delivered_seq = max(slot.seq, self.delivered_seq or 0)
+        except TimeoutError:
+            logger.warning("outbound: send timed out after %.0fs, closing slow consumer", self.send_timeout)
+            _totals["closed_slow"] += 1
+        except Exception:
+            logger.debug("outbound: send failed, closing", exc_info=True)
+        # Timed out or the socket failed (a cancelled writer never gets here)
+        self._shut()
+        await self._close_socket()
+
+    async def _hang_up(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.cancel()
+            try:
+                await writer
+            except asyncio.CancelledError:
+                pass
+        await self._close_socket()
+
+    async def _close_socket(self) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(code=CLOSE_SLOW_CONSUMER), timeout=1)
+        except Exception:  # noqa: S110 - the socket is already gone
+            pass
+
+    async def _send_resync(self) -> None:
+        if self.resync is None:
+            return
+        frames, seq = self.resync(self.delivered_seq)
+        for frame in frames:
+            await self._send(frame)
+        self.delivered_seq = max(seq, self.delivered_seq or 0)
+
+    async def _send(self, frame: str | bytes) -> None:
+        if isinstance(frame, bytes):
+            await asyncio.wait_for(self.websocket.send_bytes(frame), self.send_timeout)
+        else:
+            await asyncio.wait_for(self.websocket.send_text(frame), self.send_timeout)
+
+
+def stats() -> dict[str, Any]:
+    """Queue depth and backpressure counters across this process's connections (GET /api/admin/ws)."""
+    depths = [queue.depth for queue in _live]
+    return {
+        "connections": len(depths),
+        "queued_frames": sum(depths),
+        "queued_bytes": sum(queue.bytes for queue in _live),
+        "max_depth": max(depths, default=0),
+        **_totals,
+    }
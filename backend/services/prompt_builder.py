@@ -6,11 +6,12 @@ Assembles system prompts with snapshot context for each tier.
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from backend.utils import jsonx
+
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
 
@@ -63,13 +64,35 @@ def load_prompt(tier: str, version: str | None = None) -> str:
     return tier_prompt.replace("{{shared_prefix}}", shared)
 
 
-def build_system_blocks(tier: str, snapshot: dict[str, Any], version: str | None = None) -> list[dict[str, Any]]:
+def load_output_format(output_mode: str, version: str | None = None) -> str:
+    """Load the output-format override for a non-default wire mode.
+
+    Args:
+        output_mode: "tools" (default, no override) or "jsonl"
+        version: Optional version string (e.g., "v1", "v2")
+
+    Returns:
+        Override section to append to the tier prompt, or "" for tool_use.
+    """
+    if output_mode == "tools":
+        return ""
+    prompts_dir = _get_prompts_dir(version)
+    return (prompts_dir / f"{output_mode}_output.md").read_text()
+
+
+def build_system_blocks(
+    tier: str,
+    snapshot: dict[str, Any],
+    version: str | None = None,
+    output_mode: str = "tools",
+) -> list[dict[str, Any]]:
     """Build system prompt as separate blocks for caching.
 
     Args:
         tier: Tier name (L2, L3, L4)
         snapshot: Current snapshot dictionary
         version: Optional prompt version (e.g., "v1", "v2")
+        output_mode: Wire format — "tools" or "jsonl" (appends the JSONL override to the cached block)
 
     Returns list of content blocks:
     - Block 1: Static tier instructions (cached, survives across turns)
@@ -78,7 +101,10 @@ def build_system_blocks(tier: str, snapshot: dict[str, Any], version: str | None
     base = load_prompt(tier, version=version)
     today = datetime.now().strftime("%Y-%m-%d")
     base = base.replace("{{current_date}}", today)
-    snapshot_json = json.dumps(snapshot, indent=2, sort_keys=True)
+    output_format = load_output_format(output_mode, version=version)
+    if output_format:
+        base = f"{base}\n\n{output_format}"
+    snapshot_json = jsonx.dumps(snapshot, indent=True, sort_keys=True)
 
     return [
         {
@@ -93,13 +119,16 @@ def build_system_blocks(tier: str, snapshot: dict[str, Any], version: str | None
     ]
 
 
+# History messages sent with each turn (~3 exchanges); also the window services/conversation_history.py keeps
+MAX_HISTORY_MESSAGES = 9
+
+
 def build_messages(conversation: list[dict[str, Any]], user_message: str) -> list[dict[str, Any]]:
     """Build messages array with conversation windowing.
 
     Windows to last 9 message blocks (~3 exchanges) to prevent
     unbounded history growth at full input price.
     """
-    MAX_HISTORY_MESSAGES = 9
     if len(conversation) > MAX_HISTORY_MESSAGES:
         windowed = conversation[-MAX_HISTORY_MESSAGES:]
         # Ensure we start on a user message (API requirement)
@@ -132,7 +161,7 @@ def build_l2_prompt(snapshot: dict[str, Any]) -> str:
     L2 tier was consolidated into L3.
     """
     base = load_prompt("l3")
-    snapshot_json = json.dumps(snapshot, indent=2)
+    snapshot_json = jsonx.dumps(snapshot, indent=True)
 
     return f"""{base}
 
@@ -153,7 +182,7 @@ def build_l3_prompt(snapshot: dict[str, Any]) -> str:
     Primitives are now inline in shared prefix.
     """
     base = load_prompt("l3")
-    snapshot_json = json.dumps(snapshot, indent=2)
+    snapshot_json = jsonx.dumps(snapshot, indent=True)
 
     return f"""{base}
 
@@ -171,7 +200,7 @@ def build_l4_prompt(snapshot: dict[str, Any]) -> str:
     L4 handles queries requiring reasoning over the snapshot.
     """
     base = _load_prompt_old("l4_system")
-    snapshot_json = json.dumps(snapshot, indent=2)
+    snapshot_json = jsonx.dumps(snapshot, indent=True)
 
     return f"""{base}
 
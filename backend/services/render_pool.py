@@ -0,0 +1,316 @@
+"""
+Pool of long-lived Node render workers for publish.
+
+`renderer.render_html` used to run `subprocess.run(["node", "scripts/render.js"])`
+for every publish: a cold Node start (loading display.js included) per
+render, and the event loop blocked until it finished. Renders now go to
+RENDER_WORKERS worker processes (scripts/render_worker.js) that stay up
+between publishes and speak line-delimited JSON-RPC over asyncio pipes,
+like the CLI's NodeBridge:
+
+- a render waits for an idle worker; at most RENDER_WORKERS run at once,
+  and the queue depth and wait times are counted;
+- each request has RENDER_TIMEOUT_S to answer. A worker that times out,
+  exits or breaks the protocol is killed and started again on its next
+  use, so one bad render never wedges the pool;
+- `check()` pings idle workers and restarts dead ones (run every
+  RENDER_HEALTH_S by the scheduler);
+- counters are reported through `stats()` (GET /api/admin/render).
+
+Workers start with the app (`start()`), or on the first render if it
+wasn't started.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from backend.config import settings
+from backend.utils import jsonx
+
+logger = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).parent.parent.parent / "scripts" / "render_worker.js"
+
+# Longest response line read from a worker (a rendered page, JSON-encoded)
+MAX_LINE_BYTES = 64 * 1024 * 1024
+
+# Seconds a new worker has to load display.js and report ready
+STARTUP_TIMEOUT_S = 10.0
+
+# Recent wait and render times kept for the percentiles in stats()
+_SAMPLES = 1000
+
+
+class _WorkerError(RuntimeError):
+    """The worker can't be used again (timed out, exited, or broke the protocol)."""
+
+
+class _WorkerTimeout(_WorkerError):
+    """The worker didn't answer within the request timeout."""
+
+
+class _Worker:
+    """One Node render process."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self.proc = proc
+        self._id = 0
+        self._killed = False
+
+    @classmethod
+    async def spawn(cls, script: Path) -> _Worker:
+        """Start a worker and wait for its ready signal."""
+        proc = await asyncio.create_subprocess_exec(
+            "node",
+            str(script),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=MAX_LINE_BYTES,
+        )
+        worker = cls(proc)
+        try:
+            line = await asyncio.wait_for(proc.stdout.readline(), STARTUP_TIMEOUT_S)
+            if not line or not jsonx.loads(line).get("ready"):
+                raise _WorkerError(f"Render worker failed to start (exit code {proc.returncode})")
+        except BaseException:
+            await worker.kill()
+            raise
+        return worker
+
+    @property
+    def alive(self) -> bool:
+        return not self._killed and self.proc.returncode is None
+
+    async def call(self, method: str, params: dict[str, Any], timeout: float) -> Any:
+        """
+        Send one request and wait for its response.
+
+        Raises:
+            RuntimeError: If the worker answered with an error
+            _WorkerError: If the worker failed; it has been killed
+        """
+        self._id += 1
+        request = jsonx.dumpb({"id": self._id, "method": method, "params": params}) + b"\n"
+        try:
+            line = await asyncio.wait_for(self._exchange(request), timeout)
+        except TimeoutError as e:
+            await self.kill()
+            raise _WorkerTimeout(f"Render timeout after {timeout:g}s") from e
+        except (OSError, ValueError) as e:
+            # Broken pipe, or a response line over MAX_LINE_BYTES
+            await self.kill()
+            raise _WorkerError(f"Render worker failed: {e}") from e
+        except asyncio.CancelledError:
+            # Its response would be read as the answer to the next request
+            self._signal_kill()
+            raise
+        if not line:
+            await self.kill()
+            raise _WorkerError(f"Render worker exited (exit code {self.proc.returncode})")
+        try:
+            response = jsonx.loads(line)
+        except ValueError as e:
+            await self.kill()
+            raise _WorkerError(f"Render worker sent invalid JSON: {e}") from e
+        if response.get("id") != self._id:
+            await self.kill()
+            raise _WorkerError(f"Render worker answered request {response.get('id')}, expected {self._id}")
+        if "error" in response:
+            raise RuntimeError(f"Render failed: {response['error']}")
+        return response["result"]
+
+    async def _exchange(self, request: bytes) -> bytes:
+        self.proc.stdin.write(request)
+        await self.proc.stdin.drain()
+        return await self.proc.stdout.readline()
+
+    async def close(self) -> None:
+        """Ask the worker to exit (by closing its stdin), killing it if it doesn't."""
+        if not self.alive:
+            return
+        self.proc.stdin.close()
+        try:
+            await asyncio.wait_for(self.proc.wait(), 2)
+        except TimeoutError:
+            await self.kill()
+
+    def _signal_kill(self) -> None:
+        if self.alive:
+            self.proc.kill()
+        self._killed = True
+
+    async def kill(self) -> None:
+        self._signal_kill()
+        await self.proc.wait()
+
+
+def _percentiles(samples: deque[float]) -> dict[str, float | None]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
+class RenderPool:
+    """Fixed-size pool of Node render workers with per-request timeouts and restart."""
+
+    def __init__(self, size: int, timeout_s: float, script: Path = WORKER_SCRIPT) -> None:
+        """
+        Args:
+            size: Worker processes, and so renders running at once
+            timeout_s: Seconds a render may take before its worker is killed
+            script: Worker script speaking the render_worker.js protocol
+        """
+        self.size = max(1, size)
+        self.timeout_s = timeout_s
+        self.script = script
+        # One slot per worker; None means the worker must be (re)started before use
+        self._slots: asyncio.Queue[_Worker | None] | None = None
+        self._workers: set[_Worker] = set()
+        self._waiting = 0
+        self._peak_waiting = 0
+        self._wait_ms: deque[float] = deque(maxlen=_SAMPLES)
+        self._render_ms: deque[float] = deque(maxlen=_SAMPLES)
+        self._totals = {"renders": 0, "failed": 0, "timeouts": 0, "starts": 0, "start_failures": 0, "restarts": 0}
+
+    async def start(self) -> None:
+        """Start the workers. One that fails to start is retried on first use."""
+        if self._slots is not None:
+            return
+        self._slots = asyncio.Queue()
+        for _ in range(self.size):
+            self._slots.put_nowait(None)
+        await self.check()
+
+    async def stop(self) -> None:
+        """Stop every worker. Renders in flight fail."""
+        self._slots = None
+        workers, self._workers = self._workers, set()
+        await asyncio.gather(*(worker.close() for worker in workers), return_exceptions=True)
+
+    async def _spawn(self) -> _Worker:
+        try:
+            worker = await _Worker.spawn(self.script)
+        except Exception as e:
+            self._totals["start_failures"] += 1
+            raise RuntimeError(f"Render error: {e}") from e
+        self._totals["starts"] += 1
+        self._workers.add(worker)
+        return worker
+
+    def _release(self, slots: asyncio.Queue[_Worker | None], worker: _Worker | None) -> None:
+        """Return a slot; a dead worker's slot comes back empty."""
+        if worker is not None and not worker.alive:
+            self._workers.discard(worker)
+            self._totals["restarts"] += 1
+            worker = None
+        if slots is self._slots:
+            slots.put_nowait(worker)
+        elif worker is not None:
+            # Stopped meanwhile
+            self._workers.discard(worker)
+            asyncio.create_task(worker.close())
+
+    async def render(self, render_input: dict[str, Any]) -> str:
+        """
+        Render a render.js-style input ({state, title, description, footer, updatedAt}) to HTML.
+
+        Raises:
+            RuntimeError: If rendering fails or times out
+        """
+        if self._slots is None:
+            await self.start()
+        slots = self._slots
+        queued = time.perf_counter()
+        self._waiting += 1
+        self._peak_waiting = max(self._peak_waiting, self._waiting)
+        try:
+            worker = await slots.get()
+        finally:
+            self._waiting -= 1
+        started = time.perf_counter()
+        self._wait_ms.append((started - queued) * 1000)
+        try:
+            if worker is None:
+                worker = await self._spawn()
+            html = await worker.call("render", render_input, self.timeout_s)
+        except _WorkerError as e:
+            self._totals["failed"] += 1
+            if isinstance(e, _WorkerTimeout):
+                self._totals["timeouts"] += 1
+            logger.warning("render_pool: %s", e)
+            raise RuntimeError(str(e)) from e
+        except BaseException:
+            self._totals["failed"] += 1
+            raise
+        finally:
+            self._release(slots, worker)
+        self._totals["renders"] += 1
+        self._render_ms.append((time.perf_counter() - started) * 1000)
+        return html
+
+    async def check(self) -> int:
+        """
+        Ping the idle workers and start any that are missing or dead.
+
+        Returns:
+            Workers started
+        """
+        slots = self._slots
+        if slots is None:
+            return 0
+        idle = []
+        while not slots.empty():
+            idle.append(slots.get_nowait())
+        started = await asyncio.gather(*(self._check_one(slots, worker) for worker in idle))
+        return sum(started)
+
+    async def _check_one(self, slots: asyncio.Queue[_Worker | None], worker: _Worker | None) -> bool:
+        if worker is not None:
+            try:
+                await worker.call("ping", {}, min(self.timeout_s, 2.0))
+            except RuntimeError as e:
+                logger.warning("render_pool: health check failed: %s", e)
+                await worker.kill()
+            if worker.alive:
+                self._release(slots, worker)
+                return False
+            self._workers.discard(worker)
+            self._totals["restarts"] += 1
+        try:
+            worker = await self._spawn()
+        except RuntimeError as e:
+            logger.warning("render_pool: %s", e)
+            self._release(slots, None)
+            return False
+        self._release(slots, worker)
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Worker and queue counters for this process (GET /api/admin/render)."""
+        return {
+            "size": self.size,
+            "timeout_s": self.timeout_s,
+            "running": self._slots is not None,
+            "workers": sum(worker.alive for worker in self._workers),
+            "idle": self._slots.qsize() if self._slots is not None else 0,
+            "waiting": self._waiting,
+            "peak_waiting": self._peak_waiting,
+            "wait_ms": _percentiles(self._wait_ms),
+            "render_ms": _percentiles(self._render_ms),
+            **self._totals,
+        }
+
+
+# Singleton instance
+render_pool = RenderPool(size=settings.RENDER_WORKERS, timeout_s=settings.RENDER_TIMEOUT_S)
@@ -0,0 +1,173 @@
+"""
+Leader-elected scheduler for periodic maintenance jobs.
+
+`main.cleanup_task` used to run every job on every replica every minute, so
+the replicas raced each other over the same rows with unbounded DELETEs.
+Jobs are now registered here instead:
+
+- each job runs in its own loop, every `interval_s` plus up to
+  SCHEDULER_JITTER of it either way, so replicas and jobs drift apart
+  instead of firing together;
+- leader-only jobs (the default) run only on the replica holding the
+  `scheduler:leader` advisory lock. Every replica tries to take it before
+  each run, so when the leader exits or loses its lock connection another
+  one takes over at its next run;
+- per-process jobs (`leader_only=False`) run everywhere, for in-memory
+  state such as the rate limiter;
+- each run's duration and rows affected (whatever the job returns) are
+  recorded and reported through `stats()` (GET /api/admin/jobs).
+
+Jobs should do bounded work per transaction and be safe to repeat: if the
+leader's lock connection dies silently, two replicas may briefly both lead.
+A failed run is logged and retried at the next interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from backend import db
+
+logger = logging.getLogger(__name__)
+
+# Fraction of a job's interval its runs are randomly moved by
+SCHEDULER_JITTER = 0.1
+
+LEADER_LOCK = "scheduler:leader"
+
+
+class _Job:
+    """A registered job and its run counters."""
+
+    def __init__(self, name: str, fn: Callable[[], Awaitable[int | None]], interval_s: float, leader_only: bool):
+        self.name = name
+        self.fn = fn
+        self.interval_s = interval_s
+        self.leader_only = leader_only
+        self.totals = {"runs": 0, "skipped": 0, "failed": 0, "rows": 0}
+        self.last_run_at: datetime | None = None
+        self.last_run_ms: float | None = None
+        self.last_rows: int | None = None
+        self.last_error: str | None = None
+
+
+class JobScheduler:
+    """Runs registered maintenance jobs, leader-only ones on a single replica."""
+
+    def __init__(self, leader_lock: str = LEADER_LOCK) -> None:
+        """
+        Args:
+            leader_lock: Advisory lock name the replicas elect a leader with
+        """
+        self.leader_lock = leader_lock
+        self._jobs: dict[str, _Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._leader = False
+
+    def register(
+        self,
+        name: str,
+        fn: Callable[[], Awaitable[int | None]],
+        interval_s: float,
+        leader_only: bool = True,
+    ) -> None:
+        """
+        Register a job. Jobs registered after start() run from the next start().
+
+        Args:
+            name: Job name, unique, used in stats
+            fn: Coroutine function doing one run; returns rows affected, or None
+            interval_s: Seconds between runs (before jitter)
+            leader_only: Run on the leader replica only
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job already registered: {name}")
+        self._jobs[name] = _Job(name, fn, interval_s, leader_only)
+
+    async def start(self) -> None:
+        """Start a loop per registered job."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run(job)) for job in self._jobs.values()]
+
+    async def stop(self) -> None:
+        """Stop the job loops and give up leadership."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._leader:
+            self._leader = False
+            try:
+                await db.release_advisory_lock(self.leader_lock)
+            except Exception as e:
+                logger.warning("scheduler: releasing leadership failed: %s", e)
+
+    async def _run(self, job: _Job) -> None:
+        # Stagger the first runs so a fleet restart doesn't fire every job at once
+        await asyncio.sleep(random.uniform(0, job.interval_s * SCHEDULER_JITTER))  # noqa: S311
+        while True:
+            await self.run_once(job.name)
+            jitter = random.uniform(-SCHEDULER_JITTER, SCHEDULER_JITTER)  # noqa: S311
+            await asyncio.sleep(job.interval_s * (1 + jitter))
+
+    async def _is_leader(self) -> bool:
+        try:
+            leader = await db.hold_advisory_lock(self.leader_lock)
+        except Exception as e:
+            logger.warning("scheduler: leader election failed: %s", e)
+            leader = False
+        if leader != self._leader:
+            logger.info("scheduler: %s leadership", "took" if leader else "lost")
+            self._leader = leader
+        return leader
+
+    async def run_once(self, name: str) -> None:
+        """Run one job now (if this replica may); never raises."""
+        job = self._jobs[name]
+        if job.leader_only and not await self._is_leader():
+            job.totals["skipped"] += 1
+            return
+        started = time.perf_counter()
+        try:
+            rows = await job.fn()
+        except Exception as e:
+            job.totals["failed"] += 1
+            job.last_error = str(e)
+            logger.warning("scheduler: job %s failed: %s", name, e)
+            return
+        job.totals["runs"] += 1
+        job.totals["rows"] += rows or 0
+        job.last_rows = rows
+        job.last_run_at = datetime.now(UTC)
+        job.last_run_ms = round((time.perf_counter() - started) * 1000, 1)
+        if rows:
+            logger.info("scheduler: job %s affected %d rows in %.1f ms", name, rows, job.last_run_ms)
+
+    def stats(self) -> dict[str, Any]:
+        """Leadership and per-job counters for this process (GET /api/admin/jobs)."""
+        return {
+            "leader": self._leader,
+            "running": bool(self._tasks),
+            "jobs": {
+                job.name: {
+                    "interval_s": job.interval_s,
+                    "leader_only": job.leader_only,
+                    "last_run_at": job.last_run_at.isoformat() if job.last_run_at else None,
+                    "last_run_ms": job.last_run_ms,
+                    "last_rows": job.last_rows,
+                    "last_error": job.last_error,
+                    **job.totals,
+                }
+                for job in self._jobs.values()
+            },
+        }
+
+
+# Singleton instance
+scheduler = JobScheduler()
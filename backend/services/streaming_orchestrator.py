@@ -7,7 +7,6 @@ for WebSocket-based interactions.
 
 from __future__ import annotations
 
-import asyncio
 import copy
 import logging
 import time
@@ -16,13 +15,14 @@ from typing import Any
 from uuid import UUID
 
 from backend.services.anthropic_client import AnthropicClient
-from backend.services.classifier import classify, get_tier_models
+from backend.services.classifier import classify, get_tier_models, get_tier_output_modes
 from backend.services.escalation import needs_escalation
+from backend.services.jsonl_parser import JSONLParser
 from backend.services.prompt_builder import build_messages, build_system_blocks
 from backend.services.telemetry import TurnRecorder
 from backend.services.tool_defs import TOOLS
-from backend.services.tool_utils import tool_use_to_reducer_event
-from engine.kernel import apply
+from backend.services.tool_utils import BATCH_TOOLS, tool_use_to_reducer_events
+from engine.kernel import apply, apply_batch
 
 logger = logging.getLogger(__name__)
 
@@ -93,7 +93,9 @@ class StreamingOrchestrator:
         """
         Run a single LLM call for a tier and collect results.
 
-        Both L3 and L4 receive the full TOOLS set.
+        Both L3 and L4 receive the full TOOLS set. Tiers configured for the
+        "jsonl" output mode get no tools; the model writes compact JSONL events
+        as text and each line is applied to the snapshot as soon as it completes.
 
         Args:
             tier: Tier to run (L3 or L4)
@@ -105,7 +107,7 @@ class StreamingOrchestrator:
         Returns:
             {
                 "text_blocks": [{"text": "..."}],
-                "tool_calls": [{"name": "mutate_entity", "input": {...}}],
+                "tool_calls": [{"name": "mutate_entity", "input": {...}}],  # batched/JSONL calls add "events"
                 "all_raw_tools": [...],  # includes voice for conversation history
                 "usage": {"input_tokens": ..., "output_tokens": ..., "cache_read": ..., "cache_creation": ...},
                 "ttfc_ms": ...,
@@ -117,10 +119,12 @@ class StreamingOrchestrator:
         model = get_tier_models()[tier]
 
         # Build system prompt blocks
-        system_blocks = build_system_blocks(tier, snapshot)
+        output_mode = get_tier_output_modes()[tier]
+        system_blocks = build_system_blocks(tier, snapshot, output_mode=output_mode)
 
-        # Both tiers get full tool set (query-only enforced by prompt)
-        tools = TOOLS
+        # Both tiers get full tool set (query-only enforced by prompt); JSONL mode streams plain text
+        tools = TOOLS if output_mode == "tools" else None
+        parser = JSONLParser(expand=False) if output_mode == "jsonl" else None
 
         # Use temperature 0 by default for deterministic responses
         if temperature is None:
@@ -135,10 +139,30 @@ class StreamingOrchestrator:
         voice_texts: list[str] = []  # Text from voice tool calls only
         tool_calls: list[dict[str, Any]] = []
         all_raw_tools: list[dict[str, Any]] = []
+        # Set by a JSONL escalate line; needs_escalation reads it directly
+        escalation_reason: str | None = None
 
         # Working snapshot for this tier
         working_snapshot = copy.deepcopy(snapshot)
 
+        def apply_jsonl_line(event: dict[str, Any]) -> None:
+            nonlocal working_snapshot, escalation_reason
+            if event.get("t") == "voice":
+                voice_text = event.get("text", "")
+                voice_texts.append(voice_text)
+                text_blocks.append({"text": voice_text})
+                return
+            result = apply(working_snapshot, event)
+            if not result.accepted:
+                return
+            if result.signal is None:
+                working_snapshot = result.snapshot
+                tool_calls.append(
+                    {"name": "jsonl", "input": event, "events": [event], "seqs": [working_snapshot["_sequence"]]}
+                )
+            elif result.signal["type"] == "escalate":
+                escalation_reason = str(event.get("reason") or "")
+
         # Stream from LLM
         async for stream_event in self.client.stream(
             messages=messages,
@@ -151,6 +175,13 @@ class StreamingOrchestrator:
             if t_first_content is None:
                 t_first_content = time.time()
 
+            # JSONL mode: raw text chunks, apply each line as it completes
+            if parser is not None:
+                if isinstance(stream_event, str):
+                    for event in parser.feed(stream_event):
+                        apply_jsonl_line(event)
+                continue
+
             # Handle tool_use events
             if isinstance(stream_event, dict) and stream_event.get("type") == "tool_use":
                 tool_name = stream_event.get("name", "")
@@ -165,11 +196,12 @@ class StreamingOrchestrator:
                     }
                 )
 
-                # Convert tool call to reducer event
-                event = tool_use_to_reducer_event(tool_name, tool_input)
-                if event is None:
+                # Convert tool call to reducer events (batched tools expand to many)
+                events = tool_use_to_reducer_events(tool_name, tool_input)
+                if not events:
                     continue
 
+                event = events[0]
                 event_type = event.get("t", "")
 
                 # Handle voice events (don't reduce, just collect)
@@ -179,12 +211,29 @@ class StreamingOrchestrator:
                     text_blocks.append({"text": voice_text})  # Also log for telemetry
                     continue
 
+                # Batched call: one snapshot copy for all rows, keep only accepted events
+                if tool_name in BATCH_TOOLS:
+                    seq = working_snapshot.get("_sequence", 0)
+                    working_snapshot, batch_results = apply_batch(working_snapshot, events)
+                    accepted, seqs = [], []
+                    for e, r in zip(events, batch_results, strict=True):
+                        if r.accepted:
+                            # Every accepted mutation advances _sequence by one; signals don't
+                            seq += r.signal is None
+                            accepted.append(e)
+                            seqs.append(seq)
+                    if accepted:
+                        tool_calls.append({"name": tool_name, "input": tool_input, "events": accepted, "seqs": seqs})
+                    continue
+
                 # Apply event to working snapshot through kernel
                 result = apply(working_snapshot, event)
 
                 if result.accepted:
                     working_snapshot = result.snapshot
-                    tool_calls.append({"name": tool_name, "input": tool_input})
+                    tool_calls.append(
+                        {"name": tool_name, "input": tool_input, "seqs": [working_snapshot.get("_sequence", 0)]}
+                    )
 
             # Handle text events - text between tool calls is voice output
             elif isinstance(stream_event, dict) and stream_event.get("type") == "text":
@@ -192,6 +241,11 @@ class StreamingOrchestrator:
                 if text.strip():
                     text_blocks.append({"text": text})
 
+        # Apply a final JSONL line that arrived without a trailing newline
+        if parser is not None:
+            for event in parser.flush():
+                apply_jsonl_line(event)
+
         # Stream complete — gather metrics
         t_complete = time.time()
         ttfc_ms = int((t_first_content - t_start) * 1000) if t_first_content else 0
@@ -212,6 +266,7 @@ class StreamingOrchestrator:
             "voice_texts": voice_texts,
             "tool_calls": tool_calls,
             "all_raw_tools": all_raw_tools,
+            "escalation_reason": escalation_reason,
             "usage": {
                 "input_tokens": usage.get("input_tokens", 0),
                 "output_tokens": usage.get("output_tokens", 0),
@@ -268,7 +323,7 @@ class StreamingOrchestrator:
                     message=content,
                 )
                 # Build system prompt to capture it
-                system_blocks = build_system_blocks(tier, self.snapshot)
+                system_blocks = build_system_blocks(tier, self.snapshot, output_mode=get_tier_output_modes()[tier])
                 system_prompt = "\n\n".join(
                     block.get("text", "") for block in system_blocks if block.get("type") == "text"
                 )
@@ -283,6 +338,7 @@ class StreamingOrchestrator:
             "tier": tier,
             "model": self.model,
             "reason": classification.reason,
+            "output_mode": get_tier_output_modes()[tier],
         }
 
         # Save original snapshot for potential escalation
@@ -298,7 +354,7 @@ class StreamingOrchestrator:
                 "type": "meta.escalation",
                 "from_tier": "L3",
                 "to_tier": "L4",
-                "reason": "L3 signaled structural work or complex query",
+                "reason": result.get("escalation_reason") or "L3 signaled structural work or complex query",
             }
 
             # Pass 1: L4 creates structure with original snapshot, temperature 0
@@ -366,11 +422,18 @@ class StreamingOrchestrator:
                 turn_recorder._ttfc_ms = result["ttfc_ms"]
 
         # Yield tool_calls as events
+        mutation_count = 0
+        final_seq = self.snapshot.get("_sequence", 0)
         for tc in result["tool_calls"]:
-            # Convert tool call to reducer event for yielding
-            event = tool_use_to_reducer_event(tc["name"], tc["input"])
-            if event and event.get("t") != "voice":
-                yield {"type": "event", "event": event, "snapshot": self.snapshot}
+            # Batched calls carry their accepted events; single calls are converted here
+            events = tc.get("events") or tool_use_to_reducer_events(tc["name"], tc["input"])
+            seqs = tc.get("seqs", [])
+            for i, event in enumerate(events):
+                if event.get("t") != "voice":
+                    mutation_count += 1
+                    # seq is the _sequence right after this event; snapshot is the final state
+                    seq = seqs[i] if i < len(seqs) else final_seq
+                    yield {"type": "event", "event": event, "snapshot": self.snapshot, "seq": seq}
 
         # Yield voice tool output only (not raw text_blocks)
         for text in result["voice_texts"]:
@@ -378,7 +441,6 @@ class StreamingOrchestrator:
                 yield {"type": "voice", "text": text}
 
         # Fallback: if no voice was sent, generate a default message
-        mutation_count = len(result["tool_calls"])
         has_voice = any(t.strip() for t in result["voice_texts"])
         if not has_voice and mutation_count > 0:
             fallback_text = f"{mutation_count} update{'s' if mutation_count != 1 else ''} applied."
@@ -387,7 +449,7 @@ class StreamingOrchestrator:
         # Compute cost
         cost_usd = calculate_cost("L3" if tier == "L3->L4->L3" else tier, result["usage"])
 
-        # Set usage metrics and finalize TurnRecorder (fire and forget)
+        # Set usage metrics, count the turn and queue its record (written in the background by telemetry_sink)
         if turn_recorder:
             turn_recorder.set_usage(
                 input_tokens=result["usage"]["input_tokens"],
@@ -395,8 +457,7 @@ class StreamingOrchestrator:
                 cache_read=result["usage"]["cache_read"],
                 cache_creation=result["usage"]["cache_creation"],
             )
-            # Persist asynchronously without blocking response
-            asyncio.create_task(turn_recorder.finish())
+            await turn_recorder.finish()
 
         # Yield stream.end with metrics
         yield {
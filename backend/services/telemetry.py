@@ -8,7 +8,7 @@ Usage:
     tracker.mark_first_content()
     tracker.set_tokens(input_tokens=500, output_tokens=120)
     tracker.set_reducer_stats(emitted=5, accepted=4, rejected=1)
-    await tracker.finish()   # persists to telemetry table
+    tracker.finish()         # queues the event for the telemetry table (services/telemetry_sink.py)
 """
 
 from __future__ import annotations
@@ -22,6 +22,7 @@ from backend.models.telemetry import AideTelemetry, TelemetryEvent, TokenUsage,
 from backend.repos import telemetry_repo
 from backend.repos.aide_repo import AideRepo
 from backend.repos.user_repo import UserRepo
+from backend.services.telemetry_sink import telemetry_sink
 
 # ---------------------------------------------------------------------------
 # Pricing (per 1M tokens, as of 2026)
@@ -128,11 +129,11 @@ class LLMCallTracker:
         """Record an error string."""
         self.event.error = error
 
-    async def finish(self) -> int:
-        """Finalize timing and persist the event. Returns the row id."""
+    def finish(self) -> bool:
+        """Finalize timing and queue the event for writing. Returns False if the queue dropped it."""
         if self._start_time is not None:
             self.event.ttc_ms = int((time.perf_counter() - self._start_time) * 1000)
-        return await telemetry_repo.record_event(self.event)
+        return telemetry_sink.add_event(self.event)
 
 
 # ---------------------------------------------------------------------------
@@ -226,10 +227,18 @@ class TurnRecorder:
         """Set validation result."""
         self._validation = {"passed": passed, "issues": issues or []}
 
-    async def finish(self) -> UUID | None:
-        """Finalize and persist the turn. Returns row ID or None if missing data."""
+    async def finish(self) -> bool:
+        """
+        Count the turn against the user and queue its record for writing.
+
+        The turn count backs the shadow-user trial quota, so it is written here,
+        synchronously; only the telemetry record goes through the droppable sink.
+
+        Returns:
+            False if usage was never set or the queue dropped the turn record
+        """
         if not self._usage:
-            return None
+            return False
 
         self._ttc_ms = int((time.perf_counter() - self._start_time) * 1000)
         if self._ttfc_ms is None:
@@ -249,13 +258,8 @@ class TurnRecorder:
             validation=self._validation,
         )
 
-        row_id = await telemetry_repo.insert_turn(self._user_id, self._aide_id, turn)
-
-        # Increment user's turn count
-        user_repo = UserRepo()
-        await user_repo.increment_turns(self._user_id)
-
-        return row_id
+        await UserRepo().increment_turns(self._user_id)
+        return telemetry_sink.add_turn(self._user_id, self._aide_id, turn)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,190 @@
+"""
+In-process telemetry sink: a bounded queue written to Postgres in batches.
+
+`LLMCallTracker.finish`, `TurnRecorder.finish` and the direct-edit flush in
+aide_sessions used to write each row as it happened, in fire-and-forget
+tasks: one pooled connection per event, and for every turn an INSERT plus
+a separate `increment_turns` transaction. Under load that competed with
+user requests for the 20-connection pool, with no bound on how many were
+in flight.
+
+They now hand rows to the sink instead, which:
+
+- queues them in memory, up to TELEMETRY_QUEUE_MAX rows; past that, new
+  rows are dropped and counted (telemetry never blocks or slows a turn),
+- writes a batch with `telemetry_repo.copy_batch` (COPY, one connection,
+  one transaction) every TELEMETRY_FLUSH_MS, or as soon as
+  TELEMETRY_BATCH_ROWS rows are waiting,
+- drains the queue on shutdown (`stop()`),
+- reports its counters through `stats()` (GET /api/admin/telemetry-sink).
+
+A batch that fails to write is logged and counted, not retried. Nothing
+that must not be lost goes through here: the user's turn count (the trial
+quota) is incremented by `TurnRecorder.finish` directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from backend.config import settings
+from backend.models.telemetry import TelemetryEvent, TurnTelemetry
+from backend.repos import telemetry_repo
+
+logger = logging.getLogger(__name__)
+
+
+class TelemetrySink:
+    """Bounded, batching write-behind queue for telemetry events and turns."""
+
+    def __init__(self, max_rows: int, batch_rows: int, flush_ms: int) -> None:
+        """
+        Args:
+            max_rows: Rows held in memory before new ones are dropped
+            batch_rows: Rows per COPY batch; this many waiting triggers a flush
+            flush_ms: Longest a row waits before it is written
+        """
+        self.max_rows = max_rows
+        self.batch_rows = max(1, batch_rows)
+        self.flush_ms = flush_ms
+        self._events: deque[tuple[datetime, TelemetryEvent]] = deque()
+        self._turns: deque[tuple[datetime, UUID, UUID, TurnTelemetry]] = deque()
+        self._wake = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._full = False
+        self._totals = {
+            "written_events": 0,
+            "written_turns": 0,
+            "skipped_turns": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+        self._last_flush_ms: float | None = None
+
+    @property
+    def depth(self) -> int:
+        """Rows waiting to be written."""
+        return len(self._events) + len(self._turns)
+
+    def add_event(self, event: TelemetryEvent) -> bool:
+        """
+        Queue a telemetry event.
+
+        Args:
+            event: Event for the telemetry table
+
+        Returns:
+            False if the queue was full and the event was dropped
+        """
+        return self._offer(self._events, (datetime.now(UTC), event))
+
+    def add_events(self, events: list[TelemetryEvent]) -> None:
+        """Queue several telemetry events (e.g. a flushed batch of direct edits)."""
+        for event in events:
+            self.add_event(event)
+
+    def add_turn(self, user_id: UUID, aide_id: UUID, turn: TurnTelemetry) -> bool:
+        """
+        Queue a turn record for aide_turn_telemetry.
+
+        Args:
+            user_id: User who took the turn
+            aide_id: Aide the turn was on
+            turn: Turn telemetry for aide_turn_telemetry
+
+        Returns:
+            False if the queue was full and the turn was dropped
+        """
+        return self._offer(self._turns, (datetime.now(UTC), user_id, aide_id, turn))
+
+    def _offer(self, queue: deque, item: tuple) -> bool:
+        if self.depth >= self.max_rows:
+            if not self._full:
+                logger.warning("telemetry_sink: queue full (%d rows), dropping new rows", self.max_rows)
+            self._full = True
+            self._totals["dropped"] += 1
+            return False
+        self._full = False
+        queue.append(item)
+        if self.depth >= self.batch_rows:
+            self._wake.set()
+        return True
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            # Holding the lock means the task is not mid-write, so no popped batch is lost
+            async with self._flushing:
+                task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the rows queued so far, in batches of at most batch_rows."""
+        async with self._flushing:
+            remaining = self.depth
+            while remaining > 0 and self.depth:
+                remaining -= await self._write_batch()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_ms / 1000)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def _write_batch(self) -> int:
+        """Pop and write one batch. Returns the number of rows taken off the queue."""
+        events = [self._events.popleft() for _ in range(min(self.batch_rows, len(self._events)))]
+        turns = [self._turns.popleft() for _ in range(min(self.batch_rows - len(events), len(self._turns)))]
+        started = time.perf_counter()
+        try:
+            stored = await telemetry_repo.copy_batch(events, turns)
+        except Exception as e:
+            self._totals["failed"] += len(events) + len(turns)
+            logger.warning("telemetry_sink: dropped batch of %d rows: %s", len(events) + len(turns), e)
+        else:
+            self._totals["written_events"] += len(events)
+            self._totals["written_turns"] += stored
+            self._totals["skipped_turns"] += len(turns) - stored
+            self._totals["batches"] += 1
+            self._last_flush_ms = round((time.perf_counter() - started) * 1000, 1)
+        return len(events) + len(turns)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and write counters for this process (GET /api/admin/telemetry-sink)."""
+        return {
+            "queued_events": len(self._events),
+            "queued_turns": len(self._turns),
+            "max_rows": self.max_rows,
+            "running": self._task is not None,
+            "last_flush_ms": self._last_flush_ms,
+            **self._totals,
+        }
+
+
+# Singleton instance
+telemetry_sink = TelemetrySink(
+    max_rows=settings.TELEMETRY_QUEUE_MAX,
+    batch_rows=settings.TELEMETRY_BATCH_ROWS,
+    flush_ms=settings.TELEMETRY_FLUSH_MS,
+)
@@ -8,8 +8,25 @@ come after all tools for them to be included in the cached prefix.
 Both L3 and L4 receive the full tool set. L4 handles first-message schema
 synthesis (needs mutate_entity, set_relationship) AND queries. The query-only
 behavior is enforced by the L4 system prompt, not by withholding tools.
+
+mutate_entities is the batched form of mutate_entity: one call carries a
+shared parent/display plus N rows, so a 40-row table costs one tool_use
+block instead of 40. Output tokens dominate latency on big edits.
 """
 
+DISPLAY_HINTS = [
+    "page",
+    "section",
+    "card",
+    "list",
+    "table",
+    "checklist",
+    "grid",
+    "metric",
+    "text",
+    "image",
+]
+
 TOOLS = [
     {
         "name": "mutate_entity",
@@ -35,24 +52,64 @@ TOOLS = [
                 },
                 "display": {
                     "type": "string",
-                    "enum": [
-                        "page",
-                        "section",
-                        "card",
-                        "list",
-                        "table",
-                        "checklist",
-                        "grid",
-                        "metric",
-                        "text",
-                        "image",
-                    ],
+                    "enum": DISPLAY_HINTS,
                 },
                 "props": {"type": "object"},
             },
             "required": ["action"],
         },
     },
+    {
+        "name": "mutate_entities",
+        "description": (
+            "Create, update, or remove many entities in one call. parent and display apply to every row. "
+            "Use instead of repeated mutate_entity calls when touching 3+ siblings (e.g. table rows)."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["create", "update", "remove"],
+                },
+                "parent": {
+                    "type": "string",
+                    "description": "'root' or parent entity ID, shared by all rows (for create)",
+                },
+                "display": {
+                    "type": "string",
+                    "enum": DISPLAY_HINTS,
+                    "description": "Display hint shared by all rows (for create)",
+                },
+                "entities": {
+                    "type": "array",
+                    "description": "Row objects: {id, props} for create, {ref, props} for update/remove",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "ref": {"type": "string"},
+                            "props": {"type": "object"},
+                        },
+                    },
+                },
+                "columns": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Columnar form: names for each position in rows. Include 'id' (create) or 'ref' "
+                        "(update/remove); every other column is a prop."
+                    ),
+                },
+                "rows": {
+                    "type": "array",
+                    "items": {"type": "array"},
+                    "description": "Columnar form: one array of values per entity, aligned with columns",
+                },
+            },
+            "required": ["action"],
+        },
+    },
     {
         "name": "set_relationship",
         "description": "Set, remove, or constrain a relationship between entities.",
@@ -11,6 +11,111 @@ from __future__ import annotations
 import json
 from typing import Any
 
+# Tools whose single call expands into many reducer events
+BATCH_TOOLS = {"mutate_entities"}
+
+# Columnar mutate_entities columns that set the row's entity fields rather than its props
+_ROW_KEYS = ("id", "ref", "parent", "display")
+
+
+def _parse_props(props: Any) -> dict[str, Any]:
+    """Normalize a props value that may arrive as a JSON string."""
+    if isinstance(props, str):
+        try:
+            props = json.loads(props)
+        except json.JSONDecodeError:
+            return {}
+    return props if isinstance(props, dict) else {}
+
+
+def _batch_rows(tool_input: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Normalize mutate_entities rows to [{"id"/"ref": ..., "props": {...}}].
+
+    Accepts object rows (entities=[{id, props}]) and columnar rows
+    (columns=["id", "name"], rows=[["a", "Alice"]]). Both may appear together;
+    object rows come first. In columnar rows the id, ref, parent and display
+    columns override the row's entity fields; a row where any of them is not
+    a string (e.g. [[1, "Alice"]]) names no entity and is dropped.
+    """
+    rows: list[dict[str, Any]] = []
+
+    entities = tool_input.get("entities") or []
+    if isinstance(entities, str):
+        try:
+            entities = json.loads(entities)
+        except json.JSONDecodeError:
+            entities = []
+    for item in entities:
+        if isinstance(item, dict):
+            rows.append(item)
+
+    columns = tool_input.get("columns") or []
+    for values in tool_input.get("rows") or []:
+        if not isinstance(values, list):
+            continue
+        row: dict[str, Any] = {}
+        props: dict[str, Any] = {}
+        for column, value in zip(columns, values, strict=False):
+            if column in _ROW_KEYS:
+                # null leaves the shared parent/display in place
+                if value is not None:
+                    row[column] = value
+            else:
+                props[column] = value
+        if not all(isinstance(value, str) for value in row.values()):
+            continue
+        row["props"] = props
+        rows.append(row)
+
+    return rows
+
+
+def tool_use_to_reducer_events(tool_name: str, tool_input: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Convert a tool_use call to zero or more reducer events.
+
+    Single-entity tools map to one event (see tool_use_to_reducer_event).
+    mutate_entities expands to one entity.* event per row, each carrying the
+    shared parent/display:
+
+      mutate_entities(action="create", parent="roster", display="card",
+                      columns=["id", "name"], rows=[["p1", "Ann"], ["p2", "Bo"]])
+        → [{"t": "entity.create", "id": "p1", "parent": "roster", "display": "card", "p": {"name": "Ann"}},
+           {"t": "entity.create", "id": "p2", "parent": "roster", "display": "card", "p": {"name": "Bo"}}]
+
+    Apply the result with engine.kernel.apply_batch to pay for one snapshot copy.
+    """
+    if tool_name not in BATCH_TOOLS:
+        event = tool_use_to_reducer_event(tool_name, tool_input)
+        return [event] if event is not None else []
+
+    action = tool_input.get("action", "")
+    events: list[dict[str, Any]] = []
+    for row in _batch_rows(tool_input):
+        event: dict[str, Any] = {"t": f"entity.{action}"}
+        # Rows may carry either key; accept "id" for updates and "ref" for creates
+        if action == "create":
+            entity_id = row.get("id", row.get("ref"))
+            if entity_id is not None:
+                event["id"] = entity_id
+            # Shared parent/display; a row may override either
+            parent = row.get("parent", tool_input.get("parent"))
+            if parent is not None:
+                event["parent"] = parent
+            display = row.get("display", tool_input.get("display"))
+            if display is not None:
+                event["display"] = display
+        else:
+            ref = row.get("ref", row.get("id"))
+            if ref is not None:
+                event["ref"] = ref
+        props = _parse_props(row.get("props", {}))
+        if props and action != "remove":
+            event["p"] = props
+        events.append(event)
+    return events
+
 
 def tool_use_to_reducer_event(tool_name: str, tool_input: dict[str, Any]) -> dict[str, Any] | None:
     """
@@ -21,6 +126,9 @@ def tool_use_to_reducer_event(tool_name: str, tool_input: dict[str, Any]) -> dic
       mutate_entity(action="update", ...) → {"t": "entity.update", ...}
       set_relationship(action="set", ...) → {"t": "rel.set", ...}
       voice(text="...") → {"t": "voice", "text": "..."}
+
+    Batched tools (mutate_entities) return None here — use
+    tool_use_to_reducer_events to expand them.
     """
     if tool_name == "mutate_entity":
         action = tool_input.get("action", "")
@@ -37,13 +145,7 @@ def tool_use_to_reducer_event(tool_name: str, tool_input: dict[str, Any]) -> dic
             event["display"] = tool_input["display"]
 
         # Handle props - also handle title directly for prompt compatibility
-        props = tool_input.get("props", {})
-        # Parse props if it's a JSON string
-        if isinstance(props, str):
-            try:
-                props = json.loads(props)
-            except json.JSONDecodeError:
-                props = {}
+        props = _parse_props(tool_input.get("props", {}))
         if "title" in tool_input:
             props["title"] = tool_input["title"]
         if props:
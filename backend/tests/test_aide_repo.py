@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 
+from backend import db
 from backend.models.aide import CreateAideRequest, UpdateAideRequest
+from backend.repos import aide_repo
 from backend.repos.aide_repo import AideRepo
+from backend.repos.snapshot_cache import snapshot_cache
+from engine.kernel import apply_batch, empty_snapshot
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
@@ -73,6 +79,21 @@ async def test_list_for_user(test_user_id, second_user_id):
     assert user_b_aides[0].user_id == second_user_id
 
 
+async def test_list_and_summary_skip_state(test_user_id):
+    """Listings and summaries carry metadata only."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Summary"))
+    await repo.update_state(test_user_id, aide.id, {"entities": {"a": {"props": {"x": 1}}}}, [{"t": "x"}])
+
+    listed = [a for a in await repo.list_for_user(test_user_id) if a.id == aide.id]
+    summary = await repo.get_summary(test_user_id, aide.id)
+
+    assert [a.title for a in listed] == ["Summary"]
+    assert summary.title == "Summary"
+    assert not hasattr(summary, "state")
+    assert not hasattr(listed[0], "event_log")
+
+
 async def test_update_aide(test_user_id):
     """Test updating an aide."""
     repo = AideRepo()
@@ -192,6 +213,163 @@ async def test_update_state(test_user_id):
     assert updated.event_log == event_log
 
 
+async def test_update_state_skips_unchanged_state(test_user_id):
+    """Saving the stored state again writes nothing: version, updated_at and xmin stay put."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Same"))
+    state, _ = apply_batch(empty_snapshot(), [{"t": "entity.create", "id": "page", "display": "page", "p": {}}])
+
+    first = await repo.update_state(test_user_id, aide.id, state, [], title="Same")
+    async with db.system_conn() as conn:
+        xmin = await conn.fetchval("SELECT xmin::text FROM aides WHERE id = $1", aide.id)
+    again = await repo.update_state(test_user_id, aide.id, state, [], title="Same")
+
+    assert first.version == aide.version + 1
+    assert again.version == first.version
+    assert again.updated_at == first.updated_at
+    assert again.state == state
+    async with db.system_conn() as conn:
+        assert await conn.fetchval("SELECT xmin::text FROM aides WHERE id = $1", aide.id) == xmin
+
+    # A new title alone is a change
+    renamed = await repo.update_state(test_user_id, aide.id, state, [], title="Renamed")
+    assert renamed.version == first.version + 1
+    assert renamed.title == "Renamed"
+
+
+async def test_update_state_always_writes_states_built_outside_the_kernel(test_user_id):
+    """A state at _sequence 0 can't be matched by sequence, so saving it always writes."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Rest"))
+    state = {**empty_snapshot(), "entities": {"page": {"display": "page", "props": {}}}}
+
+    first = await repo.update_state(test_user_id, aide.id, state, [], title="Rest")
+    again = await repo.update_state(test_user_id, aide.id, state, [], title="Rest")
+
+    assert again.version == first.version + 1
+
+
+async def test_update_state_expected_version(test_user_id):
+    """A write based on an old version raises StateConflict and leaves the stored state alone."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Versions"))
+    state, _ = apply_batch(empty_snapshot(), [{"t": "entity.create", "id": "page", "display": "page", "p": {}}])
+    edited, _ = apply_batch(state, [{"t": "entity.update", "ref": "page", "p": {"title": "Edited"}}])
+
+    written = await repo.update_state(test_user_id, aide.id, state, [], expected_version=aide.version)
+    assert written.version == aide.version + 1
+
+    with pytest.raises(aide_repo.StateConflict) as conflict:
+        await repo.update_state(test_user_id, aide.id, edited, [], expected_version=aide.version)
+    assert conflict.value.current == written.version
+    snapshot_cache.invalidate(aide.id)
+    assert (await repo.get(test_user_id, aide.id)).state == state
+
+    updated = await repo.update_state(test_user_id, aide.id, edited, [], expected_version=written.version)
+    assert updated.version == written.version + 1
+    assert updated.state == edited
+
+
+async def _entity_rows(aide_id) -> dict:
+    async with db.system_conn() as conn:
+        rows = await conn.fetch(
+            "SELECT entity_id, seq, xmin::text AS xmin FROM aide_entities WHERE aide_id = $1",
+            aide_id,
+        )
+    return {r["entity_id"]: (r["seq"], r["xmin"]) for r in rows}
+
+
+async def test_entity_storage_round_trips_and_writes_only_changes(test_user_id):
+    """Per-entity storage reads back the same state and rewrites only changed entities."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Rows"))
+    events = [{"t": "entity.create", "id": "page", "display": "page", "p": {"title": "T"}}]
+    events += [{"t": "entity.create", "id": f"item_{i}", "parent": "page", "p": {"n": i}} for i in range(5)]
+    state, _ = apply_batch(empty_snapshot(), events)
+
+    with patch.object(aide_repo.settings, "AIDE_STATE_STORAGE", "entities"):
+        await repo.update_state(test_user_id, aide.id, state, [])
+        before = await _entity_rows(aide.id)
+
+        edited, _ = apply_batch(state, [{"t": "entity.update", "ref": "item_3", "p": {"n": 33}}])
+        written = await repo.update_state(test_user_id, aide.id, edited, [])
+        after = await _entity_rows(aide.id)
+
+    assert written.state == edited
+    assert (await repo.get(test_user_id, aide.id)).state == edited
+    rewritten = {entity_id for entity_id in after if after[entity_id] != before[entity_id]}
+    # item_3 changed; its parent is rewritten with it, nothing else is
+    assert rewritten == {"item_3", "page"}
+
+
+async def test_entity_storage_switches_back_to_document(test_user_id):
+    """An aide stored per entity returns to a single document on the next document-mode write."""
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Rows"))
+    state, _ = apply_batch(empty_snapshot(), [{"t": "entity.create", "id": "page", "display": "page", "p": {}}])
+
+    with patch.object(aide_repo.settings, "AIDE_STATE_STORAGE", "entities"):
+        await repo.update_state(test_user_id, aide.id, state, [])
+    await repo.update_state(test_user_id, aide.id, state, [])
+
+    assert await _entity_rows(aide.id) == {}
+    assert (await repo.get(test_user_id, aide.id)).state == state
+
+
+async def test_compressed_storage_round_trips_without_inflating_summaries(test_user_id):
+    """States over AIDE_STATE_COMPRESS_MIN_BYTES are stored as a zstd blob and read back whole."""
+    pytest.importorskip("zstandard")
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Big"))
+    events = [{"t": "entity.create", "id": "page", "display": "page", "p": {}}]
+    events += [{"t": "entity.create", "id": f"item_{i}", "parent": "page", "p": {"n": i}} for i in range(50)]
+    state, _ = apply_batch(empty_snapshot(), events)
+
+    with patch.object(aide_repo.settings, "AIDE_STATE_COMPRESS_MIN_BYTES", 1024):
+        written = await repo.update_state(test_user_id, aide.id, state, [])
+
+    async with db.system_conn() as conn:
+        row = await conn.fetchrow("SELECT state, state_storage, state_format FROM aides WHERE id = $1", aide.id)
+    assert row["state_storage"] == "compressed"
+    assert row["state"]["entities"] == {}
+    assert row["state_format"] == 1
+    assert written.state == state
+    snapshot_cache.invalidate(aide.id)
+    assert (await repo.get(test_user_id, aide.id)).state == state
+    assert await repo.get_sequence(test_user_id, aide.id) == state["_sequence"]
+    assert [a.id for a in await repo.list_for_user(test_user_id)] == [aide.id]
+
+
+async def test_compress_states_converts_existing_documents(test_user_id):
+    """The background conversion moves large document rows to the compressed layout and back."""
+    pytest.importorskip("zstandard")
+    repo = AideRepo()
+    aide = await repo.create(test_user_id, CreateAideRequest(title="Big"))
+    events = [{"t": "entity.create", "id": f"item_{i}", "parent": "root", "p": {"n": i}} for i in range(50)]
+    state, _ = apply_batch(empty_snapshot(), events)
+    await repo.update_state(test_user_id, aide.id, state, [])
+
+    assert await repo.compress_states(min_bytes=1) >= 1
+    snapshot_cache.invalidate(aide.id)
+    assert (await repo.get(test_user_id, aide.id)).state == state
+
+    assert await repo.decompress_states() >= 1
+    snapshot_cache.invalidate(aide.id)
+    assert (await repo.get(test_user_id, aide.id)).state == state
+
+
+async def test_changed_entities_includes_parents():
+    """Only entities stamped after the stored sequence are written, with their parents."""
+    entities = {
+        "page": {"parent": "root", "_created_seq": 1, "_updated_seq": 1},
+        "a": {"parent": "page", "_created_seq": 2, "_updated_seq": 2},
+        "b": {"parent": "page", "_created_seq": 3, "_updated_seq": 5},
+        "c": {"parent": "a", "_created_seq": 4, "_updated_seq": 4, "_removed": True, "_removed_seq": 6},
+    }
+    assert set(aide_repo._changed_entities(entities, 4)) == {"b", "c", "page", "a"}
+    assert set(aide_repo._changed_entities(entities, 6)) == set()
+
+
 async def test_count_for_user(test_user_id, second_user_id):
     """Test counting aides respects RLS."""
     repo = AideRepo()
@@ -0,0 +1,586 @@
+"""
+Tests for backend/services/aide_sessions.py — shared per-aide sessions.
+
+Uses fake sockets and patches the advisory lock / repo so no database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+from uuid import UUID, uuid4
+
+import pytest
+
+from backend.models.telemetry import TelemetryEvent
+from backend.services import aide_sessions, conversation_history
+from backend.services.aide_sessions import AideSessionRegistry
+from backend.services.hydration import delta_frames, legacy_frames, snapshot_frames
+from engine.kernel import apply, empty_snapshot
+
+
+class FakeSocket:
+    """Stands in for a connection's OutboundQueue; records frames as they are queued."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.sent: list[dict] = []
+        self.fail = fail
+
+    async def send_text(self, text: str, key=None, seq=None) -> None:
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(json.loads(gzip.decompress(data)))
+
+
+def _snapshot_with(entity_id: str) -> dict:
+    return apply(empty_snapshot(), {"t": "entity.create", "id": entity_id, "parent": "root"}).snapshot
+
+
+@asynccontextmanager
+async def _no_lock(key):
+    yield None
+
+
+@pytest.mark.asyncio
+async def test_sockets_on_same_aide_share_one_session():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loader = AsyncMock(return_value=_snapshot_with("a"))
+
+    s1 = await registry.join(FakeSocket(), aide_id, loader, user_id=user_id, shared=True)
+    s2 = await registry.join(FakeSocket(), aide_id, loader, user_id=user_id, shared=True)
+
+    assert s1 is s2
+    assert len(s1.sockets) == 2
+    loader.assert_awaited_once()
+    assert "a" in s1.snapshot["entities"]
+
+
+@pytest.mark.asyncio
+async def test_unshared_sessions_are_private():
+    registry = AideSessionRegistry()
+    loader = AsyncMock(return_value=empty_snapshot())
+
+    s1 = await registry.join(FakeSocket(), "new", loader)
+    s2 = await registry.join(FakeSocket(), "new", loader)
+
+    assert s1 is not s2
+    assert not s1.coordinated
+
+
+@pytest.mark.asyncio
+async def test_session_dropped_with_last_socket():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loader = AsyncMock(return_value=empty_snapshot())
+    ws1, ws2 = FakeSocket(), FakeSocket()
+
+    session = await registry.join(ws1, aide_id, loader, user_id=user_id, shared=True)
+    await registry.join(ws2, aide_id, loader, user_id=user_id, shared=True)
+    registry.leave(session, ws1)
+    assert registry.get(user_id, aide_id) is session
+    registry.leave(session, ws2)
+    assert registry.get(user_id, aide_id) is None
+
+
+@pytest.mark.asyncio
+async def test_joining_mid_turn_is_hydrated_before_receiving_deltas():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loader = AsyncMock(return_value=_snapshot_with("a"))
+    session = await registry.join(FakeSocket(), aide_id, loader, user_id=user_id, shared=True)
+    late = FakeSocket()
+
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", _no_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=None)),
+    ):
+        async with session.turn():
+            # Loaded sessions don't make a new tab wait for the running turn
+            await asyncio.wait_for(registry.join(late, aide_id, loader, user_id=user_id, shared=True), 1)
+            await session.broadcast({"type": "entity.update", "id": "a", "data": None})
+
+    types = [frame["type"] for frame in late.sent]
+    assert types[0] == "snapshot.start"
+    assert types[-2:] == ["snapshot.end", "entity.update"]
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_kept_while_another_socket_is_joining():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loaded = asyncio.Event()
+
+    async def loader(min_sequence=0):
+        await loaded.wait()
+        return empty_snapshot()
+
+    ws1, ws2 = FakeSocket(), FakeSocket()
+    session = await registry.join(ws1, aide_id, AsyncMock(return_value=empty_snapshot()), user_id=user_id, shared=True)
+    session._loaded = False
+    session.snapshot = empty_snapshot()
+    joining = asyncio.create_task(registry.join(ws2, aide_id, loader, user_id=user_id, shared=True))
+    await asyncio.sleep(0)
+
+    registry.leave(session, ws1)
+    assert registry.get(user_id, aide_id) is session
+    loaded.set()
+    assert await joining is session
+    assert session.sockets == {ws2}
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnect_catches_sessions_up():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    newer = _snapshot_with("missed")
+    ws = FakeSocket()
+    session = await registry.join(
+        ws, aide_id, AsyncMock(side_effect=[empty_snapshot(), newer]), user_id=user_id, shared=True
+    )
+
+    with patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=newer["_sequence"])):
+        registry._on_reconnect()
+        await asyncio.gather(*registry._tasks)
+
+    assert "missed" in session.snapshot["entities"]
+    assert any(frame.get("id") == "missed" for frame in ws.sent)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_socket_and_drops_dead_ones():
+    registry = AideSessionRegistry()
+    live, dead = FakeSocket(), FakeSocket(fail=True)
+    session = await registry.join(live, "new", AsyncMock(return_value=empty_snapshot()))
+    session.sockets.add(dead)
+
+    await session.broadcast({"type": "entity.update", "id": "a", "data": None})
+
+    assert live.sent == [{"type": "entity.update", "id": "a", "data": None}]
+    assert dead not in session.sockets
+
+
+@pytest.mark.asyncio
+async def test_turns_are_serialized():
+    registry = AideSessionRegistry()
+    session = await registry.join(FakeSocket(), "new", AsyncMock(return_value=empty_snapshot()))
+    order: list[str] = []
+
+    async def run(name: str) -> None:
+        async with session.turn():
+            order.append(f"{name}:start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}:end")
+
+    await asyncio.gather(run("a"), run("b"))
+
+    assert order == ["a:start", "a:end", "b:start", "b:end"]
+
+
+@pytest.mark.asyncio
+async def test_coordinated_turn_reloads_when_store_is_ahead():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    newer = _snapshot_with("from_other_replica")
+    loader = AsyncMock(side_effect=[empty_snapshot(), newer])
+    ws = FakeSocket()
+    session = await registry.join(ws, aide_id, loader, user_id=user_id, shared=True)
+
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", _no_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=newer["_sequence"])),
+    ):
+        async with session.turn():
+            assert "from_other_replica" in session.snapshot["entities"]
+
+    # The reload must not be served an older cached copy
+    loader.assert_awaited_with(newer["_sequence"])
+    assert ws.sent == legacy_frames(newer)
+
+
+@pytest.mark.asyncio
+async def test_coordinated_turn_keeps_snapshot_when_current():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loader = AsyncMock(return_value=_snapshot_with("a"))
+    session = await registry.join(FakeSocket(), aide_id, loader, user_id=user_id, shared=True)
+
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", _no_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=session.snapshot["_sequence"])),
+    ):
+        async with session.turn():
+            pass
+
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_registry_subscribes_to_snapshot_cache_writes():
+    registry = AideSessionRegistry()
+    await registry.start()
+    try:
+        assert any(cb == registry._on_change for cb, _ in aide_sessions.snapshot_cache._subscribers)
+    finally:
+        await registry.stop()
+    assert not any(cb == registry._on_change for cb, _ in aide_sessions.snapshot_cache._subscribers)
+
+
+@pytest.mark.asyncio
+async def test_save_on_other_replica_rehydrates_sockets():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    newer = _snapshot_with("b")
+    ws = FakeSocket()
+    await registry.join(ws, aide_id, AsyncMock(side_effect=[empty_snapshot(), newer]), user_id=user_id, shared=True)
+
+    # Saves at or behind what the session holds (our own, or deletes) are ignored
+    registry._on_change(UUID(aide_id), 0)
+    registry._on_change(UUID(aide_id), None)
+    assert not registry._tasks
+
+    registry._on_change(UUID(aide_id), newer["_sequence"])
+    await asyncio.gather(*registry._tasks)
+
+    assert ws.sent == legacy_frames(newer)
+
+
+@pytest.mark.asyncio
+async def test_reload_hydrates_each_socket_in_its_protocol_version():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    newer = _snapshot_with("b")
+    legacy, bulk = FakeSocket(), FakeSocket()
+    loader = AsyncMock(side_effect=[empty_snapshot(), newer])
+    session = await registry.join(legacy, aide_id, loader, user_id=user_id, shared=True)
+    await registry.join(bulk, aide_id, loader, user_id=user_id, shared=True, hydration=1)
+
+    await session.refresh(newer["_sequence"])
+
+    assert legacy.sent == legacy_frames(newer)
+    assert bulk.sent == snapshot_frames(newer)
+
+    registry.leave(session, bulk)
+    assert bulk not in session.hydration
+
+
+@pytest.mark.asyncio
+async def test_resume_at_stored_sequence_defers_loading():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    stored = _snapshot_with("a")
+    loader = AsyncMock(return_value=stored)
+
+    with patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=stored["_sequence"])):
+        session = await registry.join(
+            FakeSocket(), aide_id, loader, user_id=user_id, shared=True, hydration=1, since=stored["_sequence"]
+        )
+        again = await registry.join(
+            FakeSocket(), aide_id, loader, user_id=user_id, shared=True, hydration=1, since=stored["_sequence"]
+        )
+
+    assert again is session
+    assert not session.loaded
+    assert session.sequence == stored["_sequence"]
+    loader.assert_not_awaited()
+
+    # The first turn loads it
+    async with session.turn():
+        assert "a" in session.snapshot["entities"]
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resume_behind_store_loads_immediately():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    stored = _snapshot_with("a")
+    loader = AsyncMock(return_value=stored)
+
+    with patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=stored["_sequence"])):
+        session = await registry.join(FakeSocket(), aide_id, loader, user_id=user_id, shared=True, hydration=1, since=0)
+
+    assert session.loaded
+    loader.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_deferred_session_catches_resumed_sockets_up_on_remote_change():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    before = _snapshot_with("a")
+    for entity_id in ("b", "c"):
+        before = apply(before, {"t": "entity.create", "id": entity_id, "parent": "root"}).snapshot
+    after = apply(before, {"t": "entity.update", "ref": "a", "p": {"done": True}}).snapshot
+    ws = FakeSocket()
+
+    with patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=before["_sequence"])):
+        session = await registry.join(
+            ws,
+            aide_id,
+            AsyncMock(return_value=after),
+            user_id=user_id,
+            shared=True,
+            hydration=1,
+            since=before["_sequence"],
+        )
+    # The resume frame: nothing new since the client's sequence
+    assert ws.sent == delta_frames({"_sequence": before["_sequence"], "entities": {}}, before["_sequence"])
+    ws.sent.clear()
+
+    await session.refresh(after["_sequence"])
+
+    assert session.loaded
+    assert ws.sent == delta_frames(after, before["_sequence"])
+    assert [entity_id for entity_id, _ in ws.sent[0]["entities"]] == ["a"]
+
+
+def _edit(session, entity_id: str, value: str) -> None:
+    event = {"t": "entity.update", "ref": entity_id, "p": {"title": value}}
+    session.snapshot = apply(session.snapshot, event).snapshot
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_edits_into_one_save():
+    registry = AideSessionRegistry()
+    session = await registry.join(FakeSocket(), "new", AsyncMock(return_value=_snapshot_with("a")))
+    save = AsyncMock()
+
+    with (
+        patch.object(aide_sessions.settings, "DIRECT_EDIT_FLUSH_MS", 20),
+        patch.object(aide_sessions.telemetry_sink, "add_events") as add_events,
+    ):
+        for value in ("x", "xy", "xyz"):
+            async with session.turn(write_behind=True):
+                _edit(session, "a", value)
+                session.write_behind(save, TelemetryEvent(aide_id=uuid4(), event_type="direct_edit"))
+        save.assert_not_awaited()
+        assert session.dirty
+
+        await asyncio.sleep(0.05)
+
+    save.assert_awaited_once()
+    assert save.await_args.args[0]["entities"]["a"]["props"]["title"] == "xyz"
+    assert len(add_events.call_args.args[0]) == 3
+    assert not session.dirty
+
+
+@pytest.mark.asyncio
+async def test_pending_edits_are_flushed_before_an_llm_turn():
+    registry = AideSessionRegistry()
+    session = await registry.join(FakeSocket(), "new", AsyncMock(return_value=_snapshot_with("a")))
+    save = AsyncMock()
+
+    with patch.object(aide_sessions.settings, "DIRECT_EDIT_FLUSH_MS", 10_000):
+        async with session.turn(write_behind=True):
+            _edit(session, "a", "edited")
+            session.write_behind(save)
+
+        async with session.turn():
+            # The edit is stored before the turn does anything
+            save.assert_awaited_once()
+            assert not session.dirty
+
+    assert session._flush_task is None
+
+
+@pytest.mark.asyncio
+async def test_flush_persists_pending_edits_now():
+    registry = AideSessionRegistry()
+    session = await registry.join(FakeSocket(), "new", AsyncMock(return_value=_snapshot_with("a")))
+    save = AsyncMock()
+
+    with patch.object(aide_sessions.settings, "DIRECT_EDIT_FLUSH_MS", 10_000):
+        async with session.turn(write_behind=True):
+            _edit(session, "a", "edited")
+            session.write_behind(save)
+        await session.flush()
+        await session.flush()
+
+    save.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_holds_cross_replica_lock_until_flush():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    released: list[str] = []
+
+    @asynccontextmanager
+    async def tracking_lock(key):
+        try:
+            yield None
+        finally:
+            released.append(key)
+
+    session = await registry.join(
+        FakeSocket(), aide_id, AsyncMock(return_value=_snapshot_with("a")), user_id=user_id, shared=True
+    )
+    with (
+        patch.object(aide_sessions.settings, "DIRECT_EDIT_FLUSH_MS", 10_000),
+        patch.object(aide_sessions.db, "advisory_lock", tracking_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=0)),
+    ):
+        save = AsyncMock()
+        async with session.turn(write_behind=True):
+            _edit(session, "a", "one")
+            session.write_behind(save)
+        async with session.turn(write_behind=True):
+            _edit(session, "a", "two")
+            session.write_behind(save)
+        assert released == []
+
+        await registry.stop()
+
+    assert released == [f"aide:{aide_id}"]
+    save.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_turn_stores_conversation_before_releasing_the_aide():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    session = await registry.join(
+        FakeSocket(), aide_id, AsyncMock(return_value=_snapshot_with("a")), user_id=user_id, shared=True
+    )
+    events: list[str] = []
+
+    @asynccontextmanager
+    async def tracking_lock(key):
+        yield None
+        events.append("released")
+
+    async def append_messages(user_id, conversation_id, messages):
+        await asyncio.sleep(0)
+        events.append("stored")
+
+    session.history.conversation_id = uuid4()
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", tracking_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=None)),
+        patch.object(conversation_history.conversation_repo, "append_messages", AsyncMock(side_effect=append_messages)),
+    ):
+        async with session.turn():
+            session.history.append("hi", "hello")
+            events.append("turn done")
+
+    assert events == ["turn done", "stored", "released"]
+
+
+@pytest.mark.asyncio
+async def test_reload_from_other_replica_invalidates_history():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    newer = _snapshot_with("b")
+    session = await registry.join(
+        FakeSocket(), aide_id, AsyncMock(side_effect=[empty_snapshot(), newer]), user_id=user_id, shared=True
+    )
+    session.history._loaded = True
+
+    await session.refresh(newer["_sequence"])
+
+    assert not session.history.loaded
+
+
+@pytest.mark.asyncio
+async def test_turn_does_not_run_without_cross_replica_lock():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    session = await registry.join(
+        FakeSocket(), aide_id, AsyncMock(return_value=_snapshot_with("a")), user_id=user_id, shared=True
+    )
+
+    @asynccontextmanager
+    async def broken_lock(key):
+        raise OSError("lock connection refused")
+        yield
+
+    ran = False
+    with patch.object(aide_sessions.db, "advisory_lock", broken_lock), pytest.raises(OSError):
+        async with session.turn():
+            ran = True
+    assert not ran
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flush_refuses_to_save_after_lock_lost():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    session = await registry.join(
+        FakeSocket(), aide_id, AsyncMock(return_value=_snapshot_with("a")), user_id=user_id, shared=True
+    )
+
+    class LostLease:
+        def check(self):
+            raise aide_sessions.db.AdvisoryLockLost(f"aide:{aide_id}")
+
+    @asynccontextmanager
+    async def losing_lock(key):
+        yield LostLease()
+
+    save = AsyncMock()
+    with (
+        patch.object(aide_sessions.settings, "DIRECT_EDIT_FLUSH_MS", 10_000),
+        patch.object(aide_sessions.db, "advisory_lock", losing_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=0)),
+    ):
+        async with session.turn(write_behind=True):
+            _edit(session, "a", "edited")
+            session.write_behind(save)
+        with pytest.raises(aide_sessions.db.AdvisoryLockLost):
+            await session.flush()
+
+    save.assert_not_awaited()
+    assert not session.dirty
+
+
+@pytest.mark.asyncio
+async def test_socketless_turn_shares_the_live_session_and_rehydrates_its_sockets():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    ws = FakeSocket()
+    session = await registry.join(
+        ws, aide_id, AsyncMock(return_value=_snapshot_with("a")), user_id=user_id, shared=True
+    )
+    ws.sent.clear()
+    rest_loader = AsyncMock()
+
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", _no_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=None)),
+    ):
+        async with registry.turn(user_id, aide_id, rest_loader) as rest:
+            assert rest is session
+            assert session.busy
+            edited = apply(rest.snapshot, {"t": "entity.create", "id": "b", "parent": "root"}).snapshot
+            await rest.publish(edited)
+
+    rest_loader.assert_not_awaited()
+    assert session.sequence == edited["_sequence"]
+    assert ws.sent
+    assert registry.get(user_id, aide_id) is session
+
+
+@pytest.mark.asyncio
+async def test_socketless_turn_without_live_session_is_dropped_after():
+    registry = AideSessionRegistry()
+    user_id, aide_id = uuid4(), str(uuid4())
+    loader = AsyncMock(return_value=_snapshot_with("a"))
+
+    with (
+        patch.object(aide_sessions.db, "advisory_lock", _no_lock),
+        patch.object(aide_sessions.aide_repo, "get_sequence", AsyncMock(return_value=None)),
+    ):
+        async with registry.turn(user_id, aide_id, loader) as session:
+            assert registry.get(user_id, aide_id) is session
+            assert "a" in session.snapshot["entities"]
+
+    loader.assert_awaited_once()
+    assert registry.get(user_id, aide_id) is None
@@ -171,6 +171,21 @@ class TestMagicLinkRepo:
         retrieved = await magic_link_repo.get_by_token(magic_link.token)
         assert retrieved is None
 
+    async def test_cleanup_expired_in_batches(self):
+        """Cleanup keeps deleting batch after batch until nothing is left."""
+        email = f"test-{uuid4()}@example.com"
+        links = [await magic_link_repo.create(email) for _ in range(5)]
+        async with system_conn() as conn:
+            await conn.execute(
+                "UPDATE magic_links SET used = true, created_at = now() - interval '2 hours' WHERE email = $1",
+                email,
+            )
+
+        deleted = await magic_link_repo.cleanup_expired(older_than_hours=1, batch_size=2)
+        assert deleted >= 5
+        for link in links:
+            assert await magic_link_repo.get_by_token(link.token) is None
+
 
 class TestUserRepo:
     """Test user repository operations."""
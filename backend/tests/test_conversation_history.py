@@ -0,0 +1,122 @@
+"""
+Tests for backend/services/conversation_history.py — per-session conversation window.
+
+Patches the conversation repo so no database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from backend.models.conversation import ConversationWindow
+from backend.services import conversation_history
+from backend.services.conversation_history import ConversationHistory
+
+
+def _window(count: int, user_turns: int) -> ConversationWindow:
+    messages = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"} for i in range(count)]
+    return ConversationWindow(id=uuid4(), messages=messages, user_turns=user_turns)
+
+
+@pytest.mark.asyncio
+async def test_loads_window_once():
+    history = ConversationHistory(uuid4(), uuid4(), window=4)
+    get_recent = AsyncMock(return_value=_window(4, user_turns=10))
+
+    with patch.object(conversation_history.conversation_repo, "get_recent", get_recent):
+        await history.load()
+        await history.load()
+
+    get_recent.assert_awaited_once_with(history.user_id, history.aide_id, 4)
+    assert [m["content"] for m in history.messages] == ["m0", "m1", "m2", "m3"]
+    assert history.turn_num == 11
+
+
+@pytest.mark.asyncio
+async def test_new_aide_starts_at_turn_one():
+    history = ConversationHistory(uuid4(), uuid4())
+    with patch.object(conversation_history.conversation_repo, "get_recent", AsyncMock(return_value=None)):
+        await history.load()
+    assert history.messages == []
+    assert history.turn_num == 1
+    assert history.conversation_id is None
+
+
+@pytest.mark.asyncio
+async def test_append_trims_to_window_and_persists_in_background():
+    history = ConversationHistory(uuid4(), uuid4(), window=3)
+    window = _window(3, user_turns=2)
+    gate = asyncio.Event()
+
+    async def slow_append(user_id, conversation_id, messages):
+        await gate.wait()
+
+    append_messages = AsyncMock(side_effect=slow_append)
+    with (
+        patch.object(conversation_history.conversation_repo, "get_recent", AsyncMock(return_value=window)),
+        patch.object(conversation_history.conversation_repo, "append_messages", append_messages),
+    ):
+        await history.load()
+        history.append("next", "done")
+
+        # In memory right away, stored later
+        assert [m["content"] for m in history.messages] == ["m2", "next", "done"]
+        assert history.turn_num == 4
+        gate.set()
+        await history.flush()
+
+    conversation_id, stored = append_messages.await_args.args[1:]
+    assert conversation_id == window.id
+    assert [(m.role, m.content) for m in stored] == [("user", "next"), ("assistant", "done")]
+
+
+@pytest.mark.asyncio
+async def test_first_append_creates_conversation_and_keeps_order():
+    history = ConversationHistory(uuid4(), uuid4())
+    created = AsyncMock(return_value=AsyncMock(id=uuid4()))
+    order: list[str] = []
+
+    async def record(user_id, conversation_id, messages):
+        await asyncio.sleep(0)
+        order.append(messages[0].content)
+
+    with (
+        patch.object(conversation_history.conversation_repo, "get_recent", AsyncMock(return_value=None)),
+        patch.object(conversation_history.conversation_repo, "create", created),
+        patch.object(conversation_history.conversation_repo, "append_messages", AsyncMock(side_effect=record)),
+    ):
+        await history.load()
+        history.append("one", "")
+        history.append("two", "")
+        await history.flush()
+
+    created.assert_awaited_once()
+    assert order == ["one", "two"]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_logged_not_raised():
+    history = ConversationHistory(uuid4(), uuid4())
+    history.conversation_id = uuid4()
+    with patch.object(
+        conversation_history.conversation_repo, "append_messages", AsyncMock(side_effect=OSError("down"))
+    ):
+        history.append("hi", "hello")
+        await history.flush()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reloads_on_next_load():
+    history = ConversationHistory(uuid4(), uuid4())
+    get_recent = AsyncMock(side_effect=[_window(2, 1), _window(4, 2)])
+    with patch.object(conversation_history.conversation_repo, "get_recent", get_recent):
+        await history.load()
+        history.invalidate()
+        await history.load()
+
+    assert len(history.messages) == 4
+    assert history.turn_num == 3
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 
 import pytest
@@ -120,6 +121,82 @@ async def test_get_for_aide(test_user_id):
     assert result.id == conv2.id
 
 
+async def test_get_recent_returns_trailing_window(test_user_id):
+    """get_recent slices the last N messages and counts user turns over the whole conversation."""
+    aide_repo = AideRepo()
+    conv_repo = ConversationRepo()
+
+    aide = await aide_repo.create(test_user_id, CreateAideRequest(title="Test"))
+    conversation = await conv_repo.create(test_user_id, aide.id)
+    now = datetime.now(UTC)
+    await conv_repo.append_messages(
+        test_user_id,
+        conversation.id,
+        [Message(role="user" if i % 2 == 0 else "assistant", content=f"m{i}", timestamp=now) for i in range(7)],
+    )
+
+    window = await conv_repo.get_recent(test_user_id, aide.id, 3)
+
+    assert window is not None
+    assert window.id == conversation.id
+    assert [m["content"] for m in window.messages] == ["m4", "m5", "m6"]
+    assert window.user_turns == 4
+
+
+async def test_get_recent_without_conversation(test_user_id):
+    """get_recent returns None for an aide with no conversation."""
+    aide_repo = AideRepo()
+    conv_repo = ConversationRepo()
+
+    aide = await aide_repo.create(test_user_id, CreateAideRequest(title="Test"))
+
+    assert await conv_repo.get_recent(test_user_id, aide.id, 9) is None
+
+
+async def test_get_page_walks_back_with_keyset_cursor(test_user_id):
+    """get_page returns the tail first, then older pages via the `before` cursor."""
+    aide_repo = AideRepo()
+    conv_repo = ConversationRepo()
+
+    aide = await aide_repo.create(test_user_id, CreateAideRequest(title="Test"))
+    conversation = await conv_repo.create(test_user_id, aide.id)
+    now = datetime.now(UTC)
+    for i in range(5):
+        await conv_repo.append_message(
+            test_user_id, conversation.id, Message(role="user", content=f"m{i}", timestamp=now)
+        )
+
+    tail = await conv_repo.get_page(test_user_id, conversation.id, 2)
+    assert [m.content for m in tail.messages] == ["m3", "m4"]
+
+    middle = await conv_repo.get_page(test_user_id, conversation.id, 2, before=tail.before)
+    assert [m.content for m in middle.messages] == ["m1", "m2"]
+
+    first = await conv_repo.get_page(test_user_id, conversation.id, 2, before=middle.before)
+    assert [m.content for m in first.messages] == ["m0"]
+    assert first.before is None
+
+
+async def test_append_keeps_counters_in_step(test_user_id):
+    """Appends allocate consecutive seqs and keep message_count/user_turns current."""
+    aide_repo = AideRepo()
+    conv_repo = ConversationRepo()
+
+    aide = await aide_repo.create(test_user_id, CreateAideRequest(title="Test"))
+    conversation = await conv_repo.create(test_user_id, aide.id)
+    now = datetime.now(UTC)
+    turn = [
+        Message(role="user", content="q", timestamp=now),
+        Message(role="assistant", content="a", timestamp=now),
+    ]
+    await asyncio.gather(*(conv_repo.append_messages(test_user_id, conversation.id, turn) for _ in range(3)))
+
+    fetched = await conv_repo.get(test_user_id, conversation.id)
+    assert fetched.message_count == 6
+    assert fetched.user_turns == 3
+    assert [m.content for m in fetched.messages] == ["q", "a"] * 3
+
+
 async def test_list_for_aide(test_user_id, second_user_id):
     """Test listing conversations only shows conversations for user's aides."""
     aide_repo = AideRepo()
@@ -0,0 +1,39 @@
+"""Tests for backend/utils/cursor.py — the opaque keyset cursors of the admin listings."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from uuid import uuid4
+
+import pytest
+
+from backend.utils import cursor
+
+
+def test_round_trip():
+    created_at, row_id = datetime(2026, 4, 2, 12, 30, 15, 123456, tzinfo=UTC), uuid4()
+    assert cursor.decode(cursor.encode(created_at, row_id)) == (created_at, row_id)
+
+
+def test_cursor_is_url_safe():
+    encoded = cursor.encode(datetime.now(UTC), uuid4())
+    assert encoded.isascii()
+    assert not set(encoded) & set("+/=&?#")
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        "not-a-cursor",
+        "",
+        "é",
+        cursor.encode(datetime.now(UTC), uuid4())[:-4],
+        # Valid base64 of the wrong JSON shapes
+        "WzFd",  # [1]
+        "eyJhIjoxfQ",  # {"a":1}
+        "WyJ5ZXN0ZXJkYXkiLCJ4Il0",  # ["yesterday","x"]
+    ],
+)
+def test_malformed_cursor_raises_value_error(bad):
+    with pytest.raises(ValueError):
+        cursor.decode(bad)
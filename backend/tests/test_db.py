@@ -230,15 +230,22 @@ async def test_conversations_rls_via_aide(test_user_id, second_user_id):
 
         await conn.execute(
             """
-            INSERT INTO conversations (id, aide_id, messages)
-            VALUES ($1, $2, $3)
+            INSERT INTO conversations (id, aide_id, message_count)
+            VALUES ($1, $2, 1)
             """,
             conversation_id,
             aide_id,
-            '[{"role": "user", "content": "Hello"}]',
         )
 
-    # User B tries to read User A's conversation
+        await conn.execute(
+            """
+            INSERT INTO conversation_messages (conversation_id, seq, role, content)
+            VALUES ($1, 1, 'user', 'Hello')
+            """,
+            conversation_id,
+        )
+
+    # User B tries to read User A's conversation and its messages
     async with db.user_conn(second_user_id) as conn:
         row = await conn.fetchrow(
             "SELECT * FROM conversations WHERE id = $1",
@@ -247,6 +254,12 @@ async def test_conversations_rls_via_aide(test_user_id, second_user_id):
         # RLS should prevent this - row should be None
         assert row is None
 
+        messages = await conn.fetch(
+            "SELECT * FROM conversation_messages WHERE conversation_id = $1",
+            conversation_id,
+        )
+        assert messages == []
+
     # User A can read their own conversation
     async with db.user_conn(test_user_id) as conn:
         row = await conn.fetchrow(
@@ -308,3 +321,70 @@ async def test_audit_log_append_only(test_user_id):
 
         # Cleanup (system can delete for test cleanup)
         await conn.execute("DELETE FROM audit_log WHERE id = $1", log_id)
+
+
+async def test_unit_of_work_shares_one_connection(test_user_id, second_user_id):
+    """user_conn() calls inside unit_of_work() reuse its connection; other scopes don't."""
+    import asyncio
+
+    async def backend_pid(user_id):
+        async with db.user_conn(user_id) as conn:
+            return await conn.fetchval("SELECT pg_backend_pid()")
+
+    async with db.unit_of_work(test_user_id):
+        first = await backend_pid(test_user_id)
+        assert await backend_pid(test_user_id) == first
+        async with db.unit_of_work(test_user_id):
+            assert await backend_pid(test_user_id) == first
+        # Another user, system work and spawned tasks get their own connections
+        assert await backend_pid(second_user_id) != first
+        async with db.system_conn() as conn:
+            assert await conn.fetchval("SELECT current_setting('app.user_id', true)") == ""
+        assert await asyncio.create_task(backend_pid(test_user_id)) != first
+
+
+async def test_unit_of_work_rolls_back_and_drops_commit_callbacks(test_user_id):
+    """An error inside unit_of_work() undoes all its writes and skips on_commit callbacks."""
+    aide_id = uuid4()
+    committed: list[bool] = []
+
+    with pytest.raises(RuntimeError):
+        async with db.unit_of_work(test_user_id):
+            async with db.user_conn(test_user_id) as conn:
+                await conn.execute(
+                    "INSERT INTO aides (id, user_id, title, r2_prefix) VALUES ($1, $2, $3, $4)",
+                    aide_id,
+                    test_user_id,
+                    "Rolled back",
+                    f"test-{aide_id}",
+                )
+                db.on_commit(conn, lambda: committed.append(True))
+            assert committed == []
+            raise RuntimeError("abort")
+
+    async with db.system_conn() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM aides WHERE id = $1", aide_id) == 0
+    assert committed == []
+
+
+@pytest.mark.skipif(not db.config.settings.DATABASE_READ_URL, reason="needs a replica (DATABASE_READ_URL)")
+async def test_replica_reads_keep_rls(test_user_id, second_user_id):
+    """user_read_conn() on the replica sees only the user's own rows, read-only."""
+    import asyncio
+
+    import asyncpg
+
+    for _ in range(50):
+        if db._replica_lag_ms is not None:
+            break
+        await asyncio.sleep(0.1)
+    # The fixtures just wrote these users; wait out read-your-writes so the replica serves the read
+    db._recent_writes.clear()
+    await asyncio.sleep(db._read_your_writes_s())
+
+    async with db.user_read_conn(test_user_id) as conn:
+        assert await conn.fetchval("SELECT pg_is_in_recovery()") is True
+        assert await conn.fetchval("SELECT id FROM users WHERE id = $1", test_user_id) == test_user_id
+        assert await conn.fetchval("SELECT id FROM users WHERE id = $1", second_user_id) is None
+        with pytest.raises(asyncpg.PostgresError):
+            await conn.execute("UPDATE users SET name = 'x' WHERE id = $1", test_user_id)
@@ -149,3 +149,72 @@ def test_case_insensitive():
         "tool_calls": [],
     }
     assert needs_escalation(result) is True
+
+
+def test_batched_structural_create_triggers_escalation():
+    result = {
+        "text_blocks": [{"text": "3 sections."}],
+        "tool_calls": [
+            {
+                "name": "mutate_entities",
+                "input": {
+                    "action": "create",
+                    "parent": "page",
+                    "display": "section",
+                    "columns": ["id", "title"],
+                    "rows": [["a", "A"], ["b", "B"]],
+                },
+            },
+        ],
+    }
+    assert needs_escalation(result) is True
+
+
+def test_batched_card_create_no_escalation():
+    result = {
+        "text_blocks": [{"text": "2 players."}],
+        "tool_calls": [
+            {
+                "name": "mutate_entities",
+                "input": {"action": "create", "parent": "roster", "display": "card", "entities": [{"id": "p1"}]},
+            },
+        ],
+    }
+    assert needs_escalation(result) is False
+
+
+def test_batched_columnar_display_triggers_escalation():
+    result = {
+        "text_blocks": [],
+        "tool_calls": [
+            {
+                "name": "mutate_entities",
+                "input": {
+                    "action": "create",
+                    "display": "card",
+                    "columns": ["id", "display"],
+                    "rows": [["a", "card"], ["b", "table"]],
+                },
+            },
+        ],
+    }
+    assert needs_escalation(result) is True
+
+
+def test_jsonl_structural_create_triggers():
+    result = {
+        "text_blocks": [],
+        "tool_calls": [
+            {"name": "jsonl", "input": {"t": "entity.create", "id": "s", "parent": "page", "display": "section"}}
+        ],
+    }
+    assert needs_escalation(result) is True
+
+
+def test_jsonl_escalate_signal_triggers():
+    result = {"text_blocks": [], "tool_calls": [], "escalation_reason": "needs a roster"}
+    assert needs_escalation(result) is True
+
+
+def test_jsonl_escalate_signal_without_reason_triggers():
+    assert needs_escalation({"text_blocks": [], "tool_calls": [], "escalation_reason": ""}) is True
@@ -78,6 +78,16 @@ class TestMalformedLines:
         lines = parser.feed('bad\nalso bad\n{"t":"entity.create","id":"y"}\n')
         assert len(lines) == 1
 
+    def test_non_object_lines_skipped(self):
+        parser = JSONLParser(expand=False)
+        lines = parser.feed('[1]\n"hi"\n5\nnull\n{"t":"voice","text":"ok"}\n')
+        assert lines == [{"t": "voice", "text": "ok"}]
+
+    def test_non_object_skipped_on_flush(self):
+        parser = JSONLParser()
+        parser.feed('"just text"')
+        assert parser.flush() == []
+
     def test_truncated_json_skipped_on_flush(self):
         parser = JSONLParser()
         parser.feed('{"t":"entity.create"')  # no newline, no closing brace
@@ -155,3 +165,67 @@ class TestFlush:
         # After flush, buffer is cleared — new content starts fresh
         lines = parser.feed('{"t":"entity.create","id":"fresh"}\n')
         assert len(lines) == 1
+
+
+class TestCompactMode:
+    def test_expand_false_keeps_kernel_keys(self):
+        parser = JSONLParser(expand=False)
+        lines = parser.feed('{"t":"entity.update","ref":"a","p":{"x":1}}\n')
+        assert lines == [{"t": "entity.update", "ref": "a", "p": {"x": 1}}]
+
+    def test_expand_false_flush(self):
+        parser = JSONLParser(expand=False)
+        parser.feed('{"t":"voice","text":"Done."}')
+        assert parser.flush() == [{"t": "voice", "text": "Done."}]
+
+
+class TestChunking:
+    def test_byte_at_a_time_matches_single_feed(self):
+        text = "".join(f'{{"t":"entity.update","ref":"e{i}","p":{{"n":{i}}}}}\n' for i in range(50))
+        whole = JSONLParser(expand=False).feed(text)
+        parser = JSONLParser(expand=False)
+        streamed = []
+        for ch in text:
+            streamed.extend(parser.feed(ch))
+        assert streamed == whole
+        assert len(streamed) == 50
+        assert parser.buffer == ""
+
+    def test_pending_line_spans_many_chunks(self):
+        parser = JSONLParser(expand=False)
+        for piece in ('{"t":', '"voice",', '"text":"a', 'b"}', "\n"):
+            lines = parser.feed(piece)
+        assert lines == [{"t": "voice", "text": "ab"}]
+
+    def test_empty_chunk(self):
+        parser = JSONLParser()
+        assert parser.feed("") == []
+        assert parser.buffer == ""
+
+
+class TestPartialObject:
+    def test_open_string_is_closed(self):
+        parser = JSONLParser(expand=False)
+        parser.feed('{"t":"voice","text":"Mike is o')
+        assert parser.partial() == {"t": "voice", "text": "Mike is o"}
+        # Peeking does not consume the pending line
+        assert parser.feed('ut."}\n') == [{"t": "voice", "text": "Mike is out."}]
+
+    def test_dangling_key_is_dropped(self):
+        parser = JSONLParser(expand=False)
+        parser.feed('{"t":"entity.update","ref":"a","p":{"x":1,"y"')
+        assert parser.partial() == {"t": "entity.update", "ref": "a", "p": {"x": 1}}
+
+    def test_partial_is_expanded_by_default(self):
+        parser = JSONLParser()
+        parser.feed('{"t":"entity.create","id":"a","p":{"name":"A')
+        assert parser.partial() == {"type": "entity.create", "id": "a", "payload": {"name": "A"}}
+
+    def test_nothing_parseable(self):
+        parser = JSONLParser()
+        assert parser.partial() is None
+        parser.feed('{"t')
+        assert parser.partial() is None
+        parser.feed("\n")
+        parser.feed("not json")
+        assert parser.partial() is None
@@ -0,0 +1,88 @@
+"""
+Tests for backend/utils/jsonx.py — the JSON codec behind asyncpg, WebSocket
+frames, snapshot hashing and prompts.
+
+Both backends are exercised directly (the stdlib one always, the orjson one
+when it is installed), so the suite covers the fallback whichever backend
+this process picked.
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from backend import db
+from backend.utils import jsonx
+
+orjson = pytest.importorskip("orjson")
+
+VALUE = {"b": [1, 2.5, None, True], "a": {"nested": "text", "empty": {}, "list": []}, "c": "plain"}
+
+BACKENDS = [
+    pytest.param((jsonx._std_dumps, jsonx._std_dumpb, jsonx._std_loads), id="json"),
+    pytest.param((jsonx._orjson_dumps, jsonx._orjson_dumpb, orjson.loads), id="orjson"),
+]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_compact_output_matches_stdlib_separators(backend):
+    dumps, dumpb, _ = backend
+    expected = json.dumps(VALUE, separators=(",", ":"))
+    assert dumps(VALUE) == expected
+    assert dumpb(VALUE) == expected.encode()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_sorted_output_is_key_ordered(backend):
+    dumps, _, _ = backend
+    assert dumps(VALUE, sort_keys=True) == json.dumps(VALUE, sort_keys=True, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_indented_output_matches_stdlib_indent_2(backend):
+    dumps, _, _ = backend
+    assert dumps(VALUE, indent=True) == json.dumps(VALUE, indent=2)
+    assert dumps(VALUE, sort_keys=True, indent=True) == json.dumps(VALUE, indent=2, sort_keys=True)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_round_trips_str_bytes_and_memoryview(backend):
+    dumps, dumpb, loads = backend
+    data = {"title": "Café ☕", "n": 3}
+    assert loads(dumps(data)) == data
+    assert loads(dumpb(data)) == data
+    assert loads(memoryview(b"\x01" + dumpb(data))[1:]) == data
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_non_string_keys_are_stringified(backend):
+    dumps, _, loads = backend
+    assert loads(dumps({1: "a", 2: "b"})) == {"1": "a", "2": "b"}
+
+
+def test_orjson_falls_back_to_stdlib_for_big_ints():
+    big = {"n": 2**70}
+    assert jsonx._orjson_dumps(big) == '{"n":1180591620717411303424}'
+
+
+def test_orjson_non_ascii_is_utf8_not_escaped():
+    assert jsonx._orjson_dumps({"t": "é"}) == '{"t":"é"}'
+    assert jsonx._std_dumps({"t": "é"}) == '{"t":"\\u00e9"}'
+
+
+def test_module_functions_use_selected_backend():
+    assert jsonx.BACKEND in ("orjson", "json")
+    assert jsonx.loads(jsonx.dumpb(VALUE)) == VALUE
+    assert isinstance(jsonx.dumps(VALUE), str)
+    assert isinstance(jsonx.dumpb(VALUE), bytes)
+
+
+def test_jsonb_binary_codec_adds_and_strips_version_byte():
+    encoded = db._encode_jsonb({"a": 1})
+    assert encoded[:1] == b"\x01"
+    assert encoded[1:] == b'{"a":1}'
+    assert db._decode_jsonb(encoded) == {"a": 1}
+    # Strings stay JSON strings, as telemetry_repo's pre-encoded columns expect
+    assert db._decode_jsonb(db._encode_jsonb('{"x":1}')) == '{"x":1}'
@@ -96,3 +96,85 @@ async def test_stream_end_includes_cost(orch):
     end = [e for e in events if e.get("type") == "stream.end"][0]
     assert "cost_usd" in end
     assert end["cost_usd"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_batched_tool_yields_event_per_row():
+    """mutate_entities expands to one event per accepted row, sharing one snapshot."""
+    orch = StreamingOrchestrator(
+        "test",
+        {"entities": {}, "meta": {}, "relationships": [], "styles": {"global": {}, "entities": {}}, "_sequence": 0},
+        [],
+        "fake",
+    )
+    with patch.object(orch, "client") as mock_client:
+
+        async def mock_stream(*args, **kwargs):
+            yield {
+                "type": "tool_use",
+                "id": "t1",
+                "name": "mutate_entities",
+                "input": {
+                    "action": "create",
+                    "parent": "root",
+                    "display": "card",
+                    "columns": ["id", "name"],
+                    "rows": [["a", "A"], ["b", "B"], ["a", "dup"]],
+                },
+            }
+
+        mock_client.stream = mock_stream
+        mock_client.get_usage_stats = AsyncMock(return_value=None)
+
+        with patch("backend.services.streaming_orchestrator.classify") as mock_classify:
+            mock_classify.return_value = MagicMock(tier="L4", reason="test")
+            events = [e async for e in orch.process_message("test")]
+
+    mutations = [e for e in events if e.get("type") == "event"]
+    assert [m["event"]["id"] for m in mutations] == ["a", "b"]
+    # Each event carries the sequence right after it, not the end of the batch
+    assert [m["seq"] for m in mutations] == [1, 2]
+    assert set(orch.snapshot["entities"]) == {"a", "b"}
+    voice = [e for e in events if e.get("type") == "voice"]
+    assert voice[0]["text"] == "2 updates applied."
+
+
+@pytest.mark.asyncio
+async def test_jsonl_output_mode_applies_lines_as_they_complete():
+    """JSONL wire mode streams text without tools and applies each completed line."""
+    orch = StreamingOrchestrator(
+        "test",
+        {"entities": {}, "meta": {}, "relationships": [], "styles": {"global": {}, "entities": {}}, "_sequence": 0},
+        [],
+        "fake",
+    )
+    stream_kwargs = {}
+    with patch.object(orch, "client") as mock_client:
+
+        async def mock_stream(*args, **kwargs):
+            stream_kwargs.update(kwargs)
+            yield '{"t":"entity.create","id":"a","parent":"root","p":{"name":"A"}}\n{"t":"entity.up'
+            yield 'date","ref":"a","p":{"name":"B"}}\n{"t":"entity.update","ref":"missing","p":{}}\n'
+            yield 'not json\n{"t":"voice","text":"A renamed."}'
+
+        mock_client.stream = mock_stream
+        mock_client.get_usage_stats = AsyncMock(return_value=None)
+
+        with (
+            patch("backend.services.streaming_orchestrator.classify") as mock_classify,
+            patch(
+                "backend.services.streaming_orchestrator.get_tier_output_modes",
+                return_value={"L3": "tools", "L4": "jsonl"},
+            ),
+        ):
+            mock_classify.return_value = MagicMock(tier="L4", reason="test")
+            events = [e async for e in orch.process_message("test")]
+
+    assert stream_kwargs["tools"] is None
+    assert "Compact JSONL" in stream_kwargs["system"][0]["text"]
+    mutations = [e["event"] for e in events if e.get("type") == "event"]
+    assert [m["t"] for m in mutations] == ["entity.create", "entity.update"]
+    assert [e["seq"] for e in events if e.get("type") == "event"] == [1, 2]
+    assert orch.snapshot["entities"]["a"]["props"]["name"] == "B"
+    assert [e["text"] for e in events if e.get("type") == "voice"] == ["A renamed."]
+    assert events[0]["output_mode"] == "jsonl"
@@ -0,0 +1,193 @@
+"""
+Tests for backend/services/outbound.py — bounded per-connection send queues.
+
+A gated fake socket stands in for a slow client: nothing is written until
+the test opens the gate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from backend.services import outbound
+from backend.services.outbound import CLOSE_SLOW_CONSUMER, OutboundQueue, supersede_key
+
+
+class SlowSocket:
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.gate = asyncio.Event()
+        self.closed_with: int | None = None
+
+    async def send_text(self, text: str) -> None:
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+@pytest.fixture
+async def make_queue():
+    """Build started queues and close them all at teardown, even when a test fails."""
+    queues: list[OutboundQueue] = []
+
+    def make(socket: SlowSocket, **kwargs) -> OutboundQueue:
+        queue = OutboundQueue(socket, **kwargs)
+        queue.start()
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        await queue.close()
+
+
+def _delta(entity_id: str, seq: int, value: str = "x") -> dict:
+    return {"type": "entity.update", "id": entity_id, "data": {"v": value}, "seq": seq}
+
+
+async def _queue_delta(queue: OutboundQueue, payload: dict) -> None:
+    await queue.send_text(json.dumps(payload), key=supersede_key(payload), seq=payload["seq"])
+
+
+async def _drain() -> None:
+    """Let the writer run until it has nothing left to send."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_sends_in_order_without_blocking_the_caller(make_queue):
+    socket = SlowSocket()
+    queue = make_queue(socket, max_frames=10)
+
+    await queue.send_control({"type": "stream.start"})
+    await _queue_delta(queue, _delta("a", 1))
+    await queue.send_control({"type": "stream.end"})
+    assert queue.depth == 3
+
+    socket.gate.set()
+    await _drain()
+    assert [m["type"] for m in socket.sent] == ["stream.start", "entity.update", "stream.end"]
+    assert queue.delivered_seq == 1
+    assert queue.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_newer_delta_supersedes_pending_one_for_same_entity(make_queue):
+    socket = SlowSocket()
+    queue = make_queue(socket, max_frames=10)
+
+    await _queue_delta(queue, _delta("a", 1, "old"))
+    await _queue_delta(queue, _delta("b", 2))
+    await _queue_delta(queue, _delta("a", 3, "new"))
+    assert queue.depth == 2
+
+    socket.gate.set()
+    await _drain()
+    assert [(m["id"], m["seq"]) for m in socket.sent] == [("b", 2), ("a", 3)]
+    assert socket.sent[1]["data"] == {"v": "new"}
+
+
+@pytest.mark.asyncio
+async def test_overflow_replaces_pending_deltas_with_resync(make_queue):
+    socket = SlowSocket()
+    calls: list = []
+
+    def resync(delivered_seq):
+        calls.append(delivered_seq)
+        return [json.dumps({"type": "snapshot", "seq": 99})], 99
+
+    queue = make_queue(socket, resync=resync, max_frames=5)
+
+    await queue.send_control({"type": "stream.start"})
+    for i in range(10):
+        await _queue_delta(queue, _delta(f"e{i}", i + 1))
+    await queue.send_control({"type": "stream.end"})
+    assert queue.depth <= 5
+
+    socket.gate.set()
+    await _drain()
+    # Control frames survive; deltas before the last overflow collapse into one resync
+    assert [m["type"] for m in socket.sent] == ["stream.start", "snapshot", "entity.update", "stream.end"]
+    assert socket.sent[2]["id"] == "e9"
+    assert calls == [None]
+    assert queue.delivered_seq == 99
+
+
+@pytest.mark.asyncio
+async def test_resync_resumes_from_last_delivered_sequence(make_queue):
+    socket = SlowSocket()
+    calls: list = []
+
+    def resync(delivered_seq):
+        calls.append(delivered_seq)
+        return [], 50
+
+    queue = make_queue(socket, resync=resync, max_frames=3)
+    socket.gate.set()
+    await _queue_delta(queue, _delta("a", 7))
+    await _drain()
+    assert queue.delivered_seq == 7
+
+    socket.gate.clear()
+    for i in range(5):
+        await _queue_delta(queue, _delta(f"e{i}", 8 + i))
+    socket.gate.set()
+    await _drain()
+
+    assert calls == [7]
+    assert queue.delivered_seq == 50
+
+
+@pytest.mark.asyncio
+async def test_control_overflow_closes_connection(make_queue):
+    socket = SlowSocket()
+    queue = make_queue(socket, resync=lambda seq: ([], 0), max_frames=3)
+
+    with pytest.raises(WebSocketDisconnect):
+        for i in range(5):
+            await queue.send_control({"type": "voice", "text": str(i)})
+
+    await _drain()
+    assert queue.closed
+    assert socket.closed_with == CLOSE_SLOW_CONSUMER
+    with pytest.raises(WebSocketDisconnect):
+        await queue.send_control({"type": "stream.end"})
+
+
+@pytest.mark.asyncio
+async def test_stalled_send_times_out_and_closes(make_queue):
+    socket = SlowSocket()
+    queue = make_queue(socket, max_frames=10, send_timeout=0.01)
+
+    await queue.send_control({"type": "stream.start"})
+    await asyncio.sleep(0.05)
+
+    assert queue.closed
+    assert socket.closed_with == CLOSE_SLOW_CONSUMER
+
+
+@pytest.mark.asyncio
+async def test_stats_report_live_queue_depth(make_queue):
+    socket = SlowSocket()
+    queue = make_queue(socket, max_frames=10)
+    await queue.send_control({"type": "stream.start"})
+    await _queue_delta(queue, _delta("a", 1))
+
+    stats = outbound.stats()
+    assert stats["connections"] >= 1
+    assert stats["queued_frames"] >= 2
+    assert queue.stats()["peak_depth"] == 2
+
+    await queue.close()
+    assert queue not in outbound._live
@@ -0,0 +1,182 @@
+"""
+Tests for backend/db.py pool instrumentation — checkout histograms, the
+slow-statement log and the adaptive checkout limit.
+
+Runs against a fake pool, so no database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from backend import db
+
+
+class _Conn:
+    async def execute(self, query: str, *args) -> str:
+        return "OK"
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class _Pool:
+    def __init__(self) -> None:
+        self.seen_callers: list[str | None] = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.seen_callers.append(db._caller.get())
+        yield _Conn()
+
+    def get_size(self) -> int:
+        return 3
+
+    def get_idle_size(self) -> int:
+        return 1
+
+    def get_max_size(self) -> int:
+        return 20
+
+
+@pytest.fixture
+def pool():
+    fake = _Pool()
+    stats = {"primary": db._PoolStats(), "replica": db._PoolStats()}
+    with (
+        patch.object(db, "pool", fake),
+        patch.object(db, "read_pool", None),
+        patch.object(db, "_gate", None),
+        patch.object(db, "_pool_stats", stats),
+        patch.object(db, "_statements", db._Histogram()),
+        patch.object(db, "_slow_statements", 0),
+    ):
+        yield fake
+
+
+async def repo_method(user_id):
+    async with db.user_conn(user_id) as conn:
+        await conn.execute("SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_checkouts_are_timed_and_counted(pool):
+    await repo_method(uuid4())
+    async with db.system_conn():
+        assert db._pool_stats["primary"].in_use == 1
+
+    stats = db.pool_stats()["pools"]["primary"]
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["acquire_wait"]["count"] == 2
+    assert stats["hold"]["count"] == 2
+    assert stats["hold"]["buckets"]["inf"] == 2
+    assert stats["size"] == 3
+    assert stats["limit"] == 20
+    assert "replica" not in db.pool_stats()["pools"]
+
+
+@pytest.mark.asyncio
+async def test_transaction_knows_its_calling_repo_method(pool):
+    await repo_method(uuid4())
+    assert pool.seen_callers == [f"{__name__}.repo_method"]
+    assert db._caller.get() is None
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = db._Histogram()
+    for ms in (0.5, 3, 3, 40, 9000):
+        histogram.observe(ms)
+    stats = histogram.stats()
+    assert stats["buckets"]["le_1"] == 1
+    assert stats["buckets"]["le_5"] == 3
+    assert stats["buckets"]["le_50"] == 4
+    assert stats["buckets"]["le_5000"] == 4
+    assert stats["buckets"]["inf"] == 5
+    assert stats["p50_ms"] == 3
+    assert histogram.since(3) == [40, 9000]
+
+
+def test_slow_statements_are_logged_with_caller(pool, caplog):
+    token = db._caller.set("backend.repos.aide_repo.AideRepo.get")
+    try:
+        with (
+            patch.object(db.config.settings, "DB_SLOW_QUERY_MS", 100),
+            caplog.at_level(logging.WARNING, logger="backend.db"),
+        ):
+            db._log_query(SimpleNamespace(elapsed=0.25, query="SELECT *\n    FROM aides"))
+            db._log_query(SimpleNamespace(elapsed=0.01, query="SELECT 1"))
+    finally:
+        db._caller.reset(token)
+
+    assert db.pool_stats()["slow_statements"] == 1
+    assert db.pool_stats()["statements"]["count"] == 2
+    assert "AideRepo.get" in caplog.text
+    assert "SELECT * FROM aides" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_gate_queues_past_limit_and_resizes():
+    gate = db._Gate(1, 1, 4)
+    await gate.enter()
+    second = asyncio.create_task(gate.enter())
+    await asyncio.sleep(0)
+    assert not second.done()
+
+    gate.resize(2)
+    await asyncio.wait_for(second, timeout=1)
+    assert gate.active == 2
+
+    gate.resize(10)
+    assert gate.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    gate = db._Gate(1, 1, 1)
+    await gate.enter()
+    waiter = asyncio.create_task(gate.enter())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    gate.leave()
+    assert gate.active == 0
+    await asyncio.wait_for(gate.enter(), timeout=1)
+
+
+def test_adapt_step_grows_on_slow_waits_and_shrinks_when_idle():
+    gate, stats = db._Gate(20, 20, 40), db._PoolStats()
+    with patch.object(db.config.settings, "DB_POOL_WAIT_TARGET_MS", 10):
+        for _ in range(50):
+            stats.wait.observe(30)
+        stats.peak_in_use = 20
+        count = db._adapt_step(gate, stats, 0)
+        assert gate.limit == 25
+
+        # Still slow waits, capped at the ceiling
+        for _ in range(3):
+            for _ in range(50):
+                stats.wait.observe(30)
+            count = db._adapt_step(gate, stats, count)
+        assert gate.limit == 40
+
+        # Quiet: fast waits, low peak use
+        for _ in range(50):
+            stats.wait.observe(0.1)
+        stats.peak_in_use = 5
+        count = db._adapt_step(gate, stats, count)
+        assert gate.limit == 35
+
+        # No new waits at all also counts as quiet, down to the floor
+        for _ in range(20):
+            count = db._adapt_step(gate, stats, count)
+        assert gate.limit == 20
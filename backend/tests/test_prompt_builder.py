@@ -67,6 +67,15 @@ def test_l3_and_l4_share_prefix():
     assert "You are AIde — infrastructure" in l4_shared
 
 
+def test_jsonl_output_mode_appends_override_to_cached_block():
+    tools = build_system_blocks("L3", {"entities": {}})
+    jsonl = build_system_blocks("L3", {"entities": {}}, output_mode="jsonl")
+    assert "Compact JSONL" not in tools[0]["text"]
+    assert "Compact JSONL" in jsonl[0]["text"]
+    assert jsonl[0]["cache_control"] == {"type": "ephemeral"}
+    assert jsonl[1] == tools[1]
+
+
 # ── build_messages (windowing) ───────────────────────────────────────────────
 
 
@@ -0,0 +1,104 @@
+"""
+Tests for backend/db.py read routing — read_conn() / user_read_conn().
+
+Runs against fake primary and replica pools, so no database is needed;
+RLS on a real primary/replica pair is covered in test_db.py (set
+DATABASE_READ_URL).
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from backend import db
+
+
+class _Conn:
+    def __init__(self, pool: _Pool) -> None:
+        self.pool = pool
+
+    async def execute(self, query: str, *args) -> str:
+        self.pool.log.append(query)
+        return "OK"
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class _Pool:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.log: list[str] = []
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield _Conn(self)
+
+
+@pytest.fixture
+def pools():
+    primary, replica = _Pool("primary"), _Pool("replica")
+    with (
+        patch.object(db, "pool", primary),
+        patch.object(db, "read_pool", replica),
+        patch.object(db, "_replica_lag_ms", 10.0),
+        patch.object(db.config.settings, "REPLICA_MAX_LAG_MS", 1000),
+        patch.dict(db._recent_writes, clear=True),
+    ):
+        yield primary, replica
+
+
+async def _served_by(user_id=None) -> str:
+    scope = db.user_read_conn(user_id) if user_id else db.read_conn()
+    async with scope as conn:
+        return conn.pool.name
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_in_read_only_transaction(pools):
+    _, replica = pools
+    user_id = uuid4()
+    assert await _served_by(user_id) == "replica"
+    assert await _served_by() == "replica"
+    assert replica.log[0] == f"BEGIN READ ONLY; SELECT set_config('app.user_id', '{user_id}', true)"
+    assert replica.log[2] == "BEGIN READ ONLY; SELECT set_config('app.user_id', '', true)"
+
+
+@pytest.mark.asyncio
+async def test_writer_reads_own_writes_from_primary(pools):
+    writer, other = uuid4(), uuid4()
+    async with db.user_conn(writer):
+        pass
+    assert await _served_by(writer) == "primary"
+    assert await _served_by(other) == "replica"
+
+    # Once the replica must have replayed the write, back to the replica
+    db._recent_writes[str(writer)] = time.monotonic() - db._read_your_writes_s() - 1
+    assert await _served_by(writer) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_unknown_replica_falls_back_to_primary(pools):
+    with patch.object(db, "_replica_lag_ms", 5000.0):
+        assert await _served_by(uuid4()) == "primary"
+    with patch.object(db, "_replica_lag_ms", None):
+        assert await _served_by() == "primary"
+    assert db.read_stats()["reads_primary"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_no_replica_reads_primary(pools):
+    with patch.object(db, "read_pool", None):
+        assert await _served_by(uuid4()) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_read_inside_unit_uses_unit_connection(pools):
+    user_id = uuid4()
+    async with db.unit_of_work(user_id):
+        assert await _served_by(user_id) == "primary"
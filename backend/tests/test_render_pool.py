@@ -0,0 +1,126 @@
+"""
+Tests for backend/services/render_pool.py — long-lived Node render workers.
+
+Runs real Node processes: scripts/render_worker.js, and small stand-in
+workers for the failure cases. Skipped when node is not installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+
+import pytest
+
+from backend.services.render_pool import RenderPool
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+
+# Answers pings; hangs on "hang", exits on "exit", errors on "fail", answers its pid otherwise
+FAKE_WORKER = """
+const readline = require('readline');
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', (line) => {
+  const req = JSON.parse(line);
+  if (req.method === 'render' && req.params.mode === 'hang') return;
+  if (req.method === 'render' && req.params.mode === 'exit') process.exit(3);
+  if (req.method === 'render' && req.params.mode === 'fail') {
+    process.stdout.write(JSON.stringify({ id: req.id, error: 'Render error: bad state' }) + '\\n');
+    return;
+  }
+  const result = req.method === 'ping' ? 'pong' : `pid=${process.pid}`;
+  process.stdout.write(JSON.stringify({ id: req.id, result }) + '\\n');
+});
+process.stdout.write(JSON.stringify({ ready: true }) + '\\n');
+"""
+
+
+@pytest.fixture
+def fake_worker(tmp_path):
+    script = tmp_path / "fake_worker.js"
+    script.write_text(FAKE_WORKER)
+    return script
+
+
+@pytest.mark.asyncio
+async def test_renders_html_on_a_reused_worker():
+    pool = RenderPool(size=1, timeout_s=10)
+    await pool.start()
+    try:
+        state = {"entities": {}, "rootIds": [], "meta": {"title": "Groceries"}}
+        first = await pool.render({"state": state, "title": "Groceries"})
+        second = await pool.render({"state": state, "title": "Chores"})
+    finally:
+        await pool.stop()
+
+    assert "<title>Groceries</title>" in first
+    assert "<title>Chores</title>" in second
+    stats = pool.stats()
+    assert stats["renders"] == 2
+    assert stats["starts"] == 1
+    assert stats["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_render_error_keeps_the_worker(fake_worker):
+    pool = RenderPool(size=1, timeout_s=10, script=fake_worker)
+    try:
+        first = await pool.render({"mode": "echo"})
+        with pytest.raises(RuntimeError, match="Render failed: Render error: bad state"):
+            await pool.render({"mode": "fail"})
+        assert await pool.render({"mode": "echo"}) == first
+    finally:
+        await pool.stop()
+
+    assert pool.stats()["starts"] == 1
+    assert pool.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_and_replaces_the_worker(fake_worker):
+    pool = RenderPool(size=1, timeout_s=0.5, script=fake_worker)
+    try:
+        first = await pool.render({"mode": "echo"})
+        with pytest.raises(RuntimeError, match="timeout"):
+            await pool.render({"mode": "hang"})
+        second = await pool.render({"mode": "echo"})
+    finally:
+        await pool.stop()
+
+    assert first != second
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["restarts"] == 1
+    assert stats["starts"] == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_exit_is_restarted_by_check(fake_worker):
+    pool = RenderPool(size=2, timeout_s=5, script=fake_worker)
+    await pool.start()
+    try:
+        with pytest.raises(RuntimeError, match="exited"):
+            await pool.render({"mode": "exit"})
+        assert pool.stats()["workers"] == 1
+        assert await pool.check() == 1
+        assert pool.stats()["workers"] == 2
+        assert pool.stats()["idle"] == 2
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_renders_queue_for_workers(fake_worker):
+    pool = RenderPool(size=2, timeout_s=5, script=fake_worker)
+    await pool.start()
+    try:
+        results = await asyncio.gather(*(pool.render({"mode": "echo"}) for _ in range(10)))
+    finally:
+        await pool.stop()
+
+    # Every render ran on one of the two workers
+    assert len(set(results)) == 2
+    stats = pool.stats()
+    assert stats["renders"] == 10
+    assert stats["peak_waiting"] >= 8
+    assert stats["wait_ms"]["p50"] is not None
@@ -0,0 +1,155 @@
+"""
+Tests for backend/services/scheduler.py — leader election and job runs —
+and for the jobs backend/main.py registers with it.
+
+Patches the db advisory lock helpers and repos so no database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from backend import main
+from backend.config import settings
+from backend.services import scheduler as scheduler_module
+from backend.services.scheduler import JobScheduler
+
+
+def leader(held: bool):
+    return patch.object(scheduler_module.db, "hold_advisory_lock", AsyncMock(return_value=held))
+
+
+@pytest.mark.asyncio
+async def test_leader_runs_job_and_records_rows():
+    scheduler = JobScheduler()
+    job = AsyncMock(return_value=42)
+    scheduler.register("cleanup", job, interval_s=60)
+    with leader(True):
+        await scheduler.run_once("cleanup")
+
+    job.assert_awaited_once()
+    stats = scheduler.stats()
+    assert stats["leader"] is True
+    assert stats["jobs"]["cleanup"]["runs"] == 1
+    assert stats["jobs"]["cleanup"]["rows"] == 42
+    assert stats["jobs"]["cleanup"]["last_rows"] == 42
+    assert stats["jobs"]["cleanup"]["last_run_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_follower_skips_leader_only_jobs():
+    scheduler = JobScheduler()
+    job = AsyncMock(return_value=1)
+    scheduler.register("cleanup", job, interval_s=60)
+    with leader(False):
+        await scheduler.run_once("cleanup")
+
+    job.assert_not_awaited()
+    assert scheduler.stats()["leader"] is False
+    assert scheduler.stats()["jobs"]["cleanup"]["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_process_jobs_run_without_leadership():
+    scheduler = JobScheduler()
+    job = AsyncMock(return_value=None)
+    scheduler.register("local", job, interval_s=60, leader_only=False)
+    hold = AsyncMock(return_value=False)
+    with patch.object(scheduler_module.db, "hold_advisory_lock", hold):
+        await scheduler.run_once("local")
+
+    job.assert_awaited_once()
+    hold.assert_not_awaited()
+    assert scheduler.stats()["jobs"]["local"]["runs"] == 1
+    assert scheduler.stats()["jobs"]["local"]["rows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_election_counts_as_follower():
+    scheduler = JobScheduler()
+    job = AsyncMock()
+    scheduler.register("cleanup", job, interval_s=60)
+    with patch.object(scheduler_module.db, "hold_advisory_lock", AsyncMock(side_effect=OSError("down"))):
+        await scheduler.run_once("cleanup")
+
+    job.assert_not_awaited()
+    assert scheduler.stats()["jobs"]["cleanup"]["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_counted_not_raised():
+    scheduler = JobScheduler()
+    scheduler.register("cleanup", AsyncMock(side_effect=RuntimeError("lock timeout")), interval_s=60)
+    with leader(True):
+        await scheduler.run_once("cleanup")
+
+    stats = scheduler.stats()["jobs"]["cleanup"]
+    assert stats["failed"] == 1
+    assert stats["last_error"] == "lock timeout"
+    assert stats["last_run_at"] is None
+
+
+def test_duplicate_job_names_are_rejected():
+    scheduler = JobScheduler()
+    scheduler.register("cleanup", AsyncMock(), interval_s=60)
+    with pytest.raises(ValueError):
+        scheduler.register("cleanup", AsyncMock(), interval_s=60)
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_loops_and_releases_leadership():
+    scheduler = JobScheduler()
+    ran = asyncio.Event()
+
+    async def job():
+        ran.set()
+        return 0
+
+    scheduler.register("cleanup", job, interval_s=0.01)
+    release = AsyncMock()
+    with leader(True), patch.object(scheduler_module.db, "release_advisory_lock", release):
+        await scheduler.start()
+        await asyncio.wait_for(ran.wait(), timeout=1)
+        await scheduler.stop()
+
+    release.assert_awaited_once_with(scheduler_module.LEADER_LOCK)
+    assert scheduler.stats()["running"] is False
+    assert scheduler.stats()["leader"] is False
+
+
+def test_rollups_job_runs_on_the_leader_every_rollup_interval():
+    stats = main.scheduler.stats()["jobs"]["rollups"]
+    assert stats["leader_only"] is True
+    assert stats["interval_s"] == settings.TELEMETRY_ROLLUP_S
+
+
+@pytest.mark.asyncio
+async def test_rollups_job_rolls_up_then_refreshes_counts():
+    scheduler = JobScheduler()
+    scheduler.register("rollups", main.roll_up_stats, interval_s=60)
+    refresh = AsyncMock()
+    with (
+        leader(True),
+        patch.object(main.rollup_repo, "roll_up_telemetry", AsyncMock(return_value=7)),
+        patch.object(main.rollup_repo, "refresh_admin_counts", refresh),
+    ):
+        await scheduler.run_once("rollups")
+
+    refresh.assert_awaited_once()
+    stats = scheduler.stats()["jobs"]["rollups"]
+    assert stats["runs"] == 1
+    assert stats["rows"] == 7
+
+
+@pytest.mark.asyncio
+async def test_rollups_job_skips_the_refresh_when_the_rollup_lock_is_taken():
+    refresh = AsyncMock()
+    with (
+        patch.object(main.rollup_repo, "roll_up_telemetry", AsyncMock(return_value=None)),
+        patch.object(main.rollup_repo, "refresh_admin_counts", refresh),
+    ):
+        assert await main.roll_up_stats() is None
+    refresh.assert_not_awaited()
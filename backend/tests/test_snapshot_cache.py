@@ -0,0 +1,204 @@
+"""
+Tests for backend/repos/snapshot_cache.py — the process-local aide cache.
+
+Exercises the cache directly (no database); coherence is driven through the
+NOTIFY callback the listener connection would invoke.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from backend.models.aide import Aide
+from backend.repos import snapshot_cache
+from backend.repos.snapshot_cache import NOTIFY_CHANNEL, SnapshotCache, notify_payload
+
+T0 = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def _aide(aide_id=None, user_id=None, seq: int = 1, at: datetime = T0, padding: int = 0) -> Aide:
+    return Aide(
+        id=aide_id or uuid4(),
+        user_id=user_id or uuid4(),
+        state={"entities": {}, "meta": {"note": "x" * padding}, "_sequence": seq},
+        created_at=T0,
+        updated_at=at,
+    )
+
+
+class _Listener:
+    """Stands in for the LISTEN connection; records the termination callback."""
+
+    def __init__(self) -> None:
+        self.terminate = None
+
+    def add_termination_listener(self, callback) -> None:
+        self.terminate = callback
+
+
+def _cache(max_bytes: int = 1024 * 1024) -> SnapshotCache:
+    cache = SnapshotCache(max_bytes)
+    cache.enabled = True
+    return cache
+
+
+def test_hit_returns_copy_for_owner_only():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+
+    hit = cache.get(aide.id, aide.user_id)
+    assert hit == aide
+    assert hit is not aide
+    assert cache.get(aide.id, uuid4()) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_disabled_cache_never_serves():
+    cache = SnapshotCache(1024 * 1024)
+    aide = _aide()
+    cache.put(aide)
+    assert cache.get(aide.id, aide.user_id) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_min_sequence_skips_older_copy():
+    cache = _cache()
+    aide = _aide(seq=5)
+    cache.put(aide)
+    assert cache.get(aide.id, aide.user_id, min_sequence=6) is None
+    assert cache.get(aide.id, aide.user_id, min_sequence=5) is not None
+
+
+def test_evicts_least_recently_used_past_byte_budget():
+    first, second = _aide(padding=400), _aide(padding=400)
+    cache = _cache(max_bytes=1200)
+    cache.put(first)
+    cache.put(second)
+    cache.get(first.id, first.user_id)
+
+    cache.put(_aide(padding=400))
+
+    assert cache.get(second.id, second.user_id) is None
+    assert cache.get(first.id, first.user_id) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 1200
+
+
+def test_older_version_does_not_replace_newer():
+    cache = _cache()
+    newer = _aide(seq=2, at=T0 + timedelta(seconds=1))
+    stale = newer.model_copy(update={"updated_at": T0, "state": {"_sequence": 1}})
+    cache.put(newer)
+    cache.put(stale)
+    assert cache.get(newer.id, newer.user_id).state["_sequence"] == 2
+
+
+def test_notify_drops_older_entry_and_blocks_stale_read():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+    later = T0 + timedelta(seconds=1)
+
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide.id, later))
+    assert cache.get(aide.id, aide.user_id) is None
+    assert cache.stats()["invalidations"] == 1
+
+    # A read that started before the write must not re-populate the cache
+    cache.put(aide)
+    assert cache.get(aide.id, aide.user_id) is None
+
+    cache.put(aide.model_copy(update={"updated_at": later}))
+    assert cache.get(aide.id, aide.user_id) is not None
+
+
+def test_notify_for_cached_version_keeps_entry():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide.id, T0))
+    assert cache.get(aide.id, aide.user_id) is not None
+
+
+def test_delete_notify_blocks_later_puts():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide.id, None))
+    cache.put(aide)
+    assert cache.get(aide.id, aide.user_id) is None
+
+
+def test_malformed_notify_is_ignored():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, "not json")
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, '{"aide_id": "nope"}')
+    assert cache.get(aide.id, aide.user_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_lost_listener_disables_cache_until_reconnected():
+    cache = _cache()
+    aide = _aide()
+    cache.put(aide)
+    first, second = _Listener(), _Listener()
+    reconnected: list[bool] = []
+    cache.subscribe(lambda aide_id, seq: None, lambda: reconnected.append(True))
+
+    with (
+        patch.object(snapshot_cache.db, "listen", AsyncMock(side_effect=[first, OSError("down"), second])),
+        patch.object(snapshot_cache, "_RELISTEN_MIN_S", 0),
+    ):
+        await cache.start()
+        first.terminate(first)
+        assert cache.get(aide.id, aide.user_id) is None
+        assert cache.stats()["enabled"] is False
+        assert cache.stats()["bytes"] == 0
+
+        await cache._reconnect
+
+    assert cache._listener is second
+    assert cache.stats()["enabled"] is True
+    assert reconnected == [True]
+
+
+@pytest.mark.asyncio
+async def test_listens_for_subscribers_with_cache_off():
+    cache = SnapshotCache(0)
+    with patch.object(snapshot_cache.db, "listen", AsyncMock(return_value=_Listener())):
+        await cache.start()
+    assert cache.listening
+    assert cache.stats()["enabled"] is False
+
+
+def test_notify_is_passed_to_subscribers():
+    cache = _cache()
+    aide_id = uuid4()
+    heard: list = []
+
+    def on_change(changed_id, seq):
+        heard.append((changed_id, seq))
+
+    cache.subscribe(on_change)
+
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide_id, T0, seq=7))
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide_id, None))
+    cache.unsubscribe(on_change)
+    cache._on_notify(None, 0, NOTIFY_CHANNEL, notify_payload(aide_id, T0, seq=8))
+
+    assert heard == [(aide_id, 7), (aide_id, None)]
+
+
+def test_put_uses_given_stored_size():
+    cache = _cache(max_bytes=1000)
+    aide = _aide(padding=10)
+    cache.put(aide, size=600)
+    assert cache.stats()["bytes"] == 600
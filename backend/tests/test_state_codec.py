@@ -0,0 +1,65 @@
+"""
+Tests for backend/utils/state_codec.py — the compressed aide state format.
+
+Round trips need zstandard and are skipped without it; the fallback
+behaviour is tested by hiding the module.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.utils import state_codec
+from engine.kernel import apply_batch, empty_snapshot
+
+
+def _state(count: int) -> dict:
+    events = [{"t": "entity.create", "id": "page", "display": "page", "p": {"title": "T"}}]
+    events += [
+        {"t": "entity.create", "id": f"item_{i}", "parent": "page", "p": {"n": i, "done": False}} for i in range(count)
+    ]
+    state, _ = apply_batch(empty_snapshot(), events)
+    return state
+
+
+def test_header_empties_entities_and_keeps_sequence():
+    state = _state(3)
+    header = state_codec.header(state)
+    assert header["entities"] == {}
+    assert header["_sequence"] == state["_sequence"]
+    assert state["entities"]  # the input is not modified
+
+
+def test_threshold_zero_disables_compression():
+    assert state_codec.encode_if_large(_state(3), 0) is None
+
+
+def test_without_zstandard_nothing_is_compressed_and_reads_fail():
+    with patch.object(state_codec, "zstandard", None):
+        assert not state_codec.available()
+        assert state_codec.encode_if_large(_state(3), 1) is None
+        with pytest.raises(RuntimeError, match="zstandard is not installed"):
+            state_codec.decode(b"\x28\xb5\x2f\xfd", state_codec.STATE_FORMAT)
+
+
+def test_round_trip_above_threshold():
+    pytest.importorskip("zstandard")
+    state = _state(200)
+    blob = state_codec.encode_if_large(state, 1024)
+    assert blob is not None
+    assert len(blob) < len(str(state))
+    assert state_codec.decode(blob, state_codec.STATE_FORMAT) == state
+
+
+def test_small_state_stays_a_document():
+    pytest.importorskip("zstandard")
+    assert state_codec.encode_if_large(_state(1), 1_000_000) is None
+
+
+def test_unknown_format_is_rejected():
+    pytest.importorskip("zstandard")
+    blob = state_codec.encode(_state(1))
+    with pytest.raises(RuntimeError, match="unknown aide state format 99"):
+        state_codec.decode(blob, 99)
@@ -1,9 +1,11 @@
 """
 Tests for telemetry service and repository.
 
-Repo tests (3):
-  test_record_event_creates_row
-  test_record_event_with_all_fields
+Repo tests (5):
+  test_copy_batch_writes_event
+  test_copy_batch_stores_all_event_fields
+  test_copy_batch_inserts_events
+  test_copy_batch_writes_events_and_turns
   test_get_aide_stats_aggregates
 
 Telemetry service tests (7):
@@ -19,8 +21,9 @@ Telemetry service tests (7):
 from __future__ import annotations
 
 import asyncio
+from datetime import UTC, datetime
 from decimal import Decimal
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
@@ -36,31 +39,99 @@ pytestmark = pytest.mark.asyncio(loop_scope="session")
 # ===========================================================================
 
 
-async def test_record_event_creates_row(initialize_pool) -> None:
-    """record_event() returns an integer row id and the row exists in DB."""
+async def test_copy_batch_writes_event(initialize_pool) -> None:
+    """copy_batch() writes an event row to the telemetry table."""
     from backend import db
     from backend.repos import telemetry_repo
 
     aide_id = uuid4()
     event = TelemetryEvent(aide_id=aide_id, event_type="llm_call")
 
-    row_id = await telemetry_repo.record_event(event)
-    assert isinstance(row_id, int)
-    assert row_id > 0
+    assert await telemetry_repo.copy_batch([(datetime.now(UTC), event)], []) == 0
 
     # Verify the row is actually in the table
     async with db.system_conn() as conn:
-        row = await conn.fetchrow("SELECT * FROM telemetry WHERE id = $1", row_id)
+        row = await conn.fetchrow("SELECT * FROM telemetry WHERE aide_id = $1", aide_id)
     assert row is not None
-    assert str(row["aide_id"]) == str(aide_id)
+    assert row["event_type"] == "llm_call"
 
     # Cleanup
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM telemetry WHERE id = $1", row_id)
+        await conn.execute("DELETE FROM telemetry WHERE aide_id = $1", aide_id)
 
 
-async def test_record_event_with_all_fields(initialize_pool) -> None:
-    """record_event() stores all optional fields correctly."""
+async def test_copy_batch_inserts_events(initialize_pool) -> None:
+    """copy_batch() inserts every event in one call; an empty batch is a no-op."""
+    from backend import db
+    from backend.repos import telemetry_repo
+
+    aide_id = uuid4()
+    now = datetime.now(UTC)
+    events = [(now, TelemetryEvent(aide_id=aide_id, event_type="direct_edit", edit_latency_ms=i)) for i in range(3)]
+
+    await telemetry_repo.copy_batch(events, [])
+    assert await telemetry_repo.copy_batch([], []) == 0
+
+    async with db.system_conn() as conn:
+        rows = await conn.fetch(
+            "SELECT edit_latency_ms FROM telemetry WHERE aide_id = $1 ORDER BY edit_latency_ms", aide_id
+        )
+        await conn.execute("DELETE FROM telemetry WHERE aide_id = $1", aide_id)
+    assert [r["edit_latency_ms"] for r in rows] == [0, 1, 2]
+
+
+async def test_copy_batch_writes_events_and_turns(initialize_pool, test_user_id) -> None:
+    """copy_batch() stores events and turns, skips duplicate turns and leaves turn_count alone."""
+    from backend import db
+    from backend.models.telemetry import TokenUsage, TurnTelemetry
+    from backend.repos import telemetry_repo
+
+    aide_id = uuid4()
+    async with db.system_conn() as conn:
+        await conn.execute(
+            "INSERT INTO aides (id, user_id, title, r2_prefix) VALUES ($1, $2, $3, $4)",
+            aide_id,
+            test_user_id,
+            "Copy Batch",
+            f"test-{aide_id}",
+        )
+        turns_before = await conn.fetchval("SELECT turn_count FROM users WHERE id = $1", test_user_id)
+
+    now = datetime.now(UTC)
+    turn = TurnTelemetry(
+        turn=1,
+        tier="L3",
+        model="sonnet",
+        message="hi",
+        tool_calls=[{"name": "mutate_entity", "input": {"id": "x"}}],
+        text_blocks=["Done"],
+        usage=TokenUsage(input_tokens=10, output_tokens=5),
+        ttfc_ms=1,
+        ttc_ms=2,
+    )
+    events = [(now, TelemetryEvent(aide_id=aide_id, event_type="llm_call", cost_usd=Decimal("0.000123")))]
+    stored = await telemetry_repo.copy_batch(
+        events,
+        [(now, test_user_id, aide_id, turn), (now, test_user_id, aide_id, turn), (now, test_user_id, uuid4(), turn)],
+    )
+    assert stored == 1
+
+    turns = await telemetry_repo.get_turns_for_aide(test_user_id, aide_id)
+    assert [t.tool_calls for t in turns] == [turn.tool_calls]
+    assert turns[0].usage.input_tokens == 10
+
+    async with db.system_conn() as conn:
+        cost = await conn.fetchval("SELECT cost_usd FROM telemetry WHERE aide_id = $1", aide_id)
+        turns_after = await conn.fetchval("SELECT turn_count FROM users WHERE id = $1", test_user_id)
+        await conn.execute("DELETE FROM telemetry WHERE aide_id = $1", aide_id)
+        await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
+    assert cost == Decimal("0.000123")
+    # The trial quota is counted by TurnRecorder.finish, not by the batch
+    assert turns_after == turns_before
+
+
+async def test_copy_batch_stores_all_event_fields(initialize_pool) -> None:
+    """copy_batch() stores all optional event fields correctly."""
     from backend import db
     from backend.repos import telemetry_repo
 
@@ -90,10 +161,10 @@ async def test_record_event_with_all_fields(initialize_pool) -> None:
         message_id=message_id,
     )
 
-    row_id = await telemetry_repo.record_event(event)
+    await telemetry_repo.copy_batch([(datetime.now(UTC), event)], [])
 
     async with db.system_conn() as conn:
-        row = await conn.fetchrow("SELECT * FROM telemetry WHERE id = $1", row_id)
+        row = await conn.fetchrow("SELECT * FROM telemetry WHERE aide_id = $1", aide_id)
 
     assert row["tier"] == "L3"
     assert row["model"] == "sonnet"
@@ -106,10 +177,13 @@ async def test_record_event_with_all_fields(initialize_pool) -> None:
     assert row["lines_rejected"] == 1
     assert row["escalated"] is True
     assert row["escalation_reason"] == "new_collection_needed"
+    assert row["user_id"] == user_id
+    assert row["message_id"] == message_id
+    assert row["cost_usd"] == Decimal("0.002500")
 
     # Cleanup
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM telemetry WHERE id = $1", row_id)
+        await conn.execute("DELETE FROM telemetry WHERE aide_id = $1", aide_id)
 
 
 async def test_get_aide_stats_aggregates(initialize_pool) -> None:
@@ -120,7 +194,7 @@ async def test_get_aide_stats_aggregates(initialize_pool) -> None:
     aide_id = uuid4()
 
     # Insert 2 L2 calls
-    ids = []
+    events = []
     for _ in range(2):
         event = TelemetryEvent(
             aide_id=aide_id,
@@ -133,7 +207,7 @@ async def test_get_aide_stats_aggregates(initialize_pool) -> None:
             lines_rejected=0,
             cost_usd=Decimal("0.001"),
         )
-        ids.append(await telemetry_repo.record_event(event))
+        events.append(event)
 
     # Insert 1 L3 escalation
     escalation_event = TelemetryEvent(
@@ -146,8 +220,14 @@ async def test_get_aide_stats_aggregates(initialize_pool) -> None:
         escalation_reason="schema_missing",
         cost_usd=Decimal("0.030"),
     )
-    ids.append(await telemetry_repo.record_event(escalation_event))
+    events.append(escalation_event)
+    now = datetime.now(UTC)
+    await telemetry_repo.copy_batch([(now, event) for event in events], [])
 
+    # Stats are served from the daily rollups
+    from backend.repos import rollup_repo
+
+    assert await rollup_repo.roll_up_telemetry() >= 2
     stats = await telemetry_repo.get_aide_stats(aide_id)
 
     assert stats["llm_calls"] == 3
@@ -158,10 +238,13 @@ async def test_get_aide_stats_aggregates(initialize_pool) -> None:
     assert abs(float(stats["total_cost"]) - 0.032) < 0.0001
     # accept_rate = 6 accepted / 6 emitted = 1.0
     assert abs(float(stats["accept_rate"]) - 1.0) < 0.001
+    # One day, one row per tier, with percentiles
+    assert [(d["tier"], d["llm_calls"], d["ttfc_p50"]) for d in stats["daily"]] == [("L2", 2, 100.0), ("L3", 1, 500.0)]
 
     # Cleanup
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM telemetry WHERE id = ANY($1::int[])", ids)
+        await conn.execute("DELETE FROM telemetry WHERE aide_id = $1", aide_id)
+        await conn.execute("DELETE FROM telemetry_aide_daily WHERE aide_id = $1", aide_id)
 
 
 # ===========================================================================
@@ -171,33 +254,29 @@ async def test_get_aide_stats_aggregates(initialize_pool) -> None:
 
 async def test_tracker_records_ttfc() -> None:
     """LLMCallTracker.mark_first_content() sets ttfc_ms correctly."""
-    with patch("backend.services.telemetry.telemetry_repo") as mock_repo:
-        mock_repo.record_event = AsyncMock(return_value=1)
-
+    with patch("backend.services.telemetry.telemetry_sink") as mock_sink:
         tracker = LLMCallTracker(aide_id=uuid4(), user_id=uuid4(), tier="L2", model="haiku")
         tracker.start()
         await asyncio.sleep(0.05)
         tracker.mark_first_content()
-        await tracker.finish()
+        tracker.finish()
 
-        event = mock_repo.record_event.call_args[0][0]
+        event = mock_sink.add_event.call_args[0][0]
         assert event.ttfc_ms is not None
         assert event.ttfc_ms >= 40  # at least ~40ms
 
 
 async def test_tracker_records_ttc() -> None:
     """LLMCallTracker.finish() sets ttc_ms >= ttfc_ms."""
-    with patch("backend.services.telemetry.telemetry_repo") as mock_repo:
-        mock_repo.record_event = AsyncMock(return_value=1)
-
+    with patch("backend.services.telemetry.telemetry_sink") as mock_sink:
         tracker = LLMCallTracker(aide_id=uuid4(), user_id=uuid4(), tier="L2", model="haiku")
         tracker.start()
         await asyncio.sleep(0.03)
         tracker.mark_first_content()
         await asyncio.sleep(0.02)
-        await tracker.finish()
+        tracker.finish()
 
-        event = mock_repo.record_event.call_args[0][0]
+        event = mock_sink.add_event.call_args[0][0]
         assert event.ttc_ms is not None
         assert event.ttfc_ms is not None
         assert event.ttc_ms >= event.ttfc_ms
@@ -205,15 +284,13 @@ async def test_tracker_records_ttc() -> None:
 
 async def test_tracker_records_reducer_stats() -> None:
     """set_reducer_stats() propagates to the TelemetryEvent."""
-    with patch("backend.services.telemetry.telemetry_repo") as mock_repo:
-        mock_repo.record_event = AsyncMock(return_value=1)
-
+    with patch("backend.services.telemetry.telemetry_sink") as mock_sink:
         tracker = LLMCallTracker(aide_id=uuid4(), user_id=uuid4(), tier="L2", model="haiku")
         tracker.start()
         tracker.set_reducer_stats(emitted=10, accepted=8, rejected=2)
-        await tracker.finish()
+        tracker.finish()
 
-        event = mock_repo.record_event.call_args[0][0]
+        event = mock_sink.add_event.call_args[0][0]
         assert event.lines_emitted == 10
         assert event.lines_accepted == 8
         assert event.lines_rejected == 2
@@ -221,15 +298,13 @@ async def test_tracker_records_reducer_stats() -> None:
 
 async def test_tracker_records_escalation() -> None:
     """set_escalation() sets escalated=True and stores the reason."""
-    with patch("backend.services.telemetry.telemetry_repo") as mock_repo:
-        mock_repo.record_event = AsyncMock(return_value=1)
-
+    with patch("backend.services.telemetry.telemetry_sink") as mock_sink:
         tracker = LLMCallTracker(aide_id=uuid4(), user_id=uuid4(), tier="L3", model="sonnet")
         tracker.start()
         tracker.set_escalation("unknown_field")
-        await tracker.finish()
+        tracker.finish()
 
-        event = mock_repo.record_event.call_args[0][0]
+        event = mock_sink.add_event.call_args[0][0]
         assert event.escalated is True
         assert event.escalation_reason == "unknown_field"
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from uuid import uuid4
 
 import pytest
@@ -30,7 +31,7 @@ async def test_aide_with_turns(initialize_pool, test_user_id):
         )
 
     # Insert some turns
-    turn_ids = []
+    queued = []
     for i in range(1, 3):
         turn = TurnTelemetry(
             turn=i,
@@ -43,8 +44,8 @@ async def test_aide_with_turns(initialize_pool, test_user_id):
             ttfc_ms=200 * i,
             ttc_ms=1000 * i,
         )
-        row_id = await telemetry_repo.insert_turn(test_user_id, aide_id, turn)
-        turn_ids.append(row_id)
+        queued.append((datetime.now(UTC), test_user_id, aide_id, turn))
+    await telemetry_repo.copy_batch([], queued)
 
     class AideFixture:
         pass
@@ -52,13 +53,11 @@ async def test_aide_with_turns(initialize_pool, test_user_id):
     fixture = AideFixture()
     fixture.id = aide_id
     fixture.user_id = test_user_id
-    fixture.turn_ids = turn_ids
 
     yield fixture
 
-    # Cleanup
+    # Cleanup (turn rows go with the aide)
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = ANY($1::uuid[])", turn_ids)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
 
 
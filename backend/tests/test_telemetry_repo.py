@@ -2,13 +2,14 @@
 Tests for turn telemetry repository methods.
 
 Tests:
-  test_insert_turn_creates_row
+  test_copy_batch_creates_turn_row
   test_get_turns_returns_chronological
   test_get_turns_respects_rls
 """
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from uuid import uuid4
 
 import pytest
@@ -20,8 +21,8 @@ from backend.repos import telemetry_repo
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
-async def test_insert_turn_creates_row(initialize_pool, test_user_id) -> None:
-    """insert_turn() creates a row and returns its UUID."""
+async def test_copy_batch_creates_turn_row(initialize_pool, test_user_id) -> None:
+    """copy_batch() creates a turn row and reports it as stored."""
     # Create a test aide
     aide_id = uuid4()
     async with db.system_conn() as conn:
@@ -45,21 +46,19 @@ async def test_insert_turn_creates_row(initialize_pool, test_user_id) -> None:
         ttc_ms=1000,
     )
 
-    row_id = await telemetry_repo.insert_turn(test_user_id, aide_id, turn)
-    assert row_id is not None
+    assert await telemetry_repo.copy_batch([], [(datetime.now(UTC), test_user_id, aide_id, turn)]) == 1
 
     # Verify the row exists
     async with db.user_conn(test_user_id) as conn:
-        row = await conn.fetchrow("SELECT * FROM aide_turn_telemetry WHERE id = $1", row_id)
+        row = await conn.fetchrow("SELECT * FROM aide_turn_telemetry WHERE aide_id = $1", aide_id)
     assert row is not None
     assert row["turn_num"] == 1
     assert row["tier"] == "L3"
     assert row["model"] == "sonnet"
     assert row["message"] == "hello"
 
-    # Cleanup
+    # Cleanup (turn rows go with the aide)
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = $1", row_id)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
 
 
@@ -77,7 +76,7 @@ async def test_get_turns_returns_chronological(initialize_pool, test_user_id) ->
         )
 
     # Insert turns out of order
-    row_ids = []
+    queued = []
     for i in [3, 1, 2]:
         turn = TurnTelemetry(
             turn=i,
@@ -90,16 +89,15 @@ async def test_get_turns_returns_chronological(initialize_pool, test_user_id) ->
             ttfc_ms=200,
             ttc_ms=1000,
         )
-        row_id = await telemetry_repo.insert_turn(test_user_id, aide_id, turn)
-        row_ids.append(row_id)
+        queued.append((datetime.now(UTC), test_user_id, aide_id, turn))
+    await telemetry_repo.copy_batch([], queued)
 
     turns = await telemetry_repo.get_turns_for_aide(test_user_id, aide_id)
     assert [t.turn for t in turns] == [1, 2, 3]
     assert [t.message for t in turns] == ["msg1", "msg2", "msg3"]
 
-    # Cleanup
+    # Cleanup (turn rows go with the aide)
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = ANY($1::uuid[])", row_ids)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
 
 
@@ -127,7 +125,7 @@ async def test_get_turns_respects_rls(initialize_pool, test_user_id, second_user
         ttfc_ms=200,
         ttc_ms=1000,
     )
-    row_id = await telemetry_repo.insert_turn(test_user_id, aide_id, turn)
+    await telemetry_repo.copy_batch([], [(datetime.now(UTC), test_user_id, aide_id, turn)])
 
     # Other user should get empty list
     turns = await telemetry_repo.get_turns_for_aide(second_user_id, aide_id)
@@ -138,7 +136,6 @@ async def test_get_turns_respects_rls(initialize_pool, test_user_id, second_user
     assert len(turns) == 1
     assert turns[0].turn == 1
 
-    # Cleanup
+    # Cleanup (turn rows go with the aide)
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = $1", row_id)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
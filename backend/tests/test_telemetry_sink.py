@@ -0,0 +1,135 @@
+"""
+Tests for backend/services/telemetry_sink.py — the batched telemetry writer.
+
+Patches telemetry_repo.copy_batch so no database is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from backend.models.telemetry import TelemetryEvent, TokenUsage, TurnTelemetry
+from backend.services import telemetry_sink as sink_module
+from backend.services.telemetry_sink import TelemetrySink
+
+
+def _event(latency: int = 0) -> TelemetryEvent:
+    return TelemetryEvent(aide_id=uuid4(), event_type="direct_edit", edit_latency_ms=latency)
+
+
+def _turn(num: int = 1) -> TurnTelemetry:
+    return TurnTelemetry(
+        turn=num,
+        tier="L3",
+        model="sonnet",
+        message="hi",
+        tool_calls=[],
+        text_blocks=[],
+        usage=TokenUsage(input_tokens=1, output_tokens=1),
+        ttfc_ms=1,
+        ttc_ms=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches_of_batch_rows():
+    sink = TelemetrySink(max_rows=100, batch_rows=2, flush_ms=60_000)
+    copy_batch = AsyncMock(side_effect=lambda events, turns: len(turns))
+    for i in range(3):
+        sink.add_event(_event(i))
+    sink.add_turn(uuid4(), uuid4(), _turn())
+
+    with patch.object(sink_module.telemetry_repo, "copy_batch", copy_batch):
+        await sink.flush()
+
+    batches = [(len(call.args[0]), len(call.args[1])) for call in copy_batch.await_args_list]
+    assert batches == [(2, 0), (1, 1)]
+    assert [event.edit_latency_ms for _, event in copy_batch.await_args_list[0].args[0]] == [0, 1]
+    assert sink.depth == 0
+    assert sink.stats()["written_events"] == 3
+    assert sink.stats()["written_turns"] == 1
+    assert sink.stats()["batches"] == 2
+
+
+@pytest.mark.asyncio
+async def test_full_batch_wakes_flusher_before_timer():
+    sink = TelemetrySink(max_rows=100, batch_rows=3, flush_ms=60_000)
+    copy_batch = AsyncMock(return_value=0)
+    with patch.object(sink_module.telemetry_repo, "copy_batch", copy_batch):
+        await sink.start()
+        sink.add_events([_event(), _event()])
+        await asyncio.sleep(0.01)
+        copy_batch.assert_not_awaited()
+
+        sink.add_event(_event())
+        await asyncio.sleep(0.01)
+        await sink.stop()
+
+    copy_batch.assert_awaited_once()
+    assert len(copy_batch.await_args.args[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_partial_batch():
+    sink = TelemetrySink(max_rows=100, batch_rows=100, flush_ms=10)
+    copy_batch = AsyncMock(return_value=0)
+    with patch.object(sink_module.telemetry_repo, "copy_batch", copy_batch):
+        await sink.start()
+        sink.add_event(_event())
+        await asyncio.sleep(0.05)
+        copy_batch.assert_awaited_once()
+        await sink.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_new_rows():
+    sink = TelemetrySink(max_rows=2, batch_rows=100, flush_ms=60_000)
+    assert sink.add_event(_event(0))
+    assert sink.add_turn(uuid4(), uuid4(), _turn())
+    assert not sink.add_event(_event(1))
+    assert not sink.add_turn(uuid4(), uuid4(), _turn())
+
+    stats = sink.stats()
+    assert stats["queued_events"] == 1
+    assert stats["queued_turns"] == 1
+    assert stats["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_counted_not_raised():
+    sink = TelemetrySink(max_rows=100, batch_rows=100, flush_ms=60_000)
+    sink.add_events([_event(), _event()])
+    with patch.object(sink_module.telemetry_repo, "copy_batch", AsyncMock(side_effect=OSError("down"))):
+        await sink.flush()
+    assert sink.depth == 0
+    assert sink.stats()["failed"] == 2
+    assert sink.stats()["batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_skipped_turns_are_reported():
+    sink = TelemetrySink(max_rows=100, batch_rows=100, flush_ms=60_000)
+    sink.add_turn(uuid4(), uuid4(), _turn(1))
+    sink.add_turn(uuid4(), uuid4(), _turn(1))
+    with patch.object(sink_module.telemetry_repo, "copy_batch", AsyncMock(return_value=1)):
+        await sink.flush()
+    assert sink.stats()["written_turns"] == 1
+    assert sink.stats()["skipped_turns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue():
+    sink = TelemetrySink(max_rows=100, batch_rows=100, flush_ms=60_000)
+    copy_batch = AsyncMock(return_value=0)
+    with patch.object(sink_module.telemetry_repo, "copy_batch", copy_batch):
+        await sink.start()
+        sink.add_event(_event())
+        await sink.stop()
+
+    copy_batch.assert_awaited_once()
+    assert sink.depth == 0
+    assert sink.stats()["running"] is False
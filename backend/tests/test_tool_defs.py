@@ -34,3 +34,14 @@ def test_all_tiers_get_full_tools():
     assert "voice" in names
     assert "mutate_entity" in names
     assert "set_relationship" in names
+
+
+def test_mutate_entities_tool_exists():
+    names = [t["name"] for t in TOOLS]
+    assert "mutate_entities" in names
+
+
+def test_mutate_entities_supports_columnar_rows():
+    tool = next(t for t in TOOLS if t["name"] == "mutate_entities")
+    props = tool["input_schema"]["properties"]
+    assert {"parent", "display", "entities", "columns", "rows"} <= set(props)
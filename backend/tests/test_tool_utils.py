@@ -0,0 +1,122 @@
+"""
+Tests for backend/services/tool_utils.py
+"""
+
+from __future__ import annotations
+
+from backend.services.tool_utils import tool_use_to_reducer_event, tool_use_to_reducer_events
+from engine.kernel import apply, apply_batch, empty_snapshot
+
+
+class TestSingleToolEvents:
+    def test_mutate_entity_maps_to_one_event(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entity", {"action": "create", "id": "page", "display": "page", "props": {"title": "T"}}
+        )
+        assert events == [{"t": "entity.create", "id": "page", "display": "page", "p": {"title": "T"}}]
+
+    def test_voice_maps_to_one_event(self):
+        assert tool_use_to_reducer_events("voice", {"text": "Done."}) == [{"t": "voice", "text": "Done."}]
+
+    def test_unknown_tool_maps_to_nothing(self):
+        assert tool_use_to_reducer_events("nope", {}) == []
+
+    def test_single_converter_ignores_batch_tool(self):
+        assert tool_use_to_reducer_event("mutate_entities", {"action": "create", "entities": []}) is None
+
+
+class TestBatchExpansion:
+    def test_object_rows_share_parent_and_display(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {
+                "action": "create",
+                "parent": "roster",
+                "display": "card",
+                "entities": [{"id": "p1", "props": {"name": "Ann"}}, {"id": "p2", "props": {"name": "Bo"}}],
+            },
+        )
+        assert events == [
+            {"t": "entity.create", "id": "p1", "parent": "roster", "display": "card", "p": {"name": "Ann"}},
+            {"t": "entity.create", "id": "p2", "parent": "roster", "display": "card", "p": {"name": "Bo"}},
+        ]
+
+    def test_columnar_rows(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {
+                "action": "create",
+                "parent": "roster",
+                "columns": ["id", "name", "status"],
+                "rows": [["p1", "Ann", "in"], ["p2", "Bo", "out"]],
+            },
+        )
+        assert [e["id"] for e in events] == ["p1", "p2"]
+        assert events[1]["p"] == {"name": "Bo", "status": "out"}
+        assert all(e["parent"] == "roster" for e in events)
+
+    def test_columnar_rows_with_non_string_ids_dropped(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {"action": "create", "columns": ["id", "name"], "rows": [[1, "Alice"], ["p2", "Bo"], [["p3"], "Cy"]]},
+        )
+        assert [e["id"] for e in events] == ["p2"]
+
+    def test_columnar_display_overrides_shared_display(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {
+                "action": "create",
+                "display": "card",
+                "columns": ["id", "display"],
+                "rows": [["a", "section"], ["b", None]],
+            },
+        )
+        assert [e["display"] for e in events] == ["section", "card"]
+        assert all("p" not in e for e in events)
+
+    def test_update_uses_ref(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {"action": "update", "columns": ["ref", "status"], "rows": [["p1", "out"]]},
+        )
+        assert events == [{"t": "entity.update", "ref": "p1", "p": {"status": "out"}}]
+
+    def test_update_accepts_id_as_ref(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities", {"action": "update", "entities": [{"id": "p1", "props": {"x": 1}}]}
+        )
+        assert events[0]["ref"] == "p1"
+        assert "id" not in events[0]
+
+    def test_remove_drops_props(self):
+        events = tool_use_to_reducer_events("mutate_entities", {"action": "remove", "entities": [{"ref": "p1"}]})
+        assert events == [{"t": "entity.remove", "ref": "p1"}]
+
+    def test_props_json_string_parsed(self):
+        events = tool_use_to_reducer_events(
+            "mutate_entities", {"action": "update", "entities": [{"ref": "p1", "props": '{"x": 1}'}]}
+        )
+        assert events[0]["p"] == {"x": 1}
+
+    def test_batch_matches_individual_applies(self):
+        snap = apply(empty_snapshot(), {"t": "entity.create", "id": "roster", "display": "table"}).snapshot
+        events = tool_use_to_reducer_events(
+            "mutate_entities",
+            {
+                "action": "create",
+                "parent": "roster",
+                "display": "card",
+                "columns": ["id", "name"],
+                "rows": [[f"p{i}", f"Player {i}"] for i in range(40)],
+            },
+        )
+
+        batched, results = apply_batch(snap, events)
+
+        sequential = snap
+        for event in events:
+            sequential = apply(sequential, event).snapshot
+        assert all(r.accepted for r in results)
+        assert batched == sequential
+        assert len(batched["entities"]["roster"]["_children"]) == 40
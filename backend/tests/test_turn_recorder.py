@@ -7,6 +7,7 @@ import pytest
 from backend import db
 from backend.repos import telemetry_repo
 from backend.services.telemetry import TurnRecorder
+from backend.services.telemetry_sink import telemetry_sink
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
@@ -31,12 +32,12 @@ async def test_turn_recorder_basic_flow(initialize_pool, test_user_id):
     recorder.mark_first_content()
     recorder.set_usage(input_tokens=1000, output_tokens=500)
 
-    row_id = await recorder.finish()
-    assert row_id is not None
+    assert await recorder.finish() is True
+    await telemetry_sink.flush()
+    assert len(await telemetry_repo.get_turns_for_aide(test_user_id, aide_id)) == 1
 
-    # Cleanup
+    # Cleanup (turn rows go with the aide)
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = $1", row_id)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
 
 
@@ -59,7 +60,8 @@ async def test_turn_recorder_with_timestamps(initialize_pool, test_user_id):
     recorder.record_text_block("Done", timestamp_ms=200)
     recorder.set_usage(input_tokens=1000, output_tokens=500, cache_read=300)
 
-    row_id = await recorder.finish()
+    await recorder.finish()
+    await telemetry_sink.flush()
 
     # Verify stored data
     turns = await telemetry_repo.get_turns_for_aide(test_user_id, aide_id)
@@ -69,12 +71,11 @@ async def test_turn_recorder_with_timestamps(initialize_pool, test_user_id):
 
     # Cleanup
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = $1", row_id)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
 
 
-async def test_turn_recorder_returns_none_without_usage(initialize_pool, test_user_id):
-    """Test turn recorder returns None without usage."""
+async def test_turn_recorder_skips_turn_without_usage(initialize_pool, test_user_id):
+    """Test turn recorder queues nothing without usage."""
     # Create a test aide
     aide_id = uuid4()
     async with db.system_conn() as conn:
@@ -90,8 +91,8 @@ async def test_turn_recorder_returns_none_without_usage(initialize_pool, test_us
     recorder.start_turn(turn_num=1, tier="L3", model="sonnet", message="hello")
     # Don't call set_usage()
 
-    row_id = await recorder.finish()
-    assert row_id is None
+    assert await recorder.finish() is False
+    assert telemetry_sink.stats()["queued_turns"] == 0
 
     # Cleanup
     async with db.system_conn() as conn:
@@ -120,14 +121,13 @@ async def test_turn_recorder_increments_user_turn_count(initialize_pool, test_us
     recorder.start_turn(turn_num=1, tier="L3", model="sonnet", message="hello")
     recorder.record_tool_call("mutate_entity", {"action": "create"})
     recorder.set_usage(input_tokens=1000, output_tokens=500)
-    row_id = await recorder.finish()
+    await recorder.finish()
 
-    # Verify turn_count was incremented
+    # Verify turn_count was incremented before the sink flushed
     async with db.user_conn(test_user_id) as conn:
         new_count = await conn.fetchval("SELECT turn_count FROM users WHERE id = $1", test_user_id)
     assert new_count == initial_count + 1
 
     # Cleanup
     async with db.system_conn() as conn:
-        await conn.execute("DELETE FROM aide_turn_telemetry WHERE id = $1", row_id)
         await conn.execute("DELETE FROM aides WHERE id = $1", aide_id)
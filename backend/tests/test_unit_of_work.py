@@ -0,0 +1,115 @@
+"""
+Tests for backend/db.py unit_of_work() — connection reuse across repo calls.
+
+Runs against a fake pool that records statements, so no database is needed;
+RLS and rollback behaviour against Postgres are covered in test_db.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from backend import db
+
+
+class _Conn:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def execute(self, query: str, *args) -> str:
+        self.log.append(query)
+        return "OK"
+
+    def is_closed(self) -> bool:
+        return False
+
+
+class _Pool:
+    """Hands out a new recording connection per acquire()."""
+
+    def __init__(self) -> None:
+        self.log: list[str] = []
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield _Conn(self.log)
+
+
+@pytest.fixture
+def pool():
+    fake = _Pool()
+    with patch.object(db, "pool", fake):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_user_conn_begins_and_sets_context_in_one_statement(pool):
+    user_id = uuid4()
+    async with db.user_conn(user_id) as conn:
+        await conn.execute("SELECT 1")
+    assert pool.log == [f"BEGIN; SELECT set_config('app.user_id', '{user_id}', true)", "SELECT 1", "COMMIT"]
+
+
+@pytest.mark.asyncio
+async def test_unit_reuses_connection_for_same_user(pool):
+    user_id = uuid4()
+    async with db.unit_of_work(user_id):
+        async with db.user_conn(user_id) as first:
+            pass
+        async with db.user_conn(str(user_id)) as second:
+            assert second is first
+        async with db.user_conn(uuid4()):
+            pass
+    assert pool.acquired == 2
+    assert pool.log.count("COMMIT") == 2
+
+
+@pytest.mark.asyncio
+async def test_tasks_started_inside_unit_get_their_own_connection(pool):
+    user_id = uuid4()
+
+    async def query():
+        async with db.user_conn(user_id) as conn:
+            return conn
+
+    async with db.unit_of_work(user_id):
+        async with db.user_conn(user_id) as pinned:
+            pass
+        assert await asyncio.create_task(query()) is not pinned
+    assert pool.acquired == 2
+
+
+@pytest.mark.asyncio
+async def test_on_commit_waits_for_unit_and_is_dropped_on_rollback(pool):
+    user_id = uuid4()
+    called: list[str] = []
+
+    async with db.unit_of_work(user_id):
+        async with db.user_conn(user_id) as conn:
+            db.on_commit(conn, lambda: called.append("unit"))
+        assert called == []
+    assert called == ["unit"]
+
+    with pytest.raises(ValueError):
+        async with db.unit_of_work(user_id):
+            async with db.user_conn(user_id) as conn:
+                db.on_commit(conn, lambda: called.append("rolled back"))
+            raise ValueError
+    assert called == ["unit"]
+    assert pool.log[-1] == "ROLLBACK"
+
+
+@pytest.mark.asyncio
+async def test_on_commit_runs_now_outside_unit(pool):
+    called: list[bool] = []
+    async with db.user_conn(uuid4()) as conn:
+        pass
+    db.on_commit(conn, lambda: called.append(True))
+    assert called == [True]
@@ -0,0 +1,193 @@
+"""
+Tests for backend/services/hydration.py — WebSocket snapshot hydration frames.
+
+The HTTP hydrate endpoint is covered by test_hydrate.py.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+from backend.services import hydration
+from backend.services.hydration import (
+    delta_frames,
+    encode_frame,
+    encode_hydration,
+    legacy_frames,
+    parse_since,
+    parse_version,
+    snapshot_frames,
+)
+from engine.kernel import apply, empty_snapshot
+
+
+def _snapshot(count: int, meta: dict | None = None) -> dict:
+    snapshot = empty_snapshot()
+    for i in range(count):
+        snapshot = apply(snapshot, {"t": "entity.create", "id": f"e{i}", "parent": "root"}).snapshot
+    if meta:
+        snapshot["meta"] = meta
+    return snapshot
+
+
+def _decode(frame: str | bytes) -> dict:
+    return json.loads(gzip.decompress(frame) if isinstance(frame, bytes) else frame)
+
+
+class TestParseVersion:
+    def test_defaults_to_legacy(self):
+        assert parse_version(None) == 0
+        assert parse_version("") == 0
+
+    def test_known_version(self):
+        assert parse_version("1") == 1
+
+    def test_unknown_or_malformed_falls_back_to_legacy(self):
+        assert parse_version("99") == 0
+        assert parse_version("-1") == 0
+        assert parse_version("yes") == 0
+
+
+class TestParseSince:
+    def test_absent_or_malformed_means_no_resume(self):
+        assert parse_since(None) is None
+        assert parse_since("") is None
+        assert parse_since("abc") is None
+        assert parse_since("-3") is None
+
+    def test_sequence(self):
+        assert parse_since("42") == 42
+        assert parse_since("0") == 0
+
+
+class TestLegacyFrames:
+    def test_brackets_entity_creates_in_created_order(self):
+        frames = legacy_frames(_snapshot(3, meta={"title": "Poker"}))
+
+        assert frames[0] == {"type": "snapshot.start"}
+        assert [f["id"] for f in frames[1:4]] == ["e0", "e1", "e2"]
+        assert frames[4] == {"type": "meta.update", "data": {"title": "Poker"}}
+        assert frames[-1] == {"type": "snapshot.end"}
+
+
+class TestSnapshotFrames:
+    def test_single_frame_carries_entities_meta_and_sequence(self):
+        snapshot = _snapshot(3, meta={"title": "Poker"})
+
+        [frame] = snapshot_frames(snapshot)
+
+        assert frame["type"] == "snapshot"
+        assert frame["v"] == hydration.HYDRATION_VERSION
+        assert frame["seq"] == snapshot["_sequence"]
+        assert (frame["part"], frame["parts"]) == (0, 1)
+        assert [entity_id for entity_id, _ in frame["entities"]] == ["e0", "e1", "e2"]
+        assert frame["entities"][0][1] == snapshot["entities"]["e0"]
+        assert frame["meta"] == {"title": "Poker"}
+
+    def test_empty_snapshot_is_one_empty_part(self):
+        [frame] = snapshot_frames(empty_snapshot())
+
+        assert frame["entities"] == []
+        assert frame["parts"] == 1
+
+    def test_chunks_large_snapshots_with_meta_on_last_part(self):
+        frames = snapshot_frames(_snapshot(5, meta={"title": "Poker"}), chunk_entities=2)
+
+        assert [len(f["entities"]) for f in frames] == [2, 2, 1]
+        assert [f["part"] for f in frames] == [0, 1, 2]
+        assert all(f["parts"] == 3 for f in frames)
+        assert "meta" not in frames[0]
+        assert frames[-1]["meta"] == {"title": "Poker"}
+
+
+class TestDeltaFrames:
+    def test_only_entities_touched_after_since(self):
+        snapshot = _snapshot(4)
+        since = snapshot["_sequence"]
+        snapshot = apply(snapshot, {"t": "entity.update", "ref": "e1", "p": {"done": True}}).snapshot
+        snapshot = apply(snapshot, {"t": "entity.remove", "ref": "e2"}).snapshot
+
+        [frame] = delta_frames(snapshot, since)
+
+        assert frame["base"] == since
+        assert frame["seq"] == snapshot["_sequence"]
+        assert [entity_id for entity_id, _ in frame["entities"]] == ["e1", "e2"]
+        assert frame["entities"][1][1]["_removed"] is True
+        assert frame["meta"] == snapshot["meta"]
+
+    def test_new_child_brings_its_parent(self):
+        snapshot = _snapshot(4)
+        since = snapshot["_sequence"]
+        snapshot = apply(snapshot, {"t": "entity.create", "id": "child", "parent": "e3"}).snapshot
+
+        [frame] = delta_frames(snapshot, since)
+
+        assert [entity_id for entity_id, _ in frame["entities"]] == ["e3", "child"]
+        assert frame["entities"][0][1]["_children"] == ["child"]
+
+    def test_move_brings_old_and_new_parent(self):
+        snapshot = _snapshot(8)
+        snapshot = apply(snapshot, {"t": "entity.create", "id": "child", "parent": "e1"}).snapshot
+        since = snapshot["_sequence"]
+        snapshot = apply(snapshot, {"t": "entity.move", "ref": "child", "parent": "e3"}).snapshot
+
+        [frame] = delta_frames(snapshot, since)
+
+        entities = dict(frame["entities"])
+        assert set(entities) == {"e1", "e3", "child"}
+        assert entities["e1"]["_children"] == []
+        assert entities["e3"]["_children"] == ["child"]
+
+    def test_up_to_date_client_gets_empty_delta(self):
+        snapshot = _snapshot(3)
+
+        [frame] = delta_frames(snapshot, snapshot["_sequence"])
+
+        assert frame["entities"] == []
+
+    def test_client_ahead_or_unknown_needs_full_hydration(self):
+        snapshot = _snapshot(3)
+
+        assert delta_frames(snapshot, snapshot["_sequence"] + 1) is None
+        assert delta_frames(snapshot, 0) is None
+
+    def test_large_gap_falls_back_to_full_hydration(self):
+        snapshot = _snapshot(4)
+
+        # 3 of 4 entities created after seq 1
+        assert delta_frames(snapshot, 1) is None
+
+    def test_encode_hydration_resumes_only_bulk_clients(self):
+        snapshot = _snapshot(4)
+        since = snapshot["_sequence"]
+        snapshot = apply(snapshot, {"t": "entity.update", "ref": "e1", "p": {"done": True}}).snapshot
+
+        assert [_decode(f) for f in encode_hydration(snapshot, 1, since=since)] == delta_frames(snapshot, since)
+        assert [_decode(f) for f in encode_hydration(snapshot, 1, since=0)] == snapshot_frames(snapshot)
+        assert [_decode(f) for f in encode_hydration(snapshot, 0, since=since)] == legacy_frames(snapshot)
+
+
+class TestEncoding:
+    def test_small_frames_stay_text(self):
+        assert isinstance(encode_frame({"type": "snapshot", "entities": []}), str)
+
+    def test_large_frames_are_gzipped(self):
+        frame = {"type": "snapshot", "entities": [["e", {"text": "x" * hydration.COMPRESS_MIN_BYTES}]]}
+
+        encoded = encode_frame(frame)
+
+        assert isinstance(encoded, bytes)
+        assert len(encoded) < hydration.COMPRESS_MIN_BYTES
+        assert _decode(encoded) == frame
+
+    def test_compression_is_deterministic(self):
+        frame = {"type": "snapshot", "entities": [["e", {"text": "x" * hydration.COMPRESS_MIN_BYTES}]]}
+
+        assert encode_frame(frame) == encode_frame(frame)
+
+    def test_encode_hydration_per_version(self):
+        snapshot = _snapshot(2)
+
+        assert [_decode(f) for f in encode_hydration(snapshot, 0)] == legacy_frames(snapshot)
+        assert [_decode(f) for f in encode_hydration(snapshot, 1)] == snapshot_frames(snapshot)
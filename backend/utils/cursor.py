@@ -0,0 +1,52 @@
+"""
+Opaque keyset cursors for the admin listings.
+
+A cursor names the last row of a page by its sort key, (created_at, id),
+so the next page starts with a `(created_at, id) < (...)` index seek
+instead of skipping OFFSET rows. Clients treat it as an opaque string.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from backend.utils import jsonx
+
+
+def encode(created_at: datetime, row_id: UUID) -> str:
+    """
+    Build the cursor for the page after a row.
+
+    Args:
+        created_at: The row's created_at
+        row_id: The row's id
+
+    Returns:
+        URL-safe cursor string
+    """
+    data = jsonx.dumpb([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def decode(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Parse a cursor built by encode().
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        (created_at, id) of the last row of that page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = jsonx.loads(data)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
@@ -0,0 +1,102 @@
+"""
+JSON encoding and decoding for the hot paths: asyncpg codecs, WebSocket
+frames, snapshot hashing, prompts and the render subprocess.
+
+Backed by orjson when it is installed (JSON_CODEC=auto, the default) and
+by the stdlib json module otherwise, or when JSON_CODEC=json. Callers use
+the functions here rather than either library directly, so the choice is
+made once per process. JSON_CODEC is read from the environment here, not
+through backend.config: prompt_builder and hydration import this module and
+are used by eval and benchmark scripts that run without backend settings.
+
+    dumps(obj)                 compact str: text WebSocket frames, NOTIFY payloads
+    dumpb(obj)                 compact UTF-8 bytes: asyncpg, gzip, binary frames
+    dumps(obj, indent=True)    2-space indented str: snapshots in prompts
+    loads(data)                str, bytes or memoryview
+
+Output differs between the two backends in one visible way: orjson writes
+non-ASCII characters as UTF-8 where stdlib json escapes them (\\u00e9).
+Both parse the same, but byte-level values such as `hash_snapshot` are only
+stable within one backend. Integers outside 64 bits, which orjson rejects,
+are encoded with the stdlib instead.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only where orjson is not installed
+    orjson = None
+
+
+def _std_dumpb(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+    return _std_dumps(obj, sort_keys, indent).encode("utf-8")
+
+
+def _std_dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+    if indent:
+        return json.dumps(obj, sort_keys=sort_keys, indent=2)
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"))
+
+
+def _std_loads(data: str | bytes | bytearray | memoryview) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+if orjson is not None:
+    # Non-string dict keys are stringified, as the stdlib does
+    _OPTIONS = {
+        (False, False): orjson.OPT_NON_STR_KEYS,
+        (True, False): orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS,
+        (False, True): orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2,
+        (True, True): orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2,
+    }
+
+    def _orjson_dumpb(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_OPTIONS[sort_keys, indent])
+        except orjson.JSONEncodeError:
+            # e.g. an int beyond 64 bits; the stdlib handles it or raises its own TypeError
+            return _std_dumpb(obj, sort_keys, indent)
+
+    def _orjson_dumps(obj: Any, sort_keys: bool = False, indent: bool = False) -> str:
+        return _orjson_dumpb(obj, sort_keys, indent).decode("utf-8")
+
+
+if orjson is not None and os.environ.get("JSON_CODEC", "auto") != "json":
+    BACKEND = "orjson"
+    _dumpb, _dumps, _loads = _orjson_dumpb, _orjson_dumps, orjson.loads
+else:
+    BACKEND = "json"
+    _dumpb, _dumps, _loads = _std_dumpb, _std_dumps, _std_loads
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> str:
+    """
+    Encode a value as JSON text.
+
+    Args:
+        obj: JSON-compatible value
+        sort_keys: Sort object keys (for hashing and stable prompts)
+        indent: Indent nested values by two spaces instead of encoding compactly
+
+    Returns:
+        JSON string
+    """
+    return _dumps(obj, sort_keys, indent)
+
+
+def dumpb(obj: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Encode a value as UTF-8 JSON bytes; same options as dumps()."""
+    return _dumpb(obj, sort_keys, indent)
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode JSON text or UTF-8 bytes."""
+    return _loads(data)
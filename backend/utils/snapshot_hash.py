@@ -1,9 +1,10 @@
 """Snapshot hashing utilities for reconciliation."""
 
 import hashlib
-import json
 from typing import Any
 
+from backend.utils import jsonx
+
 
 def hash_snapshot(snapshot: dict[str, Any]) -> str:
     """
@@ -19,7 +20,7 @@ def hash_snapshot(snapshot: dict[str, Any]) -> str:
         Hexadecimal hash string (first 16 characters of SHA-256)
     """
     # Sort keys for deterministic serialization
-    serialized = json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
-    hash_obj = hashlib.sha256(serialized.encode("utf-8"))
+    serialized = jsonx.dumpb(snapshot, sort_keys=True)
+    hash_obj = hashlib.sha256(serialized)
     # Return first 16 hex chars for brevity (64 bits should be sufficient for collision detection)
     return hash_obj.hexdigest()[:16]
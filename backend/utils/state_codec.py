@@ -0,0 +1,79 @@
+"""
+Compressed storage format for large aide states (aides.state_storage = 'compressed').
+
+A compressed aide keeps a header in aides.state (the state with `entities`
+emptied, so `_sequence`, meta and styles stay queryable) and the whole
+state in aides.state_blob, in the format named by aides.state_format:
+
+    1: zstd frame over the canonical JSON (jsonx.dumpb with sorted keys)
+
+Only the full-aide read paths select state_blob, so lists, summaries and
+sequence checks never decompress it.
+
+zstandard is optional. Without it nothing is compressed, and reading a
+compressed row raises RuntimeError.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from backend.utils import jsonx
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only where zstandard is not installed
+    zstandard = None
+
+# Current value written to aides.state_format
+STATE_FORMAT = 1
+
+_LEVEL = 3
+
+
+def available() -> bool:
+    """Whether compressed states can be written and read in this process."""
+    return zstandard is not None
+
+
+def header(state: dict[str, Any]) -> dict[str, Any]:
+    """The part of a state kept in aides.state when its entities are stored elsewhere."""
+    return {**state, "entities": {}}
+
+
+def encode(state: dict[str, Any]) -> bytes:
+    """Compress a state in the current STATE_FORMAT."""
+    return zstandard.ZstdCompressor(level=_LEVEL).compress(jsonx.dumpb(state, sort_keys=True))
+
+
+def encode_if_large(state: dict[str, Any], min_bytes: int) -> bytes | None:
+    """
+    Compress a state whose canonical JSON is at least min_bytes.
+
+    Args:
+        state: Aide state
+        min_bytes: Size threshold; 0 disables compression
+
+    Returns:
+        The compressed state, or None to store it as a plain document
+    """
+    if min_bytes <= 0 or zstandard is None:
+        return None
+    data = jsonx.dumpb(state, sort_keys=True)
+    if len(data) < min_bytes:
+        return None
+    return zstandard.ZstdCompressor(level=_LEVEL).compress(data)
+
+
+def decode(blob: bytes, state_format: int) -> dict[str, Any]:
+    """
+    Decompress a stored state.
+
+    Raises:
+        RuntimeError: zstandard is not installed, or the format is unknown
+    """
+    if zstandard is None:
+        raise RuntimeError("aide state is zstd-compressed but zstandard is not installed")
+    if state_format != STATE_FORMAT:
+        raise RuntimeError(f"unknown aide state format {state_format}")
+    return jsonx.loads(zstandard.ZstdDecompressor().decompress(blob))
@@ -4,11 +4,12 @@ AIde Kernel
 apply(snapshot, event) → ApplyResult (pure, deterministic)
 """
 
-from engine.kernel.kernel import ApplyResult, apply, apply_all, empty_snapshot, replay
+from engine.kernel.kernel import ApplyResult, apply, apply_all, apply_batch, empty_snapshot, replay
 
 __all__ = [
     "apply",
     "apply_all",
+    "apply_batch",
     "empty_snapshot",
     "replay",
     "ApplyResult",
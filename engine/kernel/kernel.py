@@ -26,8 +26,8 @@ from typing import Any
 _ID_RE = re.compile(r"^[a-z][a-z0-9_]{0,63}$")
 
 
-def _valid_id(value: str) -> bool:
-    return bool(_ID_RE.match(value))
+def _valid_id(value: Any) -> bool:
+    return isinstance(value, str) and bool(_ID_RE.match(value))
 
 
 # ---------------------------------------------------------------------------
@@ -183,6 +183,36 @@ def apply(snapshot: dict[str, Any], event: dict[str, Any]) -> ApplyResult:
     return handler(snap, event)
 
 
+def apply_batch(
+    snapshot: dict[str, Any],
+    events: list[dict[str, Any]],
+) -> tuple[dict[str, Any], list[ApplyResult]]:
+    """
+    Apply a batch of events with a single deep copy.
+
+    Equivalent to calling apply() for each event in order, but copies the
+    snapshot once instead of once per event. Handlers validate before they
+    mutate, so a rejected event leaves the working copy untouched.
+
+    Returns (final_snapshot, results). Each result's snapshot is the shared
+    working copy — use final_snapshot, not per-event snapshots.
+    Input snapshot is never modified.
+    """
+    snap = copy.deepcopy(snapshot)
+    results: list[ApplyResult] = []
+    for event in events:
+        event_type = event.get("t")
+        if event_type is None:
+            results.append(_reject(snap, "MISSING_TYPE: event has no 't' field"))
+            continue
+        handler = _HANDLERS.get(event_type)
+        if handler is None:
+            results.append(_reject(snap, f"UNKNOWN_PRIMITIVE: {event_type}"))
+            continue
+        results.append(handler(snap, event))
+    return snap, results
+
+
 def apply_all(snapshot: dict[str, Any], events: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Apply a sequence of events to a snapshot.
@@ -327,6 +357,8 @@ def _handle_entity_move(snap: dict, event: dict) -> ApplyResult:
         old_parent_entity = snap["entities"].get(old_parent)
         if old_parent_entity and ref in old_parent_entity["_children"]:
             old_parent_entity["_children"].remove(ref)
+            # Like reorder: its _children changed, so catch-up hydration must resend it
+            old_parent_entity["_updated_seq"] = seq
 
     # Insert into new parent's _children
     if new_parent != "root":
@@ -123,6 +123,11 @@ class TestEntityCreate:
         assert not result.accepted
         assert "INVALID_ID" in result.reason
 
+    def test_reject_non_string_id(self, empty):
+        result = apply(empty, {"t": "entity.create", "id": 1, "p": {}})
+        assert not result.accepted
+        assert "INVALID_ID" in result.reason
+
     def test_reject_missing_id(self, empty):
         result = apply(empty, {"t": "entity.create", "p": {}})
         assert not result.accepted
@@ -300,6 +305,16 @@ class TestEntityMove:
         assert "item_x" not in result.snapshot["entities"]["section_a"]["_children"]
         assert "item_x" in result.snapshot["entities"]["section_b"]["_children"]
 
+    def test_move_marks_old_parent_updated(self, empty):
+        snap = empty
+        for eid, parent in [("section_a", "root"), ("section_b", "root"), ("item_x", "section_a")]:
+            snap = apply(snap, {"t": "entity.create", "id": eid, "parent": parent, "p": {}}).snapshot
+
+        result = apply(snap, {"t": "entity.move", "ref": "item_x", "parent": "section_b"})
+        seq = result.snapshot["_sequence"]
+        assert result.snapshot["entities"]["section_a"]["_updated_seq"] == seq
+        assert result.snapshot["entities"]["item_x"]["_updated_seq"] == seq
+
     def test_move_with_position(self, state_with_three_children):
         snap = state_with_three_children
         # Add a separate parent and move guest_bob to it at position 0
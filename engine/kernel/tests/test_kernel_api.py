@@ -4,7 +4,7 @@ TDD test for kernel API rename.
 Tests the renamed kernel API: apply() instead of reduce().
 """
 
-from engine.kernel import apply, empty_snapshot
+from engine.kernel import apply, apply_batch, empty_snapshot
 
 
 class TestKernelAPI:
@@ -33,3 +33,23 @@ class TestKernelAPI:
         assert "relationships" in snap
         assert "styles" in snap
         assert "meta" in snap
+
+    def test_apply_batch_applies_in_order(self):
+        """apply_batch() applies events in order with per-event results."""
+        snap = empty_snapshot()
+        events = [
+            {"t": "entity.create", "id": "list", "display": "list"},
+            {"t": "entity.create", "id": "a", "parent": "list", "p": {"name": "A"}},
+            {"t": "entity.create", "id": "a", "parent": "list"},
+            {"t": "entity.update", "ref": "a", "p": {"name": "B"}},
+        ]
+        final, results = apply_batch(snap, events)
+        assert [r.accepted for r in results] == [True, True, False, True]
+        assert final["entities"]["a"]["props"]["name"] == "B"
+        assert final["_sequence"] == 3
+
+    def test_apply_batch_does_not_modify_input(self):
+        """apply_batch() leaves the input snapshot untouched."""
+        snap = empty_snapshot()
+        apply_batch(snap, [{"t": "entity.create", "id": "x"}, {"t": "bogus"}])
+        assert snap == empty_snapshot()
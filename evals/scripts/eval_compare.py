@@ -7,6 +7,7 @@ Usage:
 
 Output:
   - Comparison table showing scores and token deltas
+  - Output-token and time-to-complete totals, mean TTFC and validity per turn
   - Regressions (>2% drop)
   - Improvements (>2% gain)
 """
@@ -39,6 +40,21 @@ def compare_runs(run_a: Path, run_b: Path) -> None:
 
         print_overall_row(overall_a, overall_b, overall_delta, token_delta_pct)
 
+        overall_time_a = sum(s["a_time_ms"] for s in scenarios)
+        overall_time_b = sum(s["b_time_ms"] for s in scenarios)
+        time_delta_pct = (overall_time_b - overall_time_a) / max(overall_time_a, 1) * 100
+        print(f"\nOutput tokens: {overall_tokens_a} → {overall_tokens_b} ({token_delta_pct:+.0f}%)")
+        print(f"Time to complete: {overall_time_a}ms → {overall_time_b}ms ({time_delta_pct:+.0f}%)")
+
+        ttfc_a = _mean(s["a_ttfc_ms"] for s in scenarios if s["a_ttfc_ms"] is not None)
+        ttfc_b = _mean(s["b_ttfc_ms"] for s in scenarios if s["b_ttfc_ms"] is not None)
+        if ttfc_a is not None and ttfc_b is not None:
+            print(f"Time to first content (mean/turn): {ttfc_a:.0f}ms → {ttfc_b:.0f}ms")
+        validity_a = _mean(s["a_validity"] for s in scenarios if s["a_validity"] is not None)
+        validity_b = _mean(s["b_validity"] for s in scenarios if s["b_validity"] is not None)
+        if validity_a is not None and validity_b is not None:
+            print(f"Validity (mean/turn): {validity_a:.1%} → {validity_b:.1%}")
+
     # Print regressions
     regressions = [s for s in scenarios if s["delta"] < -0.02]
     if regressions:
@@ -54,6 +70,17 @@ def compare_runs(run_a: Path, run_b: Path) -> None:
             print(f"  ✓ {i['name']}: {i['delta']:+.1%}")
 
 
+def _mean(values) -> float | None:
+    values = list(values)
+    return sum(values) / len(values) if values else None
+
+
+def _turn_mean(result: dict, key) -> float | None:
+    """Mean of a per-turn metric; key is a callable on the turn dict, None values skipped."""
+    values = [v for v in (key(t) for t in result.get("turns", [])) if v is not None]
+    return _mean(values)
+
+
 def match_scenarios(a_results: list, b_results: list) -> list:
     """Match scenarios between two runs."""
     b_by_name = {r["name"]: r for r in b_results}
@@ -70,12 +97,27 @@ def match_scenarios(a_results: list, b_results: list) -> list:
                     "delta": b["avg_score"] - a["avg_score"],
                     "a_tokens": a.get("total_tokens", 0),
                     "b_tokens": b.get("total_tokens", 0),
+                    "a_time_ms": a.get("total_time_ms", 0),
+                    "b_time_ms": b.get("total_time_ms", 0),
+                    "a_ttfc_ms": _turn_mean(a, _turn_ttfc),
+                    "b_ttfc_ms": _turn_mean(b, _turn_ttfc),
+                    "a_validity": _turn_mean(a, _turn_validity),
+                    "b_validity": _turn_mean(b, _turn_validity),
                 }
             )
 
     return scenarios
 
 
+def _turn_ttfc(turn: dict) -> int | None:
+    ttfc = turn.get("ttfc_ms")
+    return ttfc if ttfc is not None and ttfc >= 0 else None
+
+
+def _turn_validity(turn: dict) -> float | None:
+    return (turn.get("score") or {}).get("validity")
+
+
 def print_comparison_table(scenarios: list, run_a_name: str, run_b_name: str) -> None:
     """Print formatted comparison table."""
     print("╔" + "═" * 70 + "╗")
@@ -21,6 +21,12 @@ Usage:
   # Test candidate prompt version
   python eval_multiturn.py --prompt-version v2
 
+  # Baseline without batched tools (compare against a default run with eval_compare.py)
+  python eval_multiturn.py --save --single-entity-tools
+
+  # Compact JSONL wire mode instead of tool_use (compare with eval_compare.py)
+  python eval_multiturn.py --save --output-mode jsonl
+
 Environment:
   ANTHROPIC_API_KEY  — required
   AIDE_EVAL_DIR      — output dir (default: ./eval_output)
@@ -48,9 +54,10 @@ from scoring import parse_jsonl, score_scenario
 # Add backend to path and import modules
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from backend.services.classifier import classify as backend_classify
+from backend.services.jsonl_parser import JSONLParser
 from backend.services.prompt_builder import build_system_blocks
 from backend.services.tool_defs import TOOLS
-from backend.services.tool_utils import tool_use_to_reducer_event
+from backend.services.tool_utils import BATCH_TOOLS, tool_use_to_reducer_events
 from engine.kernel.kernel import apply, empty_snapshot
 
 # ---------------------------------------------------------------------------
@@ -62,6 +69,10 @@ DEFAULT_MODELS = {
     "L4": "claude-opus-4-5-20251101",
 }
 
+# Baseline tool set without batched tools — compare runs with eval_compare.py
+# to measure the output-token and TTC effect of mutate_entities
+SINGLE_ENTITY_TOOLS = [t for t in TOOLS if t["name"] not in BATCH_TOOLS]
+
 # ---------------------------------------------------------------------------
 # Snapshot builder — applies JSONL output to build next turn's state
 # ---------------------------------------------------------------------------
@@ -131,10 +142,16 @@ def run_turn(
     snapshot: dict | None,
     history: list[dict],
     prompt_version: str | None = None,
+    tools: list[dict] = TOOLS,
+    output_mode: str = "tools",
 ) -> dict:
-    """Run a single turn and return results."""
+    """Run a single turn and return results.
+
+    output_mode="jsonl" drops tools and parses the compact JSONL text the
+    model writes instead, matching the production JSONL wire mode.
+    """
     model = DEFAULT_MODELS[tier]
-    system = build_system_blocks(tier, snapshot, version=prompt_version)
+    system = build_system_blocks(tier, snapshot, version=prompt_version, output_mode=output_mode)
     messages = build_messages_with_history(history, message)
 
     start = time.time()
@@ -148,7 +165,7 @@ def run_turn(
         max_tokens=4096,
         system=system,
         messages=messages,
-        tools=TOOLS,
+        **({"tools": tools} if output_mode == "tools" else {}),
     ) as stream:
         for event in stream:
             if first_token_time is None and event.type in ("content_block_start", "content_block_delta"):
@@ -173,9 +190,14 @@ def run_turn(
             voice_text = tc["input"].get("text", "")
             reducer_events.append({"t": "voice", "text": voice_text})
         else:
-            event = tool_use_to_reducer_event(tc["name"], tc["input"])
-            if event:
-                reducer_events.append(event)
+            reducer_events.extend(tool_use_to_reducer_events(tc["name"], tc["input"]))
+
+    # JSONL mode: the text itself is the event stream
+    raw_text = "".join(text_blocks)
+    if output_mode == "jsonl":
+        parser = JSONLParser(expand=False)
+        reducer_events = parser.feed(raw_text) + parser.flush()
+        voice_text = " ".join(e.get("text", "") for e in reducer_events if e.get("t") == "voice")
 
     # Build JSONL output for scoring (maintains compatibility with existing scoring code)
     output_lines = [json.dumps(e) for e in reducer_events]
@@ -185,8 +207,8 @@ def run_turn(
         "tier": tier,
         "model": model,
         "output": clean_output,
-        "raw_output": clean_output,
-        "had_fences": False,
+        "raw_output": raw_text if output_mode == "jsonl" else clean_output,
+        "had_fences": output_mode == "jsonl" and "```" in raw_text,
         "tool_calls": tool_calls,
         "text_blocks": text_blocks,
         "voice_text": voice_text,
@@ -212,6 +234,8 @@ def run_multiturn_scenario(
     save_dir: Path | None = None,
     max_turns: int | None = None,
     prompt_version: str | None = None,
+    tools: list[dict] = TOOLS,
+    output_mode: str = "tools",
 ) -> dict:
     """Run a complete multi-turn scenario, building state across turns."""
     name = scenario["name"]
@@ -241,7 +265,7 @@ def run_multiturn_scenario(
         for tier in sorted(warmed_tiers):
             try:
                 warm_start = time.time()
-                warm_system = build_system_blocks(tier, snapshot, version=prompt_version)
+                warm_system = build_system_blocks(tier, snapshot, version=prompt_version, output_mode=output_mode)
                 # Minimal request — must include tools to match actual calls
                 # Anthropic cache is prefix-based: system + tools must match
                 client.messages.create(
@@ -249,7 +273,7 @@ def run_multiturn_scenario(
                     max_tokens=1,
                     system=warm_system,
                     messages=[{"role": "user", "content": "ping"}],
-                    tools=TOOLS,
+                    **({"tools": tools} if output_mode == "tools" else {}),
                 )
                 warm_ms = int((time.time() - warm_start) * 1000)
                 print(f"    {tier} warmed in {warm_ms}ms")
@@ -281,10 +305,20 @@ def run_multiturn_scenario(
                     classified_tier if classified_tier in accept_tiers else expected_tier,
                     snapshot,
                     version=prompt_version,
+                    output_mode=output_mode,
                 )
             )
 
-            result = run_turn(client, message, actual_tier, snapshot, history, prompt_version=prompt_version)
+            result = run_turn(
+                client,
+                message,
+                actual_tier,
+                snapshot,
+                history,
+                prompt_version=prompt_version,
+                tools=tools,
+                output_mode=output_mode,
+            )
 
             # Retry guard: if L3 produced zero parseable JSONL, it slipped
             # into conversational mode. Retry once with explicit nudge.
@@ -294,7 +328,14 @@ def run_multiturn_scenario(
                     print(f"    ⚠ {actual_tier} produced plain text, retrying with nudge...")
                     retry_msg = message + "\n\n[System: respond with JSONL operations only. No prose.]"
                     retry_result = run_turn(
-                        client, retry_msg, actual_tier, snapshot, history, prompt_version=prompt_version
+                        client,
+                        retry_msg,
+                        actual_tier,
+                        snapshot,
+                        history,
+                        prompt_version=prompt_version,
+                        tools=tools,
+                        output_mode=output_mode,
                     )
                     retry_parsed, _ = parse_jsonl(retry_result["output"])
                     if retry_parsed:
@@ -387,7 +428,9 @@ def run_multiturn_scenario(
                 turn_dir = save_dir / name / f"turn_{i + 1:02d}"
                 turn_dir.mkdir(parents=True, exist_ok=True)
 
-                sys_prompt_blocks = build_system_blocks(actual_tier, snapshot, version=prompt_version)
+                sys_prompt_blocks = build_system_blocks(
+                    actual_tier, snapshot, version=prompt_version, output_mode=output_mode
+                )
                 sys_prompt_text = chr(10).join(b["text"] for b in sys_prompt_blocks)
                 (turn_dir / "input.md").write_text(
                     f"# Turn {i + 1}: {message}\n\n"
@@ -592,6 +635,17 @@ def main():
     p.add_argument("--save", action="store_true", help="Save run artifacts")
     p.add_argument("--output-dir", default=os.environ.get("AIDE_EVAL_DIR", "./eval_output"))
     p.add_argument("--prompt-version", type=str, help="Prompt version to use (e.g., v1, v2)")
+    p.add_argument(
+        "--single-entity-tools",
+        action="store_true",
+        help="Baseline run without batched tools (mutate_entities), for token/TTC comparison",
+    )
+    p.add_argument(
+        "--output-mode",
+        choices=["tools", "jsonl"],
+        default="tools",
+        help="Wire format: tool_use blocks (default) or compact JSONL text; compare runs with eval_compare.py",
+    )
     args = p.parse_args()
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -631,6 +685,8 @@ def main():
                 save_dir=save_dir,
                 max_turns=args.turns,
                 prompt_version=args.prompt_version,
+                tools=SINGLE_ENTITY_TOOLS if args.single_entity_tools else TOOLS,
+                output_mode=args.output_mode,
             )
             results.append(result)
         except Exception as e:
@@ -166,8 +166,27 @@ def test_compare_runs_shows_improvements():
         assert "improvement_test" in result
 
 
+def test_match_scenarios_averages_turn_ttfc_and_validity():
+    """Per-turn TTFC and validity are averaged for wire-format comparisons; failed TTFC (-1) is skipped."""
+    from evals.scripts.eval_compare import match_scenarios
+
+    a = {
+        "name": "s",
+        "avg_score": 0.8,
+        "turns": [{"ttfc_ms": 400, "score": {"validity": 1.0}}, {"ttfc_ms": -1, "score": {"validity": 0.5}}],
+    }
+    b = {"name": "s", "avg_score": 0.8, "turns": [{"ttfc_ms": 200, "score": {"validity": 1.0}}]}
+
+    [s] = match_scenarios([a], [b])
+    assert s["a_ttfc_ms"] == 400
+    assert s["b_ttfc_ms"] == 200
+    assert s["a_validity"] == 0.75
+    assert s["b_validity"] == 1.0
+
+
 if __name__ == "__main__":
     test_compare_runs_outputs_table()
     test_compare_runs_shows_regressions()
     test_compare_runs_shows_improvements()
+    test_match_scenarios_averages_turn_ttfc_and_validity()
     print("All tests passed!")
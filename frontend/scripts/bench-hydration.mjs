@@ -0,0 +1,61 @@
+#!/usr/bin/env node
+/**
+ * bench-hydration.mjs — Client-side time-to-interactive for snapshot hydration
+ *
+ * Usage: node scripts/bench-hydration.mjs [entities=5000]
+ *
+ * Legacy: parse one entity.create frame per entity and fold them through
+ * applyDelta (the previous useAide.handleSnapshot). Bulk: gunzip and parse
+ * the v1 snapshot frame(s) and build the store with applySnapshot.
+ * Server-side encode cost and wire size: scripts/bench_hydration.py.
+ */
+
+import { gzipSync, gunzipSync } from 'node:zlib';
+import { createStore, applyDelta, applySnapshot } from '../src/lib/entity-store.js';
+
+const COUNT = Number(process.argv[2] || 5000);
+const CHUNK_ENTITIES = 2000;
+
+const entities = [];
+for (let i = 0; i < COUNT; i++) {
+  const props = { done: i % 3 === 0 };
+  for (let j = 0; j < 6; j++) props[`field_${j}`] = `value ${i}-${j}`;
+  const parent = i < COUNT / 100 ? 'root' : `row_${i % Math.max(Math.floor(COUNT / 100), 1)}`;
+  entities.push([`row_${i}`, { parent, props, _created_seq: i + 1 }]);
+}
+
+const legacyFrames = entities.map(([id, data]) => JSON.stringify({ type: 'entity.create', id, data }));
+const bulkFrames = [];
+for (let i = 0; i < entities.length; i += CHUNK_ENTITIES) {
+  const part = bulkFrames.length;
+  const parts = Math.ceil(entities.length / CHUNK_ENTITIES);
+  const frame = { type: 'snapshot', v: 1, seq: COUNT, part, parts, entities: entities.slice(i, i + CHUNK_ENTITIES) };
+  bulkFrames.push(gzipSync(JSON.stringify(frame)));
+}
+
+function legacy() {
+  let store = createStore();
+  for (const frame of legacyFrames) store = applyDelta(store, JSON.parse(frame));
+  return store;
+}
+
+function bulk() {
+  const received = bulkFrames.flatMap((frame) => JSON.parse(gunzipSync(frame).toString()).entities);
+  return applySnapshot(createStore(), { entities: received });
+}
+
+function best(fn, runs = 3) {
+  let ms = Infinity;
+  let store;
+  for (let i = 0; i < runs; i++) {
+    const start = performance.now();
+    store = fn();
+    ms = Math.min(ms, performance.now() - start);
+  }
+  return { ms, size: Object.keys(store.entities).length };
+}
+
+for (const [name, fn] of [['legacy', legacy], ['bulk_v1', bulk]]) {
+  const { ms, size } = best(fn);
+  console.log(`${name.padEnd(8)} ${String(size).padStart(7)} entities ${ms.toFixed(1).padStart(10)} ms`);
+}
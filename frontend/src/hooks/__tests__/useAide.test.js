@@ -32,6 +32,19 @@ describe('useAide', () => {
       return store;
     });
 
+    // Mock applySnapshot to build entities from [id, data] pairs
+    entityStore.applySnapshot.mockImplementation((store, snapshot) => ({
+      ...store,
+      entities: Object.fromEntries(snapshot.entities),
+      meta: snapshot.meta ?? store.meta,
+    }));
+
+    // Mock mergeSnapshot to upsert [id, data] pairs
+    entityStore.mergeSnapshot.mockImplementation((store, snapshot) => ({
+      ...store,
+      entities: { ...store.entities, ...Object.fromEntries(snapshot.entities) },
+    }));
+
     // Mock resetStore to return empty store
     entityStore.resetStore.mockReturnValue({
       entities: {},
@@ -75,34 +88,49 @@ describe('useAide', () => {
     expect(result.current.entityStore.entities).toHaveProperty('e1');
   });
 
-  it('handleSnapshot applies array of deltas to build store', () => {
+  it('handleSnapshot builds the store in one applySnapshot call', () => {
     const { result } = renderHook(() => useAide());
 
-    const deltas = [
-      { type: 'entity.create', id: 'e1', data: { title: 'Entity 1' } },
-      { type: 'entity.create', id: 'e2', data: { title: 'Entity 2' } },
-    ];
+    const snapshot = {
+      entities: [
+        ['e1', { title: 'Entity 1' }],
+        ['e2', { title: 'Entity 2' }],
+      ],
+      meta: { title: 'Poker' },
+    };
 
     act(() => {
-      result.current.handleSnapshot(deltas);
+      result.current.handleSnapshot(snapshot);
     });
 
     // Should call createStore once for the fresh store
     expect(entityStore.createStore).toHaveBeenCalled();
-    // Should call applyDelta for each delta
-    expect(entityStore.applyDelta).toHaveBeenCalledTimes(2);
-    expect(entityStore.applyDelta).toHaveBeenCalledWith(
-      expect.any(Object),
-      deltas[0]
-    );
-    expect(entityStore.applyDelta).toHaveBeenCalledWith(
-      expect.any(Object),
-      deltas[1]
-    );
+    // Should apply the whole snapshot at once rather than delta by delta
+    expect(entityStore.applySnapshot).toHaveBeenCalledTimes(1);
+    expect(entityStore.applySnapshot).toHaveBeenCalledWith(expect.any(Object), snapshot);
+    expect(entityStore.applyDelta).not.toHaveBeenCalled();
 
     // Final store should have both entities
     expect(result.current.entityStore.entities).toHaveProperty('e1');
     expect(result.current.entityStore.entities).toHaveProperty('e2');
+    expect(result.current.entityStore.meta).toEqual({ title: 'Poker' });
+  });
+
+  it('handleSnapshot merges a catch-up snapshot into the current store', () => {
+    const { result } = renderHook(() => useAide());
+
+    act(() => {
+      result.current.handleSnapshot({ entities: [['e1', { title: 'Entity 1' }]], seq: 5 });
+    });
+
+    const catchUp = { entities: [['e2', { title: 'Entity 2' }]], seq: 8, base: 5 };
+    act(() => {
+      result.current.handleSnapshot(catchUp);
+    });
+
+    expect(entityStore.mergeSnapshot).toHaveBeenCalledWith(expect.any(Object), catchUp);
+    expect(result.current.entityStore.entities).toHaveProperty('e1');
+    expect(result.current.entityStore.entities).toHaveProperty('e2');
   });
 
   it('resetState returns store to empty using resetStore', () => {
@@ -4,7 +4,7 @@
  */
 
 import { useState } from 'react';
-import { createStore, applyDelta, resetStore } from '../lib/entity-store.js';
+import { createStore, applyDelta, applySnapshot, mergeSnapshot, resetStore } from '../lib/entity-store.js';
 
 export function useAide() {
   const [entityStore, setEntityStore] = useState(() => createStore());
@@ -13,15 +13,14 @@ export function useAide() {
     setEntityStore((currentStore) => applyDelta(currentStore, delta));
   };
 
-  const handleSnapshot = (deltas) => {
-    // Apply all buffered deltas to build the full store
-    setEntityStore(() => {
-      let store = createStore();
-      for (const delta of deltas) {
-        store = applyDelta(store, delta);
-      }
-      return store;
-    });
+  const handleSnapshot = (snapshot) => {
+    // Resumed connection: merge only what changed since the last sequence we saw
+    if (snapshot.base != null) {
+      setEntityStore((currentStore) => mergeSnapshot(currentStore, snapshot));
+      return;
+    }
+    // Build the full store in one pass from { entities: [[id, data], ...], meta }
+    setEntityStore(() => applySnapshot(createStore(), snapshot));
   };
 
   const resetState = () => {
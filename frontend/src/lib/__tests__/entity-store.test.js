@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest';
-import { createStore, applyDelta, resetStore } from '../entity-store.js';
+import { createStore, applyDelta, applySnapshot, mergeSnapshot, resetStore } from '../entity-store.js';
 
 describe('entity-store', () => {
   it('createStore() returns { entities: {}, rootIds: [], meta: {} }', () => {
@@ -148,4 +148,90 @@ describe('entity-store', () => {
 
     expect(newStore.entities).not.toBe(originalEntities);
   });
+
+  it('applySnapshot builds entities and rootIds in snapshot order', () => {
+    const store = applySnapshot(createStore(), {
+      entities: [
+        ['e1', { props: { name: 'A' } }],
+        ['c1', { parent: 'e1', props: { name: 'child' } }],
+        ['e2', { parent: 'root', props: { name: 'B' } }],
+      ],
+      meta: { title: 'My Page' },
+    });
+
+    expect(Object.keys(store.entities)).toEqual(['e1', 'c1', 'e2']);
+    expect(store.entities.c1).toEqual({ parent: 'e1', props: { name: 'child' } });
+    expect(store.rootIds).toEqual(['e1', 'e2']);
+    expect(store.meta).toEqual({ title: 'My Page' });
+  });
+
+  it('applySnapshot matches replaying the same entities through applyDelta', () => {
+    const entities = [
+      ['e1', { props: { name: 'A' } }],
+      ['c1', { parent: 'e1' }],
+      ['e2', null],
+    ];
+
+    let replayed = createStore();
+    for (const [id, data] of entities) {
+      replayed = applyDelta(replayed, { type: 'entity.create', id, data });
+    }
+
+    expect(applySnapshot(createStore(), { entities })).toEqual(replayed);
+  });
+
+  it('applySnapshot replaces existing entities and keeps meta when none is sent', () => {
+    let store = applyDelta(createStore(), { type: 'entity.create', id: 'old', data: {} });
+    store = applyDelta(store, { type: 'meta.update', data: { title: 'Kept' } });
+
+    const newStore = applySnapshot(store, { entities: [['e1', {}]] });
+
+    expect(newStore.entities).toEqual({ e1: {} });
+    expect(newStore.rootIds).toEqual(['e1']);
+    expect(newStore.meta).toEqual({ title: 'Kept' });
+    expect(store.entities).toHaveProperty('old'); // Original unchanged
+  });
+
+  it('mergeSnapshot upserts changed entities and keeps the rest', () => {
+    const store = applySnapshot(createStore(), {
+      entities: [
+        ['e1', { props: { name: 'A' } }],
+        ['e2', { props: { name: 'B' } }],
+      ],
+      meta: { title: 'Page' },
+    });
+
+    const merged = mergeSnapshot(store, {
+      entities: [
+        ['e2', { props: { name: 'B2' } }],
+        ['e3', { parent: 'root', props: { name: 'C' } }],
+        ['c1', { parent: 'e1' }],
+      ],
+    });
+
+    expect(merged.entities.e1).toEqual({ props: { name: 'A' } });
+    expect(merged.entities.e2).toEqual({ props: { name: 'B2' } });
+    expect(merged.rootIds).toEqual(['e1', 'e2', 'e3']);
+    expect(merged.meta).toEqual({ title: 'Page' });
+    expect(store.entities.e2).toEqual({ props: { name: 'B' } }); // Original unchanged
+  });
+
+  it('mergeSnapshot moves re-parented entities in and out of rootIds', () => {
+    const store = applySnapshot(createStore(), {
+      entities: [
+        ['e1', { parent: 'root' }],
+        ['e2', { parent: 'root' }],
+        ['c1', { parent: 'e1' }],
+      ],
+    });
+
+    const merged = mergeSnapshot(store, {
+      entities: [
+        ['e2', { parent: 'e1' }],
+        ['c1', { parent: 'root' }],
+      ],
+    });
+
+    expect(merged.rootIds).toEqual(['e1', 'c1']);
+  });
 });
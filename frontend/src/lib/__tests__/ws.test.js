@@ -1,4 +1,5 @@
 import { describe, it, expect, beforeEach, vi } from 'vitest';
+import { gzipSync } from 'node:zlib';
 import { AideWS } from '../ws.js';
 
 describe('ws', () => {
@@ -20,7 +21,7 @@ describe('ws', () => {
     global.WebSocket = vi.fn(() => mockWebSocket);
   });
 
-  it("connect('aide-123') constructs WebSocket to ws://host/ws/aide/aide-123", async () => {
+  it("connect('aide-123') constructs WebSocket to ws://host/ws/aide/aide-123 requesting bulk hydration", async () => {
     // Mock location
     global.location = { protocol: 'http:', host: 'localhost:3000' };
 
@@ -31,7 +32,8 @@ describe('ws', () => {
     mockWebSocket.onopen();
     await connectPromise;
 
-    expect(global.WebSocket).toHaveBeenCalledWith('ws://localhost:3000/ws/aide/aide-123');
+    expect(global.WebSocket).toHaveBeenCalledWith('ws://localhost:3000/ws/aide/aide-123?hydrate=1');
+    expect(mockWebSocket.binaryType).toBe('arraybuffer');
   });
 
   it('connect() resolves when onopen fires', async () => {
@@ -177,12 +179,132 @@ describe('ws', () => {
     mockWebSocket.onmessage({ data: JSON.stringify({ type: 'snapshot.end' }) });
 
     // Now callback should be called with batched entities
-    expect(snapshotCb).toHaveBeenCalledWith([
-      { type: 'entity.create', id: 'e1', data: { props: { name: 'A' } } },
-      { type: 'entity.create', id: 'e2', data: { props: { name: 'B' } } },
+    expect(snapshotCb).toHaveBeenCalledWith({
+      entities: [
+        ['e1', { props: { name: 'A' } }],
+        ['e2', { props: { name: 'B' } }],
+      ],
+    });
+  });
+
+  it('onSnapshot(cb) — cb called once with all parts of a bulk snapshot', async () => {
+    global.location = { protocol: 'http:', host: 'localhost:3000' };
+
+    wsInstance = new AideWS();
+    const connectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await connectPromise;
+
+    const snapshotCb = vi.fn();
+    wsInstance.onSnapshot(snapshotCb);
+
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'snapshot', v: 1, seq: 7, part: 0, parts: 2, entities: [['e1', { props: {} }]] }),
+    });
+    expect(snapshotCb).not.toHaveBeenCalled();
+
+    mockWebSocket.onmessage({
+      data: JSON.stringify({
+        type: 'snapshot', v: 1, seq: 7, part: 1, parts: 2, entities: [['e2', { props: {} }]], meta: { title: 'T' },
+      }),
+    });
+
+    expect(snapshotCb).toHaveBeenCalledTimes(1);
+    expect(snapshotCb).toHaveBeenCalledWith({
+      entities: [
+        ['e1', { props: {} }],
+        ['e2', { props: {} }],
+      ],
+      meta: { title: 'T' },
+      seq: 7,
+    });
+  });
+
+  it('gzip binary snapshot frames are decoded before later text frames are routed', async () => {
+    global.location = { protocol: 'http:', host: 'localhost:3000' };
+
+    wsInstance = new AideWS();
+    const connectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await connectPromise;
+
+    const order = [];
+    wsInstance.onSnapshot((snapshot) => order.push(['snapshot', snapshot.entities.length]));
+    wsInstance.onDelta((delta) => order.push(['delta', delta.id]));
+
+    const frame = { type: 'snapshot', v: 1, seq: 1, part: 0, parts: 1, entities: [['e1', {}]], meta: {} };
+    const gz = gzipSync(JSON.stringify(frame));
+    mockWebSocket.onmessage({ data: gz.buffer.slice(gz.byteOffset, gz.byteOffset + gz.length) });
+    mockWebSocket.onmessage({ data: JSON.stringify({ type: 'entity.update', id: 'e1', data: { done: true } }) });
+
+    await wsInstance.decoding;
+
+    expect(order).toEqual([
+      ['snapshot', 1],
+      ['delta', 'e1'],
     ]);
   });
 
+  it('reconnect sends the last seen sequence as since', async () => {
+    global.location = { protocol: 'http:', host: 'localhost:3000' };
+
+    wsInstance = new AideWS();
+    const connectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await connectPromise;
+
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'snapshot', v: 1, seq: 7, part: 0, parts: 1, entities: [], meta: {} }),
+    });
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'entity.update', id: 'e1', data: { props: {} }, seq: 9 }),
+    });
+    expect(wsInstance.lastSeq).toBe(9);
+
+    const reconnectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await reconnectPromise;
+
+    expect(global.WebSocket).toHaveBeenLastCalledWith('ws://localhost:3000/ws/aide/aide-123?hydrate=1&since=9');
+  });
+
+  it('deltas older than the hydrated sequence do not move lastSeq back', async () => {
+    global.location = { protocol: 'http:', host: 'localhost:3000' };
+
+    wsInstance = new AideWS();
+    const connectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await connectPromise;
+
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'snapshot', v: 1, seq: 12, part: 0, parts: 1, entities: [], meta: {} }),
+    });
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'entity.update', id: 'e1', data: { props: {} }, seq: 10 }),
+    });
+
+    expect(wsInstance.lastSeq).toBe(12);
+  });
+
+  it('onSnapshot(cb) — catch-up frames pass their base through', async () => {
+    global.location = { protocol: 'http:', host: 'localhost:3000' };
+
+    wsInstance = new AideWS();
+    const connectPromise = wsInstance.connect('aide-123');
+    mockWebSocket.onopen();
+    await connectPromise;
+
+    const snapshotCb = vi.fn();
+    wsInstance.onSnapshot(snapshotCb);
+
+    mockWebSocket.onmessage({
+      data: JSON.stringify({ type: 'snapshot', v: 1, seq: 12, base: 9, part: 0, parts: 1, entities: [['e1', {}]] }),
+    });
+
+    expect(snapshotCb).toHaveBeenCalledWith(expect.objectContaining({ base: 9, seq: 12 }));
+    expect(wsInstance.lastSeq).toBe(12);
+  });
+
   it('onDirectEditError(cb) — cb called when direct_edit.error received', async () => {
     global.location = { protocol: 'http:', host: 'localhost:3000' };
 
@@ -278,7 +400,8 @@ describe('ws', () => {
     await vi.advanceTimersByTimeAsync(1000);
 
     // Now should attempt reconnect
-    expect(global.WebSocket).toHaveBeenCalledWith('ws://localhost:3000/ws/aide/aide-123');
+    expect(global.WebSocket).toHaveBeenCalledWith('ws://localhost:3000/ws/aide/aide-123?hydrate=1');
+    expect(mockWebSocket.binaryType).toBe('arraybuffer');
 
     vi.useRealTimers();
   });
@@ -69,6 +69,63 @@ export function applyDelta(store, delta) {
   return store;
 }
 
+/**
+ * Replace the store's entities with a full snapshot in one pass.
+ * `entities` is an ordered array of [id, data] pairs (server hydration order);
+ * building the maps once avoids the per-delta copies applyDelta would make.
+ */
+export function applySnapshot(store, { entities = [], meta } = {}) {
+  const newEntities = {};
+  const rootIds = [];
+
+  for (const [id, data] of entities) {
+    const entity = data || {};
+    if (!(id in newEntities)) {
+      const parent = entity.parent;
+      if (!parent || parent === 'root') rootIds.push(id);
+    }
+    newEntities[id] = entity;
+  }
+
+  return {
+    ...store,
+    entities: newEntities,
+    rootIds,
+    meta: meta ?? store.meta,
+  };
+}
+
+/**
+ * Merge a catch-up snapshot (entities changed since the client's last
+ * sequence) into the store, keeping everything else. Changed entities that
+ * moved under a parent leave rootIds; ones that moved to the root join it.
+ */
+export function mergeSnapshot(store, { entities = [], meta } = {}) {
+  const newEntities = { ...store.entities };
+  const isRoot = (entity) => !entity.parent || entity.parent === 'root';
+
+  for (const [id, data] of entities) {
+    newEntities[id] = data || {};
+  }
+
+  const changed = new Set(entities.map(([id]) => id));
+  const rootIds = store.rootIds.filter((id) => !changed.has(id) || isRoot(newEntities[id]));
+  const seen = new Set(rootIds);
+  for (const [id] of entities) {
+    if (!seen.has(id) && isRoot(newEntities[id])) {
+      rootIds.push(id);
+      seen.add(id);
+    }
+  }
+
+  return {
+    ...store,
+    entities: newEntities,
+    rootIds,
+    meta: meta ?? store.meta,
+  };
+}
+
 export function resetStore() {
   return createStore();
 }
@@ -3,6 +3,34 @@
  * Handles connection, message routing, snapshot buffering, and reconnection
  */
 
+// Hydration protocol requested from the server (see backend/services/hydration.py)
+export const HYDRATION_VERSION = 1;
+
+/**
+ * Decode a binary frame: gzip-compressed JSON text.
+ */
+async function gunzipText(data) {
+  const stream = new Response(data).body.pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).text();
+}
+
+/**
+ * Fold legacy snapshot.start … snapshot.end deltas into [id, data] pairs.
+ */
+function entitiesFromDeltas(deltas) {
+  const entities = new Map();
+  for (const { type, id, data } of deltas) {
+    if (type === 'entity.create') {
+      entities.set(id, data || {});
+    } else if (type === 'entity.update') {
+      entities.set(id, { ...(entities.get(id) || {}), ...data });
+    } else if (type === 'entity.remove') {
+      entities.delete(id);
+    }
+  }
+  return [...entities];
+}
+
 export class AideWS {
   constructor() {
     this.ws = null;
@@ -17,20 +45,27 @@ export class AideWS {
       streamError: [],
     };
     this.snapshotBuffer = [];
+    this.snapshotParts = [];
     this.isHydrating = false;
+    this.decoding = null;
+    // Last server sequence applied; sent as ?since= so a reconnect only catches up
+    this.lastSeq = null;
     this.reconnectDelay = 1000;
     this.maxReconnectDelay = 30000;
     this.currentReconnectDelay = 1000;
   }
 
   connect(aideId) {
+    if (aideId !== this.aideId) this.lastSeq = null;
     this.aideId = aideId;
     const proto = location.protocol === 'https:' ? 'wss:' : 'ws:';
-    const url = `${proto}//${location.host}/ws/aide/${aideId}`;
+    const since = this.lastSeq !== null ? `&since=${this.lastSeq}` : '';
+    const url = `${proto}//${location.host}/ws/aide/${aideId}?hydrate=${HYDRATION_VERSION}${since}`;
 
     return new Promise((resolve, reject) => {
       try {
         this.ws = new WebSocket(url);
+        this.ws.binaryType = 'arraybuffer';
 
         this.ws.onopen = () => {
           console.log('[AideWS] Connected:', url);
@@ -39,7 +74,7 @@ export class AideWS {
         };
 
         this.ws.onmessage = (event) => {
-          this.handleMessage(event);
+          this.receive(event.data);
         };
 
         this.ws.onerror = (err) => {
@@ -58,6 +93,24 @@ export class AideWS {
     });
   }
 
+  receive(data) {
+    if (typeof data === 'string' && !this.decoding) {
+      this.handleMessage({ data });
+      return;
+    }
+
+    // Binary (gzip) frames decode asynchronously; queue frames behind them to keep order
+    const decoded = (this.decoding || Promise.resolve())
+      .then(() => (typeof data === 'string' ? data : gunzipText(data)))
+      .then((text) => this.handleMessage({ data: text }))
+      .catch((err) => console.warn('[AideWS] Could not decode frame:', err));
+    this.decoding = decoded;
+    decoded.then(() => {
+      if (this.decoding === decoded) this.decoding = null;
+    });
+    return decoded;
+  }
+
   handleMessage(event) {
     let msg;
     try {
@@ -68,7 +121,21 @@ export class AideWS {
 
     const { type } = msg;
 
-    // Snapshot buffering
+    // Bulk hydration: one or more snapshot parts, applied once the last arrives
+    if (type === 'snapshot') {
+      if (msg.part === 0) this.snapshotParts = [];
+      this.snapshotParts.push(msg.entities);
+      if (msg.part === msg.parts - 1) {
+        // base is set when the server only sent what changed since our lastSeq
+        const snapshot = { entities: this.snapshotParts.flat(), meta: msg.meta, seq: msg.seq, base: msg.base };
+        this.snapshotParts = [];
+        this.lastSeq = msg.seq;
+        this.callbacks.snapshot.forEach((cb) => cb(snapshot));
+      }
+      return;
+    }
+
+    // Legacy snapshot buffering (servers without bulk hydration)
     if (type === 'snapshot.start') {
       this.isHydrating = true;
       this.snapshotBuffer = [];
@@ -77,8 +144,9 @@ export class AideWS {
 
     if (type === 'snapshot.end') {
       this.isHydrating = false;
-      this.callbacks.snapshot.forEach((cb) => cb([...this.snapshotBuffer]));
+      const snapshot = { entities: entitiesFromDeltas(this.snapshotBuffer) };
       this.snapshotBuffer = [];
+      this.callbacks.snapshot.forEach((cb) => cb(snapshot));
       return;
     }
 
@@ -88,6 +156,11 @@ export class AideWS {
       return;
     }
 
+    if (typeof msg.seq === 'number') {
+      // A tab that joins mid-turn is hydrated at the turn's end, then gets its earlier deltas
+      this.lastSeq = this.lastSeq === null ? msg.seq : Math.max(this.lastSeq, msg.seq);
+    }
+
     // Route messages to callbacks
     if (type === 'entity.create' || type === 'entity.update' || type === 'entity.remove') {
       this.callbacks.delta.forEach((cb) => cb(msg));
@@ -140,6 +213,7 @@ export class AideWS {
 
   disconnect() {
     this.aideId = null; // Prevent reconnect after explicit disconnect
+    this.lastSeq = null;
     if (this.ws) {
       this.ws.close();
       this.ws = null;
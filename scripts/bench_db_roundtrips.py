@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark database round trips for a /hydrate-style read against a local Postgres.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_db_roundtrips.py [--iterations 500] [--messages 200]
+
+Needs a database migrated with `alembic upgrade head`. Creates a throwaway
+user, aide and conversation, then runs the hydrate reads (aide, latest
+conversation, latest message page) three ways:
+
+- legacy:    each repo call opens its own transaction, then sets app.user_id
+- pipelined: each repo call sends BEGIN and set_config as one statement
+- unit:      all three calls share one unit_of_work() connection
+
+and reports statements sent and wall time per request. The snapshot cache
+is not started, so every aide read goes to Postgres.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from uuid import uuid4
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("JWT_SECRET", "bench-only-secret-bench-only-secret")
+
+from backend import db  # noqa: E402
+from backend.models.aide import CreateAideRequest  # noqa: E402
+from backend.models.conversation import Message  # noqa: E402
+from backend.repos import aide_repo as aide_repo_module  # noqa: E402
+from backend.repos import conversation_repo as conversation_repo_module  # noqa: E402
+from backend.repos.aide_repo import AideRepo  # noqa: E402
+from backend.repos.conversation_repo import ConversationRepo  # noqa: E402
+
+statements = 0
+
+
+def _count(record) -> None:
+    global statements
+    statements += 1
+
+
+@asynccontextmanager
+async def legacy_user_conn(user_id):
+    """user_conn() as it was: transaction, then a separate set_config round trip."""
+    async with db.pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT set_config('app.user_id', $1, true)", str(user_id))
+            yield conn
+
+
+async def hydrate_reads(user_id, aide_id) -> None:
+    aides, conversations = AideRepo(), ConversationRepo()
+    await aides.get(user_id, aide_id)
+    conversation = await conversations.get_for_aide(user_id, aide_id)
+    await conversations.get_page(user_id, conversation.id, 100)
+
+
+async def hydrate_in_unit(user_id, aide_id) -> None:
+    async with db.unit_of_work(user_id):
+        await hydrate_reads(user_id, aide_id)
+
+
+async def measure(label: str, run, user_id, aide_id, iterations: int) -> None:
+    global statements
+    await run(user_id, aide_id)  # warm prepared statements
+    statements = 0
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await run(user_id, aide_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:<10} {statements / iterations:>11.1f} {statistics.mean(timings):>9.2f} "
+        f"{statistics.median(timings):>9.2f} {sorted(timings)[int(len(timings) * 0.95)]:>9.2f}"
+    )
+
+
+async def main() -> None:
+    p = argparse.ArgumentParser(description="Database round-trip benchmark")
+    p.add_argument("--iterations", type=int, default=500, help="Requests per variant")
+    p.add_argument("--messages", type=int, default=200, help="Messages in the conversation")
+    args = p.parse_args()
+
+    init_connection = db._init_connection
+
+    async def counting_init(conn) -> None:
+        await init_connection(conn)
+        conn.add_query_logger(_count)
+
+    db._init_connection = counting_init
+    await db.init_pool()
+
+    user_id = uuid4()
+    async with db.system_conn() as conn:
+        await conn.execute(
+            "INSERT INTO users (id, email, name) VALUES ($1, $2, $3)", user_id, f"bench-{user_id}@example.com", "Bench"
+        )
+    try:
+        aide = await AideRepo().create(user_id, CreateAideRequest(title="Bench"))
+        conversations = ConversationRepo()
+        conversation = await conversations.create(user_id, aide.id)
+        await conversations.append_messages(
+            user_id,
+            conversation.id,
+            [
+                Message(role="user" if i % 2 == 0 else "assistant", content=f"message {i}", timestamp=datetime.now(UTC))
+                for i in range(args.messages)
+            ],
+        )
+
+        print(f"{'variant':<10} {'stmts/req':>11} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+        legacy = [
+            (aide_repo_module, "user_conn", legacy_user_conn),
+            (conversation_repo_module, "user_conn", legacy_user_conn),
+        ]
+        originals = [(module, name, getattr(module, name)) for module, name, _ in legacy]
+        for module, name, replacement in legacy:
+            setattr(module, name, replacement)
+        try:
+            await measure("legacy", hydrate_reads, user_id, aide.id, args.iterations)
+        finally:
+            for module, name, original in originals:
+                setattr(module, name, original)
+        await measure("pipelined", hydrate_reads, user_id, aide.id, args.iterations)
+        await measure("unit", hydrate_in_unit, user_id, aide.id, args.iterations)
+    finally:
+        async with db.system_conn() as conn:
+            await conn.execute("DELETE FROM aides WHERE user_id = $1", user_id)
+            await conn.execute("DELETE FROM users WHERE id = $1", user_id)
+        await db.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark WebSocket snapshot hydration: legacy per-entity frames vs bulk v1.
+
+Usage:
+    python scripts/bench_hydration.py [--entities 5000] [--props 6]
+
+Builds a synthetic snapshot through the kernel and reports, per protocol,
+frames sent, bytes on the wire, server encode time and a client-side
+receive estimate (decode every frame and rebuild the entity map). The
+browser half of time-to-interactive — building the React store — is
+measured by frontend/scripts/bench-hydration.mjs.
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from backend.services.hydration import encode_hydration  # noqa: E402
+from engine.kernel import apply_batch, empty_snapshot  # noqa: E402
+
+
+def build_snapshot(count: int, props: int) -> dict:
+    """Grids of rows under a handful of sections, like a large tracker aide."""
+    sections = max(count // 100, 1)
+    events = [{"t": "entity.create", "id": f"section_{s}", "parent": "root"} for s in range(sections)]
+    for i in range(count - sections):
+        p = {f"field_{j}": f"value {i}-{j}" for j in range(props)}
+        p["done"] = i % 3 == 0
+        events.append({"t": "entity.create", "id": f"row_{i}", "parent": f"section_{i % sections}", "p": p})
+    snapshot, _ = apply_batch(empty_snapshot(), events)
+    snapshot["meta"] = {"title": "Benchmark"}
+    return snapshot
+
+
+def receive(frames: list[str | bytes]) -> int:
+    """Decode frames the way the client does and rebuild the entity map."""
+    entities: dict[str, dict] = {}
+    for frame in frames:
+        msg = json.loads(gzip.decompress(frame) if isinstance(frame, bytes) else frame)
+        if msg["type"] == "entity.create":
+            entities[msg["id"]] = msg["data"]
+        elif msg["type"] == "snapshot":
+            entities.update(msg["entities"])
+    return len(entities)
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="WebSocket hydration benchmark")
+    p.add_argument("--entities", type=int, default=5000, help="Entities in the synthetic snapshot")
+    p.add_argument("--props", type=int, default=6, help="Props per row entity")
+    p.add_argument("--repeat", type=int, default=5, help="Runs per protocol (best is reported)")
+    args = p.parse_args()
+
+    snapshot = build_snapshot(args.entities, args.props)
+    print(f"{len(snapshot['entities'])} entities, {len(json.dumps(snapshot)) / 1024:.0f} KB as JSON\n")
+    print(f"{'protocol':<10} {'frames':>7} {'wire KB':>9} {'encode ms':>10} {'receive ms':>11}")
+    for label, version in (("legacy", 0), ("bulk_v1", 1)):
+        encode_s = receive_s = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            frames = encode_hydration(snapshot, version)
+            encode_s = min(encode_s, time.perf_counter() - start)
+            start = time.perf_counter()
+            count = receive(frames)
+            receive_s = min(receive_s, time.perf_counter() - start)
+        assert count == len(snapshot["entities"])
+        wire = sum(len(f.encode() if isinstance(f, str) else f) for f in frames)
+        print(f"{label:<10} {len(frames):>7} {wire / 1024:>9.0f} {encode_s * 1000:>10.1f} {receive_s * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
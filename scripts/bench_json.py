@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encode/decode of aide snapshots: stdlib json vs orjson.
+
+Usage:
+    python scripts/bench_json.py [--sizes 100,1000,10000,50000] [--props 6] [--repeat 5]
+
+Builds synthetic snapshots of each size (as scripts/bench_hydration.py does)
+and times the operations backend/utils/jsonx.py performs on them in the hot
+path, once per backend:
+
+- db encode:     dumpb(state), the asyncpg jsonb encoder
+- db decode:     loads(bytes), the asyncpg jsonb decoder
+- hash:          dumpb(state, sort_keys=True), as hash_snapshot does
+- prompt:        dumps(state, indent=True, sort_keys=True), the prompt snapshot block
+
+Best of --repeat runs is reported, in milliseconds.
+"""
+
+import argparse
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from backend.utils import jsonx  # noqa: E402
+from scripts.bench_hydration import build_snapshot  # noqa: E402
+
+BACKENDS = {"json": (jsonx._std_dumps, jsonx._std_dumpb, jsonx._std_loads)}
+if jsonx.orjson is not None:
+    BACKENDS["orjson"] = (jsonx._orjson_dumps, jsonx._orjson_dumpb, jsonx.orjson.loads)
+
+
+def best(fn, repeat: int) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed * 1000
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="JSON codec benchmark")
+    p.add_argument("--sizes", default="100,1000,10000,50000", help="Comma-separated entity counts")
+    p.add_argument("--props", type=int, default=6, help="Props per row entity")
+    p.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    args = p.parse_args()
+
+    if "orjson" not in BACKENDS:
+        print("orjson is not installed; reporting the stdlib backend only\n")
+    print(f"{'entities':>8} {'KB':>7} {'backend':<7} {'db enc':>8} {'db dec':>8} {'hash':>8} {'prompt':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        snapshot = build_snapshot(size, args.props)
+        encoded = jsonx._std_dumpb(snapshot)
+        for name, (dumps, dumpb, loads) in BACKENDS.items():
+            print(
+                f"{size:>8} {len(encoded) / 1024:>7.0f} {name:<7}"
+                f" {best(lambda: dumpb(snapshot), args.repeat):>8.2f}"  # noqa: B023
+                f" {best(lambda: loads(encoded), args.repeat):>8.2f}"  # noqa: B023
+                f" {best(lambda: dumpb(snapshot, sort_keys=True), args.repeat):>8.2f}"  # noqa: B023
+                f" {best(lambda: dumps(snapshot, sort_keys=True, indent=True), args.repeat):>8.2f}"  # noqa: B023
+            )
+
+
+if __name__ == "__main__":
+    main()
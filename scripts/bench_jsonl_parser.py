@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSONLParser throughput on synthetic multi-megabyte streams.
+
+Usage:
+    python scripts/bench_jsonl_parser.py [--mb 4] [--chunk 16]
+
+Feeds each stream in fixed-size chunks (LLM deltas are ~10-50 bytes) and
+compares the chunk-list parser against the previous `buffer += chunk` /
+`split("\\n", 1)` implementation, which copies the remaining buffer for
+every line and goes quadratic as streams grow.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from backend.services.jsonl_parser import JSONLParser  # noqa: E402
+
+
+class SplitBufferParser:
+    """Previous implementation, kept here as the baseline."""
+
+    def __init__(self) -> None:
+        self.buffer = ""
+
+    def feed(self, chunk: str) -> list[dict]:
+        self.buffer += chunk
+        lines = []
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            stripped = line.strip()
+            if stripped:
+                lines.append(json.loads(stripped))
+        return lines
+
+
+def short_lines(size: int) -> str:
+    """Many small entity.update lines — the common L3 shape."""
+    out, total, i = [], 0, 0
+    while total < size:
+        line = json.dumps({"t": "entity.update", "ref": f"item_{i}", "p": {"done": i % 2 == 0}}) + "\n"
+        out.append(line)
+        total += len(line)
+        i += 1
+    return "".join(out)
+
+
+def one_long_line(size: int) -> str:
+    """A single huge line (e.g. a large text prop) arriving in many chunks."""
+    return json.dumps({"t": "voice", "text": "x" * size}) + "\n"
+
+
+def run(parser, text: str, chunk: int) -> tuple[float, int]:
+    start = time.perf_counter()
+    count = 0
+    for i in range(0, len(text), chunk):
+        count += len(parser.feed(text[i : i + chunk]))
+    return time.perf_counter() - start, count
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="JSONLParser throughput benchmark")
+    p.add_argument("--mb", type=float, default=4.0, help="Stream size in MB")
+    p.add_argument("--chunk", type=int, default=16, help="Chunk size in bytes")
+    p.add_argument("--skip-baseline", action="store_true", help="Only time the current parser")
+    args = p.parse_args()
+
+    size = int(args.mb * 1024 * 1024)
+    streams = {"short_lines": short_lines(size), "one_long_line": one_long_line(size)}
+
+    print(f"{'stream':<16} {'parser':<14} {'lines':>8} {'seconds':>9} {'MB/s':>9}")
+    for name, text in streams.items():
+        mb = len(text) / (1024 * 1024)
+        parsers = [("chunk_list", JSONLParser(expand=False))]
+        if not args.skip_baseline:
+            parsers.append(("split_buffer", SplitBufferParser()))
+        for label, parser in parsers:
+            seconds, count = run(parser, text, args.chunk)
+            print(f"{name:<16} {label:<14} {count:>8} {seconds:>9.3f} {mb / seconds:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark aide state storage: plain JSONB documents vs zstd-compressed blobs.
+
+Usage:
+    python scripts/bench_state_storage.py [--sizes 1000,10000,50000] [--props 6] [--repeat 5]
+    DATABASE_URL=postgresql://... python scripts/bench_state_storage.py --database
+
+Builds kernel snapshots shaped like large tracker aides (as
+scripts/bench_hydration.py does) and reports, per size, the canonical JSON
+size, the zstd blob size, and compress and decode times (decode = zstd plus
+JSON parse, against a plain JSON parse).
+
+With --database (needs `alembic upgrade head`), also writes each snapshot
+to a throwaway aide in both layouts and reports stored bytes (TOAST/pglz
+for the document, the blob for the compressed layout) and the time of a
+full AideRepo.get(). The snapshot cache is not started, so every read goes
+to Postgres.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("JWT_SECRET", "bench-only-secret-bench-only-secret")
+
+from backend.utils import jsonx, state_codec  # noqa: E402
+from scripts.bench_hydration import build_snapshot  # noqa: E402
+
+
+def best(fn, repeat: int) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed * 1000
+
+
+def bench_codec(snapshots: dict[int, dict], repeat: int) -> None:
+    print(f"{'entities':>8} {'json KB':>8} {'zstd KB':>8} {'ratio':>6} {'compress':>9} {'parse':>7} {'inflate':>8}")
+    for size, snapshot in snapshots.items():
+        data = jsonx.dumpb(snapshot, sort_keys=True)
+        blob = state_codec.encode(snapshot)
+        print(
+            f"{size:>8} {len(data) / 1024:>8.0f} {len(blob) / 1024:>8.0f} {len(data) / len(blob):>6.1f}"
+            f" {best(lambda: state_codec.encode(snapshot), repeat):>9.2f}"  # noqa: B023
+            f" {best(lambda: jsonx.loads(data), repeat):>7.2f}"  # noqa: B023
+            f" {best(lambda: state_codec.decode(blob, state_codec.STATE_FORMAT), repeat):>8.2f}"  # noqa: B023
+        )
+
+
+async def bench_database(snapshots: dict[int, dict], repeat: int) -> None:
+    from backend import db
+    from backend.models.aide import CreateAideRequest
+    from backend.repos import aide_repo
+    from backend.repos.aide_repo import AideRepo
+
+    await db.init_pool()
+    repo, user_id = AideRepo(), uuid4()
+    async with db.system_conn() as conn:
+        await conn.execute(
+            "INSERT INTO users (id, email, name) VALUES ($1, $2, $3)", user_id, f"bench-{user_id}@example.com", "Bench"
+        )
+    try:
+        print(f"\n{'entities':>8} {'layout':<10} {'stored KB':>10} {'get ms':>8}")
+        for size, snapshot in snapshots.items():
+            for layout, min_bytes in (("document", 0), ("compressed", 1)):
+                aide = await repo.create(user_id, CreateAideRequest(title="Bench"))
+                with patch.object(aide_repo.settings, "AIDE_STATE_COMPRESS_MIN_BYTES", min_bytes):
+                    await repo.update_state(user_id, aide.id, snapshot, [])
+                async with db.system_conn() as conn:
+                    stored = await conn.fetchval(
+                        """
+                        SELECT pg_column_size(state) + COALESCE(pg_column_size(state_blob), 0)
+                        FROM aides WHERE id = $1
+                        """,
+                        aide.id,
+                    )
+                elapsed = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    await repo.get(user_id, aide.id)
+                    elapsed = min(elapsed, time.perf_counter() - start)
+                print(f"{size:>8} {layout:<10} {stored / 1024:>10.0f} {elapsed * 1000:>8.2f}")
+    finally:
+        async with db.system_conn() as conn:
+            await conn.execute("DELETE FROM aides WHERE user_id = $1", user_id)
+            await conn.execute("DELETE FROM users WHERE id = $1", user_id)
+        await db.close_pool()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Aide state storage benchmark")
+    p.add_argument("--sizes", default="1000,10000,50000", help="Comma-separated entity counts")
+    p.add_argument("--props", type=int, default=6, help="Props per row entity")
+    p.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    p.add_argument("--database", action="store_true", help="Also measure stored size and reads in Postgres")
+    args = p.parse_args()
+
+    if not state_codec.available():
+        sys.exit("zstandard is not installed")
+    snapshots = {int(s): build_snapshot(int(s), args.props) for s in args.sizes.split(",")}
+    bench_codec(snapshots, args.repeat)
+    if args.database:
+        asyncio.run(bench_database(snapshots, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
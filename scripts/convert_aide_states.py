@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Convert aide states between the document and compressed layouts.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/convert_aide_states.py --min-bytes 262144
+    DATABASE_URL=postgresql://... python scripts/convert_aide_states.py --decompress
+
+With --min-bytes, converts every document-layout aide whose stored state
+is at least that size, as the cleanup task does a batch per minute while
+AIDE_STATE_COMPRESS_MIN_BYTES is set. With --decompress, converts every
+compressed aide back to a plain document; run it (with
+AIDE_STATE_COMPRESS_MIN_BYTES=0 everywhere) before downgrading migration 012.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+os.environ.setdefault("TESTING", "true")
+os.environ.setdefault("JWT_SECRET", "convert-only-secret-convert-only-secret")
+
+from backend import db  # noqa: E402
+from backend.repos.aide_repo import AideRepo  # noqa: E402
+from backend.utils import state_codec  # noqa: E402
+
+
+async def main() -> None:
+    p = argparse.ArgumentParser(description="Convert aide state storage layouts")
+    mode = p.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--min-bytes", type=int, help="Compress document states stored at this size or larger")
+    mode.add_argument("--decompress", action="store_true", help="Convert compressed states back to documents")
+    p.add_argument("--batch", type=int, default=50, help="Aides converted per transaction")
+    args = p.parse_args()
+
+    if not state_codec.available():
+        sys.exit("zstandard is not installed")
+
+    await db.init_pool()
+    repo, total = AideRepo(), 0
+    try:
+        while True:
+            if args.decompress:
+                converted = await repo.decompress_states(args.batch)
+            else:
+                converted = await repo.compress_states(args.min_bytes, args.batch)
+            total += converted
+            if converted < args.batch:
+                break
+    finally:
+        await db.close_pool()
+    print(f"Converted {total} aides")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
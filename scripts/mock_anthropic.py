@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Mock Anthropic Messages API that replays recorded turns.
+
+Usage:
+    # Replay turns saved by eval runs (telemetry.json files under the dir)
+    python scripts/mock_anthropic.py --from-eval ./eval_output/multiturn_20260301_120000
+
+    # Replay production turns from aide_turn_telemetry (needs DATABASE_URL)
+    python scripts/mock_anthropic.py --from-db --limit 500
+
+    # Point the backend at it (the SDK reads ANTHROPIC_BASE_URL)
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=mock uvicorn backend.main:app
+
+Each POST /v1/messages streams the next recording as Anthropic SSE events:
+tool calls become tool_use blocks with input_json_delta chunks, text blocks
+are replayed through the `voice` tool. The first delta waits for the recorded
+TTFC and the remaining chunks are spread evenly over the recorded TTC, scaled
+by --speed. Requests without tools (JSONL wire mode) get the same turn as
+compact JSONL text.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Add project root to path
+sys.path.insert(0, ".")
+
+from backend.services.tool_utils import tool_use_to_reducer_events  # noqa: E402
+
+# Characters per streamed delta (~1 token)
+CHUNK_CHARS = 4
+
+
+@dataclass
+class Recording:
+    """One recorded LLM turn."""
+
+    tool_calls: list[dict] = field(default_factory=list)
+    text_blocks: list[str] = field(default_factory=list)
+    usage: dict = field(default_factory=dict)
+    ttfc_ms: int = 0
+    ttc_ms: int = 0
+
+
+def _recording_from_turn(turn: dict) -> Recording:
+    """Build a Recording from an aide_turn_telemetry row or eval telemetry turn."""
+    texts = [b["text"] if isinstance(b, dict) else b for b in turn.get("text_blocks") or []]
+    return Recording(
+        tool_calls=[{"name": tc["name"], "input": tc["input"]} for tc in turn.get("tool_calls") or []],
+        text_blocks=[t for t in texts if t and t.strip()],
+        usage=turn.get("usage") or {},
+        ttfc_ms=max(turn.get("ttfc_ms") or 0, 0),
+        ttc_ms=max(turn.get("ttc_ms") or 0, 0),
+    )
+
+
+def load_eval_recordings(run_dir: Path) -> list[Recording]:
+    """Load every turn from telemetry.json files under an eval run directory."""
+    recordings = []
+    for path in sorted(run_dir.rglob("telemetry.json")):
+        telemetry = json.loads(path.read_text())
+        recordings.extend(_recording_from_turn(t) for t in telemetry.get("turns", []))
+    return recordings
+
+
+async def load_db_recordings(limit: int) -> list[Recording]:
+    """Load the most recent turns from aide_turn_telemetry."""
+    from backend import db
+
+    await db.init_pool()
+    try:
+        async with db.system_conn() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT tool_calls, text_blocks, usage, ttfc_ms, ttc_ms
+                FROM aide_turn_telemetry
+                ORDER BY created_at DESC
+                LIMIT $1
+                """,
+                limit,
+            )
+    finally:
+        await db.close_pool()
+    return [_recording_from_turn(dict(row)) for row in rows]
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _chunks(text: str) -> list[str]:
+    return [text[i : i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)] or [""]
+
+
+def _blocks(recording: Recording, with_tools: bool) -> list[tuple[dict, list[dict]]]:
+    """Content blocks as (content_block_start payload, deltas)."""
+    if not with_tools:
+        # JSONL wire mode: one compact event per line in a single text block
+        events = []
+        for tc in recording.tool_calls:
+            if tc["name"] == "jsonl":
+                events.append(tc["input"])
+            else:
+                events.extend(tool_use_to_reducer_events(tc["name"], tc["input"]))
+        events.extend({"t": "voice", "text": text} for text in recording.text_blocks)
+        text = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events)
+        return [({"type": "text", "text": ""}, [{"type": "text_delta", "text": c} for c in _chunks(text)])]
+
+    blocks = []
+    calls = [tc for tc in recording.tool_calls if tc["name"] != "jsonl"]
+    calls += [{"name": "voice", "input": {"text": text}} for text in recording.text_blocks]
+    for tc in calls:
+        start = {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tc["name"], "input": {}}
+        deltas = [{"type": "input_json_delta", "partial_json": c} for c in _chunks(json.dumps(tc["input"]))]
+        blocks.append((start, deltas))
+    return blocks
+
+
+async def replay(recording: Recording, model: str, with_tools: bool, speed: float):
+    """Yield Anthropic SSE events for a recording with recorded pacing."""
+    usage = recording.usage
+    blocks = _blocks(recording, with_tools)
+    total_deltas = sum(len(deltas) for _, deltas in blocks)
+    first_delay = recording.ttfc_ms / 1000 / speed
+    per_delta = max(recording.ttc_ms - recording.ttfc_ms, 0) / 1000 / speed / max(total_deltas, 1)
+
+    yield _sse(
+        "message_start",
+        {
+            "type": "message_start",
+            "message": {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": 1,
+                    "cache_read_input_tokens": usage.get("cache_read", usage.get("cache_read_input_tokens", 0)),
+                    "cache_creation_input_tokens": usage.get(
+                        "cache_creation", usage.get("cache_creation_input_tokens", 0)
+                    ),
+                },
+            },
+        },
+    )
+    await asyncio.sleep(first_delay)
+
+    for index, (start, deltas) in enumerate(blocks):
+        yield _sse("content_block_start", {"type": "content_block_start", "index": index, "content_block": start})
+        for delta in deltas:
+            yield _sse("content_block_delta", {"type": "content_block_delta", "index": index, "delta": delta})
+            await asyncio.sleep(per_delta)
+        yield _sse("content_block_stop", {"type": "content_block_stop", "index": index})
+
+    stop_reason = "tool_use" if with_tools and blocks else "end_turn"
+    yield _sse(
+        "message_delta",
+        {
+            "type": "message_delta",
+            "delta": {"stop_reason": stop_reason, "stop_sequence": None},
+            "usage": {"output_tokens": usage.get("output_tokens", total_deltas)},
+        },
+    )
+    yield _sse("message_stop", {"type": "message_stop"})
+
+
+def create_app(recordings: list[Recording], speed: float = 1.0) -> FastAPI:
+    """Build the mock API app, cycling through recordings in order."""
+    if not recordings:
+        raise ValueError("No recordings to replay")
+    app = FastAPI(title="Mock Anthropic")
+    cycle = itertools.cycle(recordings)
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        recording = next(cycle)
+        model = body.get("model", "mock")
+        with_tools = bool(body.get("tools"))
+
+        if body.get("stream"):
+            return StreamingResponse(replay(recording, model, with_tools, speed), media_type="text/event-stream")
+
+        # Non-streaming (e.g. eval cache warming): answer immediately with the whole message
+        content = []
+        for start, deltas in _blocks(recording, with_tools):
+            if start["type"] == "text":
+                content.append({"type": "text", "text": "".join(d["text"] for d in deltas)})
+            else:
+                raw = "".join(d["partial_json"] for d in deltas)
+                content.append({**start, "input": json.loads(raw)})
+        return JSONResponse(
+            {
+                "id": f"msg_{uuid.uuid4().hex[:24]}",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": content,
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": recording.usage.get("input_tokens", 0),
+                    "output_tokens": recording.usage.get("output_tokens", 0),
+                },
+            }
+        )
+
+    return app
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Mock Anthropic API replaying recorded turns")
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--from-eval", type=Path, help="Eval run directory containing telemetry.json files")
+    source.add_argument("--from-db", action="store_true", help="Load from aide_turn_telemetry (DATABASE_URL)")
+    p.add_argument("--limit", type=int, default=500, help="Max turns to load from the database")
+    p.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (2 = twice as fast)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    args = p.parse_args()
+
+    recordings = load_eval_recordings(args.from_eval) if args.from_eval else asyncio.run(load_db_recordings(args.limit))
+    print(f"Loaded {len(recordings)} recorded turns")
+    uvicorn.run(create_app(recordings, speed=args.speed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,11 @@
  *   "updatedAt": "Optional timestamp"
  * }
  *
- * Outputs full HTML document to stdout.
+ * Outputs full HTML document to stdout. The server renders through the
+ * long-lived render_worker.js instead; this one-shot form is for scripts.
  */
 
-const fs = require('fs');
-const path = require('path');
-
-// Load display.js module
-const display = require(path.join(__dirname, '../frontend/display.js'));
+const { renderInput } = require('./render_worker');
 
 // Read JSON input from stdin
 let inputData = '';
@@ -32,22 +29,8 @@ process.stdin.on('end', () => {
   try {
     const input = JSON.parse(inputData);
 
-    // Extract parameters with defaults for missing properties
-    const rawState = input.state || {};
-    const store = {
-      entities: rawState.entities || {},
-      rootIds: rawState.rootIds || [],
-      meta: rawState.meta || {}
-    };
-    const options = {
-      title: input.title || store.meta.title || 'AIde',
-      description: input.description || '',
-      footer: input.footer || null,
-      updatedAt: input.updatedAt || null
-    };
-
     // Render document
-    const html = display.renderDocument(store, options);
+    const html = renderInput(input);
 
     // Output to stdout
     process.stdout.write(html);
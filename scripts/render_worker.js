@@ -0,0 +1,86 @@
+#!/usr/bin/env node
+/**
+ * render_worker.js — long-lived renderer for AIde publish
+ *
+ * Spawned by backend/services/render_pool.py and kept running between
+ * publishes. Speaks line-delimited JSON-RPC on stdin/stdout, like the CLI
+ * bridge (cli/aide_cli/bridge.js):
+ *
+ *   <- {"ready": true}                                  once, on startup
+ *   -> {"id": 1, "method": "render", "params": {...}}   params as for render.js
+ *   <- {"id": 1, "result": "<!DOCTYPE html>..."}
+ *   -> {"id": 2, "method": "ping", "params": {}}
+ *   <- {"id": 2, "result": "pong"}
+ *
+ * A failed request answers {"id": ..., "error": "..."} and the worker
+ * carries on. Requests are handled one at a time, in order.
+ *
+ * Also exports renderInput() for the one-shot render.js.
+ */
+
+const path = require('path');
+const readline = require('readline');
+
+// Load display.js module
+const display = require(path.join(__dirname, '../frontend/display.js'));
+
+/**
+ * Render a render.js-style input object to a full HTML document.
+ */
+function renderInput(input) {
+  // Extract parameters with defaults for missing properties
+  const rawState = input.state || {};
+  const store = {
+    entities: rawState.entities || {},
+    rootIds: rawState.rootIds || [],
+    meta: rawState.meta || {}
+  };
+  const options = {
+    title: input.title || store.meta.title || 'AIde',
+    description: input.description || '',
+    footer: input.footer || null,
+    updatedAt: input.updatedAt || null
+  };
+  return display.renderDocument(store, options);
+}
+
+function serve() {
+  // stdout carries the protocol; anything else logged goes to stderr
+  console.log = console.error;
+  console.info = console.error;
+
+  const respond = (message) => process.stdout.write(JSON.stringify(message) + '\n');
+  const rl = readline.createInterface({ input: process.stdin });
+
+  rl.on('line', (line) => {
+    let id = null;
+    try {
+      const req = JSON.parse(line);
+      id = req.id;
+      switch (req.method) {
+        case 'render':
+          respond({ id, result: renderInput(req.params || {}) });
+          break;
+        case 'ping':
+          respond({ id, result: 'pong' });
+          break;
+        default:
+          respond({ id, error: `Unknown method: ${req.method}` });
+      }
+    } catch (err) {
+      respond({ id, error: `Render error: ${err.message}` });
+    }
+  });
+
+  // The pool closes stdin to stop the worker
+  rl.on('close', () => process.exit(0));
+
+  // Signal readiness
+  respond({ ready: true });
+}
+
+module.exports = { renderInput };
+
+if (require.main === module) {
+  serve();
+}
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+WebSocket load test for the /ws/aide/{aide_id} streaming path.
+
+Usage:
+    # 1. Mock LLM replaying recorded turns
+    python scripts/mock_anthropic.py --from-eval ./eval_output/multiturn_20260301_120000 &
+
+    # 2. Backend pointed at the mock
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 ANTHROPIC_API_KEY=mock uvicorn backend.main:app --port 8000 &
+
+    # 3. 200 concurrent editors, 5 script steps each, ramped over 20s
+    python scripts/ws_loadtest.py --sessions 200 --steps 5 --ramp 20 --server-pid $(pgrep -f "uvicorn backend.main")
+
+Each session opens its own socket and runs the script (default: a few turns
+with a direct edit between them). Without --aide-id/--cookie, sessions use
+placeholder aide ids, which exercises streaming and the kernel but skips
+persistence; pass real aides and a session cookie to include the database.
+
+Reports TTFC/TTC/direct-edit percentiles, turn throughput, server RSS per
+connection (--server-pid) and any numeric server metrics that changed
+(--metrics-url http://127.0.0.1:8000/api/admin/metrics, which needs an admin
+session: --metrics-cookie, defaulting to --cookie). That covers DB pool
+acquire waits, the snapshot cache, send queues and the telemetry sink.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import websockets
+
+DEFAULT_SCRIPT = [
+    {"message": "plan a poker night for six players, biweekly thursdays, $20 buy-in"},
+    {"direct_edit": {"field": "title", "value": "Poker Night (edited)"}},
+    {"message": "mike is out this week and dave is hosting"},
+    {"message": "add a snacks checklist: chips, salsa, drinks"},
+    {"direct_edit": {"field": "title", "value": "Poker Night"}},
+]
+
+TURN_TIMEOUT_S = 120
+EDIT_TIMEOUT_S = 10
+
+
+class Stats:
+    """Latency samples collected across all sessions."""
+
+    def __init__(self) -> None:
+        self.ttfc_ms: list[float] = []
+        self.ttc_ms: list[float] = []
+        self.edit_ms: list[float] = []
+        self.errors: dict[str, int] = {}
+        self.frames = 0
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def read_rss_kb(pid: int | None) -> int | None:
+    """Resident set size of a process from /proc (Linux only)."""
+    if pid is None:
+        return None
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def fetch_metrics(url: str | None, cookie: str | None = None) -> dict:
+    if not url:
+        return {}
+    try:
+        async with httpx.AsyncClient(timeout=5, cookies={"session": cookie} if cookie else None) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"  metrics fetch failed: {e}")
+        return {}
+
+
+def numeric_deltas(before: dict, after: dict, prefix: str = "") -> dict[str, float]:
+    """Flatten two metric snapshots and return numeric keys that changed."""
+    deltas: dict[str, float] = {}
+    for key, value in after.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            deltas.update(numeric_deltas(before.get(key) or {}, value, f"{name}."))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            prev = before.get(key, 0)
+            if isinstance(prev, int | float) and value != prev:
+                deltas[name] = value - prev
+    return deltas
+
+
+def script_steps(script: list[dict], steps: int):
+    """Yield `steps` script entries, wrapping around the script."""
+    for i in range(steps):
+        yield script[i % len(script)]
+
+
+async def run_session(
+    index: int,
+    args: argparse.Namespace,
+    script: list[dict],
+    stats: Stats,
+    connected: asyncio.Event,
+    counter: list[int],
+) -> None:
+    """Open one editor connection and run the script."""
+    aide_ids = args.aide_id or [f"load-{index}"]
+    aide_id = aide_ids[index % len(aide_ids)]
+    headers = {"Cookie": f"session={args.cookie}"} if args.cookie else {}
+    frames: asyncio.Queue = asyncio.Queue()
+    entities: list[str] = []
+
+    try:
+        ws = await websockets.connect(f"{args.url}/ws/aide/{aide_id}", additional_headers=headers, max_size=None)
+    except (OSError, websockets.WebSocketException) as e:
+        stats.error(f"connect: {type(e).__name__}")
+        return
+
+    async def reader() -> None:
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                stats.frames += 1
+                if msg.get("type") == "entity.create" and msg.get("id") not in entities:
+                    entities.append(msg["id"])
+                frames.put_nowait(msg)
+        except websockets.ConnectionClosed:
+            pass
+
+    reader_task = asyncio.create_task(reader())
+    counter[0] += 1
+    if counter[0] == args.sessions:
+        connected.set()
+    await connected.wait()
+
+    async def wait_for(predicate, timeout: float) -> dict | None:
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                msg = await asyncio.wait_for(frames.get(), remaining)
+            except TimeoutError:
+                return None
+            if predicate(msg):
+                return msg
+        return None
+
+    try:
+        for step in script_steps(script, args.steps):
+            if "message" in step:
+                message_id = uuid.uuid4().hex[:8]
+                start = time.monotonic()
+                await ws.send(json.dumps({"type": "message", "content": step["message"], "message_id": message_id}))
+                first = await wait_for(
+                    lambda m: m.get("type") in ("entity.create", "entity.update", "entity.remove", "voice")
+                    or m.get("type") in ("stream.end", "stream.error"),
+                    TURN_TIMEOUT_S,
+                )
+                if first is None:
+                    stats.error("turn timeout")
+                    continue
+                if first.get("type") == "stream.error":
+                    stats.error(f"stream.error: {first.get('error')}")
+                    continue
+                stats.ttfc_ms.append((time.monotonic() - start) * 1000)
+                if first.get("type") != "stream.end":
+                    end = await wait_for(lambda m: m.get("type") in ("stream.end", "stream.error"), TURN_TIMEOUT_S)
+                    if end is None or end.get("type") == "stream.error":
+                        stats.error("turn timeout" if end is None else f"stream.error: {end.get('error')}")
+                        continue
+                stats.ttc_ms.append((time.monotonic() - start) * 1000)
+            elif "direct_edit" in step:
+                if not entities:
+                    stats.error("direct_edit skipped: no entities")
+                    continue
+                entity_id = entities[0]
+                start = time.monotonic()
+                await ws.send(json.dumps({"type": "direct_edit", "entity_id": entity_id, **step["direct_edit"]}))
+                reply = await wait_for(
+                    lambda m, entity_id=entity_id: (m.get("type") == "entity.update" and m.get("id") == entity_id)
+                    or m.get("type") == "direct_edit.error",
+                    EDIT_TIMEOUT_S,
+                )
+                if reply is None or reply.get("type") == "direct_edit.error":
+                    stats.error("direct_edit timeout" if reply is None else "direct_edit.error")
+                    continue
+                stats.edit_ms.append((time.monotonic() - start) * 1000)
+            await asyncio.sleep(args.think)
+    except websockets.ConnectionClosed:
+        stats.error("connection closed")
+    finally:
+        await ws.close()
+        reader_task.cancel()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    script = json.loads(Path(args.script).read_text()) if args.script else DEFAULT_SCRIPT
+    stats = Stats()
+    connected = asyncio.Event()
+    counter = [0]
+
+    rss_before = read_rss_kb(args.server_pid)
+    metrics_before = await fetch_metrics(args.metrics_url, args.metrics_cookie or args.cookie)
+
+    print(f"Opening {args.sessions} sessions against {args.url} (ramp {args.ramp}s, {args.steps} steps each)")
+    start = time.monotonic()
+    tasks = []
+    for i in range(args.sessions):
+        tasks.append(asyncio.create_task(run_session(i, args, script, stats, connected, counter)))
+        if args.ramp:
+            await asyncio.sleep(args.ramp / args.sessions)
+
+    # All sockets open and idle: measure memory before turns start allocating
+    try:
+        await asyncio.wait_for(connected.wait(), timeout=60)
+    except TimeoutError:
+        connected.set()
+    rss_connected = read_rss_kb(args.server_pid)
+    run_start = time.monotonic()
+
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - run_start
+    rss_after = read_rss_kb(args.server_pid)
+    metrics_after = await fetch_metrics(args.metrics_url, args.metrics_cookie or args.cookie)
+
+    print(f"\nFinished in {time.monotonic() - start:.1f}s ({elapsed:.1f}s after all sockets connected)")
+    print(f"{'metric':<14} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, samples in (("ttfc_ms", stats.ttfc_ms), ("ttc_ms", stats.ttc_ms), ("edit_ms", stats.edit_ms)):
+        print(
+            f"{name:<14} {len(samples):>6} {percentile(samples, 50):>9.0f} {percentile(samples, 95):>9.0f} "
+            f"{percentile(samples, 99):>9.0f} {max(samples, default=0):>9.0f}"
+        )
+    print(f"\nTurns/s: {len(stats.ttc_ms) / max(elapsed, 1e-9):.2f}  Frames/s: {stats.frames / max(elapsed, 1e-9):.1f}")
+
+    if rss_before is not None and rss_connected is not None:
+        per_conn = (rss_connected - rss_before) / max(counter[0], 1)
+        print(f"Server RSS: {rss_before / 1024:.0f} MB idle → {rss_connected / 1024:.0f} MB connected", end="")
+        print(f" → {(rss_after or 0) / 1024:.0f} MB after run ({per_conn:.0f} KB per idle connection)")
+
+    deltas = numeric_deltas(metrics_before, metrics_after)
+    if deltas:
+        print("\nServer metrics (after − before):")
+        for key, value in sorted(deltas.items()):
+            print(f"  {key}: {value:+g}")
+
+    if stats.errors:
+        print("\nErrors:")
+        for kind, count in sorted(stats.errors.items(), key=lambda x: -x[1]):
+            print(f"  {count:>6}  {kind}")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="WebSocket load test for aide editing sessions")
+    p.add_argument("--url", default="ws://127.0.0.1:8000", help="Backend WebSocket base URL")
+    p.add_argument("--sessions", type=int, default=50, help="Concurrent editor connections")
+    p.add_argument("--steps", type=int, default=len(DEFAULT_SCRIPT), help="Script steps per session")
+    p.add_argument("--ramp", type=float, default=5.0, help="Seconds over which to open connections")
+    p.add_argument("--think", type=float, default=1.0, help="Pause between steps (seconds)")
+    p.add_argument("--script", type=str, help='JSON list of {"message": ...} / {"direct_edit": {field, value}}')
+    p.add_argument("--aide-id", action="append", help="Real aide id(s) to spread sessions over (repeatable)")
+    p.add_argument("--cookie", type=str, help="Session JWT for authenticated aides")
+    p.add_argument("--server-pid", type=int, help="Backend PID for RSS sampling (Linux)")
+    p.add_argument("--metrics-url", type=str, help="Backend JSON metrics endpoint to diff before/after")
+    p.add_argument("--metrics-cookie", type=str, help="Admin session JWT for --metrics-url (default: --cookie)")
+    asyncio.run(main_async(p.parse_args()))
+
+
+if __name__ == "__main__":
+    main()